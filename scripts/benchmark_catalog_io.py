@@ -0,0 +1,151 @@
+"""Benchmark event-loop lag while catalog source files are loaded.
+
+Compares the previous loader (open() and yaml.safe_load with the
+pure-Python SafeLoader, called directly in the coroutine) against
+CatalogFileRepository._load_source with libyaml's CSafeLoader, parsing
+in the I/O thread pool ("threads") and, for files of at least
+--process-min-bytes, in the process pool ("process").
+
+While the loads run, a ticker coroutine wakes up every --tick-ms and
+records how late it was: that delay is what every HTTP request and
+WebSocket on the worker would wait.
+
+Sources are built from catalog/sources/card_account_authorization/card_main.yaml
+with its columns repeated until each file has --columns columns.
+
+Usage:
+    python scripts/benchmark_catalog_io.py [--files 8] [--columns 2000]
+        [--process-min-bytes 131072]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+import structlog
+import yaml
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.repositories.catalog.file_repository import (  # noqa: E402
+    CatalogFileRepository,
+)
+from src.repositories.catalog.yaml_io import YamlLoader  # noqa: E402
+from src.schemas.catalog_yaml import SourceMetadataYaml  # noqa: E402
+
+TEMPLATE = "catalog/sources/card_account_authorization/card_main.yaml"
+
+
+def write_sources(base_path: Path, files: int, columns: int) -> list[str]:
+    """Write large source files and return their relative paths."""
+    template_path = PROJECT_ROOT / TEMPLATE
+    data: dict[str, Any] = yaml.safe_load(template_path.read_text(encoding="utf-8"))
+    template_columns = data["columns"]
+
+    data["columns"] = [
+        {**template_columns[i % len(template_columns)], "path": f"field_{i}"}
+        for i in range(columns)
+    ]
+    text = yaml.dump(data, allow_unicode=True, sort_keys=False)
+
+    paths = []
+    for i in range(files):
+        relative = f"sources/bench/source_{i}.yaml"
+        (base_path / relative).parent.mkdir(parents=True, exist_ok=True)
+        (base_path / relative).write_text(text, encoding="utf-8")
+        paths.append(relative)
+    return paths
+
+
+def make_load_before(base_path: Path) -> Callable[[str], Awaitable[Any]]:
+    """Previous loader: blocking read and pure-Python parse in the coroutine."""
+
+    async def load(file_path: str) -> SourceMetadataYaml:
+        with (base_path / file_path).open("r", encoding="utf-8") as f:
+            data: dict[str, Any] = yaml.safe_load(f) or {}
+        return SourceMetadataYaml.from_yaml_dict(data)
+
+    return load
+
+
+async def measure(
+    name: str, load: Callable[[str], Awaitable[Any]], paths: list[str]
+) -> None:
+    """Print total load time and ticker lag while loading every file."""
+    tick = ARGS.tick_ms / 1000
+    lags: list[float] = []
+    done = asyncio.Event()
+
+    async def ticker() -> None:
+        while not done.is_set():
+            expected = time.perf_counter() + tick
+            await asyncio.sleep(tick)
+            lags.append(max(0.0, time.perf_counter() - expected))
+
+    ticker_task = asyncio.create_task(ticker())
+    await asyncio.sleep(tick * 5)  # let the ticker settle
+    lags.clear()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(load(path) for path in paths))
+    elapsed = time.perf_counter() - start
+
+    done.set()
+    await ticker_task
+
+    lags.sort()
+    p99 = lags[int(len(lags) * 0.99)] if lags else 0.0
+    worst = lags[-1] if lags else 0.0
+    print(
+        f"{name:<8} {elapsed * 1000:>9.1f} ms total"
+        f" {len(lags):>6} ticks"
+        f" {p99 * 1000:>9.1f} ms p99 lag"
+        f" {worst * 1000:>9.1f} ms max lag"
+    )
+
+
+async def main() -> None:
+    """Run both loaders over the same generated catalog."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        base_path = Path(tmpdir)
+        paths = write_sources(base_path, ARGS.files, ARGS.columns)
+        size = sum((base_path / p).stat().st_size for p in paths)
+        print(
+            f"{ARGS.files} files x {ARGS.columns} columns ({size / 1e6:.1f} MB),"
+            f" loader {YamlLoader.__name__}, {ARGS.tick_ms} ms ticks"
+        )
+
+        threads = CatalogFileRepository(catalog_path=base_path)
+        processes = CatalogFileRepository(
+            catalog_path=base_path, process_parse_min_bytes=ARGS.process_min_bytes
+        )
+        # Warm-up: spawn the worker processes
+        await asyncio.gather(*(processes._load_source(path) for path in paths))
+
+        await measure("before", make_load_before(base_path), paths)
+        await measure("threads", threads._load_source, paths)
+        await measure("process", processes._load_source, paths)
+        threads.close()
+        processes.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=8)
+    parser.add_argument("--columns", type=int, default=2000)
+    parser.add_argument("--tick-ms", type=float, default=5.0)
+    parser.add_argument("--process-min-bytes", type=int, default=131_072)
+    ARGS = parser.parse_args()
+
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+
+    asyncio.run(main())
@@ -0,0 +1,149 @@
+"""Benchmark the query result path: cursor batches to response bytes.
+
+Compares the previous path (decode each document, copy it with dict(),
+convert _id, validate rows through QueryResultResponse and render with
+the stdlib JSON encoder) against the raw BSON path (decode whole batches
+with RESULT_CODEC_OPTIONS, build the model without validation and render
+with orjson).
+
+Documents come from res/db/credit.invoice.json, with _id turned into a
+real ObjectId and encoded into raw BSON batches as MongoDB would send them.
+
+Usage:
+    python scripts/benchmark_result_path.py [--rows 1000] [--repeat 20]
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+import bson
+from bson import ObjectId
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.mongo import RESULT_CODEC_OPTIONS  # noqa: E402
+from src.core.serialization import dumps  # noqa: E402
+from src.schemas.interpreter import QueryResultResponse  # noqa: E402
+
+BATCH_SIZE = 101  # MongoDB default first batch size
+
+
+def load_raw_batches(rows: int) -> list[bytes]:
+    """Load sample documents and encode them as raw BSON batches."""
+    path = PROJECT_ROOT / "res" / "db" / "credit.invoice.json"
+    documents: list[dict[str, Any]] = json.loads(path.read_text(encoding="utf-8"))
+    while len(documents) < rows:
+        documents = documents + documents
+    documents = documents[:rows]
+
+    for document in documents:
+        document["_id"] = ObjectId(document["_id"])
+
+    return [
+        b"".join(bson.encode(d) for d in documents[i : i + BATCH_SIZE])
+        for i in range(0, len(documents), BATCH_SIZE)
+    ]
+
+
+def build_before(raw_batches: list[bytes]) -> QueryResultResponse:
+    """Previous path: per-document decode, copy and _id conversion."""
+    rows: list[dict[str, Any]] = []
+    for raw_batch in raw_batches:
+        for document in bson.decode_all(raw_batch):
+            doc = dict(document)
+            if "_id" in doc:
+                doc["_id"] = str(doc["_id"])
+            rows.append(doc)
+
+    return QueryResultResponse(
+        query_id=uuid4(), rows=rows, row_count=len(rows), execution_time_ms=0
+    )
+
+
+def render_before(result: QueryResultResponse) -> bytes:
+    """Previous rendering: response_model dump and stdlib JSONResponse."""
+    return json.dumps(
+        result.model_dump(mode="json"),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def build_after(raw_batches: list[bytes]) -> QueryResultResponse:
+    """Raw BSON path: whole-batch decode, model built without validation."""
+    rows: list[dict[str, Any]] = []
+    for raw_batch in raw_batches:
+        rows.extend(bson.decode_all(raw_batch, RESULT_CODEC_OPTIONS))
+
+    return QueryResultResponse.model_construct(
+        query_id=uuid4(),
+        rows=rows,
+        row_count=len(rows),
+        is_partial=False,
+        execution_time_ms=0,
+    )
+
+
+def render_after(result: QueryResultResponse) -> bytes:
+    """New rendering: ORJSONResponse body."""
+    return dumps(result)
+
+
+def measure(
+    name: str,
+    build: Callable[[list[bytes]], QueryResultResponse],
+    render: Callable[[QueryResultResponse], bytes],
+    batches: list[bytes],
+    rows: int,
+) -> None:
+    """Print rows/sec and per-row allocation figures for one path.
+
+    blocks/row counts the Python memory blocks still allocated for the
+    built result (before rendering); peak B/row is the traced peak of the
+    whole build + render.
+    """
+    render(build(batches))  # warm-up
+
+    repeat = ARGS.repeat
+    start = time.perf_counter()
+    for _ in range(repeat):
+        render(build(batches))
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    blocks_before = sys.getallocatedblocks()
+    result = build(batches)
+    blocks_after = sys.getallocatedblocks()
+    render(result)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{name:<8} {rows * repeat / elapsed:>12,.0f} rows/s"
+        f" {(blocks_after - blocks_before) / rows:>8.1f} blocks/row"
+        f" {peak / rows:>10,.0f} peak B/row"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    ARGS = parser.parse_args()
+
+    raw = load_raw_batches(ARGS.rows)
+    expected = json.loads(render_before(build_before(raw)))["rows"]
+    assert json.loads(render_after(build_after(raw)))["rows"] == expected
+
+    print(f"{ARGS.rows} rows in {len(raw)} raw batches, {ARGS.repeat} runs")
+    measure("before", build_before, render_before, raw, ARGS.rows)
+    measure("after", build_after, render_after, raw, ARGS.rows)
@@ -0,0 +1,19 @@
+"""Custom response classes for the API."""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from src.core.serialization import dumps
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson.
+
+    Content is serialized directly, without going through Pydantic
+    validation or the stdlib encoder; models are expanded field by field
+    so large row lists are emitted without intermediate copies.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -34,26 +34,25 @@ async def list_sources(
     log.info("Listing catalog sources")
 
     try:
-        sources = await repository.list_sources(db_name=db_name, skip=skip, limit=limit)
+        # Summaries come from the index; only entries written before
+        # summaries existed need their source file parsed
+        entries = await repository.list_source_summaries(
+            db_name=db_name, skip=skip, limit=limit
+        )
         total = await repository.count_sources(db_name=db_name)
 
-        items: list[SourceSummary] = []
-        for source in sources:
-            # Count columns and enumerables for each source
-            column_count = len(source.columns)
-            enumerable_count = sum(1 for c in source.columns if c.enumerable)
-
-            items.append(
-                SourceSummary(
-                    id=source.source_id,
-                    db_name=source.db_name,
-                    table_name=source.table_name,
-                    column_count=column_count,
-                    enumerable_count=enumerable_count,
-                    cataloged_at=source.extracted_at,
-                    updated_at=source.updated_at or source.extracted_at,
-                )
+        items = [
+            SourceSummary(
+                id=entry.source_id,
+                db_name=entry.db_name,
+                table_name=entry.table_name,
+                column_count=entry.column_count or 0,
+                enumerable_count=entry.enumerable_count or 0,
+                cataloged_at=entry.last_extracted,
+                updated_at=entry.updated_at or entry.last_extracted,
             )
+            for entry in entries
+        ]
 
         log.info("Listed sources successfully", total=total, returned=len(items))
         return SourceListResponse(items=items, total=total, skip=skip, limit=limit)
@@ -186,21 +185,10 @@ async def list_columns(
         raise HTTPException(status_code=404, detail=f"Source '{source_id}' not found")
 
     try:
-        columns = await repository.get_columns(
-            source_id=source_id,
-            inferred_type=type,
-            is_required=is_required,
-            is_enumerable=is_enumerable,
-            skip=skip,
-            limit=limit,
-        )
-
-        total = await repository.count_columns(
-            source_id=source_id,
-            inferred_type=type,
-            is_required=is_required,
-            is_enumerable=is_enumerable,
-        )
+        # Precomputed index of the source: filtering and counting are lookups
+        matching = source.filter_columns(type or None, is_required, is_enumerable)
+        columns = matching[skip : skip + limit]
+        total = len(matching)
 
         items = [
             ColumnDetail(
@@ -1,23 +1,44 @@
 """Interpreter API endpoints for LLM query generation."""
 
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, AsyncIterator
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.api.responses import ORJSONResponse
+from src.config import get_settings
 from src.core.database import get_db_manager
+from src.core.serialization import dumps
+from src.dependencies.catalog import get_catalog_repository
+from src.repositories.catalog.file_repository import CatalogFileRepository
+from src.schemas.catalog_yaml import SourceMetadataYaml
 from src.schemas.interpreter import (
+    AdmissionStatsResponse,
+    BatchExecuteRequest,
+    CountQueryRequest,
     ErrorResponse,
     ExecuteQueryRequest,
+    ExportFormat,
     InterpretationStatus,
     InterpretationWithQueryResponse,
     InterpretPromptRequest,
+    QueryCountResponse,
     QueryResponse,
     QueryResultResponse,
+    QueryRevalidationResponse,
+    RevalidateQueryRequest,
 )
+from src.services.interpreter.admission import get_admission_controller
+from src.services.interpreter.batch_executor import BatchEntry, BatchQueryExecutor
 from src.services.interpreter.query_executor import QueryExecutionError, QueryExecutor
+from src.services.interpreter.result_export import (
+    create_encoder,
+    encode_batches,
+    is_parquet_available,
+)
 from src.services.interpreter.service import (
     InterpretationException,
     InterpreterService,
@@ -25,6 +46,20 @@ from src.services.interpreter.service import (
 
 router = APIRouter(prefix="/query", tags=["query-interpreter"])
 
+# Admission rejections: 429 when the queue is full, 503 after waiting too long
+_ADMISSION_STATUS_CODES = {
+    "QUERY_QUEUE_FULL": 429,
+    "QUERY_QUEUE_TIMEOUT": 503,
+}
+
+
+def _retry_after_headers(error: QueryExecutionError) -> dict[str, str] | None:
+    """Build the Retry-After header of an admission rejection."""
+    if error.code not in _ADMISSION_STATUS_CODES:
+        return None
+    retry_after = (error.details or {}).get("retry_after_seconds", 1)
+    return {"Retry-After": str(retry_after)}
+
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     """Get database session."""
@@ -147,12 +182,67 @@ async def interpret_prompt(
         ) from e
 
 
+@router.post(
+    "/execute/batch",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {"application/x-ndjson": {}},
+            "description": "Um BatchQueryResult por linha, na ordem de conclusão",
+        },
+        400: {"model": ErrorResponse, "description": "Batch too large"},
+    },
+)
+async def execute_query_batch(
+    request: BatchExecuteRequest,
+    service: Annotated[InterpreterService, Depends(get_interpreter_service)],
+    executor: Annotated[QueryExecutor, Depends(get_query_executor)],
+) -> StreamingResponse:
+    """Execute many previously generated queries concurrently.
+
+    Results are streamed as NDJSON, one line per query, as soon as each
+    query completes; use `index` to match lines to the request. Queries
+    that compile to the same plan with the same limit run only once.
+    """
+    max_size = get_settings().query_batch_max_size
+    if len(request.queries) > max_size:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "code": "BATCH_TOO_LARGE",
+                "message": f"O lote aceita no máximo {max_size} queries",
+                "details": {"batch_size": len(request.queries)},
+                "suggestions": ["Divida as queries em lotes menores"],
+            },
+        )
+
+    entries = [
+        BatchEntry(
+            index=index,
+            query_id=item.query_id,
+            stored_query=await service.get_query(item.query_id),
+            limit=item.limit,
+        )
+        for index, item in enumerate(request.queries)
+    ]
+    batch_executor = BatchQueryExecutor(executor)
+
+    async def ndjson_lines() -> AsyncIterator[bytes]:
+        async for result in batch_executor.stream(entries):
+            yield dumps(result) + b"\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
 @router.post(
     "/{query_id}/execute",
     response_model=QueryResultResponse,
+    response_class=ORJSONResponse,
     responses={
         400: {"model": ErrorResponse, "description": "Query invalid or blocked"},
         404: {"model": ErrorResponse, "description": "Query not found"},
+        429: {"model": ErrorResponse, "description": "Execution queue full"},
+        503: {"model": ErrorResponse, "description": "Execution queue timeout"},
     },
 )
 async def execute_query(
@@ -160,11 +250,12 @@ async def execute_query(
     service: Annotated[InterpreterService, Depends(get_interpreter_service)],
     executor: Annotated[QueryExecutor, Depends(get_query_executor)],
     request: ExecuteQueryRequest | None = None,
-) -> QueryResultResponse:
+) -> ORJSONResponse:
     """Execute a previously generated query.
 
     Returns the query results with a configurable limit (default 100, max 1000).
-    If results exceed the limit, is_partial will be True.
+    If results exceed the limit, is_partial will be True. Rows are rendered
+    with orjson directly, bypassing response model re-validation.
     """
     # Get the stored query
     stored_query = await service.get_query(query_id)
@@ -216,16 +307,27 @@ async def execute_query(
 
     try:
         limit = request.limit if request else None
-        result = await executor.execute_query(stored_query, limit)
-        return result
+        random_sample = request.random_sample if request else False
+        distinct_users = request.distinct_users if request else False
+        result = await executor.execute_query(
+            stored_query,
+            limit,
+            random_sample=random_sample,
+            distinct_users=distinct_users,
+        )
+        return ORJSONResponse(result)
 
     except QueryExecutionError as e:
         # Map error codes to appropriate HTTP status codes
         status_code_map = {
             "INVALID_QUERY": 400,
             "SQL_COMMAND_BLOCKED": 400,
+            "USER_KEY_NOT_FOUND": 400,
+            "UNSUPPORTED_CONDITION": 400,
+            "JOIN_KEY_NOT_FOUND": 400,
             "EXECUTION_ERROR": 500,
             "CONNECTION_ERROR": 503,
+            **_ADMISSION_STATUS_CODES,
         }
         status_code = status_code_map.get(e.code, 500)
 
@@ -237,6 +339,7 @@ async def execute_query(
                 "details": e.details,
                 "suggestions": e.suggestions or [],
             },
+            headers=_retry_after_headers(e),
         ) from e
 
     except ValueError as e:
@@ -262,6 +365,262 @@ async def execute_query(
         ) from e
 
 
+@router.post(
+    "/{query_id}/count",
+    response_model=QueryCountResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Query invalid or blocked"},
+        404: {"model": ErrorResponse, "description": "Query not found"},
+        429: {"model": ErrorResponse, "description": "Execution queue full"},
+        503: {"model": ErrorResponse, "description": "Execution queue timeout"},
+    },
+)
+async def count_query(
+    query_id: UUID,
+    service: Annotated[InterpreterService, Depends(get_interpreter_service)],
+    executor: Annotated[QueryExecutor, Depends(get_query_executor)],
+    request: CountQueryRequest | None = None,
+) -> QueryCountResponse:
+    """Count the results of a previously generated query without fetching rows.
+
+    Queries without filters return the collection's estimated size. With
+    max_count, counting stops once the bound is reached (is_bounded=True).
+    Counts are cached per compiled query for a short TTL, so repeated
+    feasibility checks are served from memory.
+    """
+    stored_query = await service.get_query(query_id)
+
+    if stored_query is None:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "code": "QUERY_NOT_FOUND",
+                "message": f"Query {query_id} não encontrada",
+                "suggestions": [
+                    "Verifique se o ID da query está correto",
+                    "Use POST /query/interpret para gerar uma nova query",
+                ],
+            },
+        )
+
+    try:
+        return await executor.count_query(
+            stored_query, request.max_count if request else None
+        )
+    except QueryExecutionError as e:
+        status_code_map = {
+            "INVALID_QUERY": 400,
+            "SQL_COMMAND_BLOCKED": 400,
+            "UNSUPPORTED_CONDITION": 400,
+            "JOIN_KEY_NOT_FOUND": 400,
+            "EXECUTION_ERROR": 500,
+            **_ADMISSION_STATUS_CODES,
+        }
+        raise HTTPException(
+            status_code=status_code_map.get(e.code, 500),
+            detail={
+                "code": e.code,
+                "message": e.message,
+                "details": e.details,
+                "suggestions": e.suggestions or [],
+            },
+            headers=_retry_after_headers(e),
+        ) from e
+
+
+@router.post(
+    "/{query_id}/revalidate",
+    response_model=QueryRevalidationResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Query invalid or blocked"},
+        404: {"model": ErrorResponse, "description": "Query not found"},
+        429: {"model": ErrorResponse, "description": "Execution queue full"},
+        503: {"model": ErrorResponse, "description": "Execution queue timeout"},
+    },
+)
+async def revalidate_query(
+    query_id: UUID,
+    request: RevalidateQueryRequest,
+    service: Annotated[InterpreterService, Depends(get_interpreter_service)],
+    executor: Annotated[QueryExecutor, Depends(get_query_executor)],
+) -> QueryRevalidationResponse:
+    """Check which previously returned documents still match a query.
+
+    Test data drifts over time; instead of re-running the whole search,
+    the given _ids are re-checked against the compiled filters in one
+    round trip per source.
+    """
+    stored_query = await service.get_query(query_id)
+
+    if stored_query is None:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "code": "QUERY_NOT_FOUND",
+                "message": f"Query {query_id} não encontrada",
+                "suggestions": [
+                    "Verifique se o ID da query está correto",
+                    "Use POST /query/interpret para gerar uma nova query",
+                ],
+            },
+        )
+
+    try:
+        return await executor.revalidate_ids(stored_query, request.ids)
+    except QueryExecutionError as e:
+        status_code_map = {
+            "INVALID_QUERY": 400,
+            "SQL_COMMAND_BLOCKED": 400,
+            "UNSUPPORTED_CONDITION": 400,
+            "JOIN_KEY_NOT_FOUND": 400,
+            "EXECUTION_ERROR": 500,
+            **_ADMISSION_STATUS_CODES,
+        }
+        raise HTTPException(
+            status_code=status_code_map.get(e.code, 500),
+            detail={
+                "code": e.code,
+                "message": e.message,
+                "details": e.details,
+                "suggestions": e.suggestions or [],
+            },
+            headers=_retry_after_headers(e),
+        ) from e
+
+
+@router.get(
+    "/{query_id}/export",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {
+                "text/csv": {},
+                "application/x-ndjson": {},
+                "application/vnd.apache.parquet": {},
+            },
+            "description": "Arquivo com os resultados da query",
+        },
+        400: {"model": ErrorResponse, "description": "Query invalid or blocked"},
+        404: {"model": ErrorResponse, "description": "Query not found"},
+        429: {"model": ErrorResponse, "description": "Execution queue full"},
+        501: {"model": ErrorResponse, "description": "Export format unavailable"},
+    },
+)
+async def export_query(
+    query_id: UUID,
+    service: Annotated[InterpreterService, Depends(get_interpreter_service)],
+    executor: Annotated[QueryExecutor, Depends(get_query_executor)],
+    repository: Annotated[CatalogFileRepository, Depends(get_catalog_repository)],
+    format: ExportFormat = Query(default=ExportFormat.CSV),
+    limit: int | None = Query(default=None, ge=1),
+) -> StreamingResponse:
+    """Export the results of a previously generated query as a file.
+
+    Rows are streamed from the database cursor and encoded batch by batch,
+    so large exports never sit in memory. Columns follow the SELECT list,
+    or the catalog order of the queried source for SELECT *. Parquet files
+    get one row group per batch and require the optional pyarrow dependency.
+    """
+    stored_query = await service.get_query(query_id)
+
+    if stored_query is None:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "code": "QUERY_NOT_FOUND",
+                "message": f"Query {query_id} não encontrada",
+                "suggestions": [
+                    "Verifique se o ID da query está correto",
+                    "Use POST /query/interpret para gerar uma nova query",
+                ],
+            },
+        )
+
+    try:
+        executor.validate_query(stored_query)
+        # Reject unsupported SQL before the streamed response starts
+        plan = await executor.compile_plan(stored_query.sql)
+        # The stream waits for its own slot; reject now if it cannot queue
+        executor.check_capacity()
+    except QueryExecutionError as e:
+        raise HTTPException(
+            status_code=_ADMISSION_STATUS_CODES.get(e.code, 400),
+            detail={
+                "code": e.code,
+                "message": e.message,
+                "details": e.details,
+                "suggestions": e.suggestions or [],
+            },
+            headers=_retry_after_headers(e),
+        ) from e
+
+    if format == ExportFormat.PARQUET and not is_parquet_available():
+        raise HTTPException(
+            status_code=501,
+            detail={
+                "code": "EXPORT_FORMAT_UNAVAILABLE",
+                "message": "Exportação em Parquet não está disponível neste servidor",
+                "suggestions": [
+                    "Use format=csv ou format=jsonl",
+                    "Instale a dependência opcional: pip install qausersearch[export]",
+                ],
+            },
+        )
+
+    settings = get_settings()
+    export_limit = min(
+        limit or settings.query_export_limit_max, settings.query_export_limit_max
+    )
+
+    # Columns follow the SELECT list, or the catalog order for SELECT *
+    source: SourceMetadataYaml | None = None
+    fields: list[str] | None = None
+    if plan is not None and not plan.is_join:
+        source = await repository.get_source_by_identity(
+            plan.primary.db_name, plan.primary.collection_name
+        )
+        fields = plan.primary.fields
+    encoder = create_encoder(format, source, fields)
+
+    batches = executor.stream_batches(
+        stored_query, export_limit, settings.query_export_batch_size
+    )
+    return StreamingResponse(
+        encode_batches(batches, encoder),
+        media_type=encoder.media_type,
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="query-{query_id}.{encoder.extension}"'
+            )
+        },
+    )
+
+
+@router.get(
+    "/admission",
+    response_model=AdmissionStatsResponse,
+    responses={
+        404: {"model": ErrorResponse, "description": "Metrics disabled"},
+    },
+)
+async def get_admission_stats() -> AdmissionStatsResponse:
+    """Get metrics of the query execution queue.
+
+    Shows in-flight executions (global and per source), queued executions
+    per priority, and admission/rejection counters.
+    """
+    if not get_settings().metrics_enabled:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "code": "METRICS_DISABLED",
+                "message": "Métricas desabilitadas neste servidor",
+            },
+        )
+
+    return get_admission_controller().stats()
+
+
 @router.get(
     "/{query_id}",
     response_model=QueryResponse,
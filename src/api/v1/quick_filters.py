@@ -0,0 +1,57 @@
+"""Quick filter API endpoints."""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from src.api.responses import ORJSONResponse
+from src.schemas.quick_filters import QuickFilterListResponse, QuickFilterResponse
+from src.services.quick_filters import (
+    QuickFilterScheduler,
+    get_quick_filter_scheduler,
+)
+
+router = APIRouter(prefix="/quick-filters", tags=["quick-filters"])
+
+
+@router.get("", response_model=QuickFilterListResponse)
+async def list_quick_filters(
+    scheduler: Annotated[QuickFilterScheduler, Depends(get_quick_filter_scheduler)],
+) -> QuickFilterListResponse:
+    """List the quick filters with the freshness of their results."""
+    items = [state.summary() for state in scheduler.filters()]
+    return QuickFilterListResponse(items=items, total=len(items))
+
+
+@router.get(
+    "/{filter_id}",
+    response_model=QuickFilterResponse,
+    response_class=ORJSONResponse,
+)
+async def get_quick_filter(
+    filter_id: str,
+    scheduler: Annotated[QuickFilterScheduler, Depends(get_quick_filter_scheduler)],
+    include_user_keys: Annotated[
+        bool, Query(description="Incluir as chaves de todos os usuários")
+    ] = False,
+) -> ORJSONResponse:
+    """Get the materialized results of a quick filter.
+
+    Results come from the last background refresh; refreshed_at tells how
+    fresh they are. No query is executed by this endpoint.
+
+    Raises:
+        HTTPException: 404 if the quick filter does not exist.
+    """
+    state = scheduler.get(filter_id)
+    if state is None:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "code": "QUICK_FILTER_NOT_FOUND",
+                "message": f"Filtro rápido {filter_id} não encontrado",
+                "details": {"filter_id": filter_id},
+                "suggestions": ["Liste os filtros disponíveis em /quick-filters"],
+            },
+        )
+    return ORJSONResponse(state.response(include_user_keys))
@@ -0,0 +1,93 @@
+"""User-centric API endpoints."""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from src.api.responses import ORJSONResponse
+from src.schemas.users import (
+    UserBitmapIndexStats,
+    UserDossierResponse,
+    UserSetQueryRequest,
+    UserSetQueryResponse,
+)
+from src.services.interpreter.query_executor import QueryExecutionError
+from src.services.user_bitmap_index import UserBitmapIndex, get_user_bitmap_index
+from src.services.user_dossier import UserDossierService
+
+router = APIRouter(prefix="/users", tags=["users"])
+
+
+def get_user_dossier_service() -> UserDossierService:
+    """Get user dossier service instance."""
+    return UserDossierService()
+
+
+@router.get(
+    "/{consumer_id}/dossier",
+    response_model=UserDossierResponse,
+    response_class=ORJSONResponse,
+)
+async def get_user_dossier(
+    consumer_id: str,
+    service: Annotated[UserDossierService, Depends(get_user_dossier_service)],
+) -> ORJSONResponse:
+    """Get every document of a user across the cataloged sources.
+
+    All sources that declare a user key are queried concurrently. Sources
+    that fail or exceed their timeout are listed with their status and the
+    dossier is flagged as partial; complete dossiers are cached briefly.
+    """
+    dossier = await service.get_dossier(consumer_id)
+    return ORJSONResponse(dossier)
+
+
+@router.post(
+    "/sets",
+    response_model=UserSetQueryResponse,
+    response_class=ORJSONResponse,
+)
+async def query_user_set(
+    request: UserSetQueryRequest,
+    index: Annotated[UserBitmapIndex, Depends(get_user_bitmap_index)],
+) -> ORJSONResponse:
+    """Resolve a user set from the bitmap index.
+
+    Terms select the users having a value in an enumerable column of a
+    source; expressions combine them with and / or / andnot at the user
+    level. The set is computed in memory and only the rows of the first
+    `limit` users are fetched from the source.
+
+    Raises:
+        HTTPException: 400 if a term is not indexed, 429/503 if the row
+            fetch is not admitted.
+    """
+    try:
+        response = await index.query(request)
+    except QueryExecutionError as e:
+        status_code_map = {
+            "SOURCE_NOT_INDEXED": 400,
+            "PREDICATE_NOT_INDEXED": 400,
+            "QUERY_QUEUE_FULL": 429,
+            "QUERY_QUEUE_TIMEOUT": 503,
+        }
+        retry_after = (e.details or {}).get("retry_after_seconds")
+        raise HTTPException(
+            status_code=status_code_map.get(e.code, 500),
+            detail={
+                "code": e.code,
+                "message": e.message,
+                "details": e.details,
+                "suggestions": e.suggestions,
+            },
+            headers={"Retry-After": str(retry_after)} if retry_after else None,
+        ) from e
+    return ORJSONResponse(response)
+
+
+@router.get("/sets/stats", response_model=UserBitmapIndexStats)
+async def get_user_set_index_stats(
+    index: Annotated[UserBitmapIndex, Depends(get_user_bitmap_index)],
+) -> UserBitmapIndexStats:
+    """Get the memory usage and freshness of the user bitmap index."""
+    return index.stats()
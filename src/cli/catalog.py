@@ -2,7 +2,8 @@
 
 This CLI extracts schema metadata from external MongoDB sources and writes
 directly to YAML files in the catalog directory. No PostgreSQL connection
-is required for catalog operations.
+is required for catalog operations. After extraction the catalog is
+compiled into a binary snapshot that the API loads without parsing YAML.
 """
 
 import asyncio
@@ -14,6 +15,7 @@ import structlog
 import typer
 
 from src.config import get_settings
+from src.repositories.catalog.snapshot import SNAPSHOT_FILE, compile_snapshot
 from src.services.catalog_validator import CatalogValidator
 from src.services.catalog_yaml_extractor import CatalogYamlExtractor
 
@@ -58,6 +60,13 @@ def extract_all(
     asyncio.run(_extract_all(sample_size, merge=not no_merge))
 
 
+@app.command(name="compile")
+def compile_catalog() -> None:
+    """Compile the catalog YAML files into a binary snapshot."""
+    if not _compile_snapshot():
+        sys.exit(1)
+
+
 @app.command()
 def list_known() -> None:
     """List all known sources available for extraction."""
@@ -112,6 +121,8 @@ async def _extract_single(
         typer.echo(f"Error: {e}", err=True)
         sys.exit(1)
 
+    _compile_snapshot()
+
 
 async def _extract_all(sample_size: int, *, merge: bool = True) -> None:
     """Internal async implementation for batch extraction.
@@ -169,10 +180,38 @@ async def _extract_all(sample_size: int, *, merge: bool = True) -> None:
     typer.echo(f"  - Successful: {success_count}")
     typer.echo(f"  - Failed: {error_count}")
 
+    if success_count > 0:
+        _compile_snapshot()
+
     if error_count > 0:
         sys.exit(1)
 
 
+def _compile_snapshot() -> bool:
+    """Compile the catalog snapshot and report the result.
+
+    Returns:
+        True if the snapshot was written.
+    """
+    settings = get_settings()
+    typer.echo("")
+    typer.echo("Compiling catalog snapshot...")
+
+    try:
+        snapshot = compile_snapshot(settings.catalog_path)
+    except Exception as e:
+        logger.error("Snapshot compilation failed", error=str(e))
+        typer.echo(f"Error: {e}", err=True)
+        return False
+
+    snapshot_path = Path(settings.catalog_path) / SNAPSHOT_FILE
+    typer.echo("Snapshot compiled successfully:")
+    typer.echo(f"  - Sources: {len(snapshot.source_paths)}")
+    typer.echo(f"  - Content hash: {snapshot.content_hash[:16]}")
+    typer.echo(f"  - File: {snapshot_path} ({snapshot_path.stat().st_size} bytes)")
+    return True
+
+
 @app.command()
 def validate(
     path: Annotated[
@@ -66,6 +66,12 @@ class Settings(BaseSettings):
         default="mongodb://localhost:27017",
         description="MongoDB connection URI for PROD environment",
     )
+    mongodb_max_pool_size: int = Field(
+        default=100,
+        ge=1,
+        le=1000,
+        description="Maximum connections in the shared MongoDB pool",
+    )
 
     # OpenAI / LLM Configuration
     openai_api_key: str = Field(
@@ -108,6 +114,149 @@ class Settings(BaseSettings):
         le=10000,
         description="Maximum limit for query results",
     )
+    query_sample_seek_threshold: int = Field(
+        default=5_000_000,
+        ge=0,
+        description=(
+            "Collection size above which random sampling uses _id range seeks "
+            "instead of $match + $sample"
+        ),
+    )
+    query_max_in_flight: int = Field(
+        default=32,
+        ge=1,
+        le=1000,
+        description="Maximum queries executing at once across all data sources",
+    )
+    query_source_max_in_flight: int = Field(
+        default=8,
+        ge=1,
+        le=1000,
+        description="Maximum queries executing at once per data source",
+    )
+    query_queue_max_size: int = Field(
+        default=100,
+        ge=0,
+        le=10_000,
+        description="Maximum queries waiting for an execution slot",
+    )
+    query_queue_timeout_seconds: float = Field(
+        default=5.0,
+        gt=0,
+        le=120,
+        description="Maximum time a query waits for an execution slot",
+    )
+    query_count_cache_ttl_seconds: int = Field(
+        default=60,
+        ge=1,
+        le=3600,
+        description="TTL of cached query counts in seconds",
+    )
+    query_count_cache_max_entries: int = Field(
+        default=10_000,
+        ge=1,
+        le=1_000_000,
+        description="Maximum cached query counts (least recently used evicted)",
+    )
+    query_batch_max_size: int = Field(
+        default=50,
+        ge=1,
+        le=500,
+        description="Maximum number of queries in a batch execution",
+    )
+    query_batch_source_concurrency: int = Field(
+        default=4,
+        ge=1,
+        le=100,
+        description="Maximum concurrent batch queries per data source",
+    )
+    query_export_limit_max: int = Field(
+        default=100_000,
+        ge=1,
+        le=10_000_000,
+        description="Maximum rows written by a query export",
+    )
+    query_export_batch_size: int = Field(
+        default=1000,
+        ge=1,
+        le=100_000,
+        description="Rows fetched and encoded per export batch (Parquet row group)",
+    )
+
+    # User dossier
+    dossier_source_timeout_seconds: float = Field(
+        default=2.0,
+        gt=0,
+        le=60,
+        description="Timeout of each per-source lookup in a user dossier",
+    )
+    dossier_source_max_documents: int = Field(
+        default=50,
+        ge=1,
+        le=1000,
+        description="Maximum documents returned per source in a user dossier",
+    )
+    dossier_cache_ttl_seconds: int = Field(
+        default=30,
+        ge=1,
+        le=3600,
+        description="TTL of cached user dossiers in seconds",
+    )
+    dossier_cache_max_entries: int = Field(
+        default=1000,
+        ge=1,
+        le=100_000,
+        description="Maximum cached user dossiers (least recently used evicted)",
+    )
+    dossier_cache_max_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        ge=1024,
+        description="Maximum estimated memory of cached user dossiers in bytes",
+    )
+
+    # Quick filters
+    quick_filters_enabled: bool = Field(
+        default=True, description="Materialize quick filters in the background"
+    )
+    quick_filters_path: str = Field(
+        default="catalog/quick_filters.yaml",
+        description="Path to the quick filter definitions YAML file",
+    )
+    quick_filters_refresh_interval_seconds: int = Field(
+        default=900,
+        ge=10,
+        le=86_400,
+        description="Default interval between quick filter refreshes",
+    )
+    quick_filters_sample_size: int = Field(
+        default=20,
+        ge=1,
+        le=1000,
+        description="Rows sampled into each quick filter materialization",
+    )
+
+    # User bitmap index
+    user_index_enabled: bool = Field(
+        default=True, description="Maintain user key bitmaps per predicate"
+    )
+    user_index_refresh_interval_seconds: int = Field(
+        default=300,
+        ge=10,
+        le=86_400,
+        description="Interval between incremental bitmap index refreshes",
+    )
+    user_index_rebuild_interval_seconds: int = Field(
+        default=3600,
+        ge=60,
+        le=604_800,
+        description="Interval between full rebuilds (picks up updates/deletes)",
+    )
+    user_index_max_values_per_column: int = Field(
+        default=1000,
+        ge=1,
+        le=100_000,
+        description="Maximum distinct values indexed per column",
+    )
 
     # Catalog YAML Storage
     catalog_path: str = Field(
@@ -120,6 +269,68 @@ class Settings(BaseSettings):
         le=3600,
         description="TTL for catalog cache in seconds",
     )
+    catalog_cache_max_entries: int = Field(
+        default=1000,
+        ge=1,
+        le=100_000,
+        description="Maximum cached catalog sources (least recently used evicted)",
+    )
+    catalog_cache_stale_seconds: int = Field(
+        default=600,
+        ge=0,
+        le=86_400,
+        description=(
+            "How long expired catalog entries are still served while they "
+            "are reloaded in the background"
+        ),
+    )
+    catalog_cache_refresh_ahead_seconds: int = Field(
+        default=10,
+        ge=0,
+        le=3600,
+        description="How long before expiry catalog entries are reloaded",
+    )
+    catalog_watch_enabled: bool = Field(
+        default=True,
+        description="Reload changed catalog files instead of relying on the TTL",
+    )
+    catalog_watch_interval_seconds: float = Field(
+        default=1.0,
+        gt=0,
+        le=60,
+        description="Interval between catalog file change polls",
+    )
+    catalog_watched_cache_ttl_seconds: int = Field(
+        default=3600,
+        ge=1,
+        le=86_400,
+        description="Catalog cache TTL while the files are watched (safety net)",
+    )
+    catalog_io_max_workers: int = Field(
+        default=4,
+        ge=1,
+        le=64,
+        description="Maximum threads (and processes) reading catalog files",
+    )
+    catalog_process_parse_min_bytes: int = Field(
+        default=131_072,
+        ge=1024,
+        description=(
+            "Catalog files from this size on are parsed in a process pool "
+            "so parsing does not hold the GIL of the event loop"
+        ),
+    )
+    catalog_snapshot_enabled: bool = Field(
+        default=True,
+        description="Load unchanged catalog files from the compiled snapshot",
+    )
+    catalog_warm_up_enabled: bool = Field(
+        default=True,
+        description=(
+            "Load every catalog source at startup; the app reports not ready "
+            "until the warm-up completes"
+        ),
+    )
 
     @field_validator("debug", mode="after")
     @classmethod
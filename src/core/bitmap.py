@@ -0,0 +1,233 @@
+"""Compressed integer bitmaps (roaring layout) backed by numpy.
+
+Values are 32-bit unsigned integers split into a 16-bit chunk key and a
+16-bit low part. Each chunk is stored in one of two containers:
+
+- array container: sorted uint16 array of the low parts, used while the
+  chunk holds at most ARRAY_MAX_SIZE values (2 bytes per value);
+- bitset container: 8 KiB uint8 bitset covering the whole chunk, used for
+  dense chunks (fixed size, whatever the cardinality).
+
+Set operations work chunk by chunk with vectorized numpy primitives, so
+intersecting millions of users costs a few milliseconds.
+"""
+
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+# Chunks with more values than this are stored as bitsets
+ARRAY_MAX_SIZE = 4096
+
+_CHUNK_SIZE = 1 << 16
+
+# Set bits of every byte value
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint16)
+
+Container = npt.NDArray[Any]
+
+
+def _is_bitset(container: Container) -> bool:
+    return bool(container.dtype == np.uint8)
+
+
+def _to_bitset(container: Container) -> Container:
+    if _is_bitset(container):
+        return container
+    bits = np.zeros(_CHUNK_SIZE, dtype=bool)
+    bits[container] = True
+    return np.packbits(bits, bitorder="little")
+
+
+def _to_array(container: Container) -> Container:
+    if not _is_bitset(container):
+        return container
+    bits = np.unpackbits(container, bitorder="little")
+    return np.flatnonzero(bits).astype(np.uint16)
+
+
+def _cardinality(container: Container) -> int:
+    if _is_bitset(container):
+        return int(_POPCOUNT[container].sum())
+    return len(container)
+
+
+def _contains_lows(bitset: Container, lows: Container) -> npt.NDArray[np.bool_]:
+    """Test which low parts are set in a bitset container."""
+    lows = lows.astype(np.uint32)
+    bits: npt.NDArray[np.bool_] = ((bitset[lows >> 3] >> (lows & 7)) & 1).astype(bool)
+    return bits
+
+
+def _optimize(container: Container) -> Container | None:
+    """Pick the smaller container for a chunk (None when empty)."""
+    cardinality = _cardinality(container)
+    if cardinality == 0:
+        return None
+    if _is_bitset(container) and cardinality <= ARRAY_MAX_SIZE:
+        return _to_array(container)
+    if not _is_bitset(container) and cardinality > ARRAY_MAX_SIZE:
+        return _to_bitset(container)
+    return container
+
+
+def _and(left: Container, right: Container) -> Container | None:
+    if _is_bitset(left) and _is_bitset(right):
+        return _optimize(left & right)
+    if _is_bitset(left):
+        left, right = right, left
+    if _is_bitset(right):
+        return _optimize(left[_contains_lows(right, left)])
+    return _optimize(np.intersect1d(left, right, assume_unique=True))
+
+
+def _or(left: Container, right: Container) -> Container | None:
+    if _is_bitset(left) or _is_bitset(right):
+        return _optimize(_to_bitset(left) | _to_bitset(right))
+    return _optimize(np.union1d(left, right).astype(np.uint16))
+
+
+def _andnot(left: Container, right: Container) -> Container | None:
+    if _is_bitset(right):
+        if _is_bitset(left):
+            return _optimize(left & ~right)
+        return _optimize(left[~_contains_lows(right, left)])
+    if _is_bitset(left):
+        return _optimize(left & ~_to_bitset(right))
+    return _optimize(np.setdiff1d(left, right, assume_unique=True).astype(np.uint16))
+
+
+class RoaringBitmap:
+    """Immutable compressed set of 32-bit unsigned integers.
+
+    Supports &, | and - (and-not) between bitmaps, membership tests,
+    iteration in ascending order and memory accounting.
+    """
+
+    __slots__ = ("_containers",)
+
+    def __init__(self, containers: dict[int, Container] | None = None) -> None:
+        """Initialize the bitmap.
+
+        Args:
+            containers: Containers by chunk key (internal; use from_values).
+        """
+        self._containers: dict[int, Container] = containers or {}
+
+    @classmethod
+    def from_values(cls, values: Iterable[int] | npt.NDArray[Any]) -> "RoaringBitmap":
+        """Build a bitmap from integers in any order, with duplicates.
+
+        Args:
+            values: Integers in [0, 2**32).
+
+        Returns:
+            The bitmap holding the distinct values.
+        """
+        array = np.unique(np.fromiter(values, dtype=np.uint32))
+        if array.size == 0:
+            return cls()
+
+        chunk_keys = array >> 16
+        boundaries = np.flatnonzero(np.diff(chunk_keys)) + 1
+        containers: dict[int, Container] = {}
+        for chunk in np.split(array, boundaries):
+            container = _optimize((chunk & 0xFFFF).astype(np.uint16))
+            if container is not None:
+                containers[int(chunk[0] >> 16)] = container
+        return cls(containers)
+
+    def _combine(
+        self,
+        other: "RoaringBitmap",
+        operation: Any,
+        keys: Iterable[int],
+    ) -> "RoaringBitmap":
+        containers: dict[int, Container] = {}
+        for key in sorted(keys):
+            left = self._containers.get(key)
+            right = other._containers.get(key)
+            if left is not None and right is not None:
+                result = operation(left, right)
+            else:
+                # Chunk present on one side only (union, or and-not's left)
+                result = left if left is not None else right
+            if result is not None:
+                containers[key] = result
+        return RoaringBitmap(containers)
+
+    def __and__(self, other: "RoaringBitmap") -> "RoaringBitmap":
+        keys = self._containers.keys() & other._containers.keys()
+        return self._combine(other, _and, keys)
+
+    def __or__(self, other: "RoaringBitmap") -> "RoaringBitmap":
+        keys = self._containers.keys() | other._containers.keys()
+        return self._combine(other, _or, keys)
+
+    def __sub__(self, other: "RoaringBitmap") -> "RoaringBitmap":
+        return self._combine(other, _andnot, self._containers.keys())
+
+    def __len__(self) -> int:
+        return sum(_cardinality(c) for c in self._containers.values())
+
+    def __bool__(self) -> bool:
+        return bool(self._containers)
+
+    def __contains__(self, value: object) -> bool:
+        if not isinstance(value, int) or not 0 <= value < 1 << 32:
+            return False
+        container = self._containers.get(value >> 16)
+        if container is None:
+            return False
+        low = np.array([value & 0xFFFF], dtype=np.uint16)
+        if _is_bitset(container):
+            return bool(_contains_lows(container, low)[0])
+        index = int(np.searchsorted(container, low[0]))
+        return index < len(container) and int(container[index]) == low[0]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.to_array().tolist())
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RoaringBitmap):
+            return NotImplemented
+        return np.array_equal(self.to_array(), other.to_array())
+
+    def __repr__(self) -> str:
+        return f"RoaringBitmap(cardinality={len(self)}, nbytes={self.nbytes})"
+
+    def to_array(self, limit: int | None = None) -> npt.NDArray[np.uint32]:
+        """Get the values in ascending order.
+
+        Args:
+            limit: Optional maximum number of values (the smallest ones).
+
+        Returns:
+            uint32 array of the values.
+        """
+        parts: list[npt.NDArray[np.uint32]] = []
+        remaining = limit
+        for key in sorted(self._containers):
+            lows = _to_array(self._containers[key]).astype(np.uint32)
+            if remaining is not None:
+                lows = lows[:remaining]
+                remaining -= len(lows)
+            parts.append((np.uint32(key) << np.uint32(16)) | lows)
+            if remaining == 0:
+                break
+        if not parts:
+            return np.empty(0, dtype=np.uint32)
+        return np.concatenate(parts)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the containers, in bytes."""
+        return sum(c.nbytes for c in self._containers.values())
+
+    @property
+    def container_counts(self) -> tuple[int, int]:
+        """Number of (array, bitset) containers."""
+        bitsets = sum(1 for c in self._containers.values() if _is_bitset(c))
+        return len(self._containers) - bitsets, bitsets
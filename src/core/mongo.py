@@ -0,0 +1,93 @@
+"""Shared MongoDB (Motor) client for external data sources.
+
+In MOCK mode the shared client is the in-process engine over res/db/
+(src.repositories.external.mock_engine), which exposes the same subset of
+the Motor API.
+"""
+
+from typing import Any
+
+from bson import Decimal128, ObjectId
+from bson.codec_options import CodecOptions, TypeDecoder, TypeRegistry
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from src.config import get_settings
+from src.core.logging import get_logger
+from src.schemas.enums import DataSourceEnvironment
+
+logger = get_logger(__name__)
+
+
+class _ObjectIdAsString(TypeDecoder):
+    """Decode ObjectId values straight to their hex string."""
+
+    bson_type = ObjectId
+
+    def transform_bson(self, value: Any) -> str:
+        return str(value)
+
+
+class _Decimal128AsString(TypeDecoder):
+    """Decode Decimal128 values to their exact string form."""
+
+    bson_type = Decimal128
+
+    def transform_bson(self, value: Any) -> str:
+        return str(value)
+
+
+# Codec for raw BSON result batches (bson.decode_all): values come out
+# JSON-ready in the same C decoding pass, with no per-row conversion
+RESULT_CODEC_OPTIONS: CodecOptions[dict[str, Any]] = CodecOptions(
+    tz_aware=True,
+    type_registry=TypeRegistry([_ObjectIdAsString(), _Decimal128AsString()]),
+)
+
+# Global Motor client (created on first use, closed in app lifespan)
+_mongo_client: AsyncIOMotorClient | None = None  # type: ignore[type-arg]
+
+
+def get_mongo_client() -> AsyncIOMotorClient:  # type: ignore[type-arg]
+    """Get the shared Motor client, creating it on first use.
+
+    Motor clients own a connection pool; sharing one client lets every
+    request (and every query of a batch) reuse the same pool instead of
+    opening new connections.
+
+    In MOCK mode a MockMongoClient over the local res/db/ collections is
+    returned instead, so queries run without a MongoDB server.
+
+    Returns:
+        The shared Motor client.
+    """
+    global _mongo_client
+    if _mongo_client is None:
+        settings = get_settings()
+        if settings.data_source_environment == DataSourceEnvironment.MOCK:
+            from src.repositories.external.mock_engine import MockMongoClient
+
+            # Duck-types the subset of the Motor API used by QueryExecutor
+            _mongo_client = MockMongoClient(  # type: ignore[assignment]
+                index_cardinality_limit=settings.enumerable_cardinality_limit
+            )
+            logger.info("Mock query engine initialized")
+            return _mongo_client  # type: ignore[return-value]
+
+        _mongo_client = AsyncIOMotorClient(
+            settings.mongodb_uri,
+            maxPoolSize=settings.mongodb_max_pool_size,
+        )
+        logger.info(
+            "MongoDB client initialized",
+            max_pool_size=settings.mongodb_max_pool_size,
+        )
+    return _mongo_client
+
+
+def close_mongo_client() -> None:
+    """Close the shared Motor client, if it was created."""
+    global _mongo_client
+    if _mongo_client is not None:
+        _mongo_client.close()
+        _mongo_client = None
+        logger.info("MongoDB client closed")
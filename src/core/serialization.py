@@ -0,0 +1,48 @@
+"""Fast JSON serialization for API responses (orjson)."""
+
+import base64
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from bson import Decimal128, ObjectId
+from pydantic import BaseModel
+
+# Raw documents may carry non-string keys; UTC as "Z" matches Pydantic output
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+def orjson_default(value: Any) -> Any:
+    """Convert values orjson cannot serialize natively.
+
+    Pydantic models are expanded one level at a time (orjson recurses into
+    the returned dict), so rows held by a model are never copied.
+
+    Args:
+        value: The value to convert.
+
+    Returns:
+        A JSON-serializable representation.
+
+    Raises:
+        TypeError: If the value type is not supported.
+    """
+    if isinstance(value, BaseModel):
+        return {name: getattr(value, name) for name in type(value).model_fields}
+    if isinstance(value, (ObjectId, Decimal128, Decimal)):
+        return str(value)
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode("ascii")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content to JSON bytes.
+
+    Args:
+        content: Any JSON-compatible value, Pydantic model, or BSON value.
+
+    Returns:
+        UTF-8 encoded JSON.
+    """
+    return orjson.dumps(content, default=orjson_default, option=_OPTIONS)
@@ -17,7 +17,19 @@ def get_catalog_repository() -> CatalogFileRepository:
         CatalogFileRepository instance.
     """
     settings = get_settings()
+    # Watched files are reloaded when they change, so entries can live longer
+    ttl_seconds = (
+        settings.catalog_watched_cache_ttl_seconds
+        if settings.catalog_watch_enabled
+        else settings.catalog_cache_ttl_seconds
+    )
     return CatalogFileRepository(
         catalog_path=settings.catalog_path,
-        cache_ttl_seconds=float(settings.catalog_cache_ttl_seconds),
+        cache_ttl_seconds=float(ttl_seconds),
+        cache_max_entries=settings.catalog_cache_max_entries,
+        cache_stale_seconds=float(settings.catalog_cache_stale_seconds),
+        cache_refresh_ahead_seconds=float(settings.catalog_cache_refresh_ahead_seconds),
+        io_max_workers=settings.catalog_io_max_workers,
+        process_parse_min_bytes=settings.catalog_process_parse_min_bytes,
+        use_snapshot=settings.catalog_snapshot_enabled,
     )
@@ -15,6 +15,7 @@ from fastapi import FastAPI  # noqa: E402
 from src.config import get_settings  # noqa: E402
 from src.core.database import close_db_manager, init_db_manager  # noqa: E402
 from src.core.logging import get_logger, setup_logging  # noqa: E402
+from src.core.mongo import close_mongo_client  # noqa: E402
 
 # Application start time for uptime calculation
 _start_time: float = 0.0
@@ -47,6 +48,28 @@ async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
         echo=settings.debug,
     )
 
+    from src.dependencies.catalog import get_catalog_repository
+
+    # Load every catalog source concurrently; not ready until it completes
+    if settings.catalog_warm_up_enabled:
+        get_catalog_repository().start_warm_up()
+
+    # Reload catalog files as soon as they change
+    if settings.catalog_watch_enabled:
+        get_catalog_repository().start_watching(settings.catalog_watch_interval_seconds)
+
+    # Materialize quick filters in the background
+    if settings.quick_filters_enabled:
+        from src.services.quick_filters import get_quick_filter_scheduler
+
+        get_quick_filter_scheduler().start()
+
+    # Build and refresh the user bitmap index in the background
+    if settings.user_index_enabled:
+        from src.services.user_bitmap_index import get_user_bitmap_index
+
+        get_user_bitmap_index().start()
+
     _start_time = time.time()
     logger.info("Application started successfully")
 
@@ -54,7 +77,15 @@ async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
 
     # Shutdown
     logger.info("Shutting down application")
+    if settings.quick_filters_enabled:
+        await get_quick_filter_scheduler().stop()
+    if settings.user_index_enabled:
+        await get_user_bitmap_index().stop()
+    if settings.catalog_watch_enabled:
+        await get_catalog_repository().stop_watching()
+    get_catalog_repository().close()
     await close_db_manager()
+    close_mongo_client()
     logger.info("Application shutdown complete")
 
 
@@ -76,13 +107,17 @@ def create_app() -> FastAPI:
     from src.api.v1.catalog import router as catalog_router
     from src.api.v1.endpoints.interpreter import router as interpreter_router
     from src.api.v1.health import router as health_router
+    from src.api.v1.quick_filters import router as quick_filters_router
     from src.api.v1.root import router as root_router
+    from src.api.v1.users import router as users_router
     from src.api.v1.websocket.interpreter_ws import router as ws_interpreter_router
 
     app.include_router(root_router)
     app.include_router(health_router)
     app.include_router(catalog_router, prefix="/api/v1")
     app.include_router(interpreter_router, prefix="/api/v1")
+    app.include_router(users_router, prefix="/api/v1")
+    app.include_router(quick_filters_router, prefix="/api/v1")
     # WebSocket routes (no prefix - path is /ws/query/interpret)
     app.include_router(ws_interpreter_router)
 
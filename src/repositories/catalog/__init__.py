@@ -4,6 +4,12 @@ from src.repositories.catalog.cache import AsyncTTLCache, CacheEntry
 from src.repositories.catalog.catalog_repository import CatalogRepository
 from src.repositories.catalog.file_repository import CatalogFileRepository
 from src.repositories.catalog.protocol import CatalogRepositoryProtocol
+from src.repositories.catalog.snapshot import (
+    CatalogSnapshot,
+    compile_snapshot,
+    load_snapshot,
+)
+from src.repositories.catalog.watcher import CatalogWatcher
 
 __all__ = [
     "AsyncTTLCache",
@@ -11,4 +17,8 @@ __all__ = [
     "CatalogFileRepository",
     "CatalogRepository",
     "CatalogRepositoryProtocol",
+    "CatalogSnapshot",
+    "CatalogWatcher",
+    "compile_snapshot",
+    "load_snapshot",
 ]
@@ -1,11 +1,19 @@
 """Cache utilities for catalog file repository."""
 
 import asyncio
+import sys
 import threading
 import time
-from collections.abc import Awaitable, Callable
-from dataclasses import dataclass
-from typing import Generic, TypeVar
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, Generic, TypeVar
+
+import structlog
+from pydantic import BaseModel
+
+logger = structlog.get_logger(__name__)
 
 T = TypeVar("T")
 
@@ -17,88 +25,270 @@ class CacheEntry(Generic[T]):
     Attributes:
         value: The cached data.
         expires_at: Monotonic timestamp when the entry expires.
+        size: Estimated size of the value in bytes (0 when not tracked).
     """
 
     value: T
     expires_at: float
+    size: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class CacheStats:
+    """Counters and occupancy of an AsyncTTLCache.
+
+    Attributes:
+        hits: Lookups served from the cache.
+        misses: Lookups that had to call the loader.
+        evictions: Entries removed to respect the size bounds.
+        expirations: Expired entries purged.
+        entries: Entries currently stored.
+        bytes: Estimated bytes currently stored (0 when not tracked).
+        key_locks: Per-key locks currently held or awaited.
+        stale_hits: Hits served past expiry while a refresh ran.
+        refreshes: Background refreshes that completed.
+        refresh_failures: Background refreshes whose loader failed.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    entries: int
+    bytes: int
+    key_locks: int
+    stale_hits: int = 0
+    refreshes: int = 0
+    refresh_failures: int = 0
+
+
+@dataclass(slots=True)
+class _KeyLock:
+    """Per-key lock with the number of coroutines holding or awaiting it."""
+
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    refs: int = 0
+
+
+def estimate_size(value: Any) -> int:
+    """Estimate the memory used by a value and everything it references.
+
+    Walks containers and Pydantic models recursively; shared objects are
+    counted once. Meant for cache accounting, not exact measurement.
+
+    Args:
+        value: The value to measure.
+
+    Returns:
+        Estimated size in bytes.
+    """
+    seen: set[int] = set()
+    total = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, list | tuple | set | frozenset):
+            stack.extend(item)
+        elif isinstance(item, BaseModel):
+            stack.append(item.__dict__)
+    return total
 
 
 class AsyncTTLCache(Generic[T]):
-    """Thread-safe async cache with TTL and thundering herd prevention.
+    """Thread-safe async cache with TTL, size bounds and herd prevention.
 
     This cache uses a dual-lock pattern:
     - threading.Lock for protecting the data structure (for thread safety)
     - asyncio.Lock per key for preventing thundering herd (for async safety)
 
+    Entries are kept in LRU order. When max_entries or max_bytes is
+    exceeded, least recently used entries are evicted. Expired entries are
+    dropped when read and purged in full every purge_interval_seconds
+    (checked on writes). Per-key locks are reference-counted and removed
+    once no coroutine holds or awaits them.
+
+    With stale_seconds, an expired entry keeps being served for that long
+    while a background task reloads it (stale-while-revalidate); with
+    refresh_ahead_seconds, the background reload starts that long before
+    expiry. Callers then only wait for the loader on a cold miss.
+
     Attributes:
         _ttl: Time-to-live in seconds.
-        _data: Dictionary storing cache entries.
+        _data: Cache entries in LRU order (least recently used first).
         _data_lock: Threading lock for data structure access.
-        _key_locks: Dictionary of per-key async locks.
-        _key_locks_lock: Async lock for key locks dictionary access.
+        _key_locks: Per-key async locks that are in use.
     """
 
-    def __init__(self, ttl_seconds: float = 60.0) -> None:
+    def __init__(
+        self,
+        ttl_seconds: float = 60.0,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        sizeof: Callable[[T], int] | None = None,
+        purge_interval_seconds: float | None = None,
+        stale_seconds: float = 0.0,
+        refresh_ahead_seconds: float = 0.0,
+    ) -> None:
         """Initialize the cache.
 
         Args:
             ttl_seconds: Time-to-live for cache entries in seconds.
+            max_entries: Maximum number of entries (unbounded if None).
+            max_bytes: Maximum estimated bytes (unbounded if None).
+            sizeof: Size estimator used with max_bytes (defaults to
+                estimate_size).
+            purge_interval_seconds: Interval between full purges of expired
+                entries (defaults to the TTL).
+            stale_seconds: How long past expiry an entry may still be
+                served while it is reloaded in the background.
+            refresh_ahead_seconds: How long before expiry a background
+                reload starts (capped by the TTL).
         """
         self._ttl = ttl_seconds
-        self._data: dict[str, CacheEntry[T]] = {}
+        self._stale = stale_seconds
+        self._refresh_ahead = min(refresh_ahead_seconds, ttl_seconds)
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._sizeof: Callable[[T], int] = sizeof or estimate_size
+        self._purge_interval = (
+            purge_interval_seconds
+            if purge_interval_seconds is not None
+            else ttl_seconds
+        )
+        self._next_purge = time.monotonic() + self._purge_interval
+        self._data: OrderedDict[str, CacheEntry[T]] = OrderedDict()
+        self._bytes = 0
         self._data_lock = threading.Lock()
-        self._key_locks: dict[str, asyncio.Lock] = {}
-        self._key_locks_lock: asyncio.Lock | None = None
-
-    def _get_key_locks_lock(self) -> asyncio.Lock:
-        """Get or create the key locks lock (lazy initialization for event loop).
-
-        Returns:
-            The asyncio lock for key locks dictionary.
-        """
-        if self._key_locks_lock is None:
-            self._key_locks_lock = asyncio.Lock()
-        return self._key_locks_lock
-
-    def _get_if_valid(self, key: str) -> T | None:
-        """Get cached value if it exists and is not expired.
+        self._key_locks: dict[str, _KeyLock] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._stale_hits = 0
+        self._refreshes = 0
+        self._refresh_failures = 0
+        # Bumped by clear so in-flight refreshes do not restore values
+        # loaded before it
+        self._generation = 0
+        # Keys with a refresh in flight, mapped to how many times each was
+        # invalidated since that refresh started
+        self._refreshing: dict[str, int] = {}
+        self._refresh_tasks: set[asyncio.Task[None]] = set()
+
+    def _remove(self, key: str) -> CacheEntry[T]:
+        """Remove an entry (data lock must be held)."""
+        entry = self._data.pop(key)
+        self._bytes -= entry.size
+        return entry
+
+    def _get_if_valid(self, key: str) -> tuple[T | None, bool]:
+        """Get cached value if it exists and may still be served.
+
+        A hit marks the entry as most recently used; an entry past its
+        stale window is removed.
 
         Args:
             key: The cache key.
 
         Returns:
-            The cached value or None if not found/expired.
+            The cached value (None if not found/expired) and whether it
+            should be refreshed in the background.
         """
         with self._data_lock:
             entry = self._data.get(key)
-            if entry is not None and time.monotonic() < entry.expires_at:
-                return entry.value
-            return None
+            if entry is None:
+                return None, False
+            now = time.monotonic()
+            if now >= entry.expires_at + self._stale:
+                self._remove(key)
+                self._expirations += 1
+                return None, False
+            self._data.move_to_end(key)
+            if now >= entry.expires_at:
+                self._stale_hits += 1
+                return entry.value, True
+            return entry.value, now >= entry.expires_at - self._refresh_ahead
 
     def _set(self, key: str, value: T) -> None:
-        """Store a value in the cache.
+        """Store a value in the cache, evicting to respect the bounds.
 
         Args:
             key: The cache key.
             value: The value to store.
         """
-        expires_at = time.monotonic() + self._ttl
+        now = time.monotonic()
+        size = self._sizeof(value) if self._max_bytes is not None else 0
+        with self._data_lock:
+            if now >= self._next_purge:
+                self._purge_expired(now)
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = CacheEntry(
+                value=value, expires_at=now + self._ttl, size=size
+            )
+            self._bytes += size
+            while self._data and (
+                (self._max_entries is not None and len(self._data) > self._max_entries)
+                or (self._max_bytes is not None and self._bytes > self._max_bytes)
+            ):
+                self._remove(next(iter(self._data)))
+                self._evictions += 1
+
+    def _record(self, hit: bool) -> None:
+        """Count a lookup as a hit or a miss."""
+        with self._data_lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+
+    def _purge_expired(self, now: float) -> int:
+        """Remove every expired entry (data lock must be held)."""
+        expired = [
+            key
+            for key, entry in self._data.items()
+            if now >= entry.expires_at + self._stale
+        ]
+        for key in expired:
+            self._remove(key)
+        self._expirations += len(expired)
+        self._next_purge = now + self._purge_interval
+        return len(expired)
+
+    def purge_expired(self) -> int:
+        """Remove every expired entry now.
+
+        Returns:
+            Number of entries removed.
+        """
         with self._data_lock:
-            self._data[key] = CacheEntry(value=value, expires_at=expires_at)
+            return self._purge_expired(time.monotonic())
 
-    async def _get_key_lock(self, key: str) -> asyncio.Lock:
-        """Get or create a per-key lock.
+    @asynccontextmanager
+    async def _key_lock(self, key: str) -> AsyncIterator[None]:
+        """Hold the per-key lock, removing it when no longer used.
 
         Args:
             key: The cache key.
-
-        Returns:
-            The asyncio lock for this key.
         """
-        async with self._get_key_locks_lock():
-            if key not in self._key_locks:
-                self._key_locks[key] = asyncio.Lock()
-            return self._key_locks[key]
+        key_lock = self._key_locks.get(key)
+        if key_lock is None:
+            key_lock = self._key_locks[key] = _KeyLock()
+        key_lock.refs += 1
+        try:
+            async with key_lock.lock:
+                yield
+        finally:
+            key_lock.refs -= 1
+            if key_lock.refs == 0:
+                del self._key_locks[key]
 
     async def get_or_load(
         self,
@@ -118,23 +308,57 @@ class AsyncTTLCache(Generic[T]):
             The cached or newly loaded value.
         """
         # Fast path: check valid cache without lock
-        cached = self._get_if_valid(key)
+        cached, refresh = self._get_if_valid(key)
         if cached is not None:
+            self._record(hit=True)
+            if refresh:
+                self._schedule_refresh(key, loader)
             return cached
 
         # Slow path: acquire per-key lock to prevent thundering herd
-        key_lock = await self._get_key_lock(key)
-        async with key_lock:
+        async with self._key_lock(key):
             # Double-check after acquiring lock
-            cached = self._get_if_valid(key)
+            cached, _ = self._get_if_valid(key)
             if cached is not None:
+                self._record(hit=True)
                 return cached
 
             # Load and cache the value
+            self._record(hit=False)
             value = await loader()
             self._set(key, value)
             return value
 
+    def _schedule_refresh(self, key: str, loader: Callable[[], Awaitable[T]]) -> None:
+        """Reload a key in the background unless a reload is running."""
+        if key in self._refreshing:
+            return
+        self._refreshing[key] = 0
+        task = asyncio.create_task(self._refresh(key, loader, self._generation))
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _refresh(
+        self, key: str, loader: Callable[[], Awaitable[T]], generation: int
+    ) -> None:
+        """Reload a key; on failure the current value keeps being served."""
+        try:
+            async with self._key_lock(key):
+                value = await loader()
+            if generation == self._generation and not self._refreshing.get(key):
+                self._set(key, value)
+            self._refreshes += 1
+        except Exception as e:
+            self._refresh_failures += 1
+            logger.warning("Background cache refresh failed", key=key, error=str(e))
+        finally:
+            self._refreshing.pop(key, None)
+
+    async def join_refreshes(self) -> None:
+        """Wait for the background refreshes in progress."""
+        if self._refresh_tasks:
+            await asyncio.gather(*self._refresh_tasks, return_exceptions=True)
+
     def invalidate(self, key: str) -> bool:
         """Remove a specific key from the cache.
 
@@ -145,21 +369,48 @@ class AsyncTTLCache(Generic[T]):
             True if the key was found and removed, False otherwise.
         """
         with self._data_lock:
+            if key in self._refreshing:
+                self._refreshing[key] += 1
             if key in self._data:
-                del self._data[key]
+                self._remove(key)
                 return True
             return False
 
     def clear(self) -> None:
         """Remove all entries from the cache."""
         with self._data_lock:
+            self._generation += 1
             self._data.clear()
+            self._bytes = 0
 
     def size(self) -> int:
         """Get the number of entries in the cache.
 
+        Expired entries are purged first.
+
         Returns:
-            Number of cached entries (may include expired ones).
+            Number of live cached entries.
         """
         with self._data_lock:
+            self._purge_expired(time.monotonic())
             return len(self._data)
+
+    def stats(self) -> CacheStats:
+        """Get the cache counters and occupancy.
+
+        Returns:
+            CacheStats snapshot.
+        """
+        with self._data_lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                entries=len(self._data),
+                bytes=self._bytes,
+                key_locks=len(self._key_locks),
+                stale_hits=self._stale_hits,
+                refreshes=self._refreshes,
+                refresh_failures=self._refresh_failures,
+            )
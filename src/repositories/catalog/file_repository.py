@@ -1,12 +1,26 @@
 """File-based catalog repository using YAML files."""
 
+import asyncio
+import datetime as dt
+import multiprocessing
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import suppress
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
 
 import structlog
 import yaml
 
 from src.repositories.catalog.cache import AsyncTTLCache
+from src.repositories.catalog.snapshot import CatalogSnapshot, load_snapshot
+from src.repositories.catalog.watcher import (
+    INDEX_FILE,
+    SNAPSHOT_FILE,
+    CatalogWatcher,
+)
+from src.repositories.catalog.yaml_io import file_digest, read_yaml
 from src.schemas.catalog_yaml import (
     CatalogIndex,
     ColumnMetadataYaml,
@@ -16,12 +30,34 @@ from src.schemas.catalog_yaml import (
 
 logger = structlog.get_logger(__name__)
 
+T = TypeVar("T")
+
+
+def _read_small_yaml(path: Path, min_bytes: int | None) -> dict[str, Any] | None:
+    """Read and parse a YAML file unless it has at least min_bytes.
+
+    Returns:
+        Parsed mapping, or None if the file is too large.
+    """
+    if min_bytes is not None and path.stat().st_size >= min_bytes:
+        return None
+    return read_yaml(path)
+
 
 class CatalogFileRepository:
     """Repository for reading catalog metadata from YAML files.
 
     This repository reads catalog data from YAML files stored in the filesystem.
-    It uses an in-memory TTL cache to reduce file I/O for repeated reads.
+    It uses an in-memory TTL cache to reduce file I/O for repeated reads;
+    expired entries can be served stale while they reload in the background.
+    Files are read and parsed in a bounded thread pool so the event loop
+    never blocks on I/O. Parsing holds the GIL even with libyaml, so files
+    above process_parse_min_bytes are parsed in a process pool instead.
+
+    When a compiled snapshot (`qa-catalog compile`) is present, it is
+    memory-mapped and files whose content still matches it are unpickled
+    from the mapping without parsing or validation; the others are read
+    from YAML.
 
     Attributes:
         _catalog_path: Base path for catalog files.
@@ -33,20 +69,51 @@ class CatalogFileRepository:
         self,
         catalog_path: str | Path,
         cache_ttl_seconds: float = 60.0,
+        cache_max_entries: int | None = None,
+        cache_stale_seconds: float = 0.0,
+        cache_refresh_ahead_seconds: float = 0.0,
+        io_max_workers: int = 4,
+        process_parse_min_bytes: int | None = None,
+        use_snapshot: bool = True,
     ) -> None:
         """Initialize the file repository.
 
         Args:
             catalog_path: Path to the catalog directory.
             cache_ttl_seconds: TTL for cache entries in seconds.
+            cache_max_entries: Maximum cached sources (unbounded if None).
+            cache_stale_seconds: How long expired entries are still served
+                while they are reloaded in the background.
+            cache_refresh_ahead_seconds: How long before expiry entries are
+                reloaded in the background.
+            io_max_workers: Maximum threads (and processes) reading and
+                parsing files.
+            process_parse_min_bytes: Files from this size on are parsed in
+                a process pool (never if None).
+            use_snapshot: Whether to load files from the compiled snapshot.
         """
         self._catalog_path = Path(catalog_path)
         self._index_cache: AsyncTTLCache[CatalogIndex] = AsyncTTLCache(
-            ttl_seconds=cache_ttl_seconds
+            ttl_seconds=cache_ttl_seconds,
+            stale_seconds=cache_stale_seconds,
+            refresh_ahead_seconds=cache_refresh_ahead_seconds,
         )
         self._source_cache: AsyncTTLCache[SourceMetadataYaml] = AsyncTTLCache(
-            ttl_seconds=cache_ttl_seconds
+            ttl_seconds=cache_ttl_seconds,
+            max_entries=cache_max_entries,
+            stale_seconds=cache_stale_seconds,
+            refresh_ahead_seconds=cache_refresh_ahead_seconds,
         )
+        self._watch_task: asyncio.Task[None] | None = None
+        self._warm_up_task: asyncio.Task[None] | None = None
+        self._warmed_up = False
+        self._io_max_workers = io_max_workers
+        self._process_parse_min_bytes = process_parse_min_bytes
+        self._thread_executor: ThreadPoolExecutor | None = None
+        self._process_executor: ProcessPoolExecutor | None = None
+        self._use_snapshot = use_snapshot
+        self._snapshot: CatalogSnapshot | None = None
+        self._snapshot_loaded = False
         self._log = logger.bind(catalog_path=str(catalog_path))
 
     @property
@@ -54,33 +121,118 @@ class CatalogFileRepository:
         """Get the catalog base path."""
         return self._catalog_path
 
+    def _threads(self) -> ThreadPoolExecutor:
+        if self._thread_executor is None:
+            self._thread_executor = ThreadPoolExecutor(
+                max_workers=self._io_max_workers, thread_name_prefix="catalog-io"
+            )
+        return self._thread_executor
+
+    def _processes(self) -> ProcessPoolExecutor:
+        if self._process_executor is None:
+            # spawn: forking a process that runs threads is unsafe
+            self._process_executor = ProcessPoolExecutor(
+                max_workers=self._io_max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._process_executor
+
+    async def _run_in(
+        self, executor: Executor, func: Callable[..., T], *args: Any
+    ) -> T:
+        """Run a blocking function in an executor.
+
+        func and args must be picklable when the executor is a process pool.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, func, *args)
+
+    async def _read_yaml(self, path: Path) -> dict[str, Any]:
+        """Read and parse a YAML file off the event loop.
+
+        Args:
+            path: Path to the YAML file.
+
+        Returns:
+            Parsed mapping (empty for an empty file).
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist.
+            yaml.YAMLError: If YAML parsing fails.
+        """
+        data = await self._run_in(
+            self._threads(), _read_small_yaml, path, self._process_parse_min_bytes
+        )
+        if data is None:
+            self._log.debug("Parsing large file in a process", path=str(path))
+            data = await self._run_in(self._processes(), read_yaml, path)
+        return data
+
+    async def _current_snapshot(self, file_path: str) -> CatalogSnapshot | None:
+        """Get the snapshot if it holds the current content of a file.
+
+        The snapshot is mapped on first use; the file is hashed (not
+        parsed) to check that it did not change since it was compiled.
+
+        Args:
+            file_path: File path relative to the catalog root.
+
+        Returns:
+            The snapshot, or None if the file must be read from YAML.
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist.
+        """
+        if not self._use_snapshot:
+            return None
+        if not self._snapshot_loaded:
+            self._snapshot = await self._run_in(
+                self._threads(), load_snapshot, self._catalog_path
+            )
+            self._snapshot_loaded = True
+            if self._snapshot is not None:
+                self._log.info(
+                    "Catalog snapshot loaded",
+                    sources=len(self._snapshot.source_paths),
+                    content_hash=self._snapshot.content_hash,
+                )
+
+        snapshot = self._snapshot
+        if snapshot is None or file_path not in snapshot:
+            return None
+        digest = await self._run_in(
+            self._threads(), file_digest, self._catalog_path / file_path
+        )
+        if not snapshot.is_current(file_path, digest):
+            self._log.debug("File changed since snapshot", path=file_path)
+            return None
+        return snapshot
+
     async def _load_index(self) -> CatalogIndex:
         """Load the catalog index from YAML file.
 
         Returns:
-            CatalogIndex object.
+            CatalogIndex object (empty if catalog.yaml doesn't exist).
 
         Raises:
-            FileNotFoundError: If catalog.yaml doesn't exist.
             yaml.YAMLError: If YAML parsing fails.
         """
-        index_path = self._catalog_path / "catalog.yaml"
+        index_path = self._catalog_path / INDEX_FILE
         self._log.debug("Loading catalog index", path=str(index_path))
 
-        if not index_path.exists():
+        try:
+            snapshot = await self._current_snapshot(INDEX_FILE)
+            if snapshot is not None:
+                return await self._run_in(self._threads(), snapshot.index)
+            data = await self._read_yaml(index_path)
+        except FileNotFoundError:
             self._log.warning("Catalog index not found, returning empty index")
-            # Return empty index if file doesn't exist
-            import datetime as dt
-
             return CatalogIndex(
                 version="1.0",
                 generated_at=dt.datetime.now(dt.UTC),
                 sources=[],
             )
 
-        with index_path.open("r", encoding="utf-8") as f:
-            data: dict[str, Any] = yaml.safe_load(f) or {}
-
         return CatalogIndex.from_yaml_dict(data)
 
     async def _load_source(self, file_path: str) -> SourceMetadataYaml:
@@ -99,9 +251,10 @@ class CatalogFileRepository:
         full_path = self._catalog_path / file_path
         self._log.debug("Loading source file", path=str(full_path))
 
-        with full_path.open("r", encoding="utf-8") as f:
-            data: dict[str, Any] = yaml.safe_load(f) or {}
-
+        snapshot = await self._current_snapshot(file_path)
+        if snapshot is not None:
+            return await self._run_in(self._threads(), snapshot.source, file_path)
+        data = await self._read_yaml(full_path)
         return SourceMetadataYaml.from_yaml_dict(data)
 
     async def _get_index(self) -> CatalogIndex:
@@ -126,6 +279,51 @@ class CatalogFileRepository:
             lambda: self._load_source(entry.file_path),
         )
 
+    async def _load_sources(
+        self, entries: list[IndexEntry]
+    ) -> list[SourceMetadataYaml | None]:
+        """Load the sources of several index entries concurrently.
+
+        At most io_max_workers sources are loaded at a time, as many as the
+        I/O pool reads. Missing, unparsable or invalid sources are logged
+        and returned as None.
+
+        Args:
+            entries: Index entries of the sources.
+
+        Returns:
+            Sources in the order of the entries.
+        """
+        semaphore = asyncio.Semaphore(self._io_max_workers)
+
+        async def load(entry: IndexEntry) -> SourceMetadataYaml | None:
+            async with semaphore:
+                try:
+                    return await self._load_source_cached(entry)
+                except FileNotFoundError:
+                    self._log.warning(
+                        "Source file missing, skipping",
+                        source_id=entry.source_id,
+                        file_path=entry.file_path,
+                    )
+                except yaml.YAMLError as e:
+                    self._log.error(
+                        "YAML parsing error, skipping",
+                        source_id=entry.source_id,
+                        error=str(e),
+                    )
+                except (KeyError, ValueError) as e:
+                    # Structurally invalid source (ValidationError is a
+                    # ValueError): skip it instead of failing the whole load
+                    self._log.error(
+                        "Invalid source file, skipping",
+                        source_id=entry.source_id,
+                        error=str(e),
+                    )
+                return None
+
+        return await asyncio.gather(*(load(entry) for entry in entries))
+
     async def get_source_by_id(self, source_id: str) -> SourceMetadataYaml | None:
         """Get source metadata by composite ID.
 
@@ -211,33 +409,85 @@ class CatalogFileRepository:
         index = await self._get_index()
 
         # Filter by db_name if provided
-        entries = index.sources
-        if db_name:
-            entries = [e for e in entries if e.db_name == db_name]
+        entries = index.sources_in_db(db_name) if db_name else index.sources
 
         # Apply pagination
         paginated = entries[skip : skip + limit]
 
-        # Load each source
-        sources: list[SourceMetadataYaml] = []
-        for entry in paginated:
-            try:
-                source = await self._load_source_cached(entry)
-                sources.append(source)
-            except FileNotFoundError:
-                self._log.warning(
-                    "Source file missing, skipping",
-                    source_id=entry.source_id,
-                    file_path=entry.file_path,
-                )
-            except yaml.YAMLError as e:
-                self._log.error(
-                    "YAML parsing error, skipping",
-                    source_id=entry.source_id,
-                    error=str(e),
-                )
+        # Load the sources concurrently
+        sources = await self._load_sources(paginated)
+        return [source for source in sources if source is not None]
+
+    async def list_source_summaries(
+        self, db_name: str | None = None, skip: int = 0, limit: int = 100
+    ) -> list[IndexEntry]:
+        """List index entries with their source summaries.
 
-        return sources
+        Entries written with a summary are returned from the index as is
+        when the hash of their source file still matches the one recorded
+        with the summary (the file is hashed, not parsed). Entries from
+        older indexes, and entries whose file changed since, are completed
+        by loading their source.
+
+        Args:
+            db_name: Optional filter by database name.
+            skip: Number of records to skip.
+            limit: Maximum number of records.
+
+        Returns:
+            List of IndexEntry objects with summaries.
+        """
+        self._log.debug(
+            "Listing source summaries", db_name=db_name, skip=skip, limit=limit
+        )
+
+        index = await self._get_index()
+        entries = index.sources_in_db(db_name) if db_name else index.sources
+
+        paginated = entries[skip : skip + limit]
+        current = await asyncio.gather(
+            *(self._summary_is_current(entry) for entry in paginated)
+        )
+        unsummarized = [
+            entry
+            for entry, is_current in zip(paginated, current, strict=True)
+            if not is_current
+        ]
+        loaded = await self._load_sources(unsummarized)
+        computed = {
+            entry.source_id: IndexEntry.for_source(source, entry.file_path)
+            for entry, source in zip(unsummarized, loaded, strict=True)
+            if source is not None
+        }
+
+        return [
+            entry if is_current else computed[entry.source_id]
+            for entry, is_current in zip(paginated, current, strict=True)
+            if is_current or entry.source_id in computed
+        ]
+
+    async def _summary_is_current(self, entry: IndexEntry) -> bool:
+        """Check that an index summary still describes its source file.
+
+        Args:
+            entry: Index entry of the source.
+
+        Returns:
+            True if the entry has a summary and its content hash matches
+            the current file (False for a missing file).
+        """
+        if not entry.has_summary or entry.content_hash is None:
+            return False
+        try:
+            digest = await self._run_in(
+                self._threads(), file_digest, self._catalog_path / entry.file_path
+            )
+        except FileNotFoundError:
+            return False
+        if digest != entry.content_hash:
+            self._log.debug("Source changed since summary", path=entry.file_path)
+            return False
+        return True
 
     async def count_sources(self, db_name: str | None = None) -> int:
         """Count total sources.
@@ -251,7 +501,7 @@ class CatalogFileRepository:
         index = await self._get_index()
 
         if db_name:
-            return sum(1 for e in index.sources if e.db_name == db_name)
+            return len(index.sources_in_db(db_name))
 
         return len(index.sources)
 
@@ -268,20 +518,6 @@ class CatalogFileRepository:
         if source is None:
             return None
 
-        # Calculate stats
-        types_distribution: dict[str, int] = {}
-        required_count = 0
-        enumerable_count = 0
-
-        for col in source.columns:
-            col_type = col.type.value
-            types_distribution[col_type] = types_distribution.get(col_type, 0) + 1
-
-            if col.required:
-                required_count += 1
-            if col.enumerable:
-                enumerable_count += 1
-
         return {
             "id": source.source_id,
             "db_name": source.db_name,
@@ -290,12 +526,7 @@ class CatalogFileRepository:
             "cataloged_at": source.extracted_at,
             "updated_at": source.updated_at or source.extracted_at,
             "columns": source.columns,
-            "stats": {
-                "total_columns": len(source.columns),
-                "required_columns": required_count,
-                "enumerable_columns": enumerable_count,
-                "types_distribution": types_distribution,
-            },
+            "stats": source.column_stats,
         }
 
     async def get_columns(
@@ -324,15 +555,9 @@ class CatalogFileRepository:
         if source is None:
             return []
 
-        columns = source.columns
-
-        # Apply filters
-        if inferred_type:
-            columns = [c for c in columns if c.type.value == inferred_type]
-        if is_required is not None:
-            columns = [c for c in columns if c.required == is_required]
-        if is_enumerable is not None:
-            columns = [c for c in columns if c.enumerable == is_enumerable]
+        columns = source.filter_columns(
+            inferred_type or None, is_required, is_enumerable
+        )
 
         # Apply pagination
         return columns[skip : skip + limit]
@@ -359,20 +584,147 @@ class CatalogFileRepository:
         if source is None:
             return 0
 
-        columns = source.columns
-
-        # Apply filters
-        if inferred_type:
-            columns = [c for c in columns if c.type.value == inferred_type]
-        if is_required is not None:
-            columns = [c for c in columns if c.required == is_required]
-        if is_enumerable is not None:
-            columns = [c for c in columns if c.enumerable == is_enumerable]
-
-        return len(columns)
+        return len(
+            source.filter_columns(inferred_type or None, is_required, is_enumerable)
+        )
 
     def invalidate_cache(self) -> None:
         """Invalidate all cached data."""
         self._index_cache.clear()
         self._source_cache.clear()
+        # Re-read the snapshot too, it may have been recompiled
+        self._snapshot = None
+        self._snapshot_loaded = False
         self._log.info("Cache invalidated")
+
+    async def apply_file_changes(self, changed_paths: set[str]) -> None:
+        """Invalidate and reload the cache entries of changed catalog files.
+
+        Only the index (for catalog.yaml) and the sources whose files
+        changed are dropped; they are reloaded right away so requests keep
+        hitting the cache. A recompiled catalog.snapshot is mapped again on
+        next use.
+
+        Args:
+            changed_paths: Changed files relative to the catalog root.
+        """
+        if not changed_paths:
+            return
+
+        # Map files to sources with the index as it was before the change
+        index = await self._get_index()
+        file_sources = {entry.file_path: entry.source_id for entry in index.sources}
+        changed_sources = {
+            file_sources[path] for path in changed_paths if path in file_sources
+        }
+
+        if INDEX_FILE in changed_paths:
+            self._index_cache.invalidate("index")
+        for source_id in changed_sources:
+            self._source_cache.invalidate(source_id)
+        if SNAPSHOT_FILE in changed_paths:
+            # Recompiled: map the new snapshot on next use
+            self._snapshot = None
+            self._snapshot_loaded = False
+        self._log.info(
+            "Catalog files changed",
+            index_changed=INDEX_FILE in changed_paths,
+            snapshot_changed=SNAPSHOT_FILE in changed_paths,
+            sources=sorted(changed_sources),
+        )
+
+        try:
+            await self._get_index()
+            for source_id in changed_sources:
+                await self.get_source_by_id(source_id)
+        except (OSError, yaml.YAMLError, KeyError, ValueError) as e:
+            # Left uncached: the next request reports the error
+            self._log.warning("Failed to reload changed catalog files", error=str(e))
+
+    @property
+    def is_warmed_up(self) -> bool:
+        """Whether the startup warm-up has completed."""
+        return self._warmed_up
+
+    async def warm_up(self) -> None:
+        """Load the index and every source into the cache concurrently.
+
+        The warm-up completes even if some files fail to load: they are
+        logged and left for the next request to report.
+        """
+        start_time = time.perf_counter()
+        try:
+            index = await self._get_index()
+            sources = await self._load_sources(index.sources)
+            self._log.info(
+                "Catalog warmed up",
+                sources=sum(source is not None for source in sources),
+                failed=sources.count(None),
+                duration_ms=round((time.perf_counter() - start_time) * 1000),
+            )
+        except (OSError, yaml.YAMLError, KeyError, ValueError) as e:
+            self._log.warning("Catalog warm-up failed", error=str(e))
+        finally:
+            self._warmed_up = True
+
+    def start_warm_up(self) -> None:
+        """Warm up the cache in the background."""
+        if self._warm_up_task is None or self._warm_up_task.done():
+            self._warmed_up = False
+            self._warm_up_task = asyncio.create_task(
+                self.warm_up(), name="catalog-warm-up"
+            )
+
+    async def _watch(self, watcher: CatalogWatcher, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                changed = await asyncio.to_thread(watcher.poll)
+                await self.apply_file_changes(changed)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # A bad poll must not end the watcher; the next one retries
+                self._log.error(
+                    "Catalog watcher poll failed",
+                    error=str(e),
+                    error_type=type(e).__name__,
+                )
+
+    def start_watching(self, interval_seconds: float = 1.0) -> None:
+        """Poll the catalog files and apply their changes in the background.
+
+        Args:
+            interval_seconds: Interval between polls.
+        """
+        if self._watch_task is None or self._watch_task.done():
+            watcher = CatalogWatcher(self._catalog_path)
+            self._watch_task = asyncio.create_task(
+                self._watch(watcher, interval_seconds), name="catalog-watcher"
+            )
+            self._log.info("Catalog watcher started", interval_seconds=interval_seconds)
+
+    async def stop_watching(self) -> None:
+        """Stop polling the catalog files."""
+        if self._watch_task is None:
+            return
+        self._watch_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._watch_task
+        self._watch_task = None
+        self._log.info("Catalog watcher stopped")
+
+    def close(self) -> None:
+        """Cancel the warm-up and shut down the file I/O pools.
+
+        The pools are recreated on next use.
+        """
+        if self._warm_up_task is not None:
+            self._warm_up_task.cancel()
+            self._warm_up_task = None
+        if self._thread_executor is not None:
+            self._thread_executor.shutdown(wait=False, cancel_futures=True)
+            self._thread_executor = None
+        if self._process_executor is not None:
+            self._process_executor.shutdown(wait=False, cancel_futures=True)
+            self._process_executor = None
@@ -0,0 +1,284 @@
+"""Precompiled, memory-mapped binary snapshot of the YAML catalog.
+
+`qa-catalog compile` parses and validates every catalog file once and
+writes the resulting models to a single read-only file:
+
+    header | model blob per file ... | table of contents
+
+The header holds a format tag and the position of the table of contents,
+which maps each file path to the offset, length and SHA-256 of its blob.
+Each blob is one pickled model (the index or a source).
+
+Readers map the file instead of reading it: every uvicorn worker shares
+the same page-cache pages, and a model is only unpickled, straight from
+the mapping, when it is requested. Per-worker memory therefore holds the
+sources in use (bounded by the repository cache), not the whole catalog.
+Compiling replaces the file atomically; existing mappings keep the old
+file until they are dropped.
+
+An entry is only used while the file on disk still has the same content,
+so edited files fall back to YAML until the next compile. The format tag
+is derived from the snapshot version and the model schemas, so snapshots
+written by an incompatible version of the code are ignored.
+
+The snapshot is a local build artifact trusted like the code itself
+(pickle); it is written next to catalog.yaml and not committed.
+"""
+
+import datetime as dt
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import struct
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+import orjson
+import structlog
+
+from src.repositories.catalog.watcher import INDEX_FILE, SNAPSHOT_FILE
+from src.repositories.catalog.yaml_io import content_digest, parse_yaml
+from src.schemas.catalog_yaml import CatalogIndex, SourceMetadataYaml
+
+logger = structlog.get_logger(__name__)
+
+# Bump when the snapshot layout changes
+SNAPSHOT_VERSION = 4
+
+_MAGIC = b"QACATALOG"
+
+# Offset and length of the table of contents, after magic and format tag
+_TOC_POSITION = struct.Struct("<QQ")
+
+
+@dataclass(frozen=True, slots=True)
+class SnapshotEntry:
+    """Location of a compiled file in the snapshot.
+
+    Attributes:
+        offset: Offset of the pickled model in the snapshot.
+        length: Length of the pickled model in bytes.
+        digest: SHA-256 of the YAML file the model was compiled from.
+    """
+
+    offset: int
+    length: int
+    digest: str
+
+
+class CatalogSnapshot:
+    """Read-only view over a compiled snapshot buffer.
+
+    Models are unpickled from the buffer on each access and never kept,
+    so holding the snapshot costs only its table of contents.
+    """
+
+    def __init__(
+        self,
+        buffer: mmap.mmap | bytes,
+        entries: dict[str, SnapshotEntry],
+        compiled_at: dt.datetime,
+    ) -> None:
+        """Initialize the view.
+
+        Args:
+            buffer: The whole snapshot file (mapped or in memory).
+            entries: Location of each compiled file by relative path.
+            compiled_at: When the snapshot was compiled.
+        """
+        self._buffer = buffer
+        self._entries = entries
+        self.compiled_at = compiled_at
+
+    @property
+    def source_paths(self) -> list[str]:
+        """Relative paths of the compiled source files."""
+        return [path for path in self._entries if path != INDEX_FILE]
+
+    @property
+    def content_hash(self) -> str:
+        """Hash of the whole compiled catalog content."""
+        combined = "\n".join(
+            f"{path}:{entry.digest}" for path, entry in sorted(self._entries.items())
+        )
+        return hashlib.sha256(combined.encode()).hexdigest()
+
+    def __contains__(self, file_path: object) -> bool:
+        return file_path in self._entries
+
+    def is_current(self, file_path: str, digest: str) -> bool:
+        """Check whether a file was compiled with the given content.
+
+        Args:
+            file_path: File path relative to the catalog root.
+            digest: SHA-256 of the file's current content.
+
+        Returns:
+            True if the snapshot entry for the file can be used.
+        """
+        entry = self._entries.get(file_path)
+        return entry is not None and entry.digest == digest
+
+    def _load(self, file_path: str) -> Any:
+        entry = self._entries[file_path]
+        end = entry.offset + entry.length
+        with memoryview(self._buffer)[entry.offset : end] as view:
+            return pickle.loads(view)
+
+    def index(self) -> CatalogIndex:
+        """Unpickle the catalog index."""
+        index: CatalogIndex = self._load(INDEX_FILE)
+        return index
+
+    def source(self, file_path: str) -> SourceMetadataYaml:
+        """Unpickle a source.
+
+        Args:
+            file_path: Source file path relative to the catalog root.
+
+        Returns:
+            The compiled source metadata.
+
+        Raises:
+            KeyError: If the file is not in the snapshot.
+        """
+        source: SourceMetadataYaml = self._load(file_path)
+        return source
+
+
+@cache
+def format_tag() -> bytes:
+    """Tag identifying the snapshot version and the model schemas."""
+    schemas = json.dumps(
+        [
+            SNAPSHOT_VERSION,
+            CatalogIndex.model_json_schema(),
+            SourceMetadataYaml.model_json_schema(),
+        ],
+        sort_keys=True,
+    )
+    return hashlib.sha256(schemas.encode()).hexdigest()[:16].encode()
+
+
+def _read_toc(buffer: mmap.mmap | bytes) -> CatalogSnapshot | None:
+    """Check the header of a snapshot buffer and read its table of contents.
+
+    Returns:
+        The snapshot, or None if the header does not match this version.
+
+    Raises:
+        ValueError: If the table of contents is corrupt.
+    """
+    header = _MAGIC + format_tag()
+    if buffer[: len(header)] != header:
+        return None
+    toc_offset, toc_length = _TOC_POSITION.unpack_from(buffer, len(header))
+    if toc_offset + toc_length > len(buffer):
+        raise ValueError("Table of contents out of bounds")
+
+    try:
+        toc = orjson.loads(buffer[toc_offset : toc_offset + toc_length])
+        entries = {
+            path: SnapshotEntry(offset, length, digest)
+            for path, (offset, length, digest) in toc["files"].items()
+        }
+        compiled_at = dt.datetime.fromisoformat(toc["compiled_at"])
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Invalid table of contents: {e}") from e
+    if INDEX_FILE not in entries:
+        raise ValueError("Catalog index missing from snapshot")
+    return CatalogSnapshot(buffer, entries, compiled_at)
+
+
+def compile_snapshot(catalog_path: str | Path) -> CatalogSnapshot:
+    """Parse and validate the whole catalog and write its snapshot.
+
+    The snapshot is written to a temporary file and renamed, so readers
+    never see a partial file.
+
+    Args:
+        catalog_path: Path to the catalog directory.
+
+    Returns:
+        The compiled snapshot.
+
+    Raises:
+        FileNotFoundError: If catalog.yaml or a source file doesn't exist.
+        yaml.YAMLError: If YAML parsing fails.
+        pydantic.ValidationError: If a file doesn't match its model.
+    """
+    catalog_path = Path(catalog_path)
+
+    content = (catalog_path / INDEX_FILE).read_bytes()
+    index = CatalogIndex.from_yaml_dict(parse_yaml(content))
+    models: dict[str, tuple[Any, str]] = {INDEX_FILE: (index, content_digest(content))}
+    for entry in index.sources:
+        content = (catalog_path / entry.file_path).read_bytes()
+        source = SourceMetadataYaml.from_yaml_dict(parse_yaml(content))
+        models[entry.file_path] = (source, content_digest(content))
+
+    header = _MAGIC + format_tag()
+    data = bytearray(header + bytes(_TOC_POSITION.size))
+    files: dict[str, tuple[int, int, str]] = {}
+    for file_path, (model, digest) in models.items():
+        blob = pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)
+        files[file_path] = (len(data), len(blob), digest)
+        data += blob
+    toc = orjson.dumps(
+        {"compiled_at": dt.datetime.now(dt.UTC).isoformat(), "files": files}
+    )
+    _TOC_POSITION.pack_into(data, len(header), len(data), len(toc))
+    data += toc
+
+    snapshot_path = catalog_path / SNAPSHOT_FILE
+    temp_path = snapshot_path.with_name(f"{SNAPSHOT_FILE}.tmp")
+    temp_path.write_bytes(data)
+    os.replace(temp_path, snapshot_path)
+
+    snapshot = _read_toc(bytes(data))
+    assert snapshot is not None
+    logger.info(
+        "Catalog snapshot compiled",
+        path=str(snapshot_path),
+        sources=len(snapshot.source_paths),
+        content_hash=snapshot.content_hash,
+    )
+    return snapshot
+
+
+def load_snapshot(catalog_path: str | Path) -> CatalogSnapshot | None:
+    """Map the catalog snapshot read-only.
+
+    Args:
+        catalog_path: Path to the catalog directory.
+
+    Returns:
+        The snapshot, or None if it is missing, written by an incompatible
+        version or unreadable.
+    """
+    snapshot_path = Path(catalog_path) / SNAPSHOT_FILE
+    log = logger.bind(path=str(snapshot_path))
+    try:
+        with snapshot_path.open("rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        # ValueError: empty files cannot be mapped
+        log.warning("Ignoring unreadable catalog snapshot", error=str(e))
+        return None
+
+    try:
+        snapshot = _read_toc(buffer)
+    except (ValueError, struct.error) as e:
+        log.warning("Ignoring unreadable catalog snapshot", error=str(e))
+        buffer.close()
+        return None
+    if snapshot is None:
+        log.warning("Ignoring incompatible catalog snapshot")
+        buffer.close()
+    return snapshot
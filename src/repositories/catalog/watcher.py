@@ -0,0 +1,81 @@
+"""Change detection for the YAML catalog files."""
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+# Catalog files that are watched, relative to the catalog root
+INDEX_FILE = "catalog.yaml"
+SNAPSHOT_FILE = "catalog.snapshot"
+SOURCES_DIR = "sources"
+
+
+@dataclass(frozen=True, slots=True)
+class FileSignature:
+    """Cheap fingerprint of a file, from a single stat call.
+
+    Attributes:
+        mtime_ns: Modification time in nanoseconds.
+        size: Size in bytes.
+    """
+
+    mtime_ns: int
+    size: int
+
+
+class CatalogWatcher:
+    """Detects changes to the catalog files and snapshot by polling.
+
+    Watched files are catalog.yaml, sources/**/*.yaml and the compiled
+    catalog.snapshot.
+
+    Each poll stats the watched files and compares their modification time
+    and size with the previous poll; file contents are never read. Polling
+    needs no extra dependency and also works on mounted volumes where
+    inotify events are not delivered.
+    """
+
+    def __init__(self, catalog_path: str | Path) -> None:
+        """Initialize the watcher with the current state of the files.
+
+        Args:
+            catalog_path: Path to the catalog directory.
+        """
+        self._catalog_path = Path(catalog_path)
+        self._signatures = self._scan()
+
+    def _scan(self) -> dict[str, FileSignature]:
+        """Stat every watched file.
+
+        Returns:
+            Signature of each file by path relative to the catalog root.
+        """
+        paths = [self._catalog_path / INDEX_FILE, self._catalog_path / SNAPSHOT_FILE]
+        sources_dir = self._catalog_path / SOURCES_DIR
+        if sources_dir.is_dir():
+            paths.extend(sources_dir.rglob("*.yaml"))
+
+        signatures: dict[str, FileSignature] = {}
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            relative = path.relative_to(self._catalog_path).as_posix()
+            signatures[relative] = FileSignature(stat.st_mtime_ns, stat.st_size)
+        return signatures
+
+    def poll(self) -> set[str]:
+        """Get the files created, modified or deleted since the last poll.
+
+        Returns:
+            Changed paths relative to the catalog root (posix separators).
+        """
+        current = self._scan()
+        previous = self._signatures
+        self._signatures = current
+        return {
+            path
+            for path in current.keys() | previous.keys()
+            if current.get(path) != previous.get(path)
+        }
@@ -0,0 +1,87 @@
+"""Blocking read, parse, hash and write helpers for the catalog YAML files.
+
+These functions run in the repository's I/O thread and process pools and
+in the CLI; they never touch the event loop.
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+# libyaml's C loader parses several times faster than the pure-Python one
+YamlLoader: type[yaml.SafeLoader] = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def parse_yaml(content: bytes) -> dict[str, Any]:
+    """Parse YAML content.
+
+    Args:
+        content: Raw file content.
+
+    Returns:
+        Parsed mapping (empty for an empty document).
+
+    Raises:
+        yaml.YAMLError: If YAML parsing fails.
+    """
+    data: dict[str, Any] = yaml.load(content, Loader=YamlLoader) or {}
+    return data
+
+
+def read_yaml(path: Path) -> dict[str, Any]:
+    """Read and parse a YAML file.
+
+    Args:
+        path: Path to the YAML file.
+
+    Returns:
+        Parsed mapping (empty for an empty file).
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist.
+        yaml.YAMLError: If YAML parsing fails.
+    """
+    return parse_yaml(path.read_bytes())
+
+
+def content_digest(content: bytes) -> str:
+    """Hash file content (hex SHA-256)."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def file_digest(path: Path) -> str:
+    """Hash the content of a file (hex SHA-256).
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist.
+    """
+    return content_digest(path.read_bytes())
+
+
+def write_text_atomic(path: Path, content: str) -> None:
+    """Write a text file atomically.
+
+    The content goes to a temporary file in the same directory, which then
+    replaces the target, so readers (the catalog watcher included) never see
+    an empty or half-written file.
+
+    Args:
+        path: Path to the file to write.
+        content: Text content (written as UTF-8).
+    """
+    fd, tmp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
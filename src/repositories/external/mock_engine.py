@@ -0,0 +1,802 @@
+"""In-process query engine over the local mock collections in res/db/.
+
+Each ``{db_name}.{collection_name}.json`` file is loaded once into a
+columnar store: one NumPy array per flattened field path, with strings
+dictionary-encoded and hash indexes on enumerable (low-cardinality)
+string columns. MongoDB filter documents, as compiled from the query
+plan, are evaluated vectorized over those columns.
+
+MockMongoClient mimics the subset of the Motor API used by QueryExecutor
+(``find``, ``find_raw_batches``, ``aggregate_raw_batches``,
+``count_documents``, ``estimated_document_count``), so in MOCK mode the
+executor runs unchanged and returns the same results as against MongoDB.
+"""
+
+import json
+import operator
+import re
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import bson
+import numpy as np
+import structlog
+from bson import Decimal128, ObjectId
+
+logger = structlog.get_logger(__name__)
+
+# Batch size of raw BSON batches when none is requested (MongoDB default)
+_DEFAULT_BATCH_SIZE = 101
+
+_OBJECT_ID_PATTERN = re.compile(r"^[0-9a-f]{24}$")
+
+_COMPARISONS: dict[str, Callable[[Any, Any], Any]] = {
+    "$gt": operator.gt,
+    "$gte": operator.ge,
+    "$lt": operator.lt,
+    "$lte": operator.le,
+}
+
+# Comparison operators of aggregation expressions ($expr)
+_EXPR_COMPARISONS: dict[str, Callable[[Any, Any], Any]] = {
+    **_COMPARISONS,
+    "$eq": operator.eq,
+    "$ne": operator.ne,
+}
+
+# Conversions to a number; like $convert with onError/onNull null, values
+# that cannot be converted become null
+_NUMERIC_CONVERSIONS = ("$convert", "$toDecimal", "$toDouble")
+
+_rng = np.random.default_rng()
+
+
+def _get_path(document: dict[str, Any], path: str) -> Any:
+    """Read a dot-notation path from a document (None if missing)."""
+    value: Any = document
+    for segment in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(segment)
+    return value
+
+
+def _flatten(document: dict[str, Any], prefix: str = "") -> dict[str, Any]:
+    """Flatten nested objects into dot-notation paths; arrays stay whole."""
+    flat: dict[str, Any] = {}
+    for key, value in document.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict) and value:
+            flat.update(_flatten(value, f"{path}."))
+        else:
+            flat[path] = value
+    return flat
+
+
+def _normalize(value: Any) -> Any:
+    """Bring a query or document value to its columnar form."""
+    if isinstance(value, ObjectId):
+        return str(value)
+    return value
+
+
+def _kind(value: Any) -> str:
+    """Classify a non-null value into a column kind."""
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int | float):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    return "object"
+
+
+def _same_kind(left: Any, right: Any) -> bool:
+    """Check that two values are comparable under MongoDB type brackets."""
+    return _kind(left) == _kind(right) and _kind(left) != "object"
+
+
+def _project(
+    document: dict[str, Any], projection: dict[str, Any] | None
+) -> dict[str, Any]:
+    """Apply an inclusion projection (with optional _id exclusion)."""
+    if projection is None:
+        return document
+
+    projected: dict[str, Any] = {}
+    if projection.get("_id", 1) and "_id" in document:
+        projected["_id"] = document["_id"]
+
+    for path, include in projection.items():
+        if path == "_id" or not include:
+            continue
+        value = _get_path(document, path)
+        if value is None and not _has_path(document, path):
+            continue
+        target = projected
+        *parents, leaf = path.split(".")
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[leaf] = value
+    return projected
+
+
+def _to_number(value: Any) -> float:
+    """Convert a value to float, NaN (null) when it is not numeric."""
+    if isinstance(value, Decimal128):
+        return float(value.to_decimal())
+    if isinstance(value, int | float) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return np.nan
+    return np.nan
+
+
+def _has_path(document: dict[str, Any], path: str) -> bool:
+    """Check whether a dot-notation path exists (even if null)."""
+    value: Any = document
+    for segment in path.split("."):
+        if not isinstance(value, dict) or segment not in value:
+            return False
+        value = value[segment]
+    return True
+
+
+def _group(
+    documents: list[dict[str, Any]], spec: dict[str, Any]
+) -> list[dict[str, Any]]:
+    """Evaluate a $group stage keyed by one field path (or null).
+
+    Accumulators support $first (of "$$ROOT" or a "$path") and $sum (of a
+    constant or a "$path").
+    """
+
+    def resolve(document: dict[str, Any], expression: Any) -> Any:
+        if expression == "$$ROOT":
+            return document
+        if isinstance(expression, str) and expression.startswith("$"):
+            return _get_path(document, expression[1:])
+        return expression
+
+    groups: dict[Any, dict[str, Any]] = {}
+    for document in documents:
+        key = resolve(document, spec["_id"])
+        hashable = _normalize(key)
+        group = groups.get(hashable)
+        if group is None:
+            group = groups[hashable] = {"_id": key}
+        for name, accumulator in spec.items():
+            if name == "_id":
+                continue
+            (op, expression), *_ = accumulator.items()
+            value = resolve(document, expression)
+            if op == "$first":
+                group.setdefault(name, value)
+            elif op == "$sum":
+                number = value if isinstance(value, int | float) else 0
+                group[name] = group.get(name, 0) + number
+            else:
+                raise ValueError(f"Unsupported accumulator: {op}")
+    return list(groups.values())
+
+
+def _apply_document_stage(
+    documents: list[dict[str, Any]], name: str, spec: Any
+) -> list[dict[str, Any]]:
+    """Evaluate a stage over documents produced by an earlier stage.
+
+    Supports $limit, $sample, $project, $replaceRoot (of a "$path"),
+    $group and $count.
+    """
+    if name == "$limit":
+        return documents[: int(spec)]
+    if name == "$sample":
+        size = min(int(spec["size"]), len(documents))
+        return [documents[i] for i in _rng.choice(len(documents), size, replace=False)]
+    if name == "$project":
+        return [_project(document, spec) for document in documents]
+    if name == "$replaceRoot":
+        return [_get_path(document, spec["newRoot"][1:]) for document in documents]
+    if name == "$group":
+        return _group(documents, spec)
+    if name == "$count":
+        return [{spec: len(documents)}] if documents else []
+    raise ValueError(f"Unsupported pipeline stage after output: {name}")
+
+
+@dataclass
+class Column:
+    """One flattened field of a collection, stored as NumPy arrays.
+
+    Attributes:
+        kind: "number", "bool", "string" or "object" (mixed types, arrays).
+        values: float64 / bool values, int32 dictionary codes for strings
+            (-1 when absent), or the raw values for object columns.
+        present: True where the field exists and is not null.
+        categories: Sorted distinct strings of a string column.
+        codes: Dictionary code of each distinct string.
+        index: Row positions per value, for enumerable string columns.
+    """
+
+    kind: str
+    values: np.ndarray
+    present: np.ndarray
+    categories: np.ndarray | None = None
+    codes: dict[str, int] = field(default_factory=dict)
+    index: dict[str, np.ndarray] | None = None
+
+    @classmethod
+    def build(cls, raw: list[Any], index_cardinality_limit: int) -> "Column":
+        """Build a column from the values of every document (None if absent).
+
+        Args:
+            raw: One value per document, in collection order.
+            index_cardinality_limit: Maximum distinct strings for a column
+                to get a hash index.
+
+        Returns:
+            The column.
+        """
+        size = len(raw)
+        present = np.fromiter((v is not None for v in raw), dtype=bool, count=size)
+        kinds = {_kind(v) for v in raw if v is not None}
+
+        if kinds == {"string"}:
+            categories = np.array(sorted({v for v in raw if v is not None}), dtype=str)
+            codes = {value: code for code, value in enumerate(categories.tolist())}
+            values: np.ndarray = np.fromiter(
+                (codes[v] if v is not None else -1 for v in raw),
+                dtype=np.int32,
+                count=size,
+            )
+            index = None
+            if len(codes) <= index_cardinality_limit:
+                index = {
+                    value: np.flatnonzero(values == code)
+                    for value, code in codes.items()
+                }
+            return cls("string", values, present, categories, codes, index)
+
+        if kinds == {"number"}:
+            values = np.fromiter(
+                (v if v is not None else np.nan for v in raw),
+                dtype=np.float64,
+                count=size,
+            )
+            return cls("number", values, present)
+
+        if kinds == {"bool"}:
+            values = np.fromiter((bool(v) for v in raw), dtype=bool, count=size)
+            return cls("bool", values, present)
+
+        values = np.empty(size, dtype=object)
+        for position, value in enumerate(raw):
+            values[position] = value
+        return cls("object", values, present)
+
+    @classmethod
+    def missing(cls, size: int) -> "Column":
+        """Build the column of a field no document has."""
+        return cls(
+            "object", np.full(size, None, dtype=object), np.zeros(size, dtype=bool)
+        )
+
+    def _empty(self) -> np.ndarray:
+        return np.zeros(len(self.present), dtype=bool)
+
+    def to_numbers(self) -> np.ndarray:
+        """Convert the values to float64, NaN where absent or not numeric."""
+        if self.kind == "number":
+            return self.values
+        if self.kind == "string":
+            assert self.categories is not None
+            numbers = np.array(
+                [_to_number(c) for c in self.categories.tolist()] or [np.nan]
+            )
+            return np.where(self.present, numbers[np.maximum(self.values, 0)], np.nan)
+        if self.kind == "bool":
+            return np.full(len(self.present), np.nan)
+        return np.fromiter(
+            (_to_number(value) for value in self.values),
+            dtype=np.float64,
+            count=len(self.values),
+        )
+
+    def _from_categories(self, category_mask: np.ndarray) -> np.ndarray:
+        """Expand a mask over distinct strings to a mask over rows."""
+        return np.asarray(self.present & category_mask[np.maximum(self.values, 0)])
+
+    def _elementwise(self, predicate: Callable[[Any], bool]) -> np.ndarray:
+        """Evaluate a predicate per value (arrays match if any element does)."""
+
+        def test(value: Any) -> bool:
+            if isinstance(value, list):
+                return any(predicate(_normalize(item)) for item in value)
+            return value is not None and predicate(value)
+
+        return np.fromiter(
+            (test(value) for value in self.values), dtype=bool, count=len(self.values)
+        )
+
+    def equals(self, value: Any) -> np.ndarray:
+        """Rows whose value equals the operand (null matches missing)."""
+        value = _normalize(value)
+        if value is None:
+            return ~self.present
+        if self.kind == "string":
+            if not isinstance(value, str):
+                return self._empty()
+            if self.index is not None:
+                mask = self._empty()
+                positions = self.index.get(value)
+                if positions is not None:
+                    mask[positions] = True
+                return mask
+            code = self.codes.get(value)
+            return self._empty() if code is None else self.values == code
+        if self.kind in ("number", "bool"):
+            if _kind(value) != self.kind:
+                return self._empty()
+            return np.asarray(self.present & (self.values == value))
+        return self._elementwise(lambda v: v == value and _kind(v) == _kind(value))
+
+    def is_in(self, values: list[Any]) -> np.ndarray:
+        """Rows whose value equals any of the operands."""
+        mask = self._empty()
+        for value in values:
+            mask |= self.equals(value)
+        return mask
+
+    def compare(self, op: str, value: Any) -> np.ndarray:
+        """Rows whose value compares true against the operand.
+
+        As in MongoDB, values of a different type never match.
+        """
+        value = _normalize(value)
+        compare = _COMPARISONS[op]
+        if value is None:
+            return ~self.present if op in ("$gte", "$lte") else self._empty()
+        if self.kind == "string":
+            if not isinstance(value, str):
+                return self._empty()
+            assert self.categories is not None
+            return self._from_categories(compare(self.categories, value))
+        if self.kind in ("number", "bool"):
+            if _kind(value) != self.kind:
+                return self._empty()
+            return np.asarray(self.present & compare(self.values, value))
+        return self._elementwise(lambda v: _same_kind(v, value) and compare(v, value))
+
+    def regex(self, pattern: str, options: str = "") -> np.ndarray:
+        """Rows whose string value matches a regular expression."""
+        flags = re.IGNORECASE if "i" in options else 0
+        compiled = re.compile(pattern, flags)
+        if self.kind == "string":
+            assert self.categories is not None
+            category_mask = np.fromiter(
+                (compiled.search(c) is not None for c in self.categories.tolist()),
+                dtype=bool,
+                count=len(self.categories),
+            )
+            return self._from_categories(category_mask)
+        if self.kind != "object":
+            return self._empty()
+        return self._elementwise(
+            lambda v: isinstance(v, str) and compiled.search(v) is not None
+        )
+
+
+def _sort_documents(
+    documents: list[dict[str, Any]], sort: list[tuple[str, int]]
+) -> list[dict[str, Any]]:
+    """Sort documents by (key, direction) pairs; null sorts first."""
+    for key, direction in reversed(sort):
+
+        def sort_key(document: dict[str, Any], key: str = key) -> tuple[bool, Any]:
+            value = _get_path(document, key)
+            return (value is not None, value)
+
+        documents = sorted(documents, key=sort_key, reverse=direction < 0)
+    return documents
+
+
+class _DocumentCursor:
+    """Async cursor over matched documents (Motor AsyncIOMotorCursor subset)."""
+
+    def __init__(
+        self, documents: list[dict[str, Any]], projection: dict[str, Any] | None
+    ) -> None:
+        self._documents = documents
+        self._projection = projection
+
+    def sort(self, key: str, direction: int = 1) -> "_DocumentCursor":
+        self._documents = _sort_documents(self._documents, [(key, direction)])
+        return self
+
+    def limit(self, limit: int) -> "_DocumentCursor":
+        if limit:
+            self._documents = self._documents[:limit]
+        return self
+
+    async def to_list(self, length: int | None = None) -> list[dict[str, Any]]:
+        documents = self._documents if length is None else self._documents[:length]
+        return [_project(d, self._projection) for d in documents]
+
+    async def __aiter__(self) -> AsyncIterator[dict[str, Any]]:
+        for document in self._documents:
+            yield _project(document, self._projection)
+
+
+class _RawBatchCursor:
+    """Async cursor yielding raw BSON batches, like find_raw_batches."""
+
+    def __init__(
+        self,
+        documents: list[dict[str, Any]],
+        projection: dict[str, Any] | None,
+        batch_size: int,
+    ) -> None:
+        self._documents = documents
+        self._projection = projection
+        self._batch_size = batch_size or _DEFAULT_BATCH_SIZE
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for start in range(0, len(self._documents), self._batch_size):
+            yield b"".join(
+                bson.encode(_project(document, self._projection))
+                for document in self._documents[start : start + self._batch_size]
+            )
+
+
+class ColumnarCollection:
+    """A mock collection held in memory as NumPy columns."""
+
+    def __init__(
+        self, documents: list[dict[str, Any]], index_cardinality_limit: int = 50
+    ) -> None:
+        """Load documents into columns.
+
+        Args:
+            documents: The collection documents, in natural order.
+            index_cardinality_limit: Maximum distinct strings for a column
+                to get a hash index.
+        """
+        self._documents = documents
+        self._size = len(documents)
+
+        flat_documents = [_flatten(document) for document in documents]
+        paths: dict[str, None] = {}
+        for flat in flat_documents:
+            paths.update(dict.fromkeys(flat))
+
+        self.columns: dict[str, Column] = {
+            path: Column.build(
+                [_normalize(flat.get(path)) for flat in flat_documents],
+                index_cardinality_limit,
+            )
+            for path in paths
+        }
+
+    @classmethod
+    def from_file(
+        cls, file_path: Path, index_cardinality_limit: int = 50
+    ) -> "ColumnarCollection":
+        """Load a collection from a JSON export.
+
+        24-hex _id strings become ObjectIds, as they are in MongoDB.
+
+        Args:
+            file_path: Path of the JSON file (a list of documents).
+            index_cardinality_limit: Maximum distinct strings for a column
+                to get a hash index.
+
+        Returns:
+            The loaded collection.
+        """
+        documents = json.loads(file_path.read_text(encoding="utf-8"))
+        if not isinstance(documents, list):
+            documents = [documents]
+
+        for document in documents:
+            object_id = document.get("_id")
+            if isinstance(object_id, str) and _OBJECT_ID_PATTERN.match(object_id):
+                document["_id"] = ObjectId(object_id)
+
+        return cls(documents, index_cardinality_limit)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _column(self, path: str) -> Column:
+        column = self.columns.get(path)
+        return column if column is not None else Column.missing(self._size)
+
+    def match(self, filter_query: dict[str, Any]) -> np.ndarray:
+        """Evaluate a MongoDB filter document over the columns.
+
+        Supports $and, $or, equality, $eq, $ne, $gt, $gte, $lt, $lte,
+        $in, $nin, $regex (with $options), $not and numeric $expr
+        (see _expr).
+
+        Args:
+            filter_query: MongoDB filter document.
+
+        Returns:
+            Boolean mask with one entry per document.
+
+        Raises:
+            ValueError: If the filter uses an unsupported operator.
+        """
+        mask = np.ones(self._size, dtype=bool)
+        for key, condition in filter_query.items():
+            if key == "$and":
+                for clause in condition:
+                    mask &= self.match(clause)
+            elif key == "$or":
+                alternatives = np.zeros(self._size, dtype=bool)
+                for clause in condition:
+                    alternatives |= self.match(clause)
+                mask &= alternatives
+            elif key == "$expr":
+                mask &= self._expr(condition)
+            elif key.startswith("$"):
+                raise ValueError(f"Unsupported operator: {key}")
+            else:
+                mask &= self._match_field(self._column(key), condition)
+        return mask
+
+    def _match_field(self, column: Column, condition: Any) -> np.ndarray:
+        """Evaluate the condition of one field."""
+        if not (
+            isinstance(condition, dict)
+            and condition
+            and all(key.startswith("$") for key in condition)
+        ):
+            return column.equals(condition)
+
+        mask = np.ones(self._size, dtype=bool)
+        for op, operand in condition.items():
+            if op == "$eq":
+                mask &= column.equals(operand)
+            elif op == "$ne":
+                mask &= ~column.equals(operand)
+            elif op in _COMPARISONS:
+                mask &= column.compare(op, operand)
+            elif op == "$in":
+                mask &= column.is_in(operand)
+            elif op == "$nin":
+                mask &= ~column.is_in(operand)
+            elif op == "$regex":
+                mask &= column.regex(operand, condition.get("$options", ""))
+            elif op == "$options":
+                continue
+            elif op == "$not":
+                mask &= ~self._match_field(column, operand)
+            else:
+                raise ValueError(f"Unsupported operator: {op}")
+        return mask
+
+    def _expr(self, expression: dict[str, Any]) -> np.ndarray:
+        """Evaluate a boolean aggregation expression over numeric operands.
+
+        Supports $and, $or, $not, $eq, $ne, $gt, $gte, $lt, $lte and $in.
+        Operands are field paths, numeric literals, null, or $convert /
+        $toDecimal / $toDouble of those. As in MongoDB, null sorts before
+        every number.
+        """
+        (op, args), *_ = expression.items()
+        if op == "$and":
+            mask = np.ones(self._size, dtype=bool)
+            for clause in args:
+                mask &= self._expr(clause)
+            return mask
+        if op == "$or":
+            mask = np.zeros(self._size, dtype=bool)
+            for clause in args:
+                mask |= self._expr(clause)
+            return mask
+        if op == "$not":
+            return ~self._expr(args[0])
+        if op == "$in":
+            candidates = np.array([_to_number(v) for v in args[1]], dtype=np.float64)
+            return np.isin(self._numeric(args[0]), candidates)
+        if op in _EXPR_COMPARISONS:
+            left, right = (
+                np.nan_to_num(self._numeric(arg), nan=-np.inf) for arg in args
+            )
+            return np.asarray(_EXPR_COMPARISONS[op](left, right))
+        raise ValueError(f"Unsupported expression operator: {op}")
+
+    def _numeric(self, expression: Any) -> np.ndarray:
+        """Evaluate a numeric expression to float64 values (NaN for null)."""
+        if isinstance(expression, str) and expression.startswith("$"):
+            return self._column(expression[1:]).to_numbers()
+        if isinstance(expression, dict):
+            (op, spec), *_ = expression.items()
+            if op not in _NUMERIC_CONVERSIONS:
+                raise ValueError(f"Unsupported expression operator: {op}")
+            return self._numeric(spec["input"] if op == "$convert" else spec)
+        return np.full(self._size, _to_number(expression))
+
+    def _positions(self, filter_query: dict[str, Any] | None) -> np.ndarray:
+        if not filter_query:
+            return np.arange(self._size)
+        return np.flatnonzero(self.match(filter_query))
+
+    def _take(self, positions: np.ndarray) -> list[dict[str, Any]]:
+        documents = self._documents
+        return [documents[position] for position in positions.tolist()]
+
+    def find(
+        self,
+        filter_query: dict[str, Any] | None = None,
+        projection: dict[str, Any] | None = None,
+    ) -> _DocumentCursor:
+        """Find matching documents (documents keep their ObjectId _id)."""
+        return _DocumentCursor(self._take(self._positions(filter_query)), projection)
+
+    def find_raw_batches(
+        self,
+        filter_query: dict[str, Any] | None = None,
+        projection: dict[str, Any] | None = None,
+        limit: int = 0,
+        batch_size: int = 0,
+        sort: list[tuple[str, int]] | None = None,
+    ) -> _RawBatchCursor:
+        """Find matching documents as raw BSON batches."""
+        positions = self._positions(filter_query)
+        if sort:
+            documents = _sort_documents(self._take(positions), sort)
+            return _RawBatchCursor(documents[: limit or None], projection, batch_size)
+        if limit:
+            positions = positions[:limit]
+        return _RawBatchCursor(self._take(positions), projection, batch_size)
+
+    def aggregate_raw_batches(self, pipeline: list[dict[str, Any]]) -> _RawBatchCursor:
+        """Run an aggregation pipeline and return its output as raw batches.
+
+        Supports $match, $sample, $limit and $project over the collection,
+        and $group, $count and $facet (whose sub-pipelines support the
+        same stages).
+
+        Raises:
+            ValueError: If the pipeline uses another stage.
+        """
+        return _RawBatchCursor(
+            self._aggregate(np.arange(self._size), pipeline), None, 0
+        )
+
+    def _aggregate(
+        self, positions: np.ndarray, pipeline: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Run pipeline stages over the documents at the given positions.
+
+        Stages run on row positions until one produces new documents
+        ($group, $count, $facet); later stages run on those documents.
+        """
+        projection: dict[str, Any] | None = None
+        output: list[dict[str, Any]] | None = None
+
+        for stage in pipeline:
+            (name, spec), *_ = stage.items()
+            if output is not None:
+                output = _apply_document_stage(output, name, spec)
+            elif name == "$match":
+                positions = positions[self.match(spec)[positions]]
+            elif name == "$sample":
+                size = min(int(spec["size"]), len(positions))
+                positions = _rng.choice(positions, size=size, replace=False)
+            elif name == "$limit":
+                positions = positions[: int(spec)]
+            elif name == "$project":
+                if projection is not None:
+                    output = [_project(d, projection) for d in self._take(positions)]
+                    output = _apply_document_stage(output, name, spec)
+                else:
+                    projection = spec
+            elif name == "$group":
+                documents = self._take(positions)
+                if projection is not None:
+                    documents = [_project(d, projection) for d in documents]
+                output = _group(documents, spec)
+            elif name == "$count":
+                count = len(positions)
+                # As in MongoDB, $count emits nothing for empty input
+                output = [{spec: count}] if count else []
+            elif name == "$facet":
+                output = [
+                    {
+                        facet: self._aggregate(positions, stages)
+                        for facet, stages in spec.items()
+                    }
+                ]
+            else:
+                raise ValueError(f"Unsupported pipeline stage: {name}")
+
+        if output is not None:
+            return output
+        return [_project(document, projection) for document in self._take(positions)]
+
+    async def count_documents(
+        self, filter_query: dict[str, Any], limit: int | None = None
+    ) -> int:
+        """Count the documents matching a filter, up to `limit` if given."""
+        count = len(self._positions(filter_query))
+        return min(count, limit) if limit else count
+
+    async def estimated_document_count(self) -> int:
+        """Get the collection size."""
+        return self._size
+
+
+class MockDatabase:
+    """A mock database: gives access to its collections by name."""
+
+    def __init__(self, client: "MockMongoClient", db_name: str) -> None:
+        self._client = client
+        self._db_name = db_name
+
+    def __getitem__(self, collection_name: str) -> ColumnarCollection:
+        return self._client.get_collection(self._db_name, collection_name)
+
+
+class MockMongoClient:
+    """Motor-compatible client backed by the JSON files in res/db/."""
+
+    def __init__(
+        self, base_path: str | Path = "res/db", index_cardinality_limit: int = 50
+    ) -> None:
+        """Initialize the client.
+
+        Args:
+            base_path: Directory with {db_name}.{collection_name}.json files.
+            index_cardinality_limit: Maximum distinct strings for a column
+                to get a hash index.
+        """
+        self._base_path = Path(base_path)
+        self._index_cardinality_limit = index_cardinality_limit
+        self._collections: dict[tuple[str, str], ColumnarCollection] = {}
+
+    def __getitem__(self, db_name: str) -> MockDatabase:
+        return MockDatabase(self, db_name)
+
+    def get_collection(self, db_name: str, collection_name: str) -> ColumnarCollection:
+        """Get a collection, loading its file on first access.
+
+        Collections without a file are empty, as in MongoDB.
+
+        Args:
+            db_name: Database name.
+            collection_name: Collection name.
+
+        Returns:
+            The columnar collection.
+        """
+        key = (db_name, collection_name)
+        collection = self._collections.get(key)
+        if collection is None:
+            file_path = self._base_path / f"{db_name}.{collection_name}.json"
+            if file_path.exists():
+                collection = ColumnarCollection.from_file(
+                    file_path, self._index_cardinality_limit
+                )
+            else:
+                collection = ColumnarCollection([], self._index_cardinality_limit)
+            self._collections[key] = collection
+            logger.info(
+                "Mock collection loaded",
+                db_name=db_name,
+                collection_name=collection_name,
+                document_count=len(collection),
+                column_count=len(collection.columns),
+            )
+        return collection
+
+    def close(self) -> None:
+        """Release the loaded collections."""
+        self._collections.clear()
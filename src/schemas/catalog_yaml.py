@@ -3,9 +3,13 @@
 from datetime import datetime
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
-from src.schemas.enums import EnrichmentStatus, InferredType
+from src.schemas.enums import EnrichmentStatus, InferredSubtype, InferredType
+
+# (type, required, enumerable) filter of SourceMetadataYaml.filter_columns,
+# None meaning any value
+ColumnFilterKey = tuple[str | None, bool | None, bool | None]
 
 
 class ColumnMetadataYaml(BaseModel):
@@ -14,6 +18,9 @@ class ColumnMetadataYaml(BaseModel):
     path: str = Field(..., min_length=1, description="Full field path (dot notation)")
     name: str = Field(..., min_length=1, description="Field name (last part of path)")
     type: InferredType = Field(..., description="Inferred field type")
+    subtype: InferredSubtype | None = Field(
+        default=None, description="Inferred subtype (e.g. numeric_string)"
+    )
     required: bool = Field(..., description="Present in >= 95% of documents")
     nullable: bool = Field(..., description="Can be null")
     enumerable: bool = Field(..., description="Has low cardinality (< 50 values)")
@@ -39,6 +46,10 @@ class ColumnMetadataYaml(BaseModel):
             "path": self.path,
             "name": self.name,
             "type": self.type.value,
+        }
+        if self.subtype is not None:
+            result["subtype"] = self.subtype.value
+        result |= {
             "required": self.required,
             "nullable": self.nullable,
             "enumerable": self.enumerable,
@@ -67,6 +78,7 @@ class ColumnMetadataYaml(BaseModel):
             path=data["path"],
             name=data["name"],
             type=InferredType(data["type"]),
+            subtype=(InferredSubtype(data["subtype"]) if data.get("subtype") else None),
             required=data["required"],
             nullable=data["nullable"],
             enumerable=data["enumerable"],
@@ -81,7 +93,12 @@ class ColumnMetadataYaml(BaseModel):
 
 
 class SourceMetadataYaml(BaseModel):
-    """Source metadata for YAML serialization."""
+    """Source metadata for YAML serialization.
+
+    Columns are indexed at construction time by every combination of the
+    type, required and enumerable filters, and the column stats are
+    computed once. The columns must not be changed after construction.
+    """
 
     db_name: str = Field(..., min_length=1, description="Database name")
     table_name: str = Field(..., min_length=1, description="Table/collection name")
@@ -90,10 +107,36 @@ class SourceMetadataYaml(BaseModel):
     updated_at: datetime | None = Field(
         default=None, description="Last update timestamp"
     )
+    user_key: str | None = Field(
+        default=None,
+        description="Column path identifying the user (e.g. consumerId)",
+    )
     columns: list[ColumnMetadataYaml] = Field(
         default_factory=list, description="Column metadata list"
     )
 
+    _column_index: dict[ColumnFilterKey, list[ColumnMetadataYaml]] = PrivateAttr(
+        default_factory=dict
+    )
+    _types_distribution: dict[str, int] = PrivateAttr(default_factory=dict)
+
+    def model_post_init(self, __context: Any) -> None:
+        """Build the column indexes."""
+        index: dict[ColumnFilterKey, list[ColumnMetadataYaml]] = {}
+        for col in self.columns:
+            # Every filter combination the column matches, in column order
+            for type_ in (col.type.value, None):
+                for required in (col.required, None):
+                    for enumerable in (col.enumerable, None):
+                        key = (type_, required, enumerable)
+                        index.setdefault(key, []).append(col)
+        self._column_index = index
+        self._types_distribution = {
+            type_: len(columns)
+            for (type_, required, enumerable), columns in index.items()
+            if type_ is not None and required is None and enumerable is None
+        }
+
     @property
     def source_id(self) -> str:
         """Generate composite source ID.
@@ -103,20 +146,53 @@ class SourceMetadataYaml(BaseModel):
         """
         return f"{self.db_name}.{self.table_name}"
 
+    def filter_columns(
+        self,
+        inferred_type: str | None = None,
+        required: bool | None = None,
+        enumerable: bool | None = None,
+    ) -> list[ColumnMetadataYaml]:
+        """Get the columns matching the filters, in column order.
+
+        The list is shared by every caller and must not be modified.
+
+        Args:
+            inferred_type: Optional type filter (InferredType value).
+            required: Optional required filter.
+            enumerable: Optional enumerable filter.
+
+        Returns:
+            Matching columns.
+        """
+        return self._column_index.get((inferred_type, required, enumerable), [])
+
+    @property
+    def column_stats(self) -> dict[str, Any]:
+        """Column counts: total, required, enumerable and by type."""
+        return {
+            "total_columns": len(self.columns),
+            "required_columns": len(self.filter_columns(required=True)),
+            "enumerable_columns": len(self.filter_columns(enumerable=True)),
+            "types_distribution": dict(self._types_distribution),
+        }
+
     def to_yaml_dict(self) -> dict[str, Any]:
         """Convert to dict for YAML serialization.
 
         Returns:
             Dictionary suitable for YAML dumping.
         """
-        return {
+        result: dict[str, Any] = {
             "db_name": self.db_name,
             "table_name": self.table_name,
             "document_count": self.document_count,
             "extracted_at": self.extracted_at.isoformat(),
             "updated_at": (self.updated_at or self.extracted_at).isoformat(),
-            "columns": [col.to_yaml_dict() for col in self.columns],
         }
+        if self.user_key is not None:
+            result["user_key"] = self.user_key
+        result["columns"] = [col.to_yaml_dict() for col in self.columns]
+        return result
 
     @classmethod
     def from_yaml_dict(cls, data: dict[str, Any]) -> "SourceMetadataYaml":
@@ -138,6 +214,7 @@ class SourceMetadataYaml(BaseModel):
                 if data.get("updated_at")
                 else None
             ),
+            user_key=data.get("user_key"),
             columns=[
                 ColumnMetadataYaml.from_yaml_dict(c) for c in data.get("columns", [])
             ],
@@ -145,12 +222,68 @@ class SourceMetadataYaml(BaseModel):
 
 
 class IndexEntry(BaseModel):
-    """Entry in the catalog index."""
+    """Entry in the catalog index.
+
+    Besides locating the source file, an entry carries a summary of the
+    source (column counts, update time and the hash of the file it was
+    computed from) so list views do not need to parse every source.
+    Entries written before summaries existed have them unset.
+    """
 
     db_name: str = Field(..., min_length=1, description="Database name")
     table_name: str = Field(..., min_length=1, description="Table/collection name")
     last_extracted: datetime = Field(..., description="Last extraction timestamp")
     file_path: str = Field(..., description="Relative path to YAML file")
+    column_count: int | None = Field(
+        default=None, ge=0, description="Number of columns in the source"
+    )
+    enumerable_count: int | None = Field(
+        default=None, ge=0, description="Number of enumerable columns"
+    )
+    updated_at: datetime | None = Field(
+        default=None, description="Last update timestamp of the source"
+    )
+    content_hash: str | None = Field(
+        default=None,
+        description="SHA-256 of the source file the summary was computed from",
+    )
+
+    @classmethod
+    def for_source(
+        cls,
+        source: SourceMetadataYaml,
+        file_path: str,
+        content_hash: str | None = None,
+    ) -> "IndexEntry":
+        """Create an entry with the summary of a source.
+
+        Args:
+            source: The source metadata.
+            file_path: Relative path to the source YAML file.
+            content_hash: SHA-256 of the source file, if written.
+
+        Returns:
+            IndexEntry instance.
+        """
+        return cls(
+            db_name=source.db_name,
+            table_name=source.table_name,
+            last_extracted=source.extracted_at,
+            file_path=file_path,
+            column_count=len(source.columns),
+            enumerable_count=len(source.filter_columns(enumerable=True)),
+            updated_at=source.updated_at or source.extracted_at,
+            content_hash=content_hash,
+        )
+
+    @property
+    def has_summary(self) -> bool:
+        """Whether the entry carries the source summary."""
+        return (
+            self.column_count is not None
+            and self.enumerable_count is not None
+            and self.updated_at is not None
+        )
 
     @property
     def source_id(self) -> str:
@@ -167,12 +300,21 @@ class IndexEntry(BaseModel):
         Returns:
             Dictionary suitable for YAML dumping.
         """
-        return {
+        result: dict[str, Any] = {
             "db_name": self.db_name,
             "table_name": self.table_name,
             "last_extracted": self.last_extracted.isoformat(),
             "file_path": self.file_path,
         }
+        if self.column_count is not None:
+            result["column_count"] = self.column_count
+        if self.enumerable_count is not None:
+            result["enumerable_count"] = self.enumerable_count
+        if self.updated_at is not None:
+            result["updated_at"] = self.updated_at.isoformat()
+        if self.content_hash is not None:
+            result["content_hash"] = self.content_hash
+        return result
 
     @classmethod
     def from_yaml_dict(cls, data: dict[str, Any]) -> "IndexEntry":
@@ -189,11 +331,24 @@ class IndexEntry(BaseModel):
             table_name=data["table_name"],
             last_extracted=datetime.fromisoformat(data["last_extracted"]),
             file_path=data["file_path"],
+            column_count=data.get("column_count"),
+            enumerable_count=data.get("enumerable_count"),
+            updated_at=(
+                datetime.fromisoformat(data["updated_at"])
+                if data.get("updated_at")
+                else None
+            ),
+            content_hash=data.get("content_hash"),
         )
 
 
 class CatalogIndex(BaseModel):
-    """Global catalog index."""
+    """Global catalog index.
+
+    Lookups go through dicts built at construction time (by identity, by
+    source ID and by database). Change `sources` through upsert_source so
+    they stay consistent.
+    """
 
     version: str = Field(default="1.0", description="Index format version")
     generated_at: datetime = Field(..., description="Generation timestamp")
@@ -201,6 +356,28 @@ class CatalogIndex(BaseModel):
         default_factory=list, description="Indexed sources"
     )
 
+    _by_identity: dict[tuple[str, str], IndexEntry] = PrivateAttr(default_factory=dict)
+    _by_id: dict[str, IndexEntry] = PrivateAttr(default_factory=dict)
+    _by_db: dict[str, list[IndexEntry]] = PrivateAttr(default_factory=dict)
+
+    def model_post_init(self, __context: Any) -> None:
+        """Build the lookup indexes."""
+        self._reindex()
+
+    def _reindex(self) -> None:
+        """Rebuild the lookup indexes from `sources`.
+
+        The first entry wins when an identity appears more than once, as
+        with the previous linear scans.
+        """
+        self._by_identity = {}
+        self._by_id = {}
+        self._by_db = {}
+        for entry in self.sources:
+            self._by_identity.setdefault((entry.db_name, entry.table_name), entry)
+            self._by_id.setdefault(entry.source_id, entry)
+            self._by_db.setdefault(entry.db_name, []).append(entry)
+
     def to_yaml_dict(self) -> dict[str, Any]:
         """Convert to dict for YAML serialization.
 
@@ -239,10 +416,7 @@ class CatalogIndex(BaseModel):
         Returns:
             IndexEntry if found, None otherwise.
         """
-        for entry in self.sources:
-            if entry.db_name == db_name and entry.table_name == table_name:
-                return entry
-        return None
+        return self._by_identity.get((db_name, table_name))
 
     def find_source_by_id(self, source_id: str) -> IndexEntry | None:
         """Find a source entry by composite ID.
@@ -253,7 +427,32 @@ class CatalogIndex(BaseModel):
         Returns:
             IndexEntry if found, None otherwise.
         """
-        for entry in self.sources:
-            if entry.source_id == source_id:
-                return entry
-        return None
+        return self._by_id.get(source_id)
+
+    def sources_in_db(self, db_name: str) -> list[IndexEntry]:
+        """Get the source entries of a database, in index order.
+
+        Args:
+            db_name: Database name.
+
+        Returns:
+            The entries (empty if the database has none).
+        """
+        return self._by_db.get(db_name, [])
+
+    def upsert_source(self, entry: IndexEntry) -> None:
+        """Add a source entry, replacing any entry with the same identity.
+
+        The entry goes to the end of `sources`, and the lookup indexes are
+        updated.
+
+        Args:
+            entry: The entry to add.
+        """
+        self.sources = [
+            s
+            for s in self.sources
+            if (s.db_name, s.table_name) != (entry.db_name, entry.table_name)
+        ]
+        self.sources.append(entry)
+        self._reindex()
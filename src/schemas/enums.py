@@ -19,6 +19,30 @@ class CheckStatus(str, Enum):
     ERROR = "error"
 
 
+class DossierSourceStatus(str, Enum):
+    """Outcome of one source lookup in a user dossier."""
+
+    OK = "ok"
+    TIMEOUT = "timeout"
+    ERROR = "error"
+
+
+class MaterializationStatus(str, Enum):
+    """State of a quick filter materialization."""
+
+    PENDING = "pending"  # Not refreshed yet
+    READY = "ready"
+    FAILED = "failed"  # Last refresh failed and there is no previous result
+
+
+class UserSetOperator(str, Enum):
+    """Set operation between user sets of the bitmap index."""
+
+    AND = "and"
+    OR = "or"
+    ANDNOT = "andnot"  # First operand minus the others
+
+
 class Environment(str, Enum):
     """Application runtime environment."""
 
@@ -64,3 +88,9 @@ class InferredType(str, Enum):
     OBJECT = "object"  # Nested object
     NULL = "null"  # Only null values found
     UNKNOWN = "unknown"  # Type not determined
+
+
+class InferredSubtype(str, Enum):
+    """Refinement of an inferred type, for values stored in another form."""
+
+    NUMERIC_STRING = "numeric_string"  # Decimal number stored as string ("54.08")
@@ -34,6 +34,14 @@ class FilterOperator(str, Enum):
     IS_NOT_NULL = "IS NOT NULL"
 
 
+class ExportFormat(str, Enum):
+    """File formats supported by query result export."""
+
+    CSV = "csv"
+    JSONL = "jsonl"
+    PARQUET = "parquet"
+
+
 class InterpretationStatus(str, Enum):
     """Status of the interpretation process."""
 
@@ -195,6 +203,63 @@ class ExecuteQueryRequest(BaseModel):
         le=1000,
         description="Número máximo de registros a retornar",
     )
+    random_sample: bool = Field(
+        default=False,
+        description=(
+            "Retorna uma amostra aleatória dos registros encontrados em vez "
+            "dos primeiros, espalhando os usuários pela massa"
+        ),
+    )
+    distinct_users: bool = Field(
+        default=False,
+        description=(
+            "Retorna um único registro por usuário (chave de usuário do "
+            "catálogo), de modo que o limite conte usuários distintos"
+        ),
+    )
+
+
+class CountQueryRequest(BaseModel):
+    """Request body for counting the matches of a query."""
+
+    max_count: int | None = Field(
+        default=None,
+        ge=1,
+        description="Para de contar ao atingir este valor (contagem limitada)",
+    )
+
+
+class RevalidateQueryRequest(BaseModel):
+    """Request body for revalidating previously returned documents."""
+
+    ids: list[str] = Field(
+        ...,
+        min_length=1,
+        max_length=1000,
+        description="IDs (_id) dos registros retornados anteriormente",
+    )
+
+
+class BatchQueryItem(BaseModel):
+    """A single query of a batch execution."""
+
+    query_id: UUID = Field(..., description="ID da query a executar")
+    limit: int = Field(
+        default=100,
+        ge=1,
+        le=1000,
+        description="Número máximo de registros a retornar",
+    )
+
+
+class BatchExecuteRequest(BaseModel):
+    """Request body for POST /api/v1/query/execute/batch."""
+
+    queries: list[BatchQueryItem] = Field(
+        ...,
+        min_length=1,
+        description="Queries a executar, na ordem desejada",
+    )
 
 
 # =============================================================================
@@ -276,6 +341,42 @@ class QueryResultResponse(BaseModel):
         default=False, description="Se resultado foi truncado (>100 registros)"
     )
     execution_time_ms: int = Field(..., ge=0, description="Tempo de execução em ms")
+    suggestions: list[str] = Field(
+        default_factory=list,
+        description="Sugestões para ampliar a busca quando não há resultados",
+    )
+
+
+class QueryCountResponse(BaseModel):
+    """Response from a count-only execution."""
+
+    query_id: UUID = Field(..., description="ID da query contada")
+    count: int = Field(..., ge=0, description="Quantidade de registros encontrados")
+    is_estimated: bool = Field(
+        default=False,
+        description="Se a contagem veio dos metadados da coleção (sem filtros)",
+    )
+    is_bounded: bool = Field(
+        default=False,
+        description="Se a contagem parou no limite max_count (pode haver mais)",
+    )
+    cached: bool = Field(default=False, description="Se a contagem veio do cache")
+    execution_time_ms: int = Field(..., ge=0, description="Tempo de execução em ms")
+
+
+class QueryRevalidationResponse(BaseModel):
+    """Response from revalidating previously returned documents."""
+
+    query_id: UUID = Field(..., description="ID da query revalidada")
+    valid_ids: list[str] = Field(
+        default_factory=list,
+        description="IDs que ainda atendem aos filtros da query",
+    )
+    invalid_ids: list[str] = Field(
+        default_factory=list,
+        description="IDs que não atendem mais aos filtros (ou não existem)",
+    )
+    execution_time_ms: int = Field(..., ge=0, description="Tempo de execução em ms")
 
 
 class ErrorResponse(BaseModel):
@@ -292,6 +393,51 @@ class ErrorResponse(BaseModel):
     )
 
 
+class BatchQueryResult(BaseModel):
+    """One line of the NDJSON stream returned by a batch execution."""
+
+    index: int = Field(..., ge=0, description="Posição da query no lote")
+    query_id: UUID = Field(..., description="ID da query executada")
+    result: QueryResultResponse | None = Field(
+        default=None, description="Resultado, quando a execução teve sucesso"
+    )
+    error: ErrorResponse | None = Field(
+        default=None, description="Erro, quando a execução falhou"
+    )
+    deduplicated: bool = Field(
+        default=False,
+        description="Se o resultado foi reaproveitado de outra query do lote",
+    )
+
+
+class AdmissionStatsResponse(BaseModel):
+    """Metrics of the query admission queue and bulkheads."""
+
+    in_flight: int = Field(..., ge=0, description="Queries em execução")
+    max_in_flight: int = Field(..., ge=1, description="Limite global de execuções")
+    source_max_in_flight: int = Field(
+        ..., ge=1, description="Limite de execuções por fonte"
+    )
+    in_flight_by_source: dict[str, int] = Field(
+        default_factory=dict, description="Queries em execução por fonte"
+    )
+    queued: int = Field(..., ge=0, description="Queries aguardando na fila")
+    max_queue_size: int = Field(..., ge=0, description="Capacidade da fila")
+    queued_by_priority: dict[str, int] = Field(
+        default_factory=dict, description="Queries na fila por prioridade"
+    )
+    admitted_total: int = Field(..., ge=0, description="Queries admitidas")
+    rejected_total: int = Field(
+        ..., ge=0, description="Queries rejeitadas com a fila cheia"
+    )
+    timed_out_total: int = Field(
+        ..., ge=0, description="Queries rejeitadas por tempo de espera"
+    )
+    avg_wait_ms: float = Field(
+        ..., ge=0, description="Tempo médio de espera na fila em ms"
+    )
+
+
 # =============================================================================
 # Internal Storage Models
 # =============================================================================
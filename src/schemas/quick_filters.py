@@ -0,0 +1,77 @@
+"""Schemas for quick filters (predefined, materialized queries)."""
+
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from src.schemas.enums import MaterializationStatus
+
+
+class QuickFilterDefinition(BaseModel):
+    """A quick filter as declared in the definitions YAML file."""
+
+    id: str = Field(
+        ...,
+        min_length=1,
+        pattern=r"^[a-z0-9][a-z0-9_-]*$",
+        description="Identificador do filtro (slug)",
+    )
+    name: str = Field(..., min_length=1, description="Nome exibido do filtro")
+    description: str | None = Field(default=None, description="Descrição do filtro")
+    category: str | None = Field(
+        default=None, description="Categoria (ex: cartão de crédito, empréstimo)"
+    )
+    sql: str = Field(..., min_length=1, description="Query SQL do filtro")
+    refresh_interval_seconds: int | None = Field(
+        default=None,
+        ge=10,
+        description="Intervalo de atualização (padrão da configuração se ausente)",
+    )
+
+
+class QuickFilterSummary(BaseModel):
+    """A quick filter with the freshness of its materialization."""
+
+    id: str = Field(..., description="Identificador do filtro")
+    name: str = Field(..., description="Nome exibido do filtro")
+    description: str | None = Field(default=None, description="Descrição do filtro")
+    category: str | None = Field(default=None, description="Categoria do filtro")
+    status: MaterializationStatus = Field(..., description="Estado da materialização")
+    user_count: int | None = Field(
+        default=None, ge=0, description="Usuários encontrados na última atualização"
+    )
+    refreshed_at: datetime | None = Field(
+        default=None, description="Momento da última atualização bem-sucedida"
+    )
+    next_refresh_at: datetime | None = Field(
+        default=None, description="Momento previsto da próxima atualização"
+    )
+    error: str | None = Field(
+        default=None, description="Erro da última tentativa de atualização"
+    )
+
+
+class QuickFilterListResponse(BaseModel):
+    """Response for listing quick filters."""
+
+    items: list[QuickFilterSummary] = Field(
+        default_factory=list, description="Filtros rápidos disponíveis"
+    )
+    total: int = Field(..., ge=0, description="Quantidade de filtros")
+
+
+class QuickFilterResponse(QuickFilterSummary):
+    """A quick filter with its materialized results."""
+
+    sql: str = Field(..., description="Query SQL do filtro")
+    refresh_duration_ms: int | None = Field(
+        default=None, ge=0, description="Duração da última atualização em ms"
+    )
+    rows: list[dict[str, Any]] = Field(
+        default_factory=list, description="Amostra dos registros encontrados"
+    )
+    user_keys: list[str] | None = Field(
+        default=None,
+        description="Chaves de todos os usuários (com include_user_keys=true)",
+    )
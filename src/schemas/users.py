@@ -0,0 +1,147 @@
+"""Schemas for user-centric endpoints."""
+
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel, Field, model_validator
+
+from src.schemas.enums import DossierSourceStatus, UserSetOperator
+
+
+class DossierSourceResult(BaseModel):
+    """Outcome of the lookup of one catalog source in a user dossier."""
+
+    source_id: str = Field(..., description="ID da fonte (db_name.table_name)")
+    user_key: str = Field(..., description="Coluna de usuário usada na busca")
+    status: DossierSourceStatus = Field(..., description="Resultado da busca")
+    document_count: int = Field(
+        default=0, ge=0, description="Quantidade de documentos retornados"
+    )
+    truncated: bool = Field(
+        default=False,
+        description="Se a fonte tem mais documentos do que o limite retornado",
+    )
+    elapsed_ms: int = Field(..., ge=0, description="Tempo da busca em ms")
+    error: str | None = Field(default=None, description="Mensagem de erro")
+
+
+class UserDossierResponse(BaseModel):
+    """Every document of one user across the catalog sources."""
+
+    consumer_id: str = Field(..., description="Identificador do usuário")
+    documents: dict[str, list[dict[str, Any]]] = Field(
+        default_factory=dict,
+        description="Documentos do usuário por fonte (somente fontes com dados)",
+    )
+    sources: list[DossierSourceResult] = Field(
+        default_factory=list, description="Resultado da busca em cada fonte"
+    )
+    is_partial: bool = Field(
+        default=False,
+        description="Se alguma fonte falhou ou excedeu o tempo limite",
+    )
+    cached: bool = Field(default=False, description="Se o dossiê veio do cache")
+    execution_time_ms: int = Field(..., ge=0, description="Tempo de execução em ms")
+
+
+class UserSetTerm(BaseModel):
+    """Users of a source, optionally restricted to a column's values."""
+
+    source: str = Field(
+        ...,
+        pattern=r"^[^.]+\.[^.]+$",
+        description="ID da fonte (db_name.table_name)",
+    )
+    column: str | None = Field(
+        default=None,
+        description="Coluna enumerável (ausente: todos os usuários da fonte)",
+    )
+    values: list[str | int | float | bool] | None = Field(
+        default=None,
+        min_length=1,
+        description="Valores aceitos na coluna (qualquer um deles)",
+    )
+
+    @model_validator(mode="after")
+    def validate_column_values(self) -> "UserSetTerm":
+        """Ensure column and values are given together."""
+        if (self.column is None) != (self.values is None):
+            raise ValueError("column e values devem ser informados juntos")
+        return self
+
+
+class UserSetExpression(BaseModel):
+    """Set operation over the users matched by its operands."""
+
+    operator: UserSetOperator = Field(..., description="Operação entre os conjuntos")
+    operands: list["UserSetTerm | UserSetExpression"] = Field(
+        ...,
+        min_length=1,
+        description="Operandos (andnot: o primeiro menos os demais)",
+    )
+
+
+class UserSetQueryRequest(BaseModel):
+    """Request to resolve a user set from the bitmap index."""
+
+    expression: UserSetExpression | UserSetTerm = Field(
+        ..., description="Expressão sobre os predicados indexados"
+    )
+    limit: int = Field(
+        default=10, ge=0, le=1000, description="Quantidade de registros a retornar"
+    )
+    source: str | None = Field(
+        default=None,
+        pattern=r"^[^.]+\.[^.]+$",
+        description="Fonte dos registros retornados (padrão: primeira da expressão)",
+    )
+
+
+class UserSetQueryResponse(BaseModel):
+    """Users matched by a user set expression, with a few of their rows."""
+
+    user_count: int = Field(..., ge=0, description="Usuários encontrados")
+    user_keys: list[str] = Field(
+        default_factory=list, description="Chaves dos usuários retornados"
+    )
+    source: str = Field(..., description="Fonte dos registros retornados")
+    rows: list[dict[str, Any]] = Field(
+        default_factory=list, description="Registros dos usuários retornados"
+    )
+    index_refreshed_at: datetime | None = Field(
+        default=None, description="Momento da última atualização do índice"
+    )
+    execution_time_ms: int = Field(..., ge=0, description="Tempo de execução em ms")
+
+
+class SourceBitmapStats(BaseModel):
+    """Bitmap index statistics of one source."""
+
+    source_id: str = Field(..., description="ID da fonte (db_name.table_name)")
+    user_key: str = Field(..., description="Coluna de usuário da fonte")
+    columns: list[str] = Field(default_factory=list, description="Colunas indexadas")
+    predicates: int = Field(..., ge=0, description="Bitmaps (coluna, valor)")
+    users: int = Field(..., ge=0, description="Usuários presentes na fonte")
+    documents_scanned: int = Field(..., ge=0, description="Documentos lidos")
+    bitmap_bytes: int = Field(..., ge=0, description="Memória dos bitmaps em bytes")
+    built_at: datetime = Field(..., description="Momento da última reconstrução")
+    refreshed_at: datetime = Field(..., description="Momento da última atualização")
+
+
+class UserBitmapIndexStats(BaseModel):
+    """Memory usage and freshness of the user bitmap index."""
+
+    ready: bool = Field(..., description="Se o índice já foi construído")
+    users: int = Field(..., ge=0, description="Usuários no dicionário de chaves")
+    predicates: int = Field(..., ge=0, description="Total de bitmaps")
+    bitmap_bytes: int = Field(..., ge=0, description="Memória dos bitmaps em bytes")
+    dictionary_bytes: int = Field(
+        ..., ge=0, description="Memória estimada do dicionário de chaves em bytes"
+    )
+    refresh_count: int = Field(..., ge=0, description="Atualizações executadas")
+    last_refresh_ms: int | None = Field(
+        default=None, ge=0, description="Duração da última atualização em ms"
+    )
+    sources: list[SourceBitmapStats] = Field(
+        default_factory=list, description="Estatísticas por fonte"
+    )
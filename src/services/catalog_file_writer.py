@@ -7,6 +7,7 @@ from typing import Any
 import structlog
 import yaml
 
+from src.repositories.catalog.yaml_io import file_digest, write_text_atomic
 from src.schemas.catalog_yaml import (
     CatalogIndex,
     IndexEntry,
@@ -120,9 +121,7 @@ class CatalogFileWriter:
             indent=2,
         )
 
-        with file_path.open("w", encoding="utf-8") as f:
-            f.write(self.YAML_HEADER)
-            f.write(yaml_content)
+        write_text_atomic(file_path, self.YAML_HEADER + yaml_content)
 
         log.info("Source written successfully", file_path=str(file_path))
         return file_path
@@ -131,7 +130,8 @@ class CatalogFileWriter:
         """Update the catalog index with source information.
 
         If the source already exists in the index, its entry is updated.
-        If the source is new, it is added to the index.
+        If the source is new, it is added to the index. The entry carries
+        the source summary and the hash of the source file, if written.
 
         Args:
             source: Source metadata that was written.
@@ -159,45 +159,31 @@ class CatalogFileWriter:
                 sources=[],
             )
 
-        # Create new entry for the source
-        new_entry = IndexEntry(
-            db_name=source.db_name,
-            table_name=source.table_name,
-            last_extracted=source.extracted_at,
+        # Create new entry for the source, with its summary
+        source_path = self._get_source_file_path(source.db_name, source.table_name)
+        new_entry = IndexEntry.for_source(
+            source,
             file_path=f"sources/{source.db_name}/{source.table_name}.yaml",
+            content_hash=file_digest(source_path) if source_path.exists() else None,
         )
 
-        # Find and update or add the entry
-        existing_entry = index.find_source(source.db_name, source.table_name)
-        if existing_entry is not None:
-            # Replace existing entry
-            index.sources = [
-                s
-                for s in index.sources
-                if not (
-                    s.db_name == source.db_name and s.table_name == source.table_name
-                )
-            ]
-
-        index.sources.append(new_entry)
+        # Replace the existing entry or add a new one
+        index.upsert_source(new_entry)
 
         # Update generated_at timestamp
-        index = CatalogIndex(
-            version=index.version,
-            generated_at=datetime.now(tz=UTC),
-            sources=index.sources,
-        )
+        index.generated_at = datetime.now(tz=UTC)
 
         # Write updated index
-        with index_path.open("w", encoding="utf-8") as f:
+        write_text_atomic(
+            index_path,
             yaml.dump(
                 index.to_yaml_dict(),
-                f,
                 default_flow_style=False,
                 allow_unicode=True,
                 sort_keys=False,
                 indent=2,
-            )
+            ),
+        )
 
         log.info("Index updated successfully", source_count=len(index.sources))
         return index_path
@@ -14,6 +14,9 @@ from src.services.schema_extraction import SchemaAnalyzer, SchemaExtractor
 
 logger = structlog.get_logger(__name__)
 
+# Column paths that identify a user across sources, in order of preference
+USER_KEY_CANDIDATES = ("consumerId", "consumer_id")
+
 
 class CatalogYamlExtractor:
     """Service for extracting schema from external sources and writing to YAML files.
@@ -109,6 +112,7 @@ class CatalogYamlExtractor:
             table_name=table_name,
             document_count=len(documents),
             extracted_at=datetime.now(tz=UTC),
+            user_key=self._detect_user_key(columns),
             columns=columns,
         )
 
@@ -136,6 +140,21 @@ class CatalogYamlExtractor:
             "file_path": str(file_path),
         }
 
+    def _detect_user_key(self, columns: list[ColumnMetadataYaml]) -> str | None:
+        """Detect the column that identifies the user in a source.
+
+        Args:
+            columns: Extracted columns of the source.
+
+        Returns:
+            The first user key candidate present in the columns, or None.
+        """
+        paths = {column.path for column in columns}
+        for candidate in USER_KEY_CANDIDATES:
+            if candidate in paths:
+                return candidate
+        return None
+
     def _convert_to_columns(
         self, analyzed_schema: dict[str, dict[str, Any]]
     ) -> list[ColumnMetadataYaml]:
@@ -164,6 +183,7 @@ class CatalogYamlExtractor:
                 path=path,
                 name=column_name,
                 type=type_value,
+                subtype=field_info.get("inferred_subtype"),
                 required=field_info["is_required"],
                 nullable=field_info["is_nullable"],
                 enumerable=field_info["is_enumerable"],
@@ -5,6 +5,7 @@ from datetime import UTC, datetime
 from src.config import get_settings
 from src.core.database import get_db_manager
 from src.core.logging import get_logger
+from src.dependencies.catalog import get_catalog_repository
 from src.main import get_uptime_seconds
 from src.schemas.enums import CheckStatus, HealthStatus
 from src.schemas.health import DependencyCheck, HealthCheckResponse
@@ -104,6 +105,10 @@ async def is_ready() -> tuple[bool, str | None]:
     Returns:
         Tuple of (is_ready, reason_if_not_ready).
     """
+    catalog_warming_up = not get_catalog_repository().is_warmed_up
+    if get_settings().catalog_warm_up_enabled and catalog_warming_up:
+        return False, "Catalog warm-up in progress"
+
     health = await get_health_check()
 
     if health.status == HealthStatus.UNHEALTHY:
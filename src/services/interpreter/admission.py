@@ -0,0 +1,269 @@
+"""Admission control for query execution against external data sources.
+
+Every execution must be admitted before it touches MongoDB. Admission
+enforces two bulkheads:
+
+- a global cap on in-flight executions, shared by all sources;
+- a per-source cap, so one busy collection cannot take every slot.
+
+Executions that cannot start right away wait in a small priority queue
+(interactive requests ahead of batch and export jobs, FIFO within a
+priority). When the queue is full the request is rejected at once; when
+the wait exceeds the queue timeout it is rejected as well, so callers get
+a fast error instead of piling up.
+"""
+
+import asyncio
+import itertools
+import math
+import time
+from collections import Counter
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+
+import structlog
+
+from src.config import get_settings
+from src.schemas.interpreter import AdmissionStatsResponse
+
+logger = structlog.get_logger(__name__)
+
+
+class ExecutionPriority(IntEnum):
+    """Queue priority of an execution (lower runs first)."""
+
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+class AdmissionRejectedError(Exception):
+    """Raised when an execution is not admitted."""
+
+    def __init__(self, code: str, message: str, retry_after_seconds: int) -> None:
+        """Initialize the exception.
+
+        Args:
+            code: QUERY_QUEUE_FULL or QUERY_QUEUE_TIMEOUT.
+            message: Human-readable error message.
+            retry_after_seconds: Suggested delay before retrying.
+        """
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.retry_after_seconds = retry_after_seconds
+
+
+@dataclass(order=True)
+class _Waiter:
+    """A queued execution, ordered by priority then arrival."""
+
+    priority: int
+    sequence: int
+    sources: tuple[str, ...] = field(compare=False)
+    future: asyncio.Future[None] = field(compare=False)
+
+
+class AdmissionController:
+    """Global and per-source bulkheads with a priority wait queue."""
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        source_max_in_flight: int,
+        max_queue_size: int,
+        queue_timeout_seconds: float,
+    ) -> None:
+        """Initialize the controller.
+
+        Args:
+            max_in_flight: Maximum executions running at once.
+            source_max_in_flight: Maximum executions running at once per
+                source.
+            max_queue_size: Maximum executions waiting for a slot.
+            queue_timeout_seconds: Maximum time an execution waits.
+        """
+        self._max_in_flight = max_in_flight
+        self._source_max_in_flight = source_max_in_flight
+        self._max_queue_size = max_queue_size
+        self._queue_timeout = queue_timeout_seconds
+
+        self._in_flight = 0
+        self._by_source: Counter[str] = Counter()
+        self._queue: list[_Waiter] = []
+        self._sequence = itertools.count()
+
+        self._admitted = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._wait_seconds = 0.0
+
+    def _fits(self, sources: tuple[str, ...]) -> bool:
+        """Check whether an execution over the sources can start now."""
+        if self._in_flight >= self._max_in_flight:
+            return False
+        return all(
+            self._by_source[source] < self._source_max_in_flight for source in sources
+        )
+
+    def _dispatch(self) -> None:
+        """Start queued executions that fit, in priority order.
+
+        A waiter blocked only by its own sources does not hold back
+        waiters for other sources behind it.
+        """
+        for waiter in sorted(self._queue):
+            if waiter.future.done():
+                self._queue.remove(waiter)
+            elif self._fits(waiter.sources):
+                self._queue.remove(waiter)
+                self._in_flight += 1
+                self._by_source.update(waiter.sources)
+                waiter.future.set_result(None)
+            elif self._in_flight >= self._max_in_flight:
+                break
+
+    def _release(self, sources: tuple[str, ...]) -> None:
+        self._in_flight -= 1
+        self._by_source.subtract(sources)
+        for source in sources:
+            if self._by_source[source] <= 0:
+                del self._by_source[source]
+        self._dispatch()
+
+    def is_saturated(self) -> bool:
+        """Check whether new executions would be rejected as queue full."""
+        return (
+            self._in_flight >= self._max_in_flight
+            and len(self._queue) >= self._max_queue_size
+        )
+
+    @asynccontextmanager
+    async def admit(
+        self,
+        sources: Iterable[str],
+        priority: ExecutionPriority = ExecutionPriority.INTERACTIVE,
+    ) -> AsyncIterator[None]:
+        """Hold an execution slot for the duration of the context.
+
+        Args:
+            sources: Source IDs the execution reads.
+            priority: Queue priority.
+
+        Raises:
+            AdmissionRejectedError: If the queue is full or the wait times
+                out.
+        """
+        source_ids = tuple(sorted(set(sources)))
+        waiter = _Waiter(
+            priority=int(priority),
+            sequence=next(self._sequence),
+            sources=source_ids,
+            future=asyncio.get_running_loop().create_future(),
+        )
+        self._queue.append(waiter)
+        self._dispatch()
+
+        retry_after = max(1, math.ceil(self._queue_timeout))
+        if not waiter.future.done() and len(self._queue) > self._max_queue_size:
+            self._queue.remove(waiter)
+            self._rejected += 1
+            logger.warning(
+                "Query rejected: queue full",
+                sources=source_ids,
+                priority=priority.name,
+                queued=len(self._queue),
+            )
+            raise AdmissionRejectedError(
+                code="QUERY_QUEUE_FULL",
+                message="Muitas queries em execução; tente novamente em instantes",
+                retry_after_seconds=retry_after,
+            )
+
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), self._queue_timeout)
+        except TimeoutError:
+            if not waiter.future.done():
+                waiter.future.cancel()
+                self._queue.remove(waiter)
+                self._timed_out += 1
+                logger.warning(
+                    "Query rejected: queue timeout",
+                    sources=source_ids,
+                    priority=priority.name,
+                    timeout_seconds=self._queue_timeout,
+                )
+                raise AdmissionRejectedError(
+                    code="QUERY_QUEUE_TIMEOUT",
+                    message=(
+                        "A query aguardou tempo demais na fila de execução; "
+                        "tente novamente em instantes"
+                    ),
+                    retry_after_seconds=retry_after,
+                ) from None
+        except BaseException:
+            # Caller cancelled while waiting: give the slot back if granted
+            if waiter.future.done() and not waiter.future.cancelled():
+                self._release(source_ids)
+            else:
+                waiter.future.cancel()
+                if waiter in self._queue:
+                    self._queue.remove(waiter)
+            raise
+
+        self._admitted += 1
+        self._wait_seconds += time.perf_counter() - started
+        try:
+            yield
+        finally:
+            self._release(source_ids)
+
+    def stats(self) -> AdmissionStatsResponse:
+        """Get the current admission metrics."""
+        queued_by_priority = {
+            priority.name.lower(): 0 for priority in ExecutionPriority
+        }
+        for waiter in self._queue:
+            queued_by_priority[ExecutionPriority(waiter.priority).name.lower()] += 1
+
+        return AdmissionStatsResponse(
+            in_flight=self._in_flight,
+            max_in_flight=self._max_in_flight,
+            source_max_in_flight=self._source_max_in_flight,
+            in_flight_by_source=dict(self._by_source),
+            queued=len(self._queue),
+            max_queue_size=self._max_queue_size,
+            queued_by_priority=queued_by_priority,
+            admitted_total=self._admitted,
+            rejected_total=self._rejected,
+            timed_out_total=self._timed_out,
+            avg_wait_ms=(
+                round(self._wait_seconds * 1000 / self._admitted, 3)
+                if self._admitted
+                else 0.0
+            ),
+        )
+
+
+# Global controller shared by every QueryExecutor of the process
+_admission_controller: AdmissionController | None = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """Get the shared admission controller, creating it on first use.
+
+    Returns:
+        The process-wide AdmissionController.
+    """
+    global _admission_controller
+    if _admission_controller is None:
+        settings = get_settings()
+        _admission_controller = AdmissionController(
+            max_in_flight=settings.query_max_in_flight,
+            source_max_in_flight=settings.query_source_max_in_flight,
+            max_queue_size=settings.query_queue_max_size,
+            queue_timeout_seconds=settings.query_queue_timeout_seconds,
+        )
+    return _admission_controller
@@ -0,0 +1,210 @@
+"""Batch execution of stored queries.
+
+Runs many stored queries concurrently over the shared MongoDB pool, caps
+the number of in-flight queries per data source, and yields each result
+as soon as it completes. Queries in the batch that compile to the same
+plan (and limit) are executed once and their result is shared.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+from uuid import UUID
+
+import structlog
+
+from src.config import get_settings
+from src.schemas.interpreter import BatchQueryResult, ErrorResponse, StoredQuery
+from src.services.interpreter.admission import ExecutionPriority
+from src.services.interpreter.query_executor import QueryExecutionError, QueryExecutor
+from src.services.interpreter.query_plan import compile_sql
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass
+class BatchEntry:
+    """A query of the batch, resolved from its ID.
+
+    Attributes:
+        index: Position of the query in the request.
+        query_id: Requested query ID.
+        stored_query: The stored query, or None if the ID is unknown.
+        limit: Requested row limit.
+    """
+
+    index: int
+    query_id: UUID
+    stored_query: StoredQuery | None
+    limit: int
+
+
+@dataclass
+class _PlanGroup:
+    """Entries that share one compiled plan and limit."""
+
+    stored_query: StoredQuery
+    sources: list[str]
+    entries: list[BatchEntry] = field(default_factory=list)
+
+
+class BatchQueryExecutor:
+    """Executes a batch of stored queries with per-source concurrency caps."""
+
+    def __init__(
+        self,
+        executor: QueryExecutor,
+        source_concurrency: int | None = None,
+    ) -> None:
+        """Initialize the batch executor.
+
+        Args:
+            executor: Executor used for each distinct plan.
+            source_concurrency: Maximum concurrent queries per data source
+                (defaults to settings).
+        """
+        self._executor = executor
+        self._source_concurrency = (
+            source_concurrency or get_settings().query_batch_source_concurrency
+        )
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    async def stream(
+        self, entries: list[BatchEntry]
+    ) -> AsyncIterator[BatchQueryResult]:
+        """Execute the batch, yielding results in completion order.
+
+        Unknown and blocked queries are reported first; every other entry
+        yields exactly one result or error.
+
+        Args:
+            entries: The queries of the batch.
+
+        Yields:
+            One BatchQueryResult per entry.
+        """
+        groups: dict[str, _PlanGroup] = {}
+
+        for entry in entries:
+            stored_query = entry.stored_query
+            if stored_query is None:
+                yield self._error(
+                    entry,
+                    ErrorResponse(
+                        code="QUERY_NOT_FOUND",
+                        message=f"Query {entry.query_id} não encontrada",
+                        suggestions=[
+                            "Verifique se o ID da query está correto",
+                            "Use POST /query/interpret para gerar uma nova query",
+                        ],
+                    ),
+                )
+                continue
+
+            if not stored_query.is_valid:
+                yield self._error(
+                    entry,
+                    ErrorResponse(
+                        code="QUERY_BLOCKED",
+                        message="Esta query foi bloqueada por questões de segurança",
+                        details={"validation_errors": stored_query.validation_errors},
+                    ),
+                )
+                continue
+
+            plan = compile_sql(stored_query.sql)
+            plan_key = plan.fingerprint if plan else stored_query.sql
+            group_key = f"{plan_key}:{entry.limit}"
+            group = groups.get(group_key)
+            if group is None:
+                group = _PlanGroup(
+                    stored_query=stored_query,
+                    sources=sorted(set(plan.tables)) if plan else [],
+                )
+                groups[group_key] = group
+            group.entries.append(entry)
+
+        logger.info(
+            "Executing query batch",
+            batch_size=len(entries),
+            distinct_plans=len(groups),
+        )
+
+        tasks = [asyncio.create_task(self._run_group(g)) for g in groups.values()]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                for result in await next_done:
+                    yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _run_group(self, group: _PlanGroup) -> list[BatchQueryResult]:
+        """Execute a plan once and fan the result out to its entries.
+
+        Args:
+            group: Entries sharing the same plan and limit.
+
+        Returns:
+            One BatchQueryResult per entry of the group.
+        """
+        leader = group.entries[0]
+
+        try:
+            async with AsyncExitStack() as stack:
+                # Acquire in sorted order so joins cannot deadlock each other
+                for source_id in group.sources:
+                    await stack.enter_async_context(self._semaphore(source_id))
+                result = await self._executor.execute_query(
+                    group.stored_query,
+                    leader.limit,
+                    priority=ExecutionPriority.BATCH,
+                )
+        except QueryExecutionError as e:
+            error = ErrorResponse(
+                code=e.code,
+                message=e.message,
+                details=e.details,
+                suggestions=e.suggestions,
+            )
+            return [self._error(entry, error) for entry in group.entries]
+        except Exception as e:
+            logger.error(
+                "Batch query failed", query_id=str(leader.query_id), error=str(e)
+            )
+            error = ErrorResponse(
+                code="EXECUTION_ERROR",
+                message=f"Erro na execução da query: {str(e)}",
+            )
+            return [self._error(entry, error) for entry in group.entries]
+
+        return [
+            BatchQueryResult(
+                index=entry.index,
+                query_id=entry.query_id,
+                result=result.model_copy(update={"query_id": entry.query_id}),
+                deduplicated=entry is not leader,
+            )
+            for entry in group.entries
+        ]
+
+    def _semaphore(self, source_id: str) -> asyncio.Semaphore:
+        """Get the concurrency semaphore of a data source.
+
+        Args:
+            source_id: Source identifier (db_name.table_name).
+
+        Returns:
+            The semaphore shared by all queries reading the source.
+        """
+        semaphore = self._semaphores.get(source_id)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self._source_concurrency)
+            self._semaphores[source_id] = semaphore
+        return semaphore
+
+    @staticmethod
+    def _error(entry: BatchEntry, error: ErrorResponse) -> BatchQueryResult:
+        """Build the error line of an entry."""
+        return BatchQueryResult(index=entry.index, query_id=entry.query_id, error=error)
@@ -4,16 +4,45 @@ This module handles the execution of validated SQL queries against
 external MongoDB data sources via the SQL layer.
 """
 
+import asyncio
+import random
 import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
+from datetime import UTC, datetime
 from typing import Any
 
 import structlog
+from bson import ObjectId, decode_all
 from motor.motor_asyncio import AsyncIOMotorClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.config import get_settings
-from src.schemas.interpreter import QueryResultResponse, StoredQuery
+from src.core.mongo import RESULT_CODEC_OPTIONS, get_mongo_client
+from src.dependencies.catalog import get_catalog_repository
+from src.repositories.catalog.cache import AsyncTTLCache
+from src.repositories.catalog.file_repository import CatalogFileRepository
+from src.schemas.enums import InferredSubtype
+from src.schemas.interpreter import (
+    QueryCountResponse,
+    QueryResultResponse,
+    QueryRevalidationResponse,
+    StoredQuery,
+)
+from src.services.interpreter.admission import (
+    AdmissionController,
+    AdmissionRejectedError,
+    ExecutionPriority,
+    get_admission_controller,
+)
+from src.services.interpreter.query_plan import (
+    CollectionPlan,
+    Predicate,
+    QueryPlan,
+    build_filter,
+    compile_sql,
+)
 from src.services.interpreter.suggestion_service import get_suggestion_service
 from src.services.interpreter.validator import get_sql_validator
 
@@ -29,6 +58,105 @@ class NoResultsInfo:
     suggestions: list[str]
 
 
+@dataclass
+class RelaxationAnalysis:
+    """Match counts of a collection filter and its leave-one-out relaxations.
+
+    Attributes:
+        source_id: Source analysed (db_name.collection_name).
+        unit: What was counted ("usuários" or "registros").
+        matches: Matches of the full filter.
+        relaxed: Matches with each predicate removed, in predicate order.
+    """
+
+    source_id: str
+    unit: str
+    matches: int
+    relaxed: list[tuple[Predicate, int]]
+
+
+@dataclass
+class JoinKeys:
+    """Join keys resolved across the sides of a multi-collection plan.
+
+    Attributes:
+        join_keys: Join key column path of each side, in plan order.
+        build_index: Index of the side used as the hash build side.
+        raw_values: Per side index, normalized key to raw key value.
+        surviving: Normalized keys present in every side.
+    """
+
+    join_keys: list[str]
+    build_index: int
+    raw_values: dict[int, dict[str, Any]]
+    surviving: list[str]
+
+
+@dataclass(frozen=True)
+class CountResult:
+    """Outcome of a count-only execution.
+
+    Attributes:
+        count: Matching documents (distinct users for joins).
+        is_estimated: Taken from collection metadata (unfiltered queries).
+        is_bounded: Counting stopped at the requested maximum; the real
+            count may be higher.
+    """
+
+    count: int
+    is_estimated: bool = False
+    is_bounded: bool = False
+
+
+@dataclass(frozen=True)
+class PlanMaterialization:
+    """Users matched by a plan plus a sample of its rows.
+
+    Attributes:
+        user_keys: Distinct user keys (as strings) matching the plan, empty
+            when the source declares no user key.
+        rows: Random sample of the matching rows.
+    """
+
+    user_keys: list[str]
+    rows: list[dict[str, Any]]
+
+
+# Count results shared by every QueryExecutor, keyed by compiled plan
+_count_cache: AsyncTTLCache[CountResult] | None = None
+
+
+def get_count_cache() -> AsyncTTLCache[CountResult]:
+    """Get the shared count cache, creating it on first use."""
+    global _count_cache
+    if _count_cache is None:
+        settings = get_settings()
+        _count_cache = AsyncTTLCache(
+            ttl_seconds=settings.query_count_cache_ttl_seconds,
+            max_entries=settings.query_count_cache_max_entries,
+        )
+    return _count_cache
+
+
+def _id_candidates(ids: list[str]) -> list[Any]:
+    """Get the _id values to match for previously returned IDs.
+
+    Results render ObjectIds as hex strings, so 24-hex IDs are matched both
+    as ObjectId and as the plain string.
+    """
+    candidates: list[Any] = []
+    for value in dict.fromkeys(ids):
+        candidates.append(value)
+        if len(value) == 24 and ObjectId.is_valid(value):
+            candidates.append(ObjectId(value))
+    return candidates
+
+
+def _format_count(count: int) -> str:
+    """Format a count with Brazilian thousands separators (1.240)."""
+    return f"{count:,}".replace(",", ".")
+
+
 class QueryExecutionError(Exception):
     """Exception raised during query execution with details."""
 
@@ -54,35 +182,77 @@ class QueryExecutionError(Exception):
         self.suggestions = suggestions or []
 
 
+def get_path_value(document: dict[str, Any], path: str) -> Any:
+    """Read a dot-notation path from a (possibly nested) document.
+
+    Args:
+        document: The document to read from.
+        path: Field path in dot notation.
+
+    Returns:
+        The value at the path, or None if any segment is missing.
+    """
+    value: Any = document
+    for segment in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(segment)
+    return value
+
+
 class QueryExecutor:
     """Executes validated SQL queries against external data sources."""
 
+    # Largest build-side key set pushed down as $in to the probe side of a join
+    JOIN_PUSHDOWN_MAX_KEYS = 10_000
+
+    # Number of random _id range seeks used to sample very large collections
+    SAMPLE_SEEK_COUNT = 8
+
+    # Filter-removal suggestions listed per collection for empty results
+    NO_RESULTS_MAX_SUGGESTIONS = 3
+
     def __init__(
         self,
         session: AsyncSession,
         mongo_client: AsyncIOMotorClient | None = None,  # type: ignore[type-arg]
+        catalog_repository: CatalogFileRepository | None = None,
+        admission: AdmissionController | None = None,
     ) -> None:
         """Initialize the query executor.
 
         Args:
             session: Database session for audit logging.
-            mongo_client: Optional MongoDB client (created if not provided).
+            mongo_client: Optional MongoDB client (defaults to the shared
+                application client).
+            catalog_repository: Optional catalog repository used to resolve
+                join keys (defaults to the application repository).
+            admission: Optional admission controller (defaults to the
+                process-wide controller).
         """
         self._session = session
         self._settings = get_settings()
         self._sql_validator = get_sql_validator()
         self._suggestion_service = get_suggestion_service(session)
+        self._catalog_repository = catalog_repository or get_catalog_repository()
+        self._admission = admission or get_admission_controller()
+        # The suggestion service shares the session, which must not be used
+        # by concurrent executions (e.g. queries of a batch)
+        self._suggestion_lock = asyncio.Lock()
 
         if mongo_client is not None:
             self._mongo_client = mongo_client
         else:
-            self._mongo_client = AsyncIOMotorClient(self._settings.mongodb_uri)
+            self._mongo_client = get_mongo_client()
 
     async def execute_query(
         self,
         stored_query: StoredQuery,
         limit: int | None = None,
         interpreted_filters: list[dict[str, Any]] | None = None,
+        random_sample: bool = False,
+        priority: ExecutionPriority = ExecutionPriority.INTERACTIVE,
+        distinct_users: bool = False,
     ) -> QueryResultResponse:
         """Execute a stored query and return results.
 
@@ -90,79 +260,66 @@ class QueryExecutor:
             stored_query: The query to execute.
             limit: Optional limit override (default from settings).
             interpreted_filters: Original filters for no-results suggestions.
+            random_sample: Return a uniform random sample of the matching
+                documents instead of the first ones in natural order.
+            priority: Admission queue priority.
+            distinct_users: Return one document per user (catalog user key),
+                so the limit applies to distinct users.
 
         Returns:
             QueryResultResponse with query results.
 
         Raises:
-            QueryExecutionError: If the query is invalid, blocked, or fails.
+            QueryExecutionError: If the query is invalid, blocked, not
+            admitted, or fails.
         """
         log = logger.bind(query_id=str(stored_query.id))
         log.info("Starting query execution", sql_preview=stored_query.sql[:100])
 
-        # Validate query is safe
-        if not stored_query.is_valid:
-            log.warning(
-                "Attempted to execute invalid query",
-                validation_errors=stored_query.validation_errors,
-            )
-            raise QueryExecutionError(
-                code="INVALID_QUERY",
-                message="Query não é válida para execução",
-                details={"validation_errors": stored_query.validation_errors},
-                suggestions=[
-                    "A query foi marcada como inválida durante a interpretação.",
-                    "Tente reformular seu prompt.",
-                ],
-            )
-
-        validation = self._sql_validator.validate(stored_query.sql)
-        if not validation.is_valid:
-            log.warning(
-                "SQL command blocked",
-                blocked_command=validation.blocked_command,
-            )
-            raise QueryExecutionError(
-                code="SQL_COMMAND_BLOCKED",
-                message=validation.error_message
-                or f"Comando bloqueado: {validation.blocked_command}",
-                details={"blocked_command": validation.blocked_command},
-                suggestions=[
-                    "Reformule seu pedido para buscar dados em vez de modificá-los.",
-                    "Use termos como 'buscar', 'encontrar', 'listar'.",
-                    "Apenas consultas SELECT são permitidas.",
-                ],
-            )
+        self.validate_query(stored_query)
 
         # Determine effective limit
         effective_limit = self._get_effective_limit(limit)
-        log.debug("Executing query", effective_limit=effective_limit)
+        log.debug(
+            "Executing query",
+            effective_limit=effective_limit,
+            random_sample=random_sample,
+            distinct_users=distinct_users,
+        )
 
-        # Execute the query
-        start_time = time.perf_counter()
+        # Execute the query once admitted (queue wait is not timed)
         try:
-            rows = await self._execute_sql(stored_query.sql, effective_limit)
-            execution_time_ms = int((time.perf_counter() - start_time) * 1000)
+            async with self.admit(stored_query, priority):
+                start_time = time.perf_counter()
+                rows = await self._execute_sql(
+                    stored_query.sql, effective_limit, random_sample, distinct_users
+                )
+                execution_time_ms = int((time.perf_counter() - start_time) * 1000)
+
+                # Explain empty results while still holding the slot
+                no_results_info = (
+                    await self._generate_no_results_info(
+                        stored_query.sql, interpreted_filters
+                    )
+                    if not rows
+                    else None
+                )
 
             # Handle no results case with suggestions
-            if len(rows) == 0:
-                no_results_info = await self._generate_no_results_info(
-                    stored_query.sql, interpreted_filters
-                )
+            if no_results_info is not None:
                 log.info(
                     "Query returned no results",
                     execution_time_ms=execution_time_ms,
                     suggestions_count=len(no_results_info.suggestions),
                 )
 
-                # Return empty result with suggestions in a custom field
-                # The API layer can extract and return these suggestions
                 return QueryResultResponse(
                     query_id=stored_query.id,
                     rows=[],
                     row_count=0,
                     is_partial=False,
                     execution_time_ms=execution_time_ms,
+                    suggestions=no_results_info.suggestions,
                 )
 
             # Determine if results are partial
@@ -175,7 +332,8 @@ class QueryExecutor:
                 is_partial=is_partial,
             )
 
-            return QueryResultResponse(
+            # Rows come JSON-ready from the decoder: skip re-validating them
+            return QueryResultResponse.model_construct(
                 query_id=stored_query.id,
                 rows=rows,
                 row_count=len(rows),
@@ -199,22 +357,429 @@ class QueryExecutor:
                 ],
             ) from e
 
+    async def count_query(
+        self,
+        stored_query: StoredQuery,
+        max_count: int | None = None,
+    ) -> QueryCountResponse:
+        """Count the matches of a stored query without fetching rows.
+
+        Filtered single-collection plans run countDocuments (stopping at
+        max_count when given); unfiltered ones use the collection's
+        estimated count. Joins count the distinct users present in every
+        side. Results are cached per compiled plan and bound.
+
+        Args:
+            stored_query: The query to count.
+            max_count: Optional bound: stop counting once reached.
+
+        Returns:
+            QueryCountResponse with the count and how it was obtained.
+
+        Raises:
+            QueryExecutionError: If the query is invalid, blocked, not
+                admitted, or fails.
+        """
+        self.validate_query(stored_query)
+        plan = await self.compile_plan(stored_query.sql)
+        start_time = time.perf_counter()
+        loaded = False
+
+        async def load(compiled: QueryPlan) -> CountResult:
+            nonlocal loaded
+            loaded = True
+            async with self.admit(stored_query):
+                return await self._count_plan(compiled, max_count)
+
+        try:
+            if plan is None:
+                result = CountResult(count=0)
+            else:
+                result = await get_count_cache().get_or_load(
+                    f"{plan.fingerprint}:{max_count or 0}", lambda: load(plan)
+                )
+        except QueryExecutionError:
+            raise
+        except Exception as e:
+            logger.error(
+                "Query count failed", query_id=str(stored_query.id), error=str(e)
+            )
+            raise QueryExecutionError(
+                code="EXECUTION_ERROR",
+                message=f"Erro na contagem da query: {str(e)}",
+                details={"original_error": str(e)},
+                suggestions=[
+                    "Verifique se a conexão com o banco de dados está funcionando.",
+                    "Tente novamente em alguns segundos.",
+                ],
+            ) from e
+
+        return QueryCountResponse(
+            query_id=stored_query.id,
+            count=result.count,
+            is_estimated=result.is_estimated,
+            is_bounded=result.is_bounded,
+            cached=plan is not None and not loaded,
+            execution_time_ms=int((time.perf_counter() - start_time) * 1000),
+        )
+
+    async def revalidate_ids(
+        self, stored_query: StoredQuery, ids: list[str]
+    ) -> QueryRevalidationResponse:
+        """Check which previously returned documents still match a query.
+
+        Each source gets one $match on the compiled filter restricted to
+        the given _ids, instead of re-running the whole search. For joins,
+        a document stays valid only if its user still matches every other
+        side as well.
+
+        Args:
+            stored_query: The query the documents were returned by.
+            ids: _id values of the previously returned documents.
+
+        Returns:
+            QueryRevalidationResponse splitting the IDs into valid and
+            invalid, in request order.
+
+        Raises:
+            QueryExecutionError: If the query is invalid, blocked, not
+                admitted, or fails.
+        """
+        self.validate_query(stored_query)
+        plan = await self.compile_plan(stored_query.sql)
+        start_time = time.perf_counter()
+
+        try:
+            valid: set[str] = set()
+            if plan is not None:
+                async with self.admit(stored_query):
+                    valid = await self._revalidate_plan(plan, ids)
+        except QueryExecutionError:
+            raise
+        except Exception as e:
+            logger.error(
+                "Query revalidation failed",
+                query_id=str(stored_query.id),
+                error=str(e),
+            )
+            raise QueryExecutionError(
+                code="EXECUTION_ERROR",
+                message=f"Erro na revalidação dos registros: {str(e)}",
+                details={"original_error": str(e)},
+                suggestions=[
+                    "Verifique se a conexão com o banco de dados está funcionando.",
+                    "Tente novamente em alguns segundos.",
+                ],
+            ) from e
+
+        requested = list(dict.fromkeys(ids))
+        logger.info(
+            "Query revalidated",
+            query_id=str(stored_query.id),
+            checked=len(requested),
+            valid=len(valid),
+        )
+        return QueryRevalidationResponse(
+            query_id=stored_query.id,
+            valid_ids=[value for value in requested if value in valid],
+            invalid_ids=[value for value in requested if value not in valid],
+            execution_time_ms=int((time.perf_counter() - start_time) * 1000),
+        )
+
+    async def _revalidate_plan(self, plan: QueryPlan, ids: list[str]) -> set[str]:
+        """Get the IDs that still match a compiled plan.
+
+        Args:
+            plan: The compiled plan.
+            ids: _id values to check.
+
+        Returns:
+            The IDs (as strings) that still match.
+        """
+        by_id = {"_id": {"$in": _id_candidates(ids)}}
+        sides = plan.collections
+        join_keys = (
+            [await self._resolve_join_key(side) for side in sides]
+            if plan.is_join
+            else [None]
+        )
+
+        matched = await asyncio.gather(
+            *(
+                self._find_rows(
+                    side,
+                    {"$and": [side.filter, by_id]} if side.filter else by_id,
+                    projection={"_id": 1, **({key: 1} if key else {})},
+                )
+                for side, key in zip(sides, join_keys, strict=True)
+            )
+        )
+        if not plan.is_join:
+            return {str(document["_id"]) for document in matched[0]}
+
+        # Users of the matched documents must still be present in every side
+        users: dict[str, Any] = {}
+        for documents, key in zip(matched, join_keys, strict=True):
+            for document in documents:
+                raw = get_path_value(document, key or "")
+                if raw is not None:
+                    users.setdefault(str(raw), raw)
+        if not users:
+            return set()
+
+        probes = await asyncio.gather(
+            *(
+                self._collect_join_keys(side, key or "", users)
+                for side, key in zip(sides, join_keys, strict=True)
+            )
+        )
+        surviving = set(users).intersection(*probes)
+
+        return {
+            str(document["_id"])
+            for documents, key in zip(matched, join_keys, strict=True)
+            for document in documents
+            if str(get_path_value(document, key or "")) in surviving
+        }
+
+    async def materialize(
+        self, stored_query: StoredQuery, plan: QueryPlan, sample_size: int
+    ) -> PlanMaterialization:
+        """Collect every user matching a compiled plan and a sample of rows.
+
+        Runs at batch priority: materializations are background work.
+
+        Args:
+            stored_query: The query the plan was compiled from.
+            plan: The compiled plan.
+            sample_size: Number of rows to sample.
+
+        Returns:
+            PlanMaterialization with the user keys and sampled rows.
+
+        Raises:
+            QueryExecutionError: If the execution is not admitted or a join
+                key cannot be resolved.
+        """
+        async with self.admit(stored_query, ExecutionPriority.BATCH):
+            if plan.is_join:
+                join = await self._join_keys(plan)
+                rows = await self._execute_join(
+                    plan, sample_size, random_sample=True, join=join
+                )
+                return PlanMaterialization(join.surviving, rows)
+
+            user_key = await self._user_key(plan.primary)
+            if user_key is None:
+                rows = await self._sample_rows(plan.primary, sample_size)
+                return PlanMaterialization([], rows)
+
+            keys, rows = await asyncio.gather(
+                self._collect_join_keys(plan.primary, user_key),
+                self._sample_rows(plan.primary, sample_size),
+            )
+            return PlanMaterialization(list(keys), rows)
+
+    async def _count_plan(
+        self, plan: QueryPlan, max_count: int | None = None
+    ) -> CountResult:
+        """Count the matches of a compiled plan.
+
+        Args:
+            plan: The compiled plan.
+            max_count: Optional bound on the count.
+
+        Returns:
+            CountResult for the plan.
+        """
+        if plan.is_join:
+            # Keys must be intersected in full before they can be counted
+            count = len((await self._join_keys(plan)).surviving)
+            if max_count is not None and count >= max_count:
+                return CountResult(count=max_count, is_bounded=True)
+            return CountResult(count=count)
+
+        collection = self._mongo_client[plan.primary.db_name][
+            plan.primary.collection_name
+        ]
+        filter_query = plan.primary.filter
+        if not filter_query:
+            count = await collection.estimated_document_count()
+            is_estimated = True
+        elif max_count is not None:
+            count = await collection.count_documents(filter_query, limit=max_count)
+            is_estimated = False
+        else:
+            count = await collection.count_documents(filter_query)
+            is_estimated = False
+
+        if max_count is not None and count >= max_count:
+            return CountResult(
+                count=max_count, is_estimated=is_estimated, is_bounded=True
+            )
+        return CountResult(count=count, is_estimated=is_estimated)
+
+    @asynccontextmanager
+    async def admit(
+        self,
+        stored_query: StoredQuery,
+        priority: ExecutionPriority = ExecutionPriority.INTERACTIVE,
+    ) -> AsyncIterator[None]:
+        """Hold an execution slot for the sources a query reads.
+
+        Args:
+            stored_query: The query about to run.
+            priority: Admission queue priority.
+
+        Raises:
+            QueryExecutionError: QUERY_QUEUE_FULL or QUERY_QUEUE_TIMEOUT if
+                the query is not admitted.
+        """
+        plan = compile_sql(stored_query.sql)
+        try:
+            async with self._admission.admit(plan.tables if plan else [], priority):
+                yield
+        except AdmissionRejectedError as e:
+            raise QueryExecutionError(
+                code=e.code,
+                message=e.message,
+                details={"retry_after_seconds": e.retry_after_seconds},
+                suggestions=[
+                    f"Tente novamente em {e.retry_after_seconds} segundo(s).",
+                    "Reduza o número de queries simultâneas ou use limites menores.",
+                ],
+            ) from e
+
+    def check_capacity(self) -> None:
+        """Fail fast when the admission queue is already full.
+
+        Used before starting responses that can no longer change their
+        status code once streaming (exports).
+
+        Raises:
+            QueryExecutionError: QUERY_QUEUE_FULL if the queue is full.
+        """
+        if self._admission.is_saturated():
+            raise QueryExecutionError(
+                code="QUERY_QUEUE_FULL",
+                message="Muitas queries em execução; tente novamente em instantes",
+                suggestions=["Tente novamente em alguns segundos."],
+            )
+
+    def validate_query(self, stored_query: StoredQuery) -> None:
+        """Check that a stored query is safe to execute.
+
+        Args:
+            stored_query: The query to check.
+
+        Raises:
+            QueryExecutionError: If the query is invalid or blocked.
+        """
+        log = logger.bind(query_id=str(stored_query.id))
+
+        # Validate query is safe
+        if not stored_query.is_valid:
+            log.warning(
+                "Attempted to execute invalid query",
+                validation_errors=stored_query.validation_errors,
+            )
+            raise QueryExecutionError(
+                code="INVALID_QUERY",
+                message="Query não é válida para execução",
+                details={"validation_errors": stored_query.validation_errors},
+                suggestions=[
+                    "A query foi marcada como inválida durante a interpretação.",
+                    "Tente reformular seu prompt.",
+                ],
+            )
+
+        validation = self._sql_validator.validate(stored_query.sql)
+        if not validation.is_valid:
+            log.warning(
+                "SQL command blocked",
+                blocked_command=validation.blocked_command,
+            )
+            raise QueryExecutionError(
+                code="SQL_COMMAND_BLOCKED",
+                message=validation.error_message
+                or f"Comando bloqueado: {validation.blocked_command}",
+                details={"blocked_command": validation.blocked_command},
+                suggestions=[
+                    "Reformule seu pedido para buscar dados em vez de modificá-los.",
+                    "Use termos como 'buscar', 'encontrar', 'listar'.",
+                    "Apenas consultas SELECT são permitidas.",
+                ],
+            )
+
+    async def stream_batches(
+        self,
+        stored_query: StoredQuery,
+        limit: int,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Stream the rows of a stored query in batches.
+
+        Single-collection plans are read straight from the Motor cursor as
+        raw BSON batches, so at most one batch is held in memory. Joins are
+        resolved first (their size is bounded by the limit) and then yielded
+        in batches.
+
+        Callers must run validate_query beforehand. The stream holds an
+        execution slot (batch priority) while it is being consumed.
+
+        Args:
+            stored_query: The query to execute.
+            limit: Maximum number of rows to stream.
+            batch_size: Rows per yielded batch (and cursor batch size).
+
+        Yields:
+            Lists of at most batch_size rows.
+
+        Raises:
+            QueryExecutionError: If the query is not admitted.
+        """
+        plan = await self.compile_plan(stored_query.sql)
+        if plan is None:
+            logger.warning("Could not parse SQL for MongoDB execution")
+            return
+
+        async with self.admit(stored_query, ExecutionPriority.BATCH):
+            if plan.is_join:
+                rows = await self._execute_join(plan, limit)
+                for start in range(0, len(rows), batch_size):
+                    yield rows[start : start + batch_size]
+                return
+
+            collection = self._mongo_client[plan.primary.db_name][
+                plan.primary.collection_name
+            ]
+            cursor = collection.find_raw_batches(
+                plan.primary.filter,
+                plan.primary.projection,
+                limit=limit,
+                batch_size=batch_size,
+            )
+
+            async for raw_batch in cursor:
+                yield decode_all(raw_batch, RESULT_CODEC_OPTIONS)
+
     async def execute_query_with_no_results_handling(
         self,
         stored_query: StoredQuery,
         limit: int | None = None,
-        interpreted_tables: list[str] | None = None,
+        interpreted_tables: list[str] | None = None,  # noqa: ARG002
         interpreted_filters: list[dict[str, Any]] | None = None,
     ) -> tuple[QueryResultResponse, list[str] | None]:
         """Execute a query and return suggestions if no results.
 
-        This is an enhanced version of execute_query that also returns
-        suggestions when the query returns no results.
+        The suggestions are the ones execute_query already computed for
+        the empty result; no second analysis is run.
 
         Args:
             stored_query: The query to execute.
             limit: Optional limit override.
-            interpreted_tables: Tables from interpretation for suggestions.
+            interpreted_tables: Tables from interpretation (unused; the
+                tables come from the compiled plan).
             interpreted_filters: Filters from interpretation for suggestions.
 
         Returns:
@@ -226,18 +791,10 @@ class QueryExecutor:
             interpreted_filters,
         )
 
-        suggestions: list[str] | None = None
-
         if result.row_count == 0:
-            # Generate no-results suggestions
-            suggestions = (
-                await self._suggestion_service.generate_no_results_suggestions(
-                    interpreted_tables or [],
-                    interpreted_filters or [],
-                )
-            )
+            return result, result.suggestions
 
-        return result, suggestions
+        return result, None
 
     async def _generate_no_results_info(
         self,
@@ -246,6 +803,10 @@ class QueryExecutor:
     ) -> NoResultsInfo:
         """Generate information for no-results scenario.
 
+        Filters compiled from the SQL are explained with one $facet
+        relaxation analysis per collection; the generic suggestion text is
+        only used when there is nothing to relax.
+
         Args:
             sql: The SQL query that returned no results.
             interpreted_filters: The filters applied.
@@ -254,19 +815,20 @@ class QueryExecutor:
             NoResultsInfo with tables, filters, and suggestions.
         """
         # Parse tables from SQL
-        table_info = self._parse_sql_for_mongo(sql)
-        tables_queried = []
-        if table_info:
-            tables_queried.append(
-                f"{table_info['db_name']}.{table_info['collection_name']}"
-            )
+        plan = await self.compile_plan(sql)
+        tables_queried = plan.tables if plan else []
 
         filters = interpreted_filters or []
 
-        # Generate suggestions
-        suggestions = await self._suggestion_service.generate_no_results_suggestions(
-            tables_queried, filters
-        )
+        suggestions = await self._explain_no_results(plan) if plan else []
+
+        if not suggestions:
+            async with self._suggestion_lock:
+                suggestions = (
+                    await self._suggestion_service.generate_no_results_suggestions(
+                        tables_queried, filters
+                    )
+                )
 
         return NoResultsInfo(
             tables_queried=tables_queried,
@@ -274,6 +836,184 @@ class QueryExecutor:
             suggestions=suggestions,
         )
 
+    async def _explain_no_results(self, plan: QueryPlan) -> list[str]:
+        """Build concrete suggestions for a plan that matched nothing.
+
+        Each filtered collection gets one relaxation analysis (run
+        concurrently). Collections that match nothing on their own report
+        which single filter removal brings results back; if every
+        collection matches on its own, the empty result comes from the
+        join itself.
+
+        Args:
+            plan: The compiled plan that returned no rows.
+
+        Returns:
+            Suggestions in Portuguese (empty if no filter was applied).
+        """
+        sides = [side for side in plan.collections if side.predicates]
+        if not sides:
+            return []
+
+        analyses = await asyncio.gather(*(self._relaxation_counts(s) for s in sides))
+
+        suggestions: list[str] = []
+        for analysis in analyses:
+            if analysis.matches > 0:
+                continue
+            prefix = f"Em {analysis.source_id}, r" if plan.is_join else "R"
+            helpful = sorted(
+                ((p, n) for p, n in analysis.relaxed if n > 0),
+                key=lambda item: item[1],
+                reverse=True,
+            )
+            if not helpful:
+                suggestions.append(
+                    f"Nenhum filtro isolado explica a ausência de resultados em "
+                    f"{analysis.source_id}; revise mais de um filtro."
+                )
+            for predicate, count in helpful[: self.NO_RESULTS_MAX_SUGGESTIONS]:
+                suggestions.append(
+                    f"{prefix}emover o filtro `{predicate.describe()}` retorna "
+                    f"{_format_count(count)} {analysis.unit}."
+                )
+
+        if not suggestions and plan.is_join:
+            found = ", ".join(
+                f"{_format_count(a.matches)} {a.unit} em {a.source_id}"
+                for a in analyses
+            )
+            suggestions.append(
+                f"Cada tabela tem resultados isoladamente ({found}), mas nenhum "
+                "usuário aparece em todas ao mesmo tempo."
+            )
+
+        return suggestions
+
+    async def _relaxation_counts(
+        self, collection_plan: CollectionPlan
+    ) -> RelaxationAnalysis:
+        """Count matches of a filter and of each leave-one-out relaxation.
+
+        All counts come from a single aggregation: a $facet with one
+        sub-pipeline for the full filter and one per dropped predicate.
+        With two or more predicates, a leading $match on the union of the
+        relaxations narrows the scan (and can use indexes). When the
+        catalog declares the source's user key, distinct users are counted
+        instead of documents.
+
+        Args:
+            collection_plan: The collection to analyse.
+
+        Returns:
+            RelaxationAnalysis with the full and per-predicate counts.
+        """
+        predicates = collection_plan.predicates
+        user_key = await self._user_key(collection_plan)
+
+        def count_stages(kept: list[Predicate]) -> list[dict[str, Any]]:
+            stages: list[dict[str, Any]] = [{"$match": build_filter(kept)}]
+            if user_key:
+                stages.append({"$match": {user_key: {"$ne": None}}})
+                stages.append({"$group": {"_id": f"${user_key}"}})
+            stages.append({"$count": "count"})
+            return stages
+
+        relaxations = [
+            predicates[:i] + predicates[i + 1 :] for i in range(len(predicates))
+        ]
+        facets = {"all": count_stages(predicates)}
+        for index, kept in enumerate(relaxations):
+            facets[f"without_{index}"] = count_stages(kept)
+
+        pipeline: list[dict[str, Any]] = []
+        if len(predicates) > 1:
+            pipeline.append(
+                {"$match": {"$or": [build_filter(kept) for kept in relaxations]}}
+            )
+        pipeline.append({"$facet": facets})
+
+        collection = self._mongo_client[collection_plan.db_name][
+            collection_plan.collection_name
+        ]
+        documents: list[dict[str, Any]] = []
+        async for raw_batch in collection.aggregate_raw_batches(pipeline):
+            documents.extend(decode_all(raw_batch, RESULT_CODEC_OPTIONS))
+        counts = documents[0] if documents else {}
+
+        def facet_count(name: str) -> int:
+            # $count emits no document when nothing matched
+            facet = counts.get(name) or [{"count": 0}]
+            return int(facet[0]["count"])
+
+        return RelaxationAnalysis(
+            source_id=collection_plan.source_id,
+            unit="usuários" if user_key else "registros",
+            matches=facet_count("all"),
+            relaxed=[
+                (predicate, facet_count(f"without_{index}"))
+                for index, predicate in enumerate(predicates)
+            ],
+        )
+
+    async def compile_plan(self, sql: str) -> QueryPlan | None:
+        """Compile SQL into a plan typed with the catalog column metadata.
+
+        Predicates on columns the catalog tags as numeric_string compare
+        them as decimals, so range filters on string-encoded amounts run
+        on the server.
+
+        Args:
+            sql: The SQL query.
+
+        Returns:
+            The compiled plan, or None if the SQL cannot be compiled.
+
+        Raises:
+            QueryExecutionError: UNSUPPORTED_CONDITION if a WHERE condition
+                cannot be compiled without broadening the filter.
+        """
+        plan = compile_sql(sql)
+        if plan is None:
+            return None
+        if plan.unsupported:
+            raise QueryExecutionError(
+                code="UNSUPPORTED_CONDITION",
+                message=(
+                    f"Condição não suportada na cláusula WHERE: {plan.unsupported[0]}"
+                ),
+                details={"conditions": plan.unsupported},
+                suggestions=[
+                    "Compare colunas apenas com valores literais, sem funções.",
+                    "Use OR apenas entre colunas de uma mesma tabela.",
+                    "Reformule a busca separando as condições em consultas.",
+                ],
+            )
+
+        for collection_plan in plan.collections:
+            if not collection_plan.predicates:
+                continue
+            source = await self._catalog_repository.get_source_by_identity(
+                collection_plan.db_name, collection_plan.collection_name
+            )
+            if source is None:
+                continue
+            numeric_strings = {
+                column.path
+                for column in source.columns
+                if column.subtype == InferredSubtype.NUMERIC_STRING
+            }
+            if numeric_strings:
+                collection_plan.mark_numeric_strings(numeric_strings)
+        return plan
+
+    async def _user_key(self, collection_plan: CollectionPlan) -> str | None:
+        """Get the catalog-declared user key of a collection, if any."""
+        source = await self._catalog_repository.get_source_by_identity(
+            collection_plan.db_name, collection_plan.collection_name
+        )
+        return source.user_key if source is not None else None
+
     def _get_effective_limit(self, requested_limit: int | None) -> int:
         """Get the effective limit for a query.
 
@@ -295,44 +1035,276 @@ class QueryExecutor:
         self,
         sql: str,
         limit: int,
+        random_sample: bool = False,
+        distinct_users: bool = False,
     ) -> list[dict[str, Any]]:
         """Execute SQL against MongoDB.
 
-        This is a simplified implementation. In production, this would
-        use a proper SQL-to-MongoDB translation layer.
+        The SQL is compiled into a QueryPlan; single-collection plans run as
+        a plain find (or a random sample), multi-collection plans go through
+        the hash join. Join rows are already one per user, so distinct_users
+        only changes single-collection plans.
 
         Args:
             sql: The SQL query to execute.
             limit: Maximum rows to return.
+            random_sample: Sample matching documents at random.
+            distinct_users: Return one document per catalog user key.
 
         Returns:
             List of result rows as dictionaries.
+
+        Raises:
+            QueryExecutionError: If distinct_users is requested for a source
+                without a catalog user key.
         """
-        # Parse the SQL to extract table and filter information
-        # This is a simplified implementation for demonstration
-        table_info = self._parse_sql_for_mongo(sql)
+        plan = await self.compile_plan(sql)
 
-        if table_info is None:
+        if plan is None:
             logger.warning("Could not parse SQL for MongoDB execution")
             return []
 
-        db_name = table_info["db_name"]
-        collection_name = table_info["collection_name"]
-        filter_query = table_info.get("filter", {})
+        if plan.is_join:
+            return await self._execute_join(plan, limit, random_sample)
+
+        if distinct_users:
+            return await self._distinct_user_rows(plan.primary, limit, random_sample)
+
+        if random_sample:
+            return await self._sample_rows(plan.primary, limit)
+
+        return await self._find_rows(
+            plan.primary, plan.primary.filter, limit, plan.primary.projection
+        )
+
+    async def _distinct_user_rows(
+        self, collection_plan: CollectionPlan, limit: int, random_sample: bool
+    ) -> list[dict[str, Any]]:
+        """Return the first matching document of up to `limit` distinct users.
+
+        Documents are grouped by the catalog-declared user key on the
+        server ($group with $first), so duplicates per user never leave
+        MongoDB. The projection is pushed before the $group (keeping the
+        user key) to shrink the grouped documents.
+
+        Args:
+            collection_plan: The collection to query.
+            limit: Maximum number of users.
+            random_sample: Draw the users at random instead of the first
+                groups.
+
+        Returns:
+            List of JSON-ready documents, one per user.
+
+        Raises:
+            QueryExecutionError: If the source has no catalog user key.
+        """
+        user_key = await self._user_key(collection_plan)
+        if user_key is None:
+            raise QueryExecutionError(
+                code="USER_KEY_NOT_FOUND",
+                message=(
+                    f"A fonte {collection_plan.source_id} não declara a chave de "
+                    "usuário no catálogo; não é possível agrupar por usuário"
+                ),
+                details={"source_id": collection_plan.source_id},
+                suggestions=[
+                    "Execute a query sem agrupar por usuário.",
+                    "Declare o user_key da fonte no catálogo.",
+                ],
+            )
+
+        projection = collection_plan.projection
+        pipeline: list[dict[str, Any]] = [
+            {"$match": collection_plan.filter},
+            {"$match": {user_key: {"$ne": None}}},
+        ]
+        if projection is not None:
+            pipeline.append({"$project": {**projection, user_key: 1}})
+        pipeline.extend(
+            [
+                {"$group": {"_id": f"${user_key}", "document": {"$first": "$$ROOT"}}},
+                {"$sample": {"size": limit}} if random_sample else {"$limit": limit},
+                {"$replaceRoot": {"newRoot": "$document"}},
+            ]
+        )
+        if projection is not None and user_key not in projection:
+            pipeline.append({"$project": projection})
+
+        collection = self._mongo_client[collection_plan.db_name][
+            collection_plan.collection_name
+        ]
+        rows: list[dict[str, Any]] = []
+        async for raw_batch in collection.aggregate_raw_batches(pipeline):
+            rows.extend(decode_all(raw_batch, RESULT_CODEC_OPTIONS))
+        return rows
+
+    async def _sample_rows(
+        self, collection_plan: CollectionPlan, limit: int
+    ) -> list[dict[str, Any]]:
+        """Return a random sample of the documents matching a collection plan.
+
+        Uses a $match -> $sample pipeline. On collections larger than
+        query_sample_seek_threshold, where $sample after $match has to
+        shuffle every match, random ObjectId range seeks are used instead.
+
+        Args:
+            collection_plan: The collection to sample.
+            limit: Sample size.
+
+        Returns:
+            List of JSON-ready documents.
+        """
+        collection = self._mongo_client[collection_plan.db_name][
+            collection_plan.collection_name
+        ]
+
+        threshold = self._settings.query_sample_seek_threshold
+        if await collection.estimated_document_count() > threshold:
+            seek_rows = await self._seek_sample_rows(collection_plan, limit)
+            if seek_rows is not None:
+                return seek_rows
+
+        pipeline: list[dict[str, Any]] = [
+            {"$match": collection_plan.filter},
+            {"$sample": {"size": limit}},
+        ]
+        if collection_plan.projection is not None:
+            pipeline.append({"$project": collection_plan.projection})
+
+        rows: list[dict[str, Any]] = []
+        async for raw_batch in collection.aggregate_raw_batches(pipeline):
+            rows.extend(decode_all(raw_batch, RESULT_CODEC_OPTIONS))
+        return rows
+
+    async def _seek_sample_rows(
+        self, collection_plan: CollectionPlan, limit: int
+    ) -> list[dict[str, Any]] | None:
+        """Sample by seeking from random ObjectIds within the _id range.
+
+        ObjectIds grow with insertion time, so random pivots between the
+        smallest and largest _id spread the sample across the collection
+        while every seek is an index range scan. Seeks run concurrently and
+        results are de-duplicated by _id.
+
+        Args:
+            collection_plan: The collection to sample.
+            limit: Sample size.
+
+        Returns:
+            Sampled documents, or None if _id values are not ObjectIds.
+        """
+        collection = self._mongo_client[collection_plan.db_name][
+            collection_plan.collection_name
+        ]
+        bounds = await asyncio.gather(
+            *(
+                collection.find({}, {"_id": 1})
+                .sort("_id", direction)
+                .limit(1)
+                .to_list(1)
+                for direction in (1, -1)
+            )
+        )
+        if not bounds[0] or not bounds[1]:
+            return []
+        low, high = bounds[0][0]["_id"], bounds[1][0]["_id"]
+        if not isinstance(low, ObjectId) or not isinstance(high, ObjectId):
+            return None
+
+        low_time = low.generation_time.timestamp()
+        high_time = high.generation_time.timestamp()
+        seeks = min(limit, self.SAMPLE_SEEK_COUNT)
+        per_seek = -(-limit // seeks)  # ceil division
+        pivots = sorted(
+            ObjectId.from_datetime(
+                datetime.fromtimestamp(random.uniform(low_time, high_time), UTC)
+            )
+            for _ in range(seeks)
+        )
+
+        # _id is needed to de-duplicate overlapping seeks
+        projection = collection_plan.projection
+        seek_projection = None if projection is None else {**projection, "_id": 1}
+
+        batches = await asyncio.gather(
+            *(
+                self._find_rows(
+                    collection_plan,
+                    {"$and": [collection_plan.filter, {"_id": {"$gte": pivot}}]},
+                    per_seek,
+                    seek_projection,
+                    # Without a sort the server may return any matches: the
+                    # sort makes each seek an _id index range scan
+                    sort=[("_id", 1)],
+                )
+                for pivot in pivots
+            )
+        )
+        rows: dict[str, dict[str, Any]] = {}
+        for batch in batches:
+            for document in batch:
+                rows.setdefault(document["_id"], document)
+
+        # Seeks near the end of the range may come back short: top up from
+        # the start so the sample keeps the requested size
+        if len(rows) < limit:
+            seen = [ObjectId(object_id) for object_id in rows]
+            extra = await self._find_rows(
+                collection_plan,
+                {"$and": [collection_plan.filter, {"_id": {"$nin": seen}}]},
+                limit - len(rows),
+                seek_projection,
+            )
+            for document in extra:
+                rows.setdefault(document["_id"], document)
+
+        sample = list(rows.values())
+        random.shuffle(sample)
+        if projection is not None and projection.get("_id") == 0:
+            for document in sample:
+                document.pop("_id", None)
+        return sample[:limit]
+
+    async def _find_rows(
+        self,
+        collection_plan: CollectionPlan,
+        filter_query: dict[str, Any],
+        limit: int | None = None,
+        projection: dict[str, int] | None = None,
+        sort: list[tuple[str, int]] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Run a find against one collection and decode the documents.
+
+        Cursor batches are fetched as raw BSON and decoded in one pass per
+        batch with RESULT_CODEC_OPTIONS, which already turns ObjectIds
+        into strings.
+
+        Args:
+            collection_plan: The collection to query.
+            filter_query: MongoDB filter document.
+            limit: Optional maximum number of documents.
+            projection: Optional MongoDB projection.
+            sort: Optional (key, direction) sort specification.
+
+        Returns:
+            List of JSON-ready documents.
+        """
+        db_name = collection_plan.db_name
+        collection_name = collection_plan.collection_name
 
         try:
             db = self._mongo_client[db_name]
             collection = db[collection_name]
 
-            cursor = collection.find(filter_query).limit(limit)
+            # limit=0 means no limit for MongoDB
+            cursor = collection.find_raw_batches(
+                filter_query, projection, limit=limit or 0, sort=sort
+            )
             rows: list[dict[str, Any]] = []
 
-            async for document in cursor:
-                # Convert ObjectId to string for JSON serialization
-                doc = dict(document)
-                if "_id" in doc:
-                    doc["_id"] = str(doc["_id"])
-                rows.append(doc)
+            async for raw_batch in cursor:
+                rows.extend(decode_all(raw_batch, RESULT_CODEC_OPTIONS))
 
             return rows
 
@@ -345,14 +1317,234 @@ class QueryExecutor:
             )
             raise
 
+    async def _resolve_join_key(self, collection_plan: CollectionPlan) -> str:
+        """Resolve the join key of a collection.
+
+        Keys from the SQL ON clause win; otherwise the catalog-declared
+        user key of the source is used.
+
+        Args:
+            collection_plan: The collection to resolve.
+
+        Returns:
+            The join key column path.
+
+        Raises:
+            QueryExecutionError: If no join key can be determined.
+        """
+        if collection_plan.join_key:
+            return collection_plan.join_key
+
+        source = await self._catalog_repository.get_source_by_identity(
+            collection_plan.db_name, collection_plan.collection_name
+        )
+        if source is not None and source.user_key:
+            return source.user_key
+
+        raise QueryExecutionError(
+            code="JOIN_KEY_NOT_FOUND",
+            message=(
+                "Não foi possível determinar a chave de junção para "
+                f"{collection_plan.source_id}"
+            ),
+            details={"source_id": collection_plan.source_id},
+            suggestions=[
+                "Use uma cláusula JOIN ... ON com a coluna do usuário.",
+                "Declare 'user_key' no arquivo de catálogo da fonte.",
+            ],
+        )
+
+    async def _collect_join_keys(
+        self,
+        collection_plan: CollectionPlan,
+        join_key: str,
+        build_keys: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """Stream a collection's join keys, optionally probing a build side.
+
+        Only the join key is projected. When build_keys is given, the
+        cursor is probed against it and only matching keys are kept; small
+        build sides are also pushed down to the server as $in.
+
+        Args:
+            collection_plan: The collection to scan.
+            join_key: Column path of the join key in this collection.
+            build_keys: Normalized build-side keys to probe against.
+
+        Returns:
+            Mapping of normalized key (str) to the raw value in this
+            collection, in cursor order.
+        """
+        filter_query = collection_plan.filter
+        if build_keys is not None and len(build_keys) <= self.JOIN_PUSHDOWN_MAX_KEYS:
+            pushdown = {join_key: {"$in": list(build_keys.values())}}
+            filter_query = (
+                {"$and": [filter_query, pushdown]} if filter_query else pushdown
+            )
+
+        collection = self._mongo_client[collection_plan.db_name][
+            collection_plan.collection_name
+        ]
+        cursor = collection.find(filter_query, {join_key: 1, "_id": 0})
+
+        keys: dict[str, Any] = {}
+        async for document in cursor:
+            raw = get_path_value(document, join_key)
+            if raw is None:
+                continue
+            normalized = str(raw)
+            if build_keys is None or normalized in build_keys:
+                keys.setdefault(normalized, raw)
+        return keys
+
+    async def _join_keys(self, plan: QueryPlan) -> JoinKeys:
+        """Resolve the users present in every side of a multi-collection plan.
+
+        1. Count matches per collection concurrently to order the sides.
+        2. Build a hash set of join keys from the smallest side.
+        3. Probe every other side concurrently (key-only projection) and
+           intersect the surviving keys.
+
+        Args:
+            plan: The compiled multi-collection plan.
+
+        Returns:
+            JoinKeys with the surviving keys in build-side cursor order.
+        """
+        sides = plan.collections
+        join_keys = [await self._resolve_join_key(side) for side in sides]
+
+        counts = await asyncio.gather(
+            *(
+                self._mongo_client[side.db_name][side.collection_name].count_documents(
+                    side.filter
+                )
+                for side in sides
+            )
+        )
+        order = sorted(range(len(sides)), key=lambda i: counts[i])
+        log = logger.bind(tables=plan.tables, counts=list(counts))
+
+        # Build side: smallest collection
+        build_index = order[0]
+        if counts[build_index] == 0:
+            log.info("Join short-circuited: empty side")
+            return JoinKeys(join_keys, build_index, {}, [])
+
+        build_keys = await self._collect_join_keys(
+            sides[build_index], join_keys[build_index]
+        )
+
+        # Probe sides: run concurrently against the build hash set
+        probe_indexes = order[1:]
+        probe_results = await asyncio.gather(
+            *(
+                self._collect_join_keys(sides[i], join_keys[i], build_keys)
+                for i in probe_indexes
+            )
+        )
+
+        surviving = [
+            key for key in build_keys if all(key in probed for probed in probe_results)
+        ]
+        log.info(
+            "Join keys resolved", build_size=len(build_keys), surviving=len(surviving)
+        )
+
+        # Raw key values per side, used to push the final $in to each source
+        raw_values: dict[int, dict[str, Any]] = {build_index: build_keys}
+        raw_values.update(dict(zip(probe_indexes, probe_results, strict=True)))
+
+        return JoinKeys(join_keys, build_index, raw_values, surviving)
+
+    async def _execute_join(
+        self,
+        plan: QueryPlan,
+        limit: int,
+        random_sample: bool = False,
+        join: JoinKeys | None = None,
+    ) -> list[dict[str, Any]]:
+        """Execute a multi-collection plan as a streaming hash join.
+
+        The keys present in every side are resolved first (see _join_keys);
+        full documents are then fetched only for the first `limit` surviving
+        keys (or `limit` keys drawn at random when sampling).
+
+        Each result row holds the join key and, per source ID, the first
+        matching document of that source (projected to its SELECT columns
+        plus the join key).
+
+        Args:
+            plan: The compiled multi-collection plan.
+            limit: Maximum number of joined rows (distinct keys).
+            random_sample: Draw the surviving keys at random.
+            join: Join keys already resolved for the plan (resolved here
+                if None).
+
+        Returns:
+            List of joined rows.
+        """
+        sides = plan.collections
+        if join is None:
+            join = await self._join_keys(plan)
+        join_keys = join.join_keys
+
+        if random_sample:
+            surviving = random.sample(join.surviving, min(limit, len(join.surviving)))
+        else:
+            surviving = join.surviving[:limit]
+
+        if not surviving:
+            return []
+
+        fetched = await asyncio.gather(
+            *(
+                self._find_rows(
+                    side,
+                    {
+                        "$and": [
+                            side.filter,
+                            {
+                                join_keys[i]: {
+                                    "$in": [
+                                        join.raw_values[i][key] for key in surviving
+                                    ]
+                                }
+                            },
+                        ]
+                    },
+                    # The join key is kept to match documents across sides
+                    projection=(
+                        None
+                        if side.projection is None
+                        else {**side.projection, join_keys[i]: 1}
+                    ),
+                )
+                for i, side in enumerate(sides)
+            )
+        )
+
+        build_keys = join.raw_values[join.build_index]
+        rows_by_key: dict[str, dict[str, Any]] = {
+            key: {join_keys[join.build_index]: build_keys[key]} for key in surviving
+        }
+        for i, side in enumerate(sides):
+            for document in fetched[i]:
+                key = str(get_path_value(document, join_keys[i]))
+                row = rows_by_key.get(key)
+                if row is not None:
+                    row.setdefault(side.source_id, document)
+
+        return list(rows_by_key.values())
+
     def _parse_sql_for_mongo(
         self,
         sql: str,
     ) -> dict[str, Any] | None:
         """Parse SQL to extract MongoDB query parameters.
 
-        This is a simplified parser. In production, use a proper
-        SQL parser or query translation layer.
+        Only the first collection of the FROM clause is described; use
+        compile_sql for the full multi-collection plan.
 
         Args:
             sql: The SQL query to parse.
@@ -360,49 +1552,14 @@ class QueryExecutor:
         Returns:
             Dictionary with db_name, collection_name, and filter.
         """
-        import re
-
-        # Extract table name from FROM clause
-        # Expected format: "FROM db_name.collection_name" or "FROM collection_name"
-        match = re.search(
-            r"FROM\s+([a-zA-Z_][a-zA-Z0-9_]*(?:\.[a-zA-Z_][a-zA-Z0-9_]*)?)",
-            sql,
-            re.IGNORECASE,
-        )
-        if not match:
+        plan = compile_sql(sql)
+        if plan is None:
             return None
 
-        table_ref = match.group(1)
-        parts = table_ref.split(".")
-
-        if len(parts) == 2:
-            db_name, collection_name = parts
-        else:
-            # Default to using the table name as both
-            db_name = parts[0]
-            collection_name = parts[0]
-
-        # Extract simple WHERE conditions (basic implementation)
-        filter_query: dict[str, Any] = {}
-        where_match = re.search(
-            r"WHERE\s+(.+?)(?:ORDER|LIMIT|$)", sql, re.IGNORECASE | re.DOTALL
-        )
-
-        if where_match:
-            where_clause = where_match.group(1).strip()
-            # Parse simple equality conditions
-            # Example: "status = 'active'"
-            eq_matches = re.findall(
-                r"(\w+)\s*=\s*'([^']*)'",
-                where_clause,
-            )
-            for field, value in eq_matches:
-                filter_query[field] = value
-
         return {
-            "db_name": db_name,
-            "collection_name": collection_name,
-            "filter": filter_query,
+            "db_name": plan.primary.db_name,
+            "collection_name": plan.primary.collection_name,
+            "filter": plan.primary.filter,
         }
 
 
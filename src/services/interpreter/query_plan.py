@@ -0,0 +1,942 @@
+"""Query plan compilation from generated SQL to MongoDB filters.
+
+This module turns the SQL produced by the interpreter crew into a
+structured plan: one entry per catalog source referenced in the FROM/JOIN
+clauses, each carrying its own predicates and (for joins) the key used to
+match documents across collections.
+"""
+
+import hashlib
+import json
+import re
+from dataclasses import dataclass, field, replace
+from decimal import Decimal, InvalidOperation
+from typing import Any
+
+from bson import Decimal128
+
+from src.schemas.interpreter import FilterOperator
+
+# Table reference: "db_name.collection_name" or "collection_name"
+_IDENTIFIER = r"[a-zA-Z_][a-zA-Z0-9_]*"
+_TABLE_REF = rf"{_IDENTIFIER}(?:\.{_IDENTIFIER})?"
+_COLUMN_REF = rf"{_IDENTIFIER}(?:\.{_IDENTIFIER})*"
+
+# Keywords that cannot be used as table aliases
+_RESERVED_WORDS = {
+    "where",
+    "join",
+    "inner",
+    "left",
+    "right",
+    "on",
+    "order",
+    "group",
+    "limit",
+    "as",
+    "and",
+    "or",
+}
+
+_SELECT_PATTERN = re.compile(
+    r"^\s*SELECT\s+(?:DISTINCT\s+)?(.+?)\s+FROM\b", re.IGNORECASE | re.DOTALL
+)
+_SELECT_ITEM_PATTERN = re.compile(
+    rf"^({_COLUMN_REF}(?:\.\*)?|\*)(?:\s+(?:AS\s+)?{_IDENTIFIER})?$",
+    re.IGNORECASE,
+)
+_FROM_PATTERN = re.compile(
+    r"\bFROM\s+(.+?)(?=\bWHERE\b|\bORDER\b|\bGROUP\b|\bLIMIT\b|;|$)",
+    re.IGNORECASE | re.DOTALL,
+)
+_JOIN_SPLIT_PATTERN = re.compile(
+    r"\s+(?:INNER\s+|LEFT\s+(?:OUTER\s+)?|RIGHT\s+(?:OUTER\s+)?)?JOIN\s+",
+    re.IGNORECASE,
+)
+_TABLE_WITH_ALIAS_PATTERN = re.compile(
+    rf"^\s*({_TABLE_REF})(?:\s+(?:AS\s+)?({_IDENTIFIER}))?\s*$",
+    re.IGNORECASE,
+)
+_ON_PATTERN = re.compile(r"^(.+?)\s+ON\s+(.+)$", re.IGNORECASE | re.DOTALL)
+_ON_EQUALITY_PATTERN = re.compile(
+    rf"({_COLUMN_REF})\s*=\s*({_COLUMN_REF})", re.IGNORECASE
+)
+_COLUMN_EQUALITY_PATTERN = re.compile(
+    rf"^({_COLUMN_REF})\s*=\s*({_COLUMN_REF})$", re.IGNORECASE
+)
+_WHERE_PATTERN = re.compile(
+    r"\bWHERE\s+(.+?)(?=\bORDER\s+BY\b|\bGROUP\s+BY\b|\bLIMIT\b|;|$)",
+    re.IGNORECASE | re.DOTALL,
+)
+_AND_SPLIT_PATTERN = re.compile(r"\s+AND\s+", re.IGNORECASE)
+_OR_SPLIT_PATTERN = re.compile(r"\s+OR\s+", re.IGNORECASE)
+_CONDITION_PATTERN = re.compile(
+    rf"^({_COLUMN_REF})\s*"
+    r"(>=|<=|!=|<>|=|>|<|NOT\s+IN|IN|NOT\s+LIKE|LIKE|IS\s+NOT\s+NULL|IS\s+NULL|BETWEEN)"
+    r"\s*(.*?)$",
+    re.IGNORECASE | re.DOTALL,
+)
+_NUMBER_PATTERN = re.compile(r"^-?\d+(?:\.\d+)?$")
+_KEYWORD_LITERALS = {"TRUE", "FALSE", "NULL"}
+
+# Mapping from SQL comparison operators to MongoDB query operators
+_MONGO_OPERATORS: dict[str, str] = {
+    FilterOperator.NOT_EQUALS.value: "$ne",
+    FilterOperator.GREATER_THAN.value: "$gt",
+    FilterOperator.GREATER_EQUAL.value: "$gte",
+    FilterOperator.LESS_THAN.value: "$lt",
+    FilterOperator.LESS_EQUAL.value: "$lte",
+}
+
+# Operators that compare numbers as such, whatever the literal looks like
+_RANGE_OPERATORS = {
+    FilterOperator.GREATER_THAN.value,
+    FilterOperator.GREATER_EQUAL.value,
+    FilterOperator.LESS_THAN.value,
+    FilterOperator.LESS_EQUAL.value,
+    FilterOperator.BETWEEN.value,
+}
+
+# Operators combining nested predicates (parenthesized groups, OR)
+_OR = "OR"
+_AND = "AND"
+
+
+def _to_decimal(value: Any) -> Decimal128 | None:
+    """Convert a literal to Decimal128, or None if it is not numeric."""
+    if isinstance(value, bool) or not isinstance(value, int | float | str):
+        return None
+    try:
+        return Decimal128(Decimal(str(value)))
+    except (InvalidOperation, ValueError):
+        return None
+
+
+def _as_decimal(field_path: str) -> dict[str, Any]:
+    """Build the expression converting a string field to decimal.
+
+    Like $toDecimal, but values that are not numbers become null instead of
+    failing the whole query.
+    """
+    return {
+        "$convert": {
+            "input": f"${field_path}",
+            "to": "decimal",
+            "onError": None,
+            "onNull": None,
+        }
+    }
+
+
+@dataclass(frozen=True)
+class Predicate:
+    """A single WHERE condition bound to one collection.
+
+    Attributes:
+        field: Column path in dot notation (empty for OR / AND groups).
+        operator: SQL operator (FilterOperator value, plus NOT IN / NOT LIKE,
+            and OR / AND for groups of conditions).
+        value: Parsed literal value (list for IN/BETWEEN, None for IS NULL,
+            list of predicates for OR / AND).
+        numeric_string: The column stores numbers as strings (catalog
+            subtype numeric_string); numeric comparisons convert it first.
+    """
+
+    field: str
+    operator: str
+    value: Any = None
+    numeric_string: bool = False
+
+    def to_mongo(self) -> dict[str, Any]:
+        """Convert the predicate to a MongoDB filter fragment.
+
+        Returns:
+            Dictionary with a single field condition ($or / $and for groups).
+        """
+        if self.operator == _OR:
+            return {"$or": [p.to_mongo() for p in self.value]}
+        if self.operator == _AND:
+            return {"$and": [p.to_mongo() for p in self.value]}
+
+        if self.numeric_string:
+            expression = self._numeric_expression()
+            if expression is not None:
+                return {"$expr": expression}
+
+        op = self.operator
+        if op == FilterOperator.EQUALS.value:
+            return {self.field: self.value}
+        if op in _MONGO_OPERATORS:
+            return {self.field: {_MONGO_OPERATORS[op]: self.value}}
+        if op == FilterOperator.IN.value:
+            return {self.field: {"$in": list(self.value)}}
+        if op == "NOT IN":
+            return {self.field: {"$nin": list(self.value)}}
+        if op == FilterOperator.BETWEEN.value:
+            low, high = self.value
+            return {self.field: {"$gte": low, "$lte": high}}
+        if op == FilterOperator.LIKE.value:
+            return {self.field: {"$regex": like_to_regex(str(self.value))}}
+        if op == "NOT LIKE":
+            return {self.field: {"$not": {"$regex": like_to_regex(str(self.value))}}}
+        if op == FilterOperator.IS_NULL.value:
+            return {self.field: None}
+        if op == FilterOperator.IS_NOT_NULL.value:
+            return {self.field: {"$ne": None}}
+        raise ValueError(f"Unsupported operator: {op}")
+
+    def _numeric_expression(self) -> dict[str, Any] | None:
+        """Build a $expr comparing the string column as a decimal number.
+
+        Applies to range operators, and to equality / IN when the literals
+        are numbers; string literals keep the plain (indexable) comparison.
+
+        Returns:
+            Aggregation expression, or None if the predicate is not numeric.
+        """
+        op = self.operator
+        values = self.value if isinstance(self.value, list) else [self.value]
+        if op not in _RANGE_OPERATORS and not all(
+            isinstance(v, int | float) and not isinstance(v, bool) for v in values
+        ):
+            return None
+
+        decimals = [_to_decimal(v) for v in values]
+        if not decimals or any(d is None for d in decimals):
+            return None
+
+        converted = _as_decimal(self.field)
+        not_null = {"$ne": [converted, None]}
+        if op == FilterOperator.EQUALS.value:
+            condition: dict[str, Any] = {"$eq": [converted, decimals[0]]}
+        elif op in _MONGO_OPERATORS:
+            condition = {_MONGO_OPERATORS[op]: [converted, decimals[0]]}
+        elif op == FilterOperator.BETWEEN.value:
+            low, high = decimals
+            condition = {
+                "$and": [{"$gte": [converted, low]}, {"$lte": [converted, high]}]
+            }
+        elif op == FilterOperator.IN.value:
+            condition = {"$in": [converted, decimals]}
+        elif op == "NOT IN":
+            condition = {"$not": [{"$in": [converted, decimals]}]}
+        else:
+            return None
+        # As in SQL, missing / non-numeric values never match
+        return {"$and": [not_null, condition]}
+
+    def with_numeric_strings(self, paths: set[str]) -> "Predicate":
+        """Flag the predicate (or the grouped ones) if on numeric strings.
+
+        Args:
+            paths: Column paths with the numeric_string subtype.
+
+        Returns:
+            The flagged predicate.
+        """
+        if self.operator in (_OR, _AND):
+            return replace(
+                self, value=[p.with_numeric_strings(paths) for p in self.value]
+            )
+        if self.field in paths:
+            return replace(self, numeric_string=True)
+        return self
+
+    def describe(self) -> str:
+        """Render the predicate as a short human-readable condition.
+
+        Returns:
+            Condition text such as "status = CLOSED".
+        """
+        if self.operator in (_OR, _AND):
+            return (
+                "(" + f" {self.operator} ".join(p.describe() for p in self.value) + ")"
+            )
+        if self.value is None:
+            return f"{self.field} {self.operator}"
+        if isinstance(self.value, list):
+            if self.operator == FilterOperator.BETWEEN.value:
+                return f"{self.field} BETWEEN {self.value[0]} AND {self.value[1]}"
+            values = ", ".join(str(v) for v in self.value)
+            return f"{self.field} {self.operator} ({values})"
+        return f"{self.field} {self.operator} {self.value}"
+
+
+@dataclass
+class CollectionPlan:
+    """Execution plan for a single collection referenced by the query.
+
+    Attributes:
+        db_name: Database name.
+        collection_name: Collection name.
+        alias: Alias used in the SQL (if any).
+        predicates: Conditions applied to this collection.
+        join_key: Field used to join this collection with the others.
+        fields: Columns listed in the SELECT clause, or None for all.
+    """
+
+    db_name: str
+    collection_name: str
+    alias: str | None = None
+    predicates: list[Predicate] = field(default_factory=list)
+    join_key: str | None = None
+    fields: list[str] | None = None
+
+    @property
+    def source_id(self) -> str:
+        """Get the catalog source ID (db_name.collection_name)."""
+        return f"{self.db_name}.{self.collection_name}"
+
+    @property
+    def filter(self) -> dict[str, Any]:
+        """Build the MongoDB filter for all predicates of this collection.
+
+        Conditions on distinct fields are merged into a single document;
+        repeated fields are combined with $and so none overwrites another.
+
+        Returns:
+            MongoDB filter document.
+        """
+        return build_filter(self.predicates)
+
+    def mark_numeric_strings(self, paths: set[str]) -> None:
+        """Flag the predicates on columns that store numbers as strings.
+
+        Args:
+            paths: Column paths with the numeric_string subtype.
+        """
+        self.predicates = [p.with_numeric_strings(paths) for p in self.predicates]
+
+    @property
+    def projection(self) -> dict[str, int] | None:
+        """Build the MongoDB projection for the selected columns.
+
+        As in SQL, _id is only returned when it is selected.
+
+        Returns:
+            Projection document, or None to return whole documents.
+        """
+        if self.fields is None:
+            return None
+        projection = dict.fromkeys(self.fields, 1)
+        if "_id" not in projection:
+            projection["_id"] = 0
+        return projection
+
+
+@dataclass
+class QueryPlan:
+    """Compiled plan for a SQL query.
+
+    Attributes:
+        collections: Collections referenced by the query, in FROM/JOIN order.
+        unsupported: WHERE conditions that cannot be pushed down, such as
+            OR across joined collections. Running the plan without them
+            would match more than the SQL, so it must be rejected.
+    """
+
+    collections: list[CollectionPlan]
+    unsupported: list[str] = field(default_factory=list)
+
+    @property
+    def primary(self) -> CollectionPlan:
+        """Get the first collection in the FROM clause."""
+        return self.collections[0]
+
+    @property
+    def is_join(self) -> bool:
+        """Check whether the plan spans more than one collection."""
+        return len(self.collections) > 1
+
+    @property
+    def tables(self) -> list[str]:
+        """Get the source IDs of all collections in the plan."""
+        return [c.source_id for c in self.collections]
+
+    @property
+    def fingerprint(self) -> str:
+        """Get a stable hash identifying what the plan reads.
+
+        Aliases and field order do not affect the fingerprint, so SQL
+        strings that compile to the same filters share one value.
+
+        Returns:
+            Hex SHA-256 digest of the canonical plan.
+        """
+        canonical = [
+            {
+                "source_id": c.source_id,
+                "filter": c.filter,
+                "join_key": c.join_key,
+                # Documents come back in stored field order either way
+                "fields": sorted(c.fields) if c.fields is not None else None,
+            }
+            for c in self.collections
+        ]
+        payload = json.dumps(canonical, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def build_filter(predicates: list[Predicate]) -> dict[str, Any]:
+    """Combine predicates into a single MongoDB filter document.
+
+    Args:
+        predicates: Conditions to combine.
+
+    Returns:
+        MongoDB filter document ({} when there are no predicates).
+    """
+    merged: dict[str, Any] = {}
+    extra: list[dict[str, Any]] = []
+
+    for predicate in predicates:
+        fragment = predicate.to_mongo()
+        key = next(iter(fragment))
+        if key in merged:
+            extra.append(fragment)
+        else:
+            merged.update(fragment)
+
+    if extra:
+        return {"$and": [merged, *extra]}
+    return merged
+
+
+def like_to_regex(pattern: str) -> str:
+    """Translate a SQL LIKE pattern into an anchored regular expression.
+
+    Args:
+        pattern: LIKE pattern using % and _ wildcards.
+
+    Returns:
+        Equivalent regular expression.
+    """
+    parts: list[str] = []
+    for char in pattern:
+        if char == "%":
+            parts.append(".*")
+        elif char == "_":
+            parts.append(".")
+        else:
+            parts.append(re.escape(char))
+    return "^" + "".join(parts) + "$"
+
+
+def _parse_literal(raw: str) -> Any:
+    """Parse a SQL literal into a Python value.
+
+    Args:
+        raw: Literal text (quoted string, number, boolean or NULL).
+
+    Returns:
+        The parsed value.
+    """
+    text = raw.strip()
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in ("'", '"'):
+        return text[1:-1].replace("''", "'")
+    upper = text.upper()
+    if upper == "TRUE":
+        return True
+    if upper == "FALSE":
+        return False
+    if upper == "NULL":
+        return None
+    if _NUMBER_PATTERN.match(text):
+        return float(text) if "." in text else int(text)
+    return text
+
+
+def _is_literal(raw: str) -> bool:
+    """Check that text is a SQL literal _parse_literal understands.
+
+    Column references, function calls and expressions are not literals.
+
+    Args:
+        raw: Value text.
+
+    Returns:
+        True for quoted strings, numbers, booleans and NULL.
+    """
+    text = raw.strip()
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in ("'", '"'):
+        return True
+    return text.upper() in _KEYWORD_LITERALS or bool(_NUMBER_PATTERN.match(text))
+
+
+def _split_list(raw: str) -> list[str]:
+    """Split a comma-separated literal list, respecting quotes.
+
+    Args:
+        raw: List content without the surrounding parentheses.
+
+    Returns:
+        Individual literal strings.
+    """
+    items: list[str] = []
+    current: list[str] = []
+    quote: str | None = None
+
+    for char in raw:
+        if quote:
+            current.append(char)
+            if char == quote:
+                quote = None
+        elif char in ("'", '"'):
+            quote = char
+            current.append(char)
+        elif char == ",":
+            items.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+
+    if "".join(current).strip():
+        items.append("".join(current))
+    return [item.strip() for item in items if item.strip()]
+
+
+def _top_level_positions(text: str) -> list[bool]:
+    """Flag the characters outside quotes and parentheses.
+
+    Args:
+        text: SQL fragment.
+
+    Returns:
+        One flag per character of text.
+    """
+    flags: list[bool] = []
+    depth = 0
+    quote: str | None = None
+
+    for char in text:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in ("'", '"'):
+            quote = char
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        flags.append(quote is None and depth == 0 and char not in "()")
+    return flags
+
+
+def _split_top_level(text: str, pattern: re.Pattern[str]) -> list[str]:
+    """Split text on a separator outside quotes and parentheses.
+
+    Args:
+        text: SQL fragment.
+        pattern: Separator pattern (e.g. AND, OR).
+
+    Returns:
+        The pieces between top-level separators.
+    """
+    top_level = _top_level_positions(text)
+    pieces: list[str] = []
+    start = 0
+    for match in pattern.finditer(text):
+        if top_level[match.start()]:
+            pieces.append(text[start : match.start()])
+            start = match.end()
+    pieces.append(text[start:])
+    return pieces
+
+
+def _closing_paren(text: str) -> int:
+    """Find the parenthesis closing the one text starts with.
+
+    Args:
+        text: SQL fragment starting with "(".
+
+    Returns:
+        Index of the matching ")", or -1 if unbalanced.
+    """
+    depth = 0
+    quote: str | None = None
+    for index, char in enumerate(text):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in ("'", '"'):
+            quote = char
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                return index
+    return -1
+
+
+def _strip_parens(text: str) -> str:
+    """Remove parentheses wrapping a whole condition.
+
+    "(a = 1 OR b = 2)" loses its parentheses; "(a = 1) OR (b = 2)" is
+    kept as is.
+
+    Args:
+        text: Condition text.
+
+    Returns:
+        The condition without its outer parentheses.
+    """
+    text = text.strip()
+    while text.startswith("(") and _closing_paren(text) == len(text) - 1:
+        text = text[1:-1].strip()
+    return text
+
+
+def _split_conditions(where_clause: str) -> list[str]:
+    """Split a WHERE clause on top-level AND, keeping BETWEEN ranges intact.
+
+    Args:
+        where_clause: The WHERE clause body.
+
+    Returns:
+        List of individual condition strings.
+    """
+    pieces = _split_top_level(where_clause.strip(), _AND_SPLIT_PATTERN)
+    conditions: list[str] = []
+
+    for piece in pieces:
+        if conditions and re.search(
+            r"\bBETWEEN\s+\S+\s*$", conditions[-1], re.IGNORECASE
+        ):
+            conditions[-1] = f"{conditions[-1]} AND {piece}"
+        else:
+            conditions.append(piece)
+
+    return [c.strip() for c in conditions if c.strip()]
+
+
+def _conjuncts(where_clause: str) -> list[str]:
+    """Flatten a WHERE clause into the conditions that must all hold.
+
+    Parenthesized AND groups are flattened; a condition with a top-level
+    OR is kept whole (OR binds weaker than AND).
+
+    Args:
+        where_clause: The WHERE clause body or a part of it.
+
+    Returns:
+        List of condition strings.
+    """
+    text = _strip_parens(where_clause)
+    if len(_split_top_level(text, _OR_SPLIT_PATTERN)) > 1:
+        return [text]
+
+    conditions = _split_conditions(text)
+    if len(conditions) == 1:
+        return conditions
+    return [c for condition in conditions for c in _conjuncts(condition)]
+
+
+def _parse_condition(condition: str) -> tuple[str, Predicate] | None:
+    """Parse one WHERE condition into a (column reference, predicate) pair.
+
+    Args:
+        condition: Condition text such as "i.status = 'OPEN'".
+
+    Returns:
+        Tuple of raw column reference and predicate, or None if unsupported
+        (including comparisons against another column or an expression).
+    """
+    text = condition.strip()
+    while text.startswith("(") and text.endswith(")") and text.count("(") == 1:
+        text = text[1:-1].strip()
+
+    match = _CONDITION_PATTERN.match(text)
+    if not match:
+        return None
+
+    column_ref, raw_operator, raw_value = match.groups()
+    operator = " ".join(raw_operator.upper().split())
+    if operator == "<>":
+        operator = FilterOperator.NOT_EQUALS.value
+
+    value: Any
+    if operator in (FilterOperator.IS_NULL.value, FilterOperator.IS_NOT_NULL.value):
+        value = None
+    elif operator in (FilterOperator.IN.value, "NOT IN"):
+        inner = raw_value.strip()
+        if not (inner.startswith("(") and inner.endswith(")")):
+            return None
+        items = _split_list(inner[1:-1])
+        if not all(_is_literal(item) for item in items):
+            return None
+        value = [_parse_literal(item) for item in items]
+    elif operator == FilterOperator.BETWEEN.value:
+        bounds = _AND_SPLIT_PATTERN.split(raw_value, maxsplit=1)
+        if len(bounds) != 2 or not all(_is_literal(b) for b in bounds):
+            return None
+        value = [_parse_literal(bounds[0]), _parse_literal(bounds[1])]
+    else:
+        if not _is_literal(raw_value):
+            return None
+        value = _parse_literal(raw_value)
+
+    return column_ref, Predicate(field=column_ref, operator=operator, value=value)
+
+
+def _parse_table(raw: str) -> CollectionPlan | None:
+    """Parse a table reference with an optional alias.
+
+    Args:
+        raw: Text such as "credit.invoice i" or "credit.invoice AS i".
+
+    Returns:
+        CollectionPlan without predicates, or None if not a table reference.
+    """
+    match = _TABLE_WITH_ALIAS_PATTERN.match(raw)
+    if not match:
+        return None
+
+    table_ref, alias = match.groups()
+    if alias and alias.lower() in _RESERVED_WORDS:
+        alias = None
+
+    parts = table_ref.split(".")
+    if len(parts) == 2:
+        db_name, collection_name = parts
+    else:
+        # Default to using the table name as both
+        db_name = parts[0]
+        collection_name = parts[0]
+
+    return CollectionPlan(
+        db_name=db_name,
+        collection_name=collection_name,
+        alias=alias,
+    )
+
+
+def _resolve_column(
+    column_ref: str, collections: list[CollectionPlan]
+) -> tuple[CollectionPlan, str]:
+    """Find the collection a column reference belongs to.
+
+    A leading segment matching an alias (or the collection name) selects
+    that collection; unqualified columns belong to the first collection.
+
+    Args:
+        column_ref: Column reference, optionally alias-qualified.
+        collections: Collections in the plan.
+
+    Returns:
+        Tuple of the owning collection and the column path within it.
+    """
+    qualified = _qualified_column(column_ref, collections)
+    if qualified is not None:
+        return qualified
+    return collections[0], column_ref
+
+
+def _qualified_column(
+    column_ref: str, collections: list[CollectionPlan]
+) -> tuple[CollectionPlan, str] | None:
+    """Resolve a column reference qualified by an alias or collection name.
+
+    Args:
+        column_ref: Column reference such as "i.consumerId".
+        collections: Collections in the plan.
+
+    Returns:
+        Tuple of the collection and the column path, or None if the
+        reference is not qualified by a collection of the plan.
+    """
+    head, _, rest = column_ref.partition(".")
+    if rest:
+        for collection in collections:
+            if head in (collection.alias, collection.collection_name):
+                return collection, rest
+    return None
+
+
+def _join_equality(
+    condition: str, collections: list[CollectionPlan]
+) -> list[tuple[CollectionPlan, str]] | None:
+    """Resolve a column-to-column equality between two collections.
+
+    Args:
+        condition: Condition text such as "c.consumerId = i.consumerId".
+        collections: Collections in the plan.
+
+    Returns:
+        The (collection, column) pair of each side, or None if the
+        condition is not an equality between columns of two collections.
+    """
+    match = _COLUMN_EQUALITY_PATTERN.match(_strip_parens(condition))
+    if not match:
+        return None
+    sides = [_qualified_column(ref, collections) for ref in match.groups()]
+    left, right = sides
+    if left is None or right is None or left[0] is right[0]:
+        return None
+    return [left, right]
+
+
+class _UnsupportedConditionError(ValueError):
+    """A WHERE condition that cannot be compiled without changing it."""
+
+
+def _parse_expression(
+    condition: str, collections: list[CollectionPlan]
+) -> tuple[CollectionPlan, Predicate] | None:
+    """Parse a WHERE condition, including OR and parenthesized groups.
+
+    Every condition of a group must be understood and belong to the same
+    collection: dropping part of an OR would change which documents it
+    matches, so such groups are rejected instead of ignored.
+
+    Args:
+        condition: Condition text.
+        collections: Collections in the plan.
+
+    Returns:
+        Tuple of the owning collection and the predicate, or None if a
+        plain condition is not supported.
+
+    Raises:
+        _UnsupportedConditionError: If a group cannot be compiled.
+    """
+    text = _strip_parens(condition)
+    for operator, parts in (
+        (_OR, _split_top_level(text, _OR_SPLIT_PATTERN)),
+        (_AND, _split_conditions(text)),
+    ):
+        if len(parts) == 1:
+            continue
+        members: list[tuple[CollectionPlan, Predicate]] = []
+        for part in parts:
+            member = _parse_expression(part, collections)
+            if member is None:
+                raise _UnsupportedConditionError(text)
+            members.append(member)
+        if len({id(owner) for owner, _ in members}) != 1:
+            raise _UnsupportedConditionError(text)
+        return members[0][0], Predicate(
+            field="", operator=operator, value=[p for _, p in members]
+        )
+
+    parsed_condition = _parse_condition(text)
+    if parsed_condition is None:
+        return None
+    column_ref, predicate = parsed_condition
+    collection, column = _resolve_column(column_ref, collections)
+    return collection, replace(predicate, field=column)
+
+
+def _assign_selected_fields(
+    select_clause: str, collections: list[CollectionPlan]
+) -> None:
+    """Record the SELECT columns of each collection.
+
+    Collections selected with * (or alias.*) keep whole documents; in a
+    join, a collection none of whose columns is selected gets an empty
+    projection. If any item is not a plain column (functions,
+    expressions), no projection is applied at all.
+
+    Args:
+        select_clause: Text between SELECT and FROM.
+        collections: Collections in the plan.
+    """
+    selected: dict[int, list[str]] = {}
+    whole: set[int] = set()
+
+    for item in _split_list(select_clause):
+        match = _SELECT_ITEM_PATTERN.match(item.strip())
+        if not match:
+            return
+        column_ref = match.group(1)
+        if column_ref == "*":
+            return
+        collection, column = _resolve_column(column_ref, collections)
+        key = id(collection)
+        if column == "*":
+            whole.add(key)
+        else:
+            selected.setdefault(key, []).append(column)
+
+    for collection in collections:
+        key = id(collection)
+        if key not in whole:
+            collection.fields = list(dict.fromkeys(selected.get(key, [])))
+
+
+def compile_sql(sql: str) -> QueryPlan | None:
+    """Compile a SQL SELECT into a query plan.
+
+    Supports comma-separated FROM lists and INNER JOINs with equality ON
+    clauses; with a FROM list, a WHERE equality between columns of two
+    collections is their join key. WHERE conditions joined by AND are
+    assigned to the collection their alias points to; OR expressions (and
+    parenthesized groups) on one collection become $or / $and. Every
+    condition that cannot be compiled (functions, column comparisons,
+    groups spanning collections) is listed in QueryPlan.unsupported.
+
+    Args:
+        sql: The SQL query to compile.
+
+    Returns:
+        QueryPlan, or None if no table reference was found.
+    """
+    from_match = _FROM_PATTERN.search(sql)
+    if not from_match:
+        return None
+
+    collections: list[CollectionPlan] = []
+    join_conditions: list[str] = []
+
+    for from_item in from_match.group(1).split(","):
+        for index, join_part in enumerate(_JOIN_SPLIT_PATTERN.split(from_item)):
+            table_text = join_part
+            on_match = _ON_PATTERN.match(join_part) if index > 0 else None
+            if on_match:
+                table_text, on_clause = on_match.groups()
+                join_conditions.append(on_clause)
+
+            collection = _parse_table(table_text)
+            if collection is not None:
+                collections.append(collection)
+
+    if not collections:
+        return None
+
+    # Join keys from ON clauses (a.key = b.key)
+    for on_clause in join_conditions:
+        for left, right in _ON_EQUALITY_PATTERN.findall(on_clause):
+            for column_ref in (left, right):
+                collection, column = _resolve_column(column_ref, collections)
+                if collection.join_key is None:
+                    collection.join_key = column
+
+    unsupported: list[str] = []
+    where_match = _WHERE_PATTERN.search(sql)
+    if where_match:
+        for condition in _conjuncts(where_match.group(1)):
+            join_sides = _join_equality(condition, collections)
+            if join_sides is not None:
+                for collection, column in join_sides:
+                    if collection.join_key is None:
+                        collection.join_key = column
+                if any(c.join_key != column for c, column in join_sides):
+                    # Already joined on another key: cannot enforce both
+                    unsupported.append(condition)
+                continue
+            try:
+                parsed = _parse_expression(condition, collections)
+            except _UnsupportedConditionError:
+                unsupported.append(condition)
+                continue
+            if parsed is None:
+                unsupported.append(condition)
+                continue
+            collection, predicate = parsed
+            collection.predicates.append(predicate)
+
+    select_match = _SELECT_PATTERN.search(sql)
+    if select_match:
+        _assign_selected_fields(select_match.group(1), collections)
+
+    return QueryPlan(collections=collections, unsupported=unsupported)
@@ -0,0 +1,400 @@
+"""Incremental encoders for exporting query results.
+
+Each encoder turns batches of result rows into bytes as they arrive, so
+an export never holds more than one batch in memory. Columns follow the
+query's SELECT list, or the catalog order for SELECT *; keys of the first
+batch that neither lists are appended.
+
+Parquet support requires the optional ``pyarrow`` dependency
+(``pip install qausersearch[export]``).
+"""
+
+import csv
+import io
+import json
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import Any
+
+import structlog
+
+from src.schemas.catalog_yaml import SourceMetadataYaml
+from src.schemas.enums import InferredType
+from src.schemas.interpreter import ExportFormat
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - depends on installed extras
+    pa = None
+    pq = None
+
+logger = structlog.get_logger(__name__)
+
+
+def is_parquet_available() -> bool:
+    """Check whether the optional Parquet dependency is installed."""
+    return pa is not None
+
+
+def flatten_document(document: dict[str, Any], prefix: str = "") -> dict[str, Any]:
+    """Flatten nested objects into dot-notation keys.
+
+    Arrays are kept as values; only objects are expanded.
+
+    Args:
+        document: The document to flatten.
+        prefix: Path prefix of the current level.
+
+    Returns:
+        Mapping of column path to value.
+    """
+    flat: dict[str, Any] = {}
+    for key, value in document.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict) and value:
+            flat.update(flatten_document(value, f"{path}."))
+        else:
+            flat[path] = value
+    return flat
+
+
+def catalog_columns(source: SourceMetadataYaml) -> list[str]:
+    """Get the exportable (leaf) column paths of a source in catalog order.
+
+    Object columns whose children are also cataloged are skipped, since
+    their values are exported through the child columns. Arrays are kept
+    whole.
+
+    Args:
+        source: Catalog metadata of the source.
+
+    Returns:
+        Column paths in catalog order.
+    """
+    paths = [column.path for column in source.columns]
+    parents = {path.rsplit(".", 1)[0] for path in paths if "." in path}
+    return [
+        column.path
+        for column in source.columns
+        if not (column.type == InferredType.OBJECT and column.path in parents)
+    ]
+
+
+def _to_text(value: Any) -> str:
+    """Render a value as a CSV/Parquet string cell."""
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class ResultEncoder(ABC):
+    """Base class for incremental result encoders."""
+
+    media_type: str
+    extension: str
+
+    def __init__(self, columns: list[str] | None = None) -> None:
+        """Initialize the encoder.
+
+        Args:
+            columns: Column paths in output order. Keys of the first batch
+                that are not listed follow them; when None, the columns of
+                the first batch are used.
+        """
+        self._base_columns = columns or []
+        self._columns: list[str] | None = None
+        self._warned_dropped = False
+
+    def _resolve_columns(self, rows: list[dict[str, Any]]) -> list[str]:
+        """Fix the columns on the first batch; later batches must fit them.
+
+        Output files have one header (or schema), so keys first seen after
+        the first batch cannot be added; they are dropped with a warning.
+        """
+        if self._columns is None:
+            seen = dict.fromkeys(self._base_columns)
+            for row in rows:
+                seen.update(dict.fromkeys(row))
+            self._columns = list(seen)
+        elif not self._warned_dropped:
+            known = set(self._columns)
+            dropped = {key for row in rows for key in row if key not in known}
+            if dropped:
+                self._warned_dropped = True
+                logger.warning(
+                    "Export columns first seen after the first batch were dropped",
+                    columns=sorted(dropped),
+                )
+        return self._columns
+
+    @abstractmethod
+    def encode(self, rows: list[dict[str, Any]]) -> bytes:
+        """Encode a batch of rows.
+
+        Args:
+            rows: Result rows (nested documents).
+
+        Returns:
+            Encoded bytes to append to the output.
+        """
+
+    def finish(self) -> bytes:
+        """Encode any trailing data once all batches were written."""
+        return b""
+
+
+class CsvEncoder(ResultEncoder):
+    """CSV with a header row; nested values are flattened by path."""
+
+    media_type = "text/csv"
+    extension = "csv"
+
+    def __init__(self, columns: list[str] | None = None) -> None:
+        super().__init__(columns)
+        self._header_written = False
+
+    def encode(self, rows: list[dict[str, Any]]) -> bytes:
+        flat_rows = [flatten_document(row) for row in rows]
+        columns = self._resolve_columns(flat_rows)
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if not self._header_written:
+            writer.writerow(columns)
+            self._header_written = True
+        for row in flat_rows:
+            writer.writerow([_to_text(row.get(column)) for column in columns])
+        return buffer.getvalue().encode("utf-8")
+
+    def finish(self) -> bytes:
+        # An empty result still gets its header when columns are known
+        if not self._header_written and self._base_columns:
+            self._header_written = True
+            buffer = io.StringIO()
+            csv.writer(buffer).writerow(self._base_columns)
+            return buffer.getvalue().encode("utf-8")
+        return b""
+
+
+class JsonlEncoder(ResultEncoder):
+    """One JSON document per line, top-level keys in catalog order."""
+
+    media_type = "application/x-ndjson"
+    extension = "jsonl"
+
+    def __init__(self, columns: list[str] | None = None) -> None:
+        super().__init__(columns)
+        # Top-level keys derived from (possibly nested) catalog paths
+        self._key_order = (
+            list(dict.fromkeys(path.split(".", 1)[0] for path in columns))
+            if columns
+            else []
+        )
+
+    def encode(self, rows: list[dict[str, Any]]) -> bytes:
+        lines: list[str] = []
+        for row in rows:
+            ordered = {key: row[key] for key in self._key_order if key in row}
+            ordered.update(row)
+            lines.append(json.dumps(ordered, ensure_ascii=False, default=str))
+        return ("\n".join(lines) + "\n").encode("utf-8") if lines else b""
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only stream that hands out written bytes in chunks.
+
+    The Parquet writer relies on tell() for file offsets, so the position
+    keeps growing even though drained chunks are released.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        """Return and release the bytes written since the last drain."""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+_ARROW_TYPES: dict[InferredType, str] = {
+    InferredType.INTEGER: "int64",
+    InferredType.NUMBER: "float64",
+    InferredType.BOOLEAN: "bool",
+}
+
+
+class ParquetEncoder(ResultEncoder):
+    """Parquet file written one row group per batch."""
+
+    media_type = "application/vnd.apache.parquet"
+    extension = "parquet"
+
+    def __init__(
+        self,
+        columns: list[str] | None = None,
+        column_types: dict[str, InferredType] | None = None,
+    ) -> None:
+        """Initialize the encoder.
+
+        Args:
+            columns: Column paths in output order.
+            column_types: Catalog types by path; integer, number and
+                boolean columns keep their type, everything else is text.
+
+        Raises:
+            RuntimeError: If pyarrow is not installed.
+        """
+        if pa is None:
+            raise RuntimeError("Parquet export requires the 'pyarrow' package")
+        super().__init__(columns)
+        self._column_types = column_types or {}
+        self._sink = _ChunkSink()
+        self._writer: Any = None
+        self._schema: Any = None
+
+    def _arrow_type(self, column: str) -> Any:
+        type_name = _ARROW_TYPES.get(
+            self._column_types.get(column, InferredType.STRING)
+        )
+        return pa.type_for_alias(type_name) if type_name else pa.string()
+
+    @staticmethod
+    def _coerce(value: Any, arrow_type: Any) -> Any:
+        """Convert a cell to the column type, or None if it does not fit."""
+        if value is None:
+            return None
+        if pa.types.is_string(arrow_type):
+            return _to_text(value)
+        try:
+            if pa.types.is_boolean(arrow_type):
+                return value if isinstance(value, bool) else None
+            if pa.types.is_integer(arrow_type):
+                return int(value)
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+
+    def encode(self, rows: list[dict[str, Any]]) -> bytes:
+        flat_rows = [flatten_document(row) for row in rows]
+        columns = self._resolve_columns(flat_rows)
+
+        if self._writer is None:
+            self._schema = pa.schema([(c, self._arrow_type(c)) for c in columns])
+            self._writer = pq.ParquetWriter(self._sink, self._schema)
+
+        arrays = [
+            pa.array(
+                [self._coerce(row.get(field.name), field.type) for row in flat_rows],
+                type=field.type,
+            )
+            for field in self._schema
+        ]
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self._schema))
+        return self._sink.drain()
+
+    def finish(self) -> bytes:
+        if self._writer is None:
+            # Empty result: write a valid file with the known columns
+            self.encode([])
+        self._writer.close()
+        return self._sink.drain()
+
+
+def selected_columns(
+    fields: list[str], source: SourceMetadataYaml | None = None
+) -> list[str]:
+    """Get the exportable column paths of a SELECT list.
+
+    Selected object columns are expanded to their cataloged leaf columns,
+    matching how nested values are flattened.
+
+    Args:
+        fields: Columns listed in the SELECT clause, in order.
+        source: Catalog metadata of the source, if known.
+
+    Returns:
+        Column paths in SELECT order.
+    """
+    leaves = catalog_columns(source) if source else []
+    columns: list[str] = []
+    for field in fields:
+        children = [path for path in leaves if path.startswith(f"{field}.")]
+        columns.extend(children or [field])
+    return list(dict.fromkeys(columns))
+
+
+def create_encoder(
+    export_format: ExportFormat,
+    source: SourceMetadataYaml | None = None,
+    fields: list[str] | None = None,
+) -> ResultEncoder:
+    """Create the encoder for a format with the query's column order.
+
+    Args:
+        export_format: Requested output format.
+        source: Catalog metadata of the queried source, if any.
+        fields: Columns of the SELECT list, or None for SELECT * (catalog
+            order when the source is known).
+
+    Returns:
+        A fresh encoder.
+
+    Raises:
+        RuntimeError: If Parquet is requested but pyarrow is not installed.
+    """
+    columns: list[str] | None
+    if fields is not None:
+        columns = selected_columns(fields, source)
+    else:
+        columns = catalog_columns(source) if source else None
+
+    if export_format == ExportFormat.CSV:
+        return CsvEncoder(columns)
+    if export_format == ExportFormat.JSONL:
+        return JsonlEncoder(columns)
+
+    column_types = {c.path: c.type for c in source.columns} if source else None
+    return ParquetEncoder(columns, column_types)
+
+
+async def encode_batches(
+    batches: AsyncIterator[list[dict[str, Any]]],
+    encoder: ResultEncoder,
+) -> AsyncIterator[bytes]:
+    """Encode a stream of row batches.
+
+    Args:
+        batches: Row batches, e.g. from QueryExecutor.stream_batches.
+        encoder: Encoder for the output format.
+
+    Yields:
+        Encoded chunks, one per batch plus the trailer.
+    """
+    async for rows in batches:
+        chunk = encoder.encode(rows)
+        if chunk:
+            yield chunk
+    trailer = encoder.finish()
+    if trailer:
+        yield trailer
@@ -0,0 +1,323 @@
+"""Quick filters: predefined queries materialized in the background.
+
+Quick filters are declared in a YAML file. Each one is compiled once into a
+query plan; an in-process scheduler then refreshes its materialization
+(every matching user key plus a random sample of rows) at the filter's
+interval. Reads are served from the last materialization together with its
+freshness timestamp, so the same heavy scans are not repeated per request.
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+from uuid import NAMESPACE_URL, uuid5
+
+import structlog
+import yaml
+from pydantic import ValidationError
+
+from src.config import get_settings
+from src.core.database import get_db_manager
+from src.schemas.enums import MaterializationStatus
+from src.schemas.interpreter import StoredQuery
+from src.schemas.quick_filters import (
+    QuickFilterDefinition,
+    QuickFilterResponse,
+    QuickFilterSummary,
+)
+from src.services.interpreter.query_executor import QueryExecutionError, QueryExecutor
+from src.services.interpreter.query_plan import QueryPlan
+
+logger = structlog.get_logger(__name__)
+
+
+def load_quick_filter_definitions(path: str | Path) -> list[QuickFilterDefinition]:
+    """Load quick filter definitions from a YAML file.
+
+    Args:
+        path: Path to the definitions file.
+
+    Returns:
+        The definitions, or an empty list if the file does not exist.
+
+    Raises:
+        ValueError: If the file is malformed or an ID is repeated.
+    """
+    file_path = Path(path)
+    if not file_path.exists():
+        logger.info("No quick filter definitions found", path=str(file_path))
+        return []
+
+    data = yaml.safe_load(file_path.read_text(encoding="utf-8")) or {}
+    try:
+        definitions = [
+            QuickFilterDefinition.model_validate(item)
+            for item in data.get("quick_filters", [])
+        ]
+    except ValidationError as e:
+        raise ValueError(f"Invalid quick filter definition in {file_path}: {e}") from e
+
+    ids = [definition.id for definition in definitions]
+    duplicates = sorted({i for i in ids if ids.count(i) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate quick filter IDs in {file_path}: {duplicates}")
+    return definitions
+
+
+@dataclass(frozen=True)
+class QuickFilterMaterialization:
+    """Materialized results of a quick filter.
+
+    Attributes:
+        user_keys: Every matching user key.
+        rows: Random sample of the matching rows.
+        refreshed_at: When the refresh finished.
+        duration_ms: How long the refresh took.
+    """
+
+    user_keys: list[str]
+    rows: list[dict[str, Any]]
+    refreshed_at: datetime
+    duration_ms: int
+
+
+@dataclass
+class QuickFilterState:
+    """A quick filter with its compiled plan and latest materialization.
+
+    Attributes:
+        definition: The declared filter.
+        stored_query: Query used for validation and admission.
+        interval_seconds: Refresh interval.
+        plan: Compiled plan (compiled once, on the first refresh).
+        materialization: Last successful materialization.
+        error: Error of the last refresh, if it failed.
+        next_refresh: Monotonic time of the next refresh.
+    """
+
+    definition: QuickFilterDefinition
+    stored_query: StoredQuery
+    interval_seconds: int
+    plan: QueryPlan | None = None
+    materialization: QuickFilterMaterialization | None = None
+    error: str | None = None
+    next_refresh: float = 0.0
+
+    @property
+    def status(self) -> MaterializationStatus:
+        """Get the materialization status."""
+        if self.materialization is not None:
+            return MaterializationStatus.READY
+        if self.error is not None:
+            return MaterializationStatus.FAILED
+        return MaterializationStatus.PENDING
+
+    def summary(self) -> QuickFilterSummary:
+        """Build the API summary of the filter."""
+        return QuickFilterSummary(**self._summary_fields())
+
+    def response(self, include_user_keys: bool = False) -> QuickFilterResponse:
+        """Build the API response with the materialized results.
+
+        Args:
+            include_user_keys: Include every matching user key.
+        """
+        materialization = self.materialization
+        return QuickFilterResponse(
+            **self._summary_fields(),
+            sql=self.definition.sql,
+            refresh_duration_ms=(
+                materialization.duration_ms if materialization else None
+            ),
+            rows=materialization.rows if materialization else [],
+            user_keys=(
+                materialization.user_keys
+                if materialization and include_user_keys
+                else None
+            ),
+        )
+
+    def _summary_fields(self) -> dict[str, Any]:
+        materialization = self.materialization
+        next_refresh_at = datetime.now(UTC) + timedelta(
+            seconds=max(0.0, self.next_refresh - time.monotonic())
+        )
+        return {
+            "id": self.definition.id,
+            "name": self.definition.name,
+            "description": self.definition.description,
+            "category": self.definition.category,
+            "status": self.status,
+            "user_count": len(materialization.user_keys) if materialization else None,
+            "refreshed_at": materialization.refreshed_at if materialization else None,
+            "next_refresh_at": next_refresh_at,
+            "error": self.error,
+        }
+
+
+class QuickFilterScheduler:
+    """Keeps quick filter materializations fresh in the background."""
+
+    # Retry delay after a failed refresh, capped by the filter interval
+    RETRY_DELAY_SECONDS = 60
+
+    def __init__(
+        self,
+        definitions: list[QuickFilterDefinition],
+        refresh_interval_seconds: int,
+        sample_size: int,
+        executor: QueryExecutor | None = None,
+    ) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            definitions: Quick filters to materialize.
+            refresh_interval_seconds: Default refresh interval.
+            sample_size: Rows sampled into each materialization.
+            executor: Optional executor (defaults to one per refresh cycle,
+                with its own database session).
+        """
+        self._sample_size = sample_size
+        self._executor = executor
+        self._task: asyncio.Task[None] | None = None
+        self._filters: dict[str, QuickFilterState] = {
+            definition.id: QuickFilterState(
+                definition=definition,
+                stored_query=StoredQuery(
+                    id=uuid5(NAMESPACE_URL, f"quick-filter:{definition.id}"),
+                    interpretation_id=uuid5(NAMESPACE_URL, definition.id),
+                    sql=definition.sql,
+                    is_valid=True,
+                ),
+                interval_seconds=(
+                    definition.refresh_interval_seconds or refresh_interval_seconds
+                ),
+            )
+            for definition in definitions
+        }
+
+    def filters(self) -> list[QuickFilterState]:
+        """Get every quick filter, in definition order."""
+        return list(self._filters.values())
+
+    def get(self, filter_id: str) -> QuickFilterState | None:
+        """Get a quick filter by ID."""
+        return self._filters.get(filter_id)
+
+    @asynccontextmanager
+    async def _get_executor(self) -> AsyncIterator[QueryExecutor]:
+        if self._executor is not None:
+            yield self._executor
+            return
+        async with get_db_manager().session() as session:
+            yield QueryExecutor(session)
+
+    async def refresh(self, state: QuickFilterState) -> None:
+        """Refresh one quick filter now.
+
+        Failures are recorded on the filter; the previous materialization
+        keeps being served until a refresh succeeds.
+
+        Args:
+            state: The quick filter to refresh.
+        """
+        log = logger.bind(quick_filter=state.definition.id)
+        start_time = time.perf_counter()
+        try:
+            async with self._get_executor() as executor:
+                if state.plan is None:
+                    executor.validate_query(state.stored_query)
+                    state.plan = await executor.compile_plan(state.definition.sql)
+                if state.plan is None:
+                    raise ValueError("SQL não suportada para materialização")
+                result = await executor.materialize(
+                    state.stored_query, state.plan, self._sample_size
+                )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Any failure (including driver errors such as server selection
+            # timeouts) must not end the scheduler loop.
+            message = e.message if isinstance(e, QueryExecutionError) else str(e)
+            state.error = message or type(e).__name__
+            state.next_refresh = time.monotonic() + min(
+                self.RETRY_DELAY_SECONDS, state.interval_seconds
+            )
+            log.warning(
+                "Quick filter refresh failed",
+                error=state.error,
+                error_type=type(e).__name__,
+            )
+            return
+
+        duration_ms = int((time.perf_counter() - start_time) * 1000)
+        state.materialization = QuickFilterMaterialization(
+            user_keys=result.user_keys,
+            rows=result.rows,
+            refreshed_at=datetime.now(UTC),
+            duration_ms=duration_ms,
+        )
+        state.error = None
+        state.next_refresh = time.monotonic() + state.interval_seconds
+        log.info(
+            "Quick filter refreshed",
+            user_count=len(result.user_keys),
+            duration_ms=duration_ms,
+        )
+
+    async def refresh_due(self) -> None:
+        """Refresh, one after another, every quick filter that is due."""
+        now = time.monotonic()
+        for state in self._filters.values():
+            if state.next_refresh <= now:
+                await self.refresh(state)
+
+    async def _run(self) -> None:
+        while True:
+            await self.refresh_due()
+            if not self._filters:
+                return
+            next_refresh = min(s.next_refresh for s in self._filters.values())
+            await asyncio.sleep(max(0.0, next_refresh - time.monotonic()))
+
+    def start(self) -> None:
+        """Start refreshing in the background (first refresh right away)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="quick-filters")
+            logger.info("Quick filter scheduler started", filters=len(self._filters))
+
+    async def stop(self) -> None:
+        """Stop the background refreshes."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        logger.info("Quick filter scheduler stopped")
+
+
+# Global scheduler (started and stopped in the app lifespan)
+_scheduler: QuickFilterScheduler | None = None
+
+
+def get_quick_filter_scheduler() -> QuickFilterScheduler:
+    """Get the shared quick filter scheduler, creating it on first use.
+
+    Returns:
+        The process-wide QuickFilterScheduler.
+    """
+    global _scheduler
+    if _scheduler is None:
+        settings = get_settings()
+        _scheduler = QuickFilterScheduler(
+            definitions=load_quick_filter_definitions(settings.quick_filters_path),
+            refresh_interval_seconds=settings.quick_filters_refresh_interval_seconds,
+            sample_size=settings.quick_filters_sample_size,
+        )
+    return _scheduler
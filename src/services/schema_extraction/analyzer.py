@@ -119,6 +119,7 @@ class SchemaAnalyzer:
             # Combine all analysis
             analyzed[path] = {
                 "inferred_type": inferred_type,
+                "inferred_subtype": field_data.get("inferred_subtype"),
                 "sample_values": sample_values[:5],  # Limit to 5 samples
                 "presence_ratio": presence_info["presence_ratio"],
                 "is_required": presence_info["is_required"],
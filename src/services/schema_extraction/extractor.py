@@ -4,7 +4,7 @@ import contextlib
 import re
 from typing import Any
 
-from src.schemas.enums import InferredType
+from src.schemas.enums import InferredSubtype, InferredType
 
 
 class TypeInferrer:
@@ -15,6 +15,7 @@ class TypeInferrer:
     _DATETIME_PATTERN = re.compile(
         r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:\d{2})$"
     )
+    _NUMERIC_PATTERN = re.compile(r"^-?\d+(?:\.\d+)?$")
 
     def infer(self, value: Any) -> InferredType:
         """Infer the type of a single value.
@@ -58,6 +59,36 @@ class TypeInferrer:
 
         return InferredType.STRING
 
+    def infer_subtype(
+        self, inferred_type: InferredType, values: list[Any]
+    ) -> InferredSubtype | None:
+        """Infer the subtype of a field from all of its values.
+
+        String fields whose values are all decimal numbers, with at least one
+        fractional value (e.g. "54.08"), are monetary amounts stored as
+        strings. Integer-only strings are left alone, since those are
+        usually identifiers.
+
+        Args:
+            inferred_type: The inferred type of the field.
+            values: Every value seen for the field.
+
+        Returns:
+            The inferred subtype, or None.
+        """
+        if inferred_type != InferredType.STRING:
+            return None
+
+        has_fraction = False
+        for value in values:
+            if value is None:
+                continue
+            if not isinstance(value, str) or not self._NUMERIC_PATTERN.match(value):
+                return None
+            has_fraction = has_fraction or "." in value
+
+        return InferredSubtype.NUMERIC_STRING if has_fraction else None
+
 
 def flatten_fields(document: dict[str, Any], prefix: str = "") -> dict[str, Any]:
     """Flatten a nested document into dot-notation paths.
@@ -101,6 +132,7 @@ class SchemaExtractor:
         Returns:
             A dictionary mapping field paths to their metadata:
             - inferred_type: The inferred data type
+            - inferred_subtype: The inferred subtype (or None)
             - values: List of all values encountered
             - present_count: Number of documents containing this field
             - sample_values: Up to 5 unique sample values
@@ -148,4 +180,8 @@ class SchemaExtractor:
             if field["inferred_type"] is None:
                 field["inferred_type"] = InferredType.NULL
 
+            field["inferred_subtype"] = self._inferrer.infer_subtype(
+                field["inferred_type"], field["values"]
+            )
+
         return schema
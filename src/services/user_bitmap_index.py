@@ -0,0 +1,506 @@
+"""In-memory bitmap index of user keys per predicate.
+
+Every catalog source that declares a user key is scanned (user key plus its
+enumerable columns only) and, for each (column, value) pair, the users
+having at least one document with that value are stored as a compressed
+bitmap. User keys are mapped to dense integer IDs by a shared dictionary,
+so bitmaps of different sources can be combined.
+
+Scenarios are then answered at the user level by bitmap AND / OR / AND-NOT
+in memory; MongoDB is only queried to fetch the rows of the first users of
+the result. Refreshes are incremental (documents with an _id above the last
+one seen) with periodic full rebuilds to pick up updates and deletes.
+"""
+
+import asyncio
+import sys
+import time
+from collections import defaultdict
+from contextlib import suppress
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from functools import reduce
+from typing import Any
+
+import structlog
+from bson import decode_all
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from src.config import get_settings
+from src.core.bitmap import RoaringBitmap
+from src.core.mongo import RESULT_CODEC_OPTIONS, get_mongo_client
+from src.dependencies.catalog import get_catalog_repository
+from src.repositories.catalog.file_repository import CatalogFileRepository
+from src.schemas.catalog_yaml import SourceMetadataYaml
+from src.schemas.enums import InferredType, UserSetOperator
+from src.schemas.users import (
+    SourceBitmapStats,
+    UserBitmapIndexStats,
+    UserSetExpression,
+    UserSetQueryRequest,
+    UserSetQueryResponse,
+    UserSetTerm,
+)
+from src.services.interpreter.admission import (
+    AdmissionController,
+    AdmissionRejectedError,
+    ExecutionPriority,
+    get_admission_controller,
+)
+from src.services.interpreter.query_executor import (
+    QueryExecutionError,
+    get_path_value,
+)
+from src.services.user_dossier import user_id_candidates
+
+logger = structlog.get_logger(__name__)
+
+# Column types whose values can be indexed
+_INDEXABLE_TYPES = {
+    InferredType.STRING,
+    InferredType.INTEGER,
+    InferredType.NUMBER,
+    InferredType.BOOLEAN,
+    InferredType.DATETIME,
+}
+
+
+class UserKeyDictionary:
+    """Append-only mapping between user keys and dense integer IDs."""
+
+    def __init__(self) -> None:
+        """Initialize an empty dictionary."""
+        self._ids: dict[str, int] = {}
+        self._keys: list[str] = []
+        self._key_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def encode(self, key: str) -> int:
+        """Get the ID of a user key, assigning the next one if it is new."""
+        user_id = self._ids.get(key)
+        if user_id is None:
+            user_id = len(self._keys)
+            self._ids[key] = user_id
+            self._keys.append(key)
+            self._key_bytes += sys.getsizeof(key)
+        return user_id
+
+    def decode(self, user_ids: Any) -> list[str]:
+        """Get the user keys of a sequence of IDs."""
+        return [self._keys[user_id] for user_id in user_ids]
+
+    @property
+    def nbytes(self) -> int:
+        """Estimated memory used by the keys and both mappings, in bytes."""
+        return self._key_bytes + sys.getsizeof(self._ids) + sys.getsizeof(self._keys)
+
+
+@dataclass
+class SourceBitmaps:
+    """Bitmaps of one source.
+
+    Attributes:
+        source_id: Source ID (db_name.table_name).
+        user_key: Column path of the user key.
+        columns: Indexed column paths.
+        users: Every user with at least one document.
+        bitmaps: Users per (column, value).
+        overflowed: Columns with more distinct values than indexed.
+        last_id: Highest _id scanned (None when _id is missing or not
+            comparable, which disables incremental refreshes).
+        documents_scanned: Documents read since the last rebuild.
+        built_at: Last full rebuild.
+        refreshed_at: Last refresh (full or incremental).
+    """
+
+    source_id: str
+    user_key: str
+    columns: list[str]
+    users: RoaringBitmap = field(default_factory=RoaringBitmap)
+    bitmaps: dict[tuple[str, Any], RoaringBitmap] = field(default_factory=dict)
+    overflowed: set[str] = field(default_factory=set)
+    last_id: Any = None
+    documents_scanned: int = 0
+    built_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+    refreshed_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the bitmaps, in bytes."""
+        return self.users.nbytes + sum(b.nbytes for b in self.bitmaps.values())
+
+    def stats(self) -> SourceBitmapStats:
+        """Build the statistics of the source."""
+        return SourceBitmapStats(
+            source_id=self.source_id,
+            user_key=self.user_key,
+            columns=self.columns,
+            predicates=len(self.bitmaps),
+            users=len(self.users),
+            documents_scanned=self.documents_scanned,
+            bitmap_bytes=self.nbytes,
+            built_at=self.built_at,
+            refreshed_at=self.refreshed_at,
+        )
+
+
+class UserBitmapIndex:
+    """Maintains user key bitmaps per predicate and evaluates scenarios."""
+
+    def __init__(
+        self,
+        mongo_client: AsyncIOMotorClient | None = None,  # type: ignore[type-arg]
+        catalog_repository: CatalogFileRepository | None = None,
+        admission: AdmissionController | None = None,
+    ) -> None:
+        """Initialize the index.
+
+        Args:
+            mongo_client: Optional Motor client (defaults to the shared one).
+            catalog_repository: Optional catalog repository.
+            admission: Optional admission controller (defaults to the
+                process-wide one).
+        """
+        self._settings = get_settings()
+        self._mongo_client = mongo_client or get_mongo_client()
+        self._catalog_repository = catalog_repository or get_catalog_repository()
+        self._admission = admission or get_admission_controller()
+        self._dictionary = UserKeyDictionary()
+        self._sources: dict[str, SourceBitmaps] = {}
+        self._refresh_lock = asyncio.Lock()
+        self._refresh_count = 0
+        self._last_refresh_ms: int | None = None
+        self._last_rebuild: float | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether the index has been built at least once."""
+        return self._last_rebuild is not None
+
+    async def refresh(self, full: bool = False) -> None:
+        """Bring the bitmaps up to date with the catalog sources.
+
+        Sources are refreshed incrementally unless a full rebuild is
+        requested or due, the source is new, or its documents have no
+        comparable _id. Sources are scanned one at a time at batch priority.
+
+        Args:
+            full: Rebuild every source from scratch.
+        """
+        async with self._refresh_lock:
+            await self._refresh(full)
+
+    async def ensure_ready(self) -> None:
+        """Build the index now if it has never been built."""
+        if self.is_ready:
+            return
+        async with self._refresh_lock:
+            if not self.is_ready:
+                await self._refresh(full=True)
+
+    async def _refresh(self, full: bool) -> None:
+        start_time = time.perf_counter()
+        rebuild_due = (
+            self._last_rebuild is None
+            or time.monotonic() - self._last_rebuild
+            >= self._settings.user_index_rebuild_interval_seconds
+        )
+        full = full or rebuild_due
+
+        total = await self._catalog_repository.count_sources()
+        sources = await self._catalog_repository.list_sources(limit=total)
+        indexed: dict[str, SourceBitmaps] = {}
+        for source in sources:
+            if source.user_key is None:
+                continue
+            current = self._sources.get(source.source_id)
+            if full or current is None or current.last_id is None:
+                current = self._new_source(source, source.user_key)
+            await self._scan(current)
+            indexed[source.source_id] = current
+
+        self._sources = indexed
+        if full:
+            self._last_rebuild = time.monotonic()
+        self._refresh_count += 1
+        self._last_refresh_ms = int((time.perf_counter() - start_time) * 1000)
+        logger.info(
+            "User bitmap index refreshed",
+            full=full,
+            sources=len(indexed),
+            users=len(self._dictionary),
+            bitmap_bytes=sum(s.nbytes for s in indexed.values()),
+            duration_ms=self._last_refresh_ms,
+        )
+
+    def _new_source(self, source: SourceMetadataYaml, user_key: str) -> SourceBitmaps:
+        columns = [
+            column.path
+            for column in source.columns
+            if column.enumerable
+            and column.type in _INDEXABLE_TYPES
+            and column.path != user_key
+        ]
+        return SourceBitmaps(
+            source_id=source.source_id, user_key=user_key, columns=columns
+        )
+
+    async def _scan(self, bitmaps: SourceBitmaps) -> None:
+        """Scan new documents of a source and OR them into its bitmaps.
+
+        Only the user key, the indexed columns and _id are projected.
+
+        Args:
+            bitmaps: The source to update (modified in place).
+        """
+        db_name, collection_name = bitmaps.source_id.split(".", 1)
+        collection = self._mongo_client[db_name][collection_name]
+        filter_query = (
+            {"_id": {"$gt": bitmaps.last_id}} if bitmaps.last_id is not None else {}
+        )
+        projection = {bitmaps.user_key: 1, "_id": 1} | dict.fromkeys(bitmaps.columns, 1)
+        max_values = self._settings.user_index_max_values_per_column
+
+        users: list[int] = []
+        values: dict[tuple[str, Any], list[int]] = defaultdict(list)
+        distinct_values: dict[str, set[Any]] = defaultdict(set)
+        for column, value in bitmaps.bitmaps:
+            distinct_values[column].add(value)
+        last_id = bitmaps.last_id
+        comparable_ids = True
+        scanned = 0
+
+        async with self._admission.admit([bitmaps.source_id], ExecutionPriority.BATCH):
+            async for document in collection.find(filter_query, projection):
+                scanned += 1
+                document_id = document.get("_id")
+                if comparable_ids:
+                    try:
+                        if last_id is None or document_id > last_id:
+                            last_id = document_id
+                    except TypeError:
+                        comparable_ids = False
+                raw_key = get_path_value(document, bitmaps.user_key)
+                if raw_key is None:
+                    continue
+                user_id = self._dictionary.encode(str(raw_key))
+                users.append(user_id)
+                for column in bitmaps.columns:
+                    value = get_path_value(document, column)
+                    if value is None or isinstance(value, dict | list):
+                        continue
+                    seen = distinct_values[column]
+                    if value not in seen:
+                        if len(seen) >= max_values:
+                            bitmaps.overflowed.add(column)
+                            continue
+                        seen.add(value)
+                    values[(column, value)].append(user_id)
+
+        bitmaps.users = bitmaps.users | RoaringBitmap.from_values(users)
+        for predicate, user_ids in values.items():
+            added = RoaringBitmap.from_values(user_ids)
+            current = bitmaps.bitmaps.get(predicate)
+            bitmaps.bitmaps[predicate] = added if current is None else current | added
+        bitmaps.last_id = last_id if comparable_ids else None
+        bitmaps.documents_scanned += scanned
+        bitmaps.refreshed_at = datetime.now(UTC)
+
+    def evaluate(self, node: UserSetExpression | UserSetTerm) -> RoaringBitmap:
+        """Evaluate a user set expression over the bitmaps.
+
+        Args:
+            node: The expression (or a single term).
+
+        Returns:
+            Bitmap of the matching user IDs.
+
+        Raises:
+            QueryExecutionError: If a term uses a source or column that is
+                not indexed.
+        """
+        if isinstance(node, UserSetTerm):
+            return self._evaluate_term(node)
+
+        operands = [self.evaluate(operand) for operand in node.operands]
+        if node.operator == UserSetOperator.AND:
+            # Smallest first: intermediate results only shrink
+            operands.sort(key=len)
+            return reduce(lambda left, right: left & right, operands)
+        if node.operator == UserSetOperator.OR:
+            return reduce(lambda left, right: left | right, operands)
+        return reduce(lambda left, right: left - right, operands)
+
+    def _get_source(self, source_id: str) -> SourceBitmaps:
+        source = self._sources.get(source_id)
+        if source is None:
+            raise QueryExecutionError(
+                code="SOURCE_NOT_INDEXED",
+                message=f"Fonte {source_id} não está no índice de usuários",
+                details={"source": source_id, "indexed_sources": list(self._sources)},
+                suggestions=["Use uma fonte do catálogo que declare user_key."],
+            )
+        return source
+
+    def _evaluate_term(self, term: UserSetTerm) -> RoaringBitmap:
+        source = self._get_source(term.source)
+        if term.column is None or term.values is None:
+            return source.users
+
+        if term.column not in source.columns:
+            raise QueryExecutionError(
+                code="PREDICATE_NOT_INDEXED",
+                message=f"Coluna {term.column} não está indexada em {term.source}",
+                details={"column": term.column, "indexed_columns": source.columns},
+                suggestions=["Use uma coluna enumerável da fonte."],
+            )
+
+        result = RoaringBitmap()
+        for value in term.values:
+            bitmap = source.bitmaps.get((term.column, value))
+            if bitmap is None and term.column in source.overflowed:
+                raise QueryExecutionError(
+                    code="PREDICATE_NOT_INDEXED",
+                    message=(
+                        f"Valor {value!r} de {term.column} não está indexado "
+                        f"em {term.source}"
+                    ),
+                    details={"column": term.column, "value": value},
+                    suggestions=["Use a busca por consulta para este valor."],
+                )
+            if bitmap is not None:
+                result = result | bitmap
+        return result
+
+    async def query(self, request: UserSetQueryRequest) -> UserSetQueryResponse:
+        """Resolve a user set and fetch the rows of its first users.
+
+        Builds the index first if it has never been built.
+
+        Args:
+            request: The expression, the row limit and the row source.
+
+        Returns:
+            UserSetQueryResponse with the user count and the rows.
+
+        Raises:
+            QueryExecutionError: If a term is not indexed or the row fetch
+                is not admitted.
+        """
+        start_time = time.perf_counter()
+        await self.ensure_ready()
+
+        matched = self.evaluate(request.expression)
+        source = self._get_source(request.source or _first_source(request.expression))
+
+        user_keys = self._dictionary.decode(
+            matched.to_array(request.limit).tolist() if request.limit else []
+        )
+        rows = await self._fetch_rows(source, user_keys, request.limit)
+
+        return UserSetQueryResponse(
+            user_count=len(matched),
+            user_keys=user_keys,
+            source=source.source_id,
+            rows=rows,
+            index_refreshed_at=source.refreshed_at,
+            execution_time_ms=int((time.perf_counter() - start_time) * 1000),
+        )
+
+    async def _fetch_rows(
+        self, source: SourceBitmaps, user_keys: list[str], limit: int
+    ) -> list[dict[str, Any]]:
+        """Fetch up to limit documents of the given users from a source."""
+        if not user_keys:
+            return []
+        db_name, collection_name = source.source_id.split(".", 1)
+        collection = self._mongo_client[db_name][collection_name]
+        candidates = [c for key in user_keys for c in user_id_candidates(key)]
+        filter_query = {source.user_key: {"$in": candidates}}
+
+        rows: list[dict[str, Any]] = []
+        try:
+            async with self._admission.admit([source.source_id]):
+                cursor = collection.find_raw_batches(filter_query, limit=limit)
+                async for raw_batch in cursor:
+                    rows.extend(decode_all(raw_batch, RESULT_CODEC_OPTIONS))
+        except AdmissionRejectedError as e:
+            raise QueryExecutionError(
+                code=e.code,
+                message=e.message,
+                details={"retry_after_seconds": e.retry_after_seconds},
+                suggestions=[f"Tente novamente em {e.retry_after_seconds} segundo(s)."],
+            ) from e
+        return rows
+
+    def stats(self) -> UserBitmapIndexStats:
+        """Get the memory usage and freshness of the index."""
+        sources = [source.stats() for source in self._sources.values()]
+        return UserBitmapIndexStats(
+            ready=self.is_ready,
+            users=len(self._dictionary),
+            predicates=sum(s.predicates for s in sources),
+            bitmap_bytes=sum(s.bitmap_bytes for s in sources),
+            dictionary_bytes=self._dictionary.nbytes,
+            refresh_count=self._refresh_count,
+            last_refresh_ms=self._last_refresh_ms,
+            sources=sources,
+        )
+
+    async def _run(self) -> None:
+        interval = self._settings.user_index_refresh_interval_seconds
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Driver errors (e.g. PyMongoError) must not end the refresher
+                logger.error(
+                    "User bitmap index refresh failed",
+                    error=str(e),
+                    error_type=type(e).__name__,
+                )
+            await asyncio.sleep(interval)
+
+    def start(self) -> None:
+        """Start refreshing in the background (first build right away)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="user-bitmap-index")
+            logger.info("User bitmap index refresher started")
+
+    async def stop(self) -> None:
+        """Stop the background refreshes."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        logger.info("User bitmap index refresher stopped")
+
+
+def _first_source(node: UserSetExpression | UserSetTerm) -> str:
+    """Get the source of the first term of an expression."""
+    while isinstance(node, UserSetExpression):
+        node = node.operands[0]
+    return node.source
+
+
+# Global index (refreshed in the background from the app lifespan)
+_user_bitmap_index: UserBitmapIndex | None = None
+
+
+def get_user_bitmap_index() -> UserBitmapIndex:
+    """Get the shared user bitmap index, creating it on first use.
+
+    Returns:
+        The process-wide UserBitmapIndex.
+    """
+    global _user_bitmap_index
+    if _user_bitmap_index is None:
+        _user_bitmap_index = UserBitmapIndex()
+    return _user_bitmap_index
@@ -0,0 +1,257 @@
+"""User dossier: every document of one user across the catalog sources.
+
+Each catalog source that declares a user key is queried concurrently with
+an indexed equality lookup on that key. Lookups are independent: a slow or
+failing source is reported in the dossier instead of failing it, and each
+lookup is bounded by its own timeout. Complete dossiers are cached for a
+short TTL.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+import structlog
+from bson import decode_all
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from src.config import get_settings
+from src.core.mongo import RESULT_CODEC_OPTIONS, get_mongo_client
+from src.dependencies.catalog import get_catalog_repository
+from src.repositories.catalog.cache import AsyncTTLCache
+from src.repositories.catalog.file_repository import CatalogFileRepository
+from src.schemas.catalog_yaml import SourceMetadataYaml
+from src.schemas.enums import DossierSourceStatus
+from src.schemas.users import DossierSourceResult, UserDossierResponse
+from src.services.interpreter.admission import (
+    AdmissionController,
+    get_admission_controller,
+)
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass
+class _SourceLookup:
+    """Result of the lookup of one source."""
+
+    result: DossierSourceResult
+    documents: list[dict[str, Any]] = field(default_factory=list)
+
+
+def user_id_candidates(consumer_id: str) -> list[Any]:
+    """Get the values a user ID may be stored as.
+
+    Path parameters are strings, but some sources store numeric IDs as
+    numbers; both forms are matched.
+    """
+    candidates: list[Any] = [consumer_id]
+    if consumer_id.isdigit():
+        candidates.append(int(consumer_id))
+    return candidates
+
+
+# Dossiers shared by every UserDossierService, keyed by user ID
+_dossier_cache: AsyncTTLCache[UserDossierResponse] | None = None
+
+
+def get_dossier_cache() -> AsyncTTLCache[UserDossierResponse]:
+    """Get the shared dossier cache, creating it on first use."""
+    global _dossier_cache
+    if _dossier_cache is None:
+        settings = get_settings()
+        _dossier_cache = AsyncTTLCache(
+            ttl_seconds=settings.dossier_cache_ttl_seconds,
+            max_entries=settings.dossier_cache_max_entries,
+            max_bytes=settings.dossier_cache_max_bytes,
+        )
+    return _dossier_cache
+
+
+class UserDossierService:
+    """Builds user dossiers by fanning out lookups to the catalog sources."""
+
+    def __init__(
+        self,
+        mongo_client: AsyncIOMotorClient | None = None,  # type: ignore[type-arg]
+        catalog_repository: CatalogFileRepository | None = None,
+        admission: AdmissionController | None = None,
+    ) -> None:
+        """Initialize the service.
+
+        Args:
+            mongo_client: Optional Motor client (defaults to the shared one).
+            catalog_repository: Optional catalog repository.
+            admission: Optional admission controller (defaults to the
+                process-wide one).
+        """
+        self._settings = get_settings()
+        self._mongo_client = mongo_client or get_mongo_client()
+        self._catalog_repository = catalog_repository or get_catalog_repository()
+        self._admission = admission or get_admission_controller()
+
+    async def get_dossier(self, consumer_id: str) -> UserDossierResponse:
+        """Get every document of a user across the catalog sources.
+
+        Args:
+            consumer_id: The user identifier.
+
+        Returns:
+            UserDossierResponse with the documents grouped by source.
+        """
+        start_time = time.perf_counter()
+        cache = get_dossier_cache()
+        loaded = False
+
+        async def load() -> UserDossierResponse:
+            nonlocal loaded
+            loaded = True
+            return await self._build_dossier(consumer_id)
+
+        dossier = await cache.get_or_load(consumer_id, load)
+        if loaded and dossier.is_partial:
+            # Do not serve a dossier with failed sources from the cache
+            cache.invalidate(consumer_id)
+
+        return dossier.model_copy(
+            update={
+                "cached": not loaded,
+                "execution_time_ms": int((time.perf_counter() - start_time) * 1000),
+            }
+        )
+
+    async def _build_dossier(self, consumer_id: str) -> UserDossierResponse:
+        """Query every source with a user key concurrently and merge.
+
+        Args:
+            consumer_id: The user identifier.
+
+        Returns:
+            The uncached dossier.
+        """
+        total = await self._catalog_repository.count_sources()
+        sources = [
+            (source, source.user_key)
+            for source in await self._catalog_repository.list_sources(limit=total)
+            if source.user_key is not None
+        ]
+        candidates = user_id_candidates(consumer_id)
+
+        lookups = await asyncio.gather(
+            *(
+                self._lookup_source(source, user_key, candidates)
+                for source, user_key in sources
+            )
+        )
+
+        documents = {
+            lookup.result.source_id: lookup.documents
+            for lookup in lookups
+            if lookup.documents
+        }
+        results = [lookup.result for lookup in lookups]
+        is_partial = any(r.status != DossierSourceStatus.OK for r in results)
+        logger.info(
+            "User dossier built",
+            sources=len(results),
+            sources_with_documents=len(documents),
+            is_partial=is_partial,
+        )
+
+        return UserDossierResponse(
+            consumer_id=consumer_id,
+            documents=documents,
+            sources=results,
+            is_partial=is_partial,
+            execution_time_ms=0,
+        )
+
+    async def _lookup_source(
+        self, source: SourceMetadataYaml, user_key: str, candidates: list[Any]
+    ) -> _SourceLookup:
+        """Fetch the documents of one user from one source, within a timeout.
+
+        The timeout covers the wait for an execution slot as well as the
+        lookup itself. Failures are captured in the result.
+
+        Args:
+            source: The catalog source.
+            user_key: The source's user key column path.
+            candidates: Values the user key may be stored as.
+
+        Returns:
+            The lookup result and documents.
+        """
+        timeout = self._settings.dossier_source_timeout_seconds
+        start_time = time.perf_counter()
+
+        def result(
+            status: DossierSourceStatus, error: str | None = None, **extra: Any
+        ) -> DossierSourceResult:
+            return DossierSourceResult(
+                source_id=source.source_id,
+                user_key=user_key,
+                status=status,
+                error=error,
+                elapsed_ms=int((time.perf_counter() - start_time) * 1000),
+                **extra,
+            )
+
+        try:
+            documents = await asyncio.wait_for(
+                self._find_documents(source, user_key, candidates), timeout
+            )
+        except TimeoutError:
+            logger.warning(
+                "Dossier lookup timed out",
+                source_id=source.source_id,
+                timeout_seconds=timeout,
+            )
+            return _SourceLookup(
+                result(
+                    DossierSourceStatus.TIMEOUT,
+                    f"Tempo limite de {timeout:g}s excedido",
+                )
+            )
+        except Exception as e:
+            logger.warning(
+                "Dossier lookup failed", source_id=source.source_id, error=str(e)
+            )
+            return _SourceLookup(result(DossierSourceStatus.ERROR, str(e)))
+
+        max_documents = self._settings.dossier_source_max_documents
+        return _SourceLookup(
+            result(
+                DossierSourceStatus.OK,
+                document_count=min(len(documents), max_documents),
+                truncated=len(documents) > max_documents,
+            ),
+            documents[:max_documents],
+        )
+
+    async def _find_documents(
+        self, source: SourceMetadataYaml, user_key: str, candidates: list[Any]
+    ) -> list[dict[str, Any]]:
+        """Run the user-key lookup on a source once admitted.
+
+        One extra document is fetched to detect truncation.
+
+        Args:
+            source: The catalog source.
+            user_key: The source's user key column path.
+            candidates: Values the user key may be stored as.
+
+        Returns:
+            Up to dossier_source_max_documents + 1 JSON-ready documents.
+        """
+        collection = self._mongo_client[source.db_name][source.table_name]
+        filter_query = {user_key: {"$in": candidates}}
+        limit = self._settings.dossier_source_max_documents + 1
+
+        documents: list[dict[str, Any]] = []
+        async with self._admission.admit([source.source_id]):
+            cursor = collection.find_raw_batches(filter_query, limit=limit)
+            async for raw_batch in cursor:
+                documents.extend(decode_all(raw_batch, RESULT_CODEC_OPTIONS))
+        return documents
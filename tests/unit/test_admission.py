@@ -0,0 +1,200 @@
+"""Unit tests for query admission control."""
+
+import asyncio
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+
+from src.schemas.interpreter import StoredQuery
+from src.services.interpreter.admission import (
+    AdmissionController,
+    AdmissionRejectedError,
+    ExecutionPriority,
+)
+from src.services.interpreter.query_executor import QueryExecutionError, QueryExecutor
+
+
+def _controller(
+    max_in_flight: int = 2,
+    source_max_in_flight: int = 1,
+    max_queue_size: int = 10,
+    queue_timeout_seconds: float = 1.0,
+) -> AdmissionController:
+    return AdmissionController(
+        max_in_flight=max_in_flight,
+        source_max_in_flight=source_max_in_flight,
+        max_queue_size=max_queue_size,
+        queue_timeout_seconds=queue_timeout_seconds,
+    )
+
+
+async def _hold(
+    controller: AdmissionController,
+    sources: list[str],
+    release: asyncio.Event,
+    order: list[str] | None = None,
+    name: str = "",
+    priority: ExecutionPriority = ExecutionPriority.INTERACTIVE,
+) -> None:
+    async with controller.admit(sources, priority):
+        if order is not None:
+            order.append(name)
+        await release.wait()
+
+
+class TestAdmissionController:
+    """Tests for the bulkheads and the priority queue."""
+
+    @pytest.mark.asyncio
+    async def test_admit_and_release(self) -> None:
+        """Test that a free slot is granted at once and released on exit."""
+        controller = _controller()
+
+        async with controller.admit(["credit.invoice"]):
+            stats = controller.stats()
+            assert stats.in_flight == 1
+            assert stats.in_flight_by_source == {"credit.invoice": 1}
+
+        stats = controller.stats()
+        assert stats.in_flight == 0
+        assert stats.in_flight_by_source == {}
+        assert stats.admitted_total == 1
+
+    @pytest.mark.asyncio
+    async def test_source_bulkhead_does_not_block_other_sources(self) -> None:
+        """Test that a saturated source only queues its own executions."""
+        controller = _controller(max_in_flight=3, source_max_in_flight=1)
+        release = asyncio.Event()
+        order: list[str] = []
+
+        busy = asyncio.create_task(
+            _hold(controller, ["credit.invoice"], release, order, "first")
+        )
+        await asyncio.sleep(0)
+        same_source = asyncio.create_task(
+            _hold(controller, ["credit.invoice"], release, order, "second")
+        )
+        other_source = asyncio.create_task(
+            _hold(controller, ["card.main"], release, order, "other")
+        )
+        await asyncio.sleep(0.01)
+
+        assert order == ["first", "other"]
+        assert controller.stats().queued == 1
+
+        release.set()
+        await asyncio.gather(busy, same_source, other_source)
+        assert order == ["first", "other", "second"]
+
+    @pytest.mark.asyncio
+    async def test_interactive_runs_before_batch(self) -> None:
+        """Test that queued interactive executions overtake batch ones."""
+        controller = _controller(max_in_flight=1, source_max_in_flight=5)
+        hold = asyncio.Event()
+        release = asyncio.Event()
+        release.set()
+        order: list[str] = []
+
+        blocker = asyncio.create_task(_hold(controller, ["a"], hold))
+        await asyncio.sleep(0)
+        batch = asyncio.create_task(
+            _hold(controller, ["a"], release, order, "batch", ExecutionPriority.BATCH)
+        )
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(
+            _hold(controller, ["a"], release, order, "interactive")
+        )
+        await asyncio.sleep(0)
+        assert controller.stats().queued_by_priority == {"interactive": 1, "batch": 1}
+
+        hold.set()
+        await asyncio.gather(blocker, batch, interactive)
+        assert order == ["interactive", "batch"]
+
+    @pytest.mark.asyncio
+    async def test_full_queue_rejects_immediately(self) -> None:
+        """Test that a full queue rejects new executions without waiting."""
+        controller = _controller(max_in_flight=1, max_queue_size=0)
+        release = asyncio.Event()
+        blocker = asyncio.create_task(_hold(controller, ["a"], release))
+        await asyncio.sleep(0)
+
+        assert controller.is_saturated()
+        with pytest.raises(AdmissionRejectedError) as exc_info:
+            async with controller.admit(["b"]):
+                pass
+
+        assert exc_info.value.code == "QUERY_QUEUE_FULL"
+        assert controller.stats().rejected_total == 1
+        release.set()
+        await blocker
+
+    @pytest.mark.asyncio
+    async def test_queue_timeout(self) -> None:
+        """Test that waiting past the timeout rejects and leaves the queue."""
+        controller = _controller(max_in_flight=1, queue_timeout_seconds=0.01)
+        release = asyncio.Event()
+        blocker = asyncio.create_task(_hold(controller, ["a"], release))
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejectedError) as exc_info:
+            async with controller.admit(["a"]):
+                pass
+
+        assert exc_info.value.code == "QUERY_QUEUE_TIMEOUT"
+        stats = controller.stats()
+        assert stats.timed_out_total == 1
+        assert stats.queued == 0
+        release.set()
+        await blocker
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self) -> None:
+        """Test that a cancelled caller does not keep its queue entry."""
+        controller = _controller(max_in_flight=1)
+        release = asyncio.Event()
+        blocker = asyncio.create_task(_hold(controller, ["a"], release))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(_hold(controller, ["a"], release))
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert controller.stats().queued == 0
+        release.set()
+        await blocker
+        assert controller.stats().in_flight == 0
+
+
+class TestExecutorAdmission:
+    """Tests for admission errors surfaced by QueryExecutor."""
+
+    @pytest.mark.asyncio
+    async def test_rejection_becomes_execution_error(self) -> None:
+        """Test that a rejected execution raises QUERY_QUEUE_FULL."""
+        controller = _controller(max_in_flight=1, max_queue_size=0)
+        executor = QueryExecutor(
+            MagicMock(),
+            mongo_client=MagicMock(),
+            catalog_repository=MagicMock(),
+            admission=controller,
+        )
+        stored_query = StoredQuery(
+            interpretation_id=uuid4(),
+            sql="SELECT * FROM credit.invoice",
+            is_valid=True,
+        )
+        release = asyncio.Event()
+        blocker = asyncio.create_task(_hold(controller, ["a"], release))
+        await asyncio.sleep(0)
+
+        with pytest.raises(QueryExecutionError) as exc_info:
+            await executor.execute_query(stored_query)
+
+        assert exc_info.value.code == "QUERY_QUEUE_FULL"
+        assert exc_info.value.details == {"retry_after_seconds": 1}
+        release.set()
+        await blocker
@@ -233,3 +233,200 @@ class TestAsyncTTLCache:
 
         assert result == "success"
         assert call_count == 2
+
+
+async def _value(value: str) -> str:
+    return value
+
+
+class TestAsyncTTLCacheBounds:
+    """Tests for size bounds, purging, key locks and counters."""
+
+    @pytest.mark.asyncio
+    async def test_max_entries_evicts_least_recently_used(self) -> None:
+        """Test that the least recently used entry is evicted first."""
+        cache: AsyncTTLCache[str] = AsyncTTLCache(ttl_seconds=60.0, max_entries=2)
+
+        await cache.get_or_load("a", lambda: _value("a"))
+        await cache.get_or_load("b", lambda: _value("b"))
+        await cache.get_or_load("a", lambda: _value("a"))  # "b" is now the LRU
+        await cache.get_or_load("c", lambda: _value("c"))
+
+        assert cache.invalidate("b") is False
+        assert cache.size() == 2
+        assert cache.stats().evictions == 1
+
+    @pytest.mark.asyncio
+    async def test_max_bytes_evicts_until_within_bound(self) -> None:
+        """Test that byte accounting evicts entries and oversized values."""
+        cache: AsyncTTLCache[str] = AsyncTTLCache(
+            ttl_seconds=60.0, max_bytes=10, sizeof=len
+        )
+
+        await cache.get_or_load("a", lambda: _value("x" * 4))
+        await cache.get_or_load("b", lambda: _value("x" * 4))
+        assert cache.stats().bytes == 8
+
+        await cache.get_or_load("c", lambda: _value("x" * 4))
+        assert cache.stats().bytes == 8
+        assert cache.invalidate("a") is False
+
+        # A value larger than the bound is returned but not kept
+        assert await cache.get_or_load("d", lambda: _value("x" * 11)) == "x" * 11
+        stats = cache.stats()
+        assert stats.entries == 0
+        assert stats.bytes == 0
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_purged(self) -> None:
+        """Test lazy and periodic removal of expired entries."""
+        cache: AsyncTTLCache[str] = AsyncTTLCache(
+            ttl_seconds=0.05, purge_interval_seconds=0.05
+        )
+        await cache.get_or_load("a", lambda: _value("a"))
+        await cache.get_or_load("b", lambda: _value("b"))
+        await asyncio.sleep(0.06)
+
+        # Writing after the purge interval removes every expired entry
+        await cache.get_or_load("c", lambda: _value("c"))
+
+        stats = cache.stats()
+        assert stats.entries == 1
+        assert stats.expirations == 2
+
+    @pytest.mark.asyncio
+    async def test_key_locks_are_released(self) -> None:
+        """Test that per-key locks do not outlive their waiters."""
+        cache: AsyncTTLCache[str] = AsyncTTLCache(ttl_seconds=60.0)
+        release = asyncio.Event()
+
+        async def slow_loader() -> str:
+            await release.wait()
+            return "value"
+
+        async def failing_loader() -> str:
+            raise ValueError("fail")
+
+        tasks = [
+            asyncio.create_task(cache.get_or_load("key", slow_loader)) for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        assert cache.stats().key_locks == 1
+
+        release.set()
+        await asyncio.gather(*tasks)
+        with pytest.raises(ValueError):
+            await cache.get_or_load("other", failing_loader)
+
+        assert cache.stats().key_locks == 0
+
+    @pytest.mark.asyncio
+    async def test_hit_and_miss_counters(self) -> None:
+        """Test that lookups are counted as hits or misses."""
+        cache: AsyncTTLCache[str] = AsyncTTLCache(ttl_seconds=60.0)
+
+        await cache.get_or_load("a", lambda: _value("a"))
+        await cache.get_or_load("a", lambda: _value("a"))
+        await cache.get_or_load("b", lambda: _value("b"))
+
+        stats = cache.stats()
+        assert (stats.hits, stats.misses) == (1, 2)
+
+
+class TestStaleWhileRevalidate:
+    """Tests for background refresh of expired and expiring entries."""
+
+    @pytest.mark.asyncio
+    async def test_stale_value_served_while_refreshing(self) -> None:
+        """Test that an expired entry is returned at once and reloaded."""
+        cache: AsyncTTLCache[str] = AsyncTTLCache(ttl_seconds=0.05, stale_seconds=60)
+        versions = iter(["v1", "v2"])
+
+        async def loader() -> str:
+            return next(versions)
+
+        assert await cache.get_or_load("key", loader) == "v1"
+        await asyncio.sleep(0.06)
+
+        assert await cache.get_or_load("key", loader) == "v1"
+        await cache.join_refreshes()
+        assert await cache.get_or_load("key", loader) == "v2"
+
+        stats = cache.stats()
+        assert (stats.stale_hits, stats.refreshes, stats.misses) == (1, 1, 1)
+
+    @pytest.mark.asyncio
+    async def test_refresh_ahead_of_expiry(self) -> None:
+        """Test that entries close to expiry are reloaded in the background."""
+        cache: AsyncTTLCache[str] = AsyncTTLCache(
+            ttl_seconds=60.0, refresh_ahead_seconds=60.0
+        )
+        load_count = 0
+
+        async def loader() -> str:
+            nonlocal load_count
+            load_count += 1
+            return f"value_{load_count}"
+
+        await cache.get_or_load("key", loader)
+        # Concurrent hits schedule a single refresh
+        await asyncio.gather(*(cache.get_or_load("key", loader) for _ in range(3)))
+        await cache.join_refreshes()
+
+        assert load_count == 2
+        assert cache.stats().stale_hits == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_stale_value(self) -> None:
+        """Test that a failing reload does not drop the served value."""
+        cache: AsyncTTLCache[str] = AsyncTTLCache(ttl_seconds=0.05, stale_seconds=60)
+        await cache.get_or_load("key", lambda: _value("v1"))
+        await asyncio.sleep(0.06)
+
+        async def failing_loader() -> str:
+            raise OSError("file gone")
+
+        assert await cache.get_or_load("key", failing_loader) == "v1"
+        await cache.join_refreshes()
+
+        assert await cache.get_or_load("key", failing_loader) == "v1"
+        assert cache.stats().refresh_failures >= 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_discards_in_flight_refresh(self) -> None:
+        """Test that a refresh started before invalidate is not stored."""
+        cache: AsyncTTLCache[str] = AsyncTTLCache(ttl_seconds=0.05, stale_seconds=60)
+        await cache.get_or_load("key", lambda: _value("v1"))
+        await asyncio.sleep(0.06)
+        release = asyncio.Event()
+
+        async def slow_loader() -> str:
+            await release.wait()
+            return "old"
+
+        await cache.get_or_load("key", slow_loader)
+        cache.invalidate("key")
+        release.set()
+        await cache.join_refreshes()
+
+        assert await cache.get_or_load("key", lambda: _value("new")) == "new"
+
+    @pytest.mark.asyncio
+    async def test_invalidate_keeps_other_keys_refreshing(self) -> None:
+        """Test that invalidating one key does not discard other refreshes."""
+        cache: AsyncTTLCache[str] = AsyncTTLCache(ttl_seconds=0.05, stale_seconds=60)
+        await cache.get_or_load("a", lambda: _value("a1"))
+        await cache.get_or_load("b", lambda: _value("b1"))
+        await asyncio.sleep(0.06)
+        release = asyncio.Event()
+
+        async def slow_loader() -> str:
+            await release.wait()
+            return "a2"
+
+        await cache.get_or_load("a", slow_loader)
+        cache.invalidate("b")
+        release.set()
+        await cache.join_refreshes()
+
+        assert await cache.get_or_load("a", lambda: _value("stale")) == "a2"
@@ -0,0 +1,171 @@
+"""Unit tests for BatchQueryExecutor."""
+
+import asyncio
+from unittest.mock import MagicMock
+from uuid import UUID, uuid4
+
+import pytest
+
+from src.schemas.interpreter import QueryResultResponse, StoredQuery
+from src.services.interpreter.admission import ExecutionPriority
+from src.services.interpreter.batch_executor import BatchEntry, BatchQueryExecutor
+from src.services.interpreter.query_executor import QueryExecutionError
+
+
+def _stored(sql: str, is_valid: bool = True) -> StoredQuery:
+    return StoredQuery(interpretation_id=uuid4(), sql=sql, is_valid=is_valid)
+
+
+def _entries(*queries: StoredQuery | None, limit: int = 10) -> list[BatchEntry]:
+    return [
+        BatchEntry(
+            index=i,
+            query_id=q.id if q else uuid4(),
+            stored_query=q,
+            limit=limit,
+        )
+        for i, q in enumerate(queries)
+    ]
+
+
+class RecordingExecutor:
+    """Fake executor that records calls and tracks concurrency."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.calls: list[str] = []
+        self.limits: list[int | None] = []
+        self.priorities: list[ExecutionPriority] = []
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def execute_query(
+        self,
+        stored_query: StoredQuery,
+        limit: int | None = None,
+        priority: ExecutionPriority = ExecutionPriority.INTERACTIVE,
+    ) -> QueryResultResponse:
+        self.calls.append(stored_query.sql)
+        self.limits.append(limit)
+        self.priorities.append(priority)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        if "missing" in stored_query.sql:
+            raise QueryExecutionError(code="EXECUTION_ERROR", message="falhou")
+        return QueryResultResponse(
+            query_id=stored_query.id,
+            rows=[{"_id": "1"}],
+            row_count=1,
+            execution_time_ms=1,
+        )
+
+
+async def _collect(batch: BatchQueryExecutor, entries: list[BatchEntry]) -> list:
+    return [result async for result in batch.stream(entries)]
+
+
+class TestBatchQueryExecutor:
+    """Tests for batch execution."""
+
+    @pytest.mark.asyncio
+    async def test_identical_plans_run_once(self) -> None:
+        """Test that queries compiling to the same plan share one execution."""
+        executor = RecordingExecutor()
+        batch = BatchQueryExecutor(executor, source_concurrency=2)  # type: ignore[arg-type]
+        first = _stored("SELECT * FROM credit.invoice WHERE status = 'OPEN'")
+        second = _stored("SELECT * FROM credit.invoice i WHERE i.status = 'OPEN'")
+
+        results = await _collect(batch, _entries(first, second))
+
+        assert len(executor.calls) == 1
+        assert executor.priorities == [ExecutionPriority.BATCH]
+        assert sorted(r.index for r in results) == [0, 1]
+        by_index = {r.index: r for r in results}
+        assert by_index[0].deduplicated is False
+        assert by_index[1].deduplicated is True
+        assert by_index[1].result.query_id == second.id
+
+    @pytest.mark.asyncio
+    async def test_different_limits_are_not_deduplicated(self) -> None:
+        """Test that the same plan with another limit runs separately."""
+        executor = RecordingExecutor()
+        batch = BatchQueryExecutor(executor)  # type: ignore[arg-type]
+        query = _stored("SELECT * FROM credit.invoice")
+        entries = _entries(query, query)
+        entries[1].limit = 50
+
+        await _collect(batch, entries)
+
+        assert sorted(executor.limits) == [10, 50]
+
+    @pytest.mark.asyncio
+    async def test_unknown_and_blocked_queries(self) -> None:
+        """Test that unknown and blocked queries yield errors without running."""
+        executor = RecordingExecutor()
+        batch = BatchQueryExecutor(executor)  # type: ignore[arg-type]
+        blocked = _stored("DELETE FROM credit.invoice", is_valid=False)
+
+        results = await _collect(batch, _entries(None, blocked))
+
+        assert executor.calls == []
+        assert [r.error.code for r in results] == ["QUERY_NOT_FOUND", "QUERY_BLOCKED"]
+
+    @pytest.mark.asyncio
+    async def test_execution_errors_do_not_stop_the_batch(self) -> None:
+        """Test that a failing query is reported and others still complete."""
+        executor = RecordingExecutor()
+        batch = BatchQueryExecutor(executor)  # type: ignore[arg-type]
+
+        results = await _collect(
+            batch,
+            _entries(
+                _stored("SELECT * FROM credit.missing"),
+                _stored("SELECT * FROM credit.invoice"),
+            ),
+        )
+
+        by_index = {r.index: r for r in results}
+        assert by_index[0].error is not None
+        assert by_index[0].error.code == "EXECUTION_ERROR"
+        assert by_index[1].result is not None
+
+    @pytest.mark.asyncio
+    async def test_per_source_concurrency_cap(self) -> None:
+        """Test that queries on one source never exceed the cap."""
+        executor = RecordingExecutor(delay=0.01)
+        batch = BatchQueryExecutor(executor, source_concurrency=2)  # type: ignore[arg-type]
+        queries = [
+            _stored(f"SELECT * FROM credit.invoice WHERE value = {i}") for i in range(6)
+        ]
+
+        results = await _collect(batch, _entries(*queries))
+
+        assert len(results) == 6
+        assert executor.max_in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_results_stream_in_completion_order(self) -> None:
+        """Test that a fast query is yielded before a slow one."""
+        executor = MagicMock()
+
+        async def execute_query(
+            stored_query: StoredQuery,
+            _limit: int | None = None,
+            **_kwargs: object,
+        ) -> QueryResultResponse:
+            await asyncio.sleep(0.05 if "slow" in stored_query.sql else 0)
+            return QueryResultResponse(
+                query_id=stored_query.id, rows=[], row_count=0, execution_time_ms=0
+            )
+
+        executor.execute_query = execute_query
+        batch = BatchQueryExecutor(executor)
+        slow = _stored("SELECT * FROM credit.slow")
+        fast = _stored("SELECT * FROM credit.fast")
+
+        results = await _collect(batch, _entries(slow, fast))
+
+        assert [r.query_id for r in results] == [fast.id, slow.id]
+        assert all(isinstance(r.query_id, UUID) for r in results)
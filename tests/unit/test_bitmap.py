@@ -0,0 +1,58 @@
+"""Unit tests for the compressed bitmap."""
+
+import random
+
+import pytest
+
+from src.core.bitmap import ARRAY_MAX_SIZE, RoaringBitmap
+
+
+def _random_set(size: int, seed: int) -> set[int]:
+    rng = random.Random(seed)
+    return set(rng.sample(range(300_000), size))
+
+
+class TestRoaringBitmap:
+    """Tests for set semantics across array and bitset containers."""
+
+    @pytest.mark.parametrize(
+        ("left_size", "right_size"),
+        [(10, 20), (10, 100_000), (100_000, 10), (60_000, 100_000), (0, 50)],
+    )
+    def test_set_operations_match_python_sets(
+        self, left_size: int, right_size: int
+    ) -> None:
+        """Test and, or and and-not against Python sets."""
+        left = _random_set(left_size, 1)
+        right = _random_set(right_size, 2)
+        left_bitmap = RoaringBitmap.from_values(left)
+        right_bitmap = RoaringBitmap.from_values(right)
+
+        assert set(left_bitmap & right_bitmap) == left & right
+        assert set(left_bitmap | right_bitmap) == left | right
+        assert set(left_bitmap - right_bitmap) == left - right
+        assert set(right_bitmap - left_bitmap) == right - left
+        assert len(left_bitmap | right_bitmap) == len(left | right)
+
+    def test_dense_chunks_use_bitsets(self) -> None:
+        """Test that containers switch layout around ARRAY_MAX_SIZE."""
+        sparse = RoaringBitmap.from_values(range(ARRAY_MAX_SIZE))
+        dense = RoaringBitmap.from_values(range(ARRAY_MAX_SIZE + 1))
+
+        assert sparse.container_counts == (1, 0)
+        assert sparse.nbytes == ARRAY_MAX_SIZE * 2
+        assert dense.container_counts == (0, 1)
+        assert dense.nbytes == 8192
+        # Back to an array once the intersection becomes sparse
+        assert (dense & sparse).container_counts == (1, 0)
+
+    def test_membership_and_ordered_values(self) -> None:
+        """Test contains, duplicates and ascending iteration."""
+        bitmap = RoaringBitmap.from_values([70_000, 3, 3, 1 << 31])
+
+        assert list(bitmap) == [3, 70_000, 1 << 31]
+        assert 70_000 in bitmap
+        assert 4 not in bitmap
+        assert -1 not in bitmap
+        assert bitmap.to_array(limit=2).tolist() == [3, 70_000]
+        assert not RoaringBitmap()
@@ -9,6 +9,7 @@ import pytest
 import yaml
 
 from src.repositories.catalog.file_repository import CatalogFileRepository
+from src.repositories.catalog.yaml_io import file_digest
 from src.schemas.enums import InferredType
 
 
@@ -359,6 +360,75 @@ class TestListSources:
         assert len(sources) == 0
 
 
+class TestListSourceSummaries:
+    """Tests for CatalogFileRepository.list_source_summaries()."""
+
+    @staticmethod
+    def _write_invoice_summary(catalog_dir: Path, content_hash: str | None) -> None:
+        index_path = catalog_dir / "catalog.yaml"
+        index_data = yaml.safe_load(index_path.read_text(encoding="utf-8"))
+        index_data["sources"][0].update(
+            column_count=42,
+            enumerable_count=7,
+            updated_at="2025-01-16T10:00:00+00:00",
+            content_hash=content_hash,
+        )
+        index_path.write_text(yaml.dump(index_data), encoding="utf-8")
+
+    @pytest.mark.asyncio
+    async def test_summaries_from_index_and_sources(
+        self, catalog_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that current summaries are used and missing ones computed."""
+        invoice_path = catalog_dir / "sources" / "credit" / "invoice.yaml"
+        self._write_invoice_summary(catalog_dir, file_digest(invoice_path))
+        repository = CatalogFileRepository(catalog_path=catalog_dir)
+        loaded: list[str] = []
+        load_source = repository._load_source
+
+        async def counting_load(file_path: str) -> Any:
+            loaded.append(file_path)
+            return await load_source(file_path)
+
+        monkeypatch.setattr(repository, "_load_source", counting_load)
+
+        summaries = await repository.list_source_summaries(db_name="credit")
+
+        invoice, user = summaries
+        # The summary alone answers for the invoice: its file is not parsed
+        assert (invoice.column_count, invoice.enumerable_count) == (42, 7)
+        assert loaded == ["sources/credit/user.yaml"]
+        assert user.source_id == "credit.user"
+        assert user.has_summary
+        assert user.column_count == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("content_hash", [None, "0" * 64])
+    async def test_stale_summary_is_recomputed(
+        self, catalog_dir: Path, content_hash: str | None
+    ) -> None:
+        """Test that a summary without a matching file hash is not served."""
+        self._write_invoice_summary(catalog_dir, content_hash)
+        repository = CatalogFileRepository(catalog_path=catalog_dir)
+
+        invoice, _ = await repository.list_source_summaries(db_name="credit")
+
+        assert invoice.source_id == "credit.invoice"
+        assert invoice.column_count != 42
+
+    @pytest.mark.asyncio
+    async def test_summary_of_missing_file_is_skipped(self, catalog_dir: Path) -> None:
+        """Test that a source whose file was removed is not listed."""
+        invoice_path = catalog_dir / "sources" / "credit" / "invoice.yaml"
+        self._write_invoice_summary(catalog_dir, file_digest(invoice_path))
+        invoice_path.unlink()
+        repository = CatalogFileRepository(catalog_path=catalog_dir)
+
+        summaries = await repository.list_source_summaries(db_name="credit")
+
+        assert [s.source_id for s in summaries] == ["credit.user"]
+
+
 class TestCountSources:
     """Tests for CatalogFileRepository.count_sources()."""
 
@@ -554,6 +624,109 @@ class TestInvalidateCache:
         assert repository._source_cache.size() == 0
 
 
+class TestFileIO:
+    """Tests for reading catalog files off the event loop."""
+
+    @pytest.mark.asyncio
+    async def test_files_are_parsed_in_io_threads(
+        self, repository: CatalogFileRepository, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that files are read and parsed outside the event loop thread."""
+        import threading
+
+        from src.repositories.catalog import file_repository, yaml_io
+
+        threads: list[str] = []
+
+        def recording_read_yaml(path: Path) -> dict[str, Any]:
+            threads.append(threading.current_thread().name)
+            return yaml_io.read_yaml(path)
+
+        monkeypatch.setattr(file_repository, "read_yaml", recording_read_yaml)
+
+        source = await repository.get_source_by_id("credit.invoice")
+
+        assert source is not None
+        assert len(threads) == 2
+        assert all(name.startswith("catalog-io") for name in threads)
+
+        # The pool is recreated on demand after close()
+        repository.close()
+        repository.invalidate_cache()
+        assert await repository.get_source_by_id("credit.invoice") is not None
+
+    @pytest.mark.asyncio
+    async def test_large_files_are_parsed_in_processes(self, catalog_dir: Path) -> None:
+        """Test that files above the size threshold go to the process pool."""
+        repository = CatalogFileRepository(
+            catalog_path=catalog_dir, process_parse_min_bytes=1
+        )
+        try:
+            source = await repository.get_source_by_id("credit.invoice")
+            assert repository._process_executor is not None
+        finally:
+            repository.close()
+
+        assert source is not None
+        assert source.table_name == "invoice"
+
+
+class TestWarmUp:
+    """Tests for concurrent source loading and the startup warm-up."""
+
+    @pytest.mark.asyncio
+    async def test_warm_up_loads_sources_concurrently(self, catalog_dir: Path) -> None:
+        """Test that warm-up caches every source, io_max_workers at a time."""
+        import asyncio
+
+        (catalog_dir / "sources" / "payment" / "transaction.yaml").unlink()
+        repository = CatalogFileRepository(catalog_path=catalog_dir, io_max_workers=2)
+        load_source = repository._load_source
+        running = 0
+        max_running = 0
+
+        async def counting_load_source(file_path: str) -> Any:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            try:
+                return await load_source(file_path)
+            finally:
+                running -= 1
+
+        repository._load_source = counting_load_source  # type: ignore[method-assign]
+
+        repository.start_warm_up()
+        assert not repository.is_warmed_up
+        await repository._warm_up_task  # type: ignore[misc]
+
+        # The missing file does not keep the warm-up from completing
+        assert repository.is_warmed_up
+        assert max_running == 2
+        assert repository._source_cache.size() == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "content",
+        ["", "db_name: credit\ntable_name: invoice\ndocument_count: many\n"],
+    )
+    async def test_invalid_source_is_skipped(
+        self, catalog_dir: Path, content: str
+    ) -> None:
+        """Test that an empty or invalid source file does not fail the load."""
+        invoice_path = catalog_dir / "sources" / "credit" / "invoice.yaml"
+        invoice_path.write_text(content, encoding="utf-8")
+        repository = CatalogFileRepository(catalog_path=catalog_dir)
+
+        await repository.warm_up()
+        sources = await repository.list_sources()
+
+        assert repository.is_warmed_up
+        assert repository._source_cache.size() == 2
+        assert "credit.invoice" not in {source.source_id for source in sources}
+
+
 class TestCacheTTLExpiration:
     """Tests for cache TTL expiration behavior in CatalogFileRepository."""
 
@@ -735,3 +908,35 @@ class TestCorruptedYaml:
             source = await repo.get_source_by_id("db.table")
 
             assert source is None
+
+    @pytest.mark.asyncio
+    async def test_stale_source_served_while_reloading(self) -> None:
+        """Test that an expired source is served at once and reloaded."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            base_path = Path(tmpdir)
+            create_test_catalog_structure(base_path)
+            repo = CatalogFileRepository(
+                catalog_path=base_path, cache_ttl_seconds=0.1, cache_stale_seconds=60
+            )
+            assert (await repo.get_source_by_id("credit.invoice")) is not None
+
+            invoice_path = base_path / "sources" / "credit" / "invoice.yaml"
+            with invoice_path.open("r", encoding="utf-8") as f:
+                data: dict[str, Any] = yaml.safe_load(f)
+            data["document_count"] = 2000
+            with invoice_path.open("w", encoding="utf-8") as f:
+                yaml.dump(data, f, allow_unicode=True)
+
+            import asyncio
+
+            await asyncio.sleep(0.15)
+
+            # Expired: the stale value is returned while the file reloads
+            stale = await repo.get_source_by_id("credit.invoice")
+            assert stale is not None
+            assert stale.document_count == 1000
+
+            await repo._source_cache.join_refreshes()
+            fresh = await repo.get_source_by_id("credit.invoice")
+            assert fresh is not None
+            assert fresh.document_count == 2000
@@ -282,6 +282,25 @@ class TestCatalogFileWriterWriteSource:
 
         assert data["document_count"] == 2000
 
+    def test_write_source_is_atomic(self, temp_catalog_dir: Path) -> None:
+        """Verify a failed write keeps the previous file and no temp files."""
+        from unittest.mock import patch
+
+        from src.services.catalog_file_writer import CatalogFileWriter
+
+        writer = CatalogFileWriter(catalog_path=temp_catalog_dir)
+        yaml_path = writer.write_source(create_sample_source())
+        original_content = yaml_path.read_text()
+
+        with (
+            patch("os.replace", side_effect=OSError("Simulated crash")),
+            pytest.raises(OSError),
+        ):
+            writer.write_source(create_sample_source())
+
+        assert yaml_path.read_text() == original_content
+        assert list(yaml_path.parent.iterdir()) == [yaml_path]
+
 
 class TestCatalogFileWriterMergeManualFields:
     """Tests for CatalogFileWriter._merge_manual_fields() method."""
@@ -544,6 +563,26 @@ class TestCatalogFileWriterUpdateIndex:
 
         assert data["generated_at"] != original_generated_at
 
+    def test_update_index_writes_source_summary(self, temp_catalog_dir: Path) -> None:
+        """Verify update_index stores the source summary in its entry."""
+        from src.repositories.catalog.yaml_io import file_digest
+        from src.services.catalog_file_writer import CatalogFileWriter
+
+        writer = CatalogFileWriter(catalog_path=temp_catalog_dir)
+        source = create_sample_source()
+
+        source_path = writer.write_source(source)
+        writer.update_index(source)
+
+        with (temp_catalog_dir / "catalog.yaml").open("r", encoding="utf-8") as f:
+            data = yaml.safe_load(f)
+
+        entry = data["sources"][0]
+        assert entry["column_count"] == 3
+        assert entry["enumerable_count"] == 1
+        assert entry["updated_at"] == "2026-02-03T10:00:00+00:00"
+        assert entry["content_hash"] == file_digest(source_path)
+
 
 class TestCatalogFileWriterEnsureDirectories:
     """Tests for CatalogFileWriter._ensure_directories() method."""
@@ -8,7 +8,7 @@ from src.schemas.catalog_yaml import (
     IndexEntry,
     SourceMetadataYaml,
 )
-from src.schemas.enums import EnrichmentStatus, InferredType
+from src.schemas.enums import EnrichmentStatus, InferredSubtype, InferredType
 
 
 class TestColumnMetadataYaml:
@@ -113,6 +113,27 @@ class TestColumnMetadataYaml:
         assert column.description == "Status da fatura"
         assert column.enrichment_status == EnrichmentStatus.ENRICHED
 
+    def test_subtype_roundtrip(self) -> None:
+        """Test that the subtype is written after the type and read back."""
+        column = ColumnMetadataYaml(
+            path="value",
+            name="value",
+            type=InferredType.STRING,
+            subtype=InferredSubtype.NUMERIC_STRING,
+            required=True,
+            nullable=False,
+            enumerable=False,
+            presence_ratio=1.0,
+        )
+
+        yaml_dict = column.to_yaml_dict()
+
+        assert list(yaml_dict)[:4] == ["path", "name", "type", "subtype"]
+        assert yaml_dict["subtype"] == "numeric_string"
+        assert ColumnMetadataYaml.from_yaml_dict(yaml_dict).subtype == (
+            InferredSubtype.NUMERIC_STRING
+        )
+
     def test_roundtrip(self) -> None:
         """Test that to_yaml_dict -> from_yaml_dict preserves data."""
         original = ColumnMetadataYaml(
@@ -206,12 +227,32 @@ class TestSourceMetadataYaml:
         assert source.db_name == "credit"
         assert source.table_name == "invoice"
         assert source.document_count == 15234
-        assert source.extracted_at == datetime(
-            2026, 2, 3, 10, 30, 0, tzinfo=UTC
-        )
+        assert source.extracted_at == datetime(2026, 2, 3, 10, 30, 0, tzinfo=UTC)
         assert source.updated_at == datetime(2026, 2, 3, 11, 0, 0, tzinfo=UTC)
         assert len(source.columns) == 1
         assert source.columns[0].path == "_id"
+        assert source.user_key is None
+
+    def test_user_key_roundtrip(self) -> None:
+        """Test that the declared user key is written only when set."""
+        extracted_at = datetime(2026, 2, 3, 10, 30, 0, tzinfo=UTC)
+        source = SourceMetadataYaml(
+            db_name="credit",
+            table_name="invoice",
+            document_count=1,
+            extracted_at=extracted_at,
+            user_key="consumerId",
+        )
+
+        data = source.to_yaml_dict()
+        restored = SourceMetadataYaml.from_yaml_dict(data)
+
+        assert data["user_key"] == "consumerId"
+        assert restored.user_key == "consumerId"
+        assert (
+            "user_key"
+            not in source.model_copy(update={"user_key": None}).to_yaml_dict()
+        )
 
     def test_source_id_property(self) -> None:
         """Test source_id property generates correct composite ID."""
@@ -262,6 +303,56 @@ class TestSourceMetadataYaml:
         assert len(restored.columns) == len(original.columns)
         assert restored.columns[0].description == original.columns[0].description
 
+    def test_filter_columns_and_stats(self) -> None:
+        """Test that the column indexes match filtering the column list."""
+        columns = [
+            ColumnMetadataYaml(
+                path=f"col{i}",
+                name=f"col{i}",
+                type=type_,
+                required=required,
+                nullable=False,
+                enumerable=enumerable,
+                presence_ratio=1.0,
+            )
+            for i, (type_, required, enumerable) in enumerate(
+                [
+                    (InferredType.STRING, True, True),
+                    (InferredType.STRING, False, False),
+                    (InferredType.INTEGER, True, False),
+                    (InferredType.STRING, True, False),
+                ]
+            )
+        ]
+        source = SourceMetadataYaml(
+            db_name="credit",
+            table_name="invoice",
+            document_count=1,
+            extracted_at=datetime(2026, 2, 3, tzinfo=UTC),
+            columns=columns,
+        )
+
+        for type_ in (None, "string", "integer", "boolean"):
+            for required in (None, True, False):
+                for enumerable in (None, True, False):
+                    expected = [
+                        c
+                        for c in columns
+                        if (type_ is None or c.type.value == type_)
+                        and (required is None or c.required == required)
+                        and (enumerable is None or c.enumerable == enumerable)
+                    ]
+                    assert (
+                        source.filter_columns(type_, required, enumerable) == expected
+                    )
+
+        assert source.column_stats == {
+            "total_columns": 4,
+            "required_columns": 3,
+            "enumerable_columns": 1,
+            "types_distribution": {"string": 3, "integer": 1},
+        }
+
 
 class TestCatalogIndex:
     """Tests for CatalogIndex and IndexEntry to_yaml_dict and from_yaml_dict."""
@@ -295,9 +386,7 @@ class TestCatalogIndex:
 
         assert entry.db_name == "credit"
         assert entry.table_name == "invoice"
-        assert entry.last_extracted == datetime(
-            2026, 2, 3, 10, 30, 0, tzinfo=UTC
-        )
+        assert entry.last_extracted == datetime(2026, 2, 3, 10, 30, 0, tzinfo=UTC)
         assert entry.file_path == "sources/credit/invoice.yaml"
 
     def test_index_entry_source_id_property(self) -> None:
@@ -350,9 +439,7 @@ class TestCatalogIndex:
         index = CatalogIndex.from_yaml_dict(data)
 
         assert index.version == "1.0"
-        assert index.generated_at == datetime(
-            2026, 2, 3, 10, 30, 0, tzinfo=UTC
-        )
+        assert index.generated_at == datetime(2026, 2, 3, 10, 30, 0, tzinfo=UTC)
         assert len(index.sources) == 1
         assert index.sources[0].db_name == "credit"
 
@@ -370,9 +457,7 @@ class TestCatalogIndex:
             last_extracted=datetime.now(UTC),
             file_path="sources/credit/closed_invoice.yaml",
         )
-        index = CatalogIndex(
-            generated_at=datetime.now(UTC), sources=[entry1, entry2]
-        )
+        index = CatalogIndex(generated_at=datetime.now(UTC), sources=[entry1, entry2])
 
         found = index.find_source("credit", "invoice")
         not_found = index.find_source("credit", "nonexistent")
@@ -398,6 +483,38 @@ class TestCatalogIndex:
         assert found.table_name == "invoice"
         assert not_found is None
 
+    def test_upsert_source_keeps_lookups_consistent(self) -> None:
+        """Test that replacing and adding entries updates every lookup."""
+        old_invoice = IndexEntry(
+            db_name="credit",
+            table_name="invoice",
+            last_extracted=datetime(2026, 1, 1, tzinfo=UTC),
+            file_path="sources/credit/invoice.yaml",
+        )
+        card = IndexEntry(
+            db_name="card_account_authorization",
+            table_name="card_main",
+            last_extracted=datetime(2026, 1, 1, tzinfo=UTC),
+            file_path="sources/card_account_authorization/card_main.yaml",
+        )
+        index = CatalogIndex(
+            generated_at=datetime.now(UTC), sources=[old_invoice, card]
+        )
+
+        new_invoice = old_invoice.model_copy(
+            update={"last_extracted": datetime(2026, 2, 1, tzinfo=UTC)}
+        )
+        closed = old_invoice.model_copy(update={"table_name": "closed_invoice"})
+        index.upsert_source(new_invoice)
+        index.upsert_source(closed)
+
+        assert index.sources == [card, new_invoice, closed]
+        assert index.find_source("credit", "invoice") is new_invoice
+        assert index.find_source_by_id("credit.closed_invoice") is closed
+        assert index.sources_in_db("credit") == [new_invoice, closed]
+        assert index.sources_in_db("card_account_authorization") == [card]
+        assert index.sources_in_db("nonexistent") == []
+
     def test_roundtrip(self) -> None:
         """Test that to_yaml_dict -> from_yaml_dict preserves data."""
         entry = IndexEntry(
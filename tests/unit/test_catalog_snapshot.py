@@ -0,0 +1,165 @@
+"""Unit tests for the compiled catalog snapshot."""
+
+import shutil
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from src.cli.catalog import app
+from src.config import get_settings
+from src.repositories.catalog import file_repository, yaml_io
+from src.repositories.catalog.file_repository import CatalogFileRepository
+from src.repositories.catalog.snapshot import (
+    SNAPSHOT_FILE,
+    compile_snapshot,
+    load_snapshot,
+)
+from src.repositories.catalog.watcher import CatalogWatcher
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+INVOICE_FILE = "sources/credit/invoice.yaml"
+
+
+@pytest.fixture
+def catalog_dir(tmp_path: Path) -> Path:
+    """Copy the project catalog YAML files to a temporary directory."""
+    shutil.copytree(
+        PROJECT_ROOT / "catalog",
+        tmp_path,
+        dirs_exist_ok=True,
+        ignore=shutil.ignore_patterns(f"{SNAPSHOT_FILE}*"),
+    )
+    return tmp_path
+
+
+def _record_yaml_reads(monkeypatch: pytest.MonkeyPatch) -> list[Path]:
+    """Record the files the repository parses from YAML."""
+    parsed: list[Path] = []
+
+    def recording_read_yaml(path: Path) -> dict[str, object]:
+        parsed.append(path)
+        return yaml_io.read_yaml(path)
+
+    monkeypatch.setattr(file_repository, "read_yaml", recording_read_yaml)
+    return parsed
+
+
+class TestCatalogSnapshot:
+    """Tests for compiling and loading the snapshot."""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_catalog_is_served_from_snapshot(
+        self, catalog_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that no YAML is parsed when the snapshot is current."""
+        compiled = compile_snapshot(catalog_dir)
+        parsed = _record_yaml_reads(monkeypatch)
+        repository = CatalogFileRepository(catalog_path=catalog_dir)
+
+        sources = await repository.list_sources()
+
+        assert parsed == []
+        assert len(sources) == len(compiled.source_paths)
+        assert sources[0] == compiled.source(compiled.index().sources[0].file_path)
+
+    @pytest.mark.asyncio
+    async def test_changed_file_falls_back_to_yaml(
+        self, catalog_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a file edited after compiling is read from YAML."""
+        compile_snapshot(catalog_dir)
+        invoice_path = catalog_dir / INVOICE_FILE
+        invoice_path.write_text(
+            invoice_path.read_text(encoding="utf-8").replace(
+                "document_count:", "document_count: 123456 #"
+            ),
+            encoding="utf-8",
+        )
+        parsed = _record_yaml_reads(monkeypatch)
+        repository = CatalogFileRepository(catalog_path=catalog_dir)
+
+        invoice = await repository.get_source_by_id("credit.invoice")
+        await repository.get_source_by_id("credit.closed_invoice")
+
+        assert parsed == [invoice_path]
+        assert invoice is not None
+        assert invoice.document_count == 123456
+
+    @pytest.mark.asyncio
+    async def test_recompiled_snapshot_is_reloaded(
+        self, catalog_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a snapshot recompiled while running replaces the old one."""
+        compile_snapshot(catalog_dir)
+        repository = CatalogFileRepository(catalog_path=catalog_dir)
+        await repository.get_source_by_id("credit.invoice")
+        watcher = CatalogWatcher(catalog_dir)
+
+        invoice_path = catalog_dir / INVOICE_FILE
+        invoice_path.write_text(
+            invoice_path.read_text(encoding="utf-8").replace(
+                "document_count:", "document_count: 123456 #"
+            ),
+            encoding="utf-8",
+        )
+        compile_snapshot(catalog_dir)
+        parsed = _record_yaml_reads(monkeypatch)
+        changed = watcher.poll()
+        await repository.apply_file_changes(changed)
+
+        invoice = await repository.get_source_by_id("credit.invoice")
+
+        assert SNAPSHOT_FILE in changed
+        assert parsed == []
+        assert invoice is not None
+        assert invoice.document_count == 123456
+
+    @pytest.mark.parametrize("content", [b"", b"QACATALOG0000000000000000garbage"])
+    def test_invalid_snapshot_is_ignored(
+        self, catalog_dir: Path, content: bytes
+    ) -> None:
+        """Test that empty or incompatible snapshots are not loaded."""
+        (catalog_dir / SNAPSHOT_FILE).write_bytes(content)
+
+        assert load_snapshot(catalog_dir) is None
+
+    def test_truncated_snapshot_is_ignored(self, catalog_dir: Path) -> None:
+        """Test that a snapshot cut before its table of contents is ignored."""
+        compile_snapshot(catalog_dir)
+        snapshot_path = catalog_dir / SNAPSHOT_FILE
+        content = snapshot_path.read_bytes()
+        snapshot_path.write_bytes(content[: len(content) // 2])
+
+        assert load_snapshot(catalog_dir) is None
+
+    def test_sources_are_read_from_the_mapping(self, catalog_dir: Path) -> None:
+        """Test that a mapped snapshot decodes each source on demand."""
+        compiled = compile_snapshot(catalog_dir)
+        snapshot = load_snapshot(catalog_dir)
+
+        assert snapshot is not None
+        assert snapshot.content_hash == compiled.content_hash
+        assert snapshot.source_paths == compiled.source_paths
+        assert INVOICE_FILE in snapshot
+        invoice = snapshot.source(INVOICE_FILE)
+        assert invoice == compiled.source(INVOICE_FILE)
+        # Each access decodes a fresh copy: nothing is retained by the view
+        assert snapshot.source(INVOICE_FILE) is not invoice
+
+    def test_compile_command_writes_snapshot(
+        self, catalog_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that `qa-catalog compile` writes a loadable snapshot."""
+        monkeypatch.setenv("CATALOG_PATH", str(catalog_dir))
+        get_settings.cache_clear()
+        try:
+            result = CliRunner().invoke(app, ["compile"])
+        finally:
+            get_settings.cache_clear()
+
+        assert result.exit_code == 0
+        snapshot = load_snapshot(catalog_dir)
+        assert snapshot is not None
+        assert snapshot.content_hash[:16] in result.output
@@ -0,0 +1,151 @@
+"""Unit tests for catalog file change detection."""
+
+import asyncio
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+import yaml
+
+from src.repositories.catalog.file_repository import CatalogFileRepository
+from src.repositories.catalog.watcher import CatalogWatcher
+
+
+def _source(db_name: str, table_name: str, document_count: int) -> dict[str, Any]:
+    return {
+        "db_name": db_name,
+        "table_name": table_name,
+        "document_count": document_count,
+        "extracted_at": "2025-01-15T10:00:00+00:00",
+        "columns": [],
+    }
+
+
+def _write(path: Path, data: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(yaml.dump(data), encoding="utf-8")
+    # Bump the mtime explicitly: some filesystems have coarse timestamps
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+@pytest.fixture
+def catalog_dir(tmp_path: Path) -> Path:
+    """Create a catalog with two sources."""
+    _write(
+        tmp_path / "catalog.yaml",
+        {
+            "version": "1.0",
+            "generated_at": "2025-01-15T10:00:00+00:00",
+            "sources": [
+                {
+                    "db_name": db_name,
+                    "table_name": table_name,
+                    "last_extracted": "2025-01-15T10:00:00+00:00",
+                    "file_path": f"sources/{db_name}/{table_name}.yaml",
+                }
+                for db_name, table_name in [("credit", "invoice"), ("card", "main")]
+            ],
+        },
+    )
+    _write(tmp_path / "sources/credit/invoice.yaml", _source("credit", "invoice", 1))
+    _write(tmp_path / "sources/card/main.yaml", _source("card", "main", 1))
+    return tmp_path
+
+
+class TestCatalogWatcher:
+    """Tests for polling file signatures."""
+
+    def test_poll_reports_changed_files(self, catalog_dir: Path) -> None:
+        """Test that modified, created and deleted files are reported."""
+        watcher = CatalogWatcher(catalog_dir)
+        assert watcher.poll() == set()
+
+        _write(
+            catalog_dir / "sources/credit/invoice.yaml", _source("credit", "invoice", 2)
+        )
+        _write(catalog_dir / "sources/new/table.yaml", _source("new", "table", 1))
+        (catalog_dir / "sources/card/main.yaml").unlink()
+
+        assert watcher.poll() == {
+            "sources/credit/invoice.yaml",
+            "sources/new/table.yaml",
+            "sources/card/main.yaml",
+        }
+        assert watcher.poll() == set()
+
+
+class TestRepositoryChanges:
+    """Tests for applying file changes to the repository caches."""
+
+    @pytest.mark.asyncio
+    async def test_only_changed_sources_are_reloaded(
+        self, catalog_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that unchanged sources stay cached across a change."""
+        repository = CatalogFileRepository(catalog_dir, cache_ttl_seconds=3600)
+        await repository.list_sources()
+        loaded: list[str] = []
+        load_source = repository._load_source
+
+        async def counting_load(file_path: str) -> Any:
+            loaded.append(file_path)
+            return await load_source(file_path)
+
+        monkeypatch.setattr(repository, "_load_source", counting_load)
+        _write(
+            catalog_dir / "sources/credit/invoice.yaml", _source("credit", "invoice", 2)
+        )
+
+        await repository.apply_file_changes({"sources/credit/invoice.yaml"})
+        sources = {s.source_id: s for s in await repository.list_sources()}
+
+        assert loaded == ["sources/credit/invoice.yaml"]
+        assert sources["credit.invoice"].document_count == 2
+
+    @pytest.mark.asyncio
+    async def test_watcher_applies_changes_in_background(
+        self, catalog_dir: Path
+    ) -> None:
+        """Test that a change shows up without waiting for the TTL."""
+        repository = CatalogFileRepository(catalog_dir, cache_ttl_seconds=3600)
+        assert (await repository.get_source_by_id("card.main")) is not None
+        repository.start_watching(interval_seconds=0.01)
+        try:
+            _write(catalog_dir / "sources/card/main.yaml", _source("card", "main", 5))
+            for _ in range(100):
+                source = await repository.get_source_by_id("card.main")
+                if source is not None and source.document_count == 5:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await repository.stop_watching()
+
+        source = await repository.get_source_by_id("card.main")
+        assert source is not None
+        assert source.document_count == 5
+
+    @pytest.mark.asyncio
+    async def test_watcher_survives_invalid_source(self, catalog_dir: Path) -> None:
+        """Test that an empty source file does not stop the watcher."""
+        repository = CatalogFileRepository(catalog_dir, cache_ttl_seconds=3600)
+        assert (await repository.get_source_by_id("card.main")) is not None
+        repository.start_watching(interval_seconds=0.01)
+        try:
+            _write(catalog_dir / "sources/card/main.yaml", {})
+            await asyncio.sleep(0.05)
+            _write(catalog_dir / "sources/card/main.yaml", _source("card", "main", 7))
+            for _ in range(100):
+                source = await repository.get_source_by_id("card.main")
+                if source is not None and source.document_count == 7:
+                    break
+                await asyncio.sleep(0.01)
+            assert repository._watch_task is not None
+            assert not repository._watch_task.done()
+        finally:
+            await repository.stop_watching()
+
+        source = await repository.get_source_by_id("card.main")
+        assert source is not None
+        assert source.document_count == 7
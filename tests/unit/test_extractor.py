@@ -1,6 +1,6 @@
 """Unit tests for schema extraction (TypeInferrer, flatten_fields)."""
 
-from src.schemas.enums import InferredType
+from src.schemas.enums import InferredSubtype, InferredType
 
 
 class TestTypeInferrer:
@@ -240,3 +240,20 @@ class TestSchemaExtractor:
         assert "status" in result
         assert "sample_values" in result["status"]
         assert set(result["status"]["sample_values"]) == {"A", "B", "C"}
+
+    def test_extract_tags_numeric_strings(self) -> None:
+        """Test that decimal amounts stored as strings get a subtype."""
+        from src.services.schema_extraction.extractor import SchemaExtractor
+
+        documents = [
+            {"value": "54.08", "consumerId": "123", "code": "A1"},
+            {"value": "0", "consumerId": "456", "code": "7.5"},
+            {"value": None, "consumerId": "789", "code": "B2"},
+        ]
+
+        result = SchemaExtractor().extract(documents)
+
+        assert result["value"]["inferred_subtype"] == InferredSubtype.NUMERIC_STRING
+        # Integer-only strings are usually identifiers
+        assert result["consumerId"]["inferred_subtype"] is None
+        assert result["code"]["inferred_subtype"] is None
@@ -0,0 +1,328 @@
+"""Unit tests for the in-process mock query engine."""
+
+import json
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import bson
+import numpy as np
+import pytest
+
+from src.repositories.external.mock_engine import ColumnarCollection, MockMongoClient
+from src.schemas.interpreter import StoredQuery
+from src.services.interpreter.query_executor import QueryExecutor
+
+DOCUMENTS: list[dict[str, Any]] = [
+    {
+        "_id": "61df355c6d26db1a6b46515b",
+        "consumerId": "1",
+        "status": "OPEN",
+        "value": "10.50",
+        "installments": 3,
+        "customer": {"name": "Ana", "segment": "PF"},
+        "isFirstInvoice": True,
+    },
+    {
+        "_id": "61df355c6d26db1a6b46515c",
+        "consumerId": "2",
+        "status": "CLOSED",
+        "value": "5.00",
+        "installments": 12,
+        "customer": {"name": "Bruno"},
+        "isFirstInvoice": False,
+        "tags": ["vip", "late"],
+    },
+    {
+        "_id": "61df355c6d26db1a6b46515d",
+        "consumerId": "3",
+        "status": "CLOSED",
+        "value": None,
+        "installments": 1.5,
+        "customer": {"name": "Carla", "segment": "PJ"},
+        "isFirstInvoice": True,
+        "tags": ["late"],
+    },
+]
+
+
+@pytest.fixture
+def base_path(tmp_path: Path) -> Path:
+    """Write the test documents as a res/db-style JSON file."""
+    (tmp_path / "credit.invoice.json").write_text(json.dumps(DOCUMENTS))
+    return tmp_path
+
+
+@pytest.fixture
+def collection(base_path: Path) -> ColumnarCollection:
+    """Load the test collection."""
+    return MockMongoClient(base_path)["credit"]["invoice"]
+
+
+def _matched_ids(collection: ColumnarCollection, filter_query: dict[str, Any]) -> list:
+    mask = collection.match(filter_query)
+    return [DOCUMENTS[i]["consumerId"] for i in np.flatnonzero(mask)]
+
+
+class TestColumns:
+    """Tests for the columnar layout."""
+
+    def test_column_kinds(self, collection: ColumnarCollection) -> None:
+        """Test that each flattened path gets a typed column."""
+        columns = collection.columns
+        assert columns["status"].kind == "string"
+        assert columns["installments"].kind == "number"
+        assert columns["isFirstInvoice"].kind == "bool"
+        assert columns["customer.name"].kind == "string"
+        assert columns["tags"].kind == "object"
+        assert columns["_id"].kind == "string"
+
+    def test_strings_are_dictionary_encoded(
+        self, collection: ColumnarCollection
+    ) -> None:
+        """Test that strings are stored as codes into sorted categories."""
+        column = collection.columns["status"]
+        assert column.categories is not None
+        assert column.categories.tolist() == ["CLOSED", "OPEN"]
+        assert column.values.tolist() == [1, 0, 0]
+        assert column.index is not None
+        assert column.index["CLOSED"].tolist() == [1, 2]
+
+    def test_high_cardinality_columns_are_not_indexed(self, base_path: Path) -> None:
+        """Test that only enumerable columns get a hash index."""
+        collection = MockMongoClient(base_path, index_cardinality_limit=2)["credit"][
+            "invoice"
+        ]
+        assert collection.columns["status"].index is not None
+        assert collection.columns["consumerId"].index is None
+
+    def test_object_ids_are_restored(self, collection: ColumnarCollection) -> None:
+        """Test that 24-hex _id strings are loaded as ObjectIds."""
+        documents = collection.find({"consumerId": "1"})._documents
+        assert isinstance(documents[0]["_id"], bson.ObjectId)
+
+
+class TestMatch:
+    """Tests for vectorized filter evaluation."""
+
+    @pytest.mark.parametrize(
+        ("filter_query", "expected"),
+        [
+            ({"status": "CLOSED"}, ["2", "3"]),
+            ({"status": {"$ne": "CLOSED"}}, ["1"]),
+            ({"status": {"$in": ["OPEN", "OTHER"]}}, ["1"]),
+            ({"consumerId": {"$nin": ["1", "2"]}}, ["3"]),
+            ({"installments": {"$gte": 3}}, ["1", "2"]),
+            ({"installments": {"$gt": 1, "$lt": 12}}, ["1", "3"]),
+            ({"installments": "3"}, []),
+            ({"value": {"$lt": "2"}}, ["1"]),
+            ({"value": None}, ["3"]),
+            ({"value": {"$ne": None}}, ["1", "2"]),
+            ({"customer.segment": None}, ["2"]),
+            ({"customer.name": {"$regex": "^(Ana|Bruno)$"}}, ["1", "2"]),
+            ({"customer.name": {"$not": {"$regex": "^A"}}}, ["2", "3"]),
+            ({"isFirstInvoice": True}, ["1", "3"]),
+            ({"tags": "late"}, ["2", "3"]),
+            ({"missing": None}, ["1", "2", "3"]),
+            ({"missing": "x"}, []),
+            (
+                {"$and": [{"status": "CLOSED"}, {"installments": {"$lte": 2}}]},
+                ["3"],
+            ),
+            ({"$or": [{"consumerId": "1"}, {"consumerId": "3"}]}, ["1", "3"]),
+        ],
+    )
+    def test_filters(
+        self,
+        collection: ColumnarCollection,
+        filter_query: dict[str, Any],
+        expected: list[str],
+    ) -> None:
+        """Test MongoDB filter semantics over the columns."""
+        assert _matched_ids(collection, filter_query) == expected
+
+    @pytest.mark.parametrize(
+        ("expression", "expected"),
+        [
+            ({"$gt": [{"$toDecimal": "$value"}, bson.Decimal128("6")]}, ["1"]),
+            ({"$lt": ["$value", 6]}, ["2", "3"]),
+            ({"$ne": [{"$toDouble": "$value"}, None]}, ["1", "2"]),
+            (
+                {
+                    "$in": [
+                        {"$convert": {"input": "$value", "to": "decimal"}},
+                        [5, 7],
+                    ]
+                },
+                ["2"],
+            ),
+            ({"$not": [{"$eq": ["$installments", 3]}]}, ["2", "3"]),
+        ],
+    )
+    def test_numeric_expr(
+        self,
+        collection: ColumnarCollection,
+        expression: dict[str, Any],
+        expected: list[str],
+    ) -> None:
+        """Test numeric $expr over converted string columns (null sorts first)."""
+        assert _matched_ids(collection, {"$expr": expression}) == expected
+
+    def test_object_id_operands(self, collection: ColumnarCollection) -> None:
+        """Test that ObjectId operands compare against _id."""
+        pivot = bson.ObjectId("61df355c6d26db1a6b46515c")
+        assert _matched_ids(collection, {"_id": {"$gte": pivot}}) == ["2", "3"]
+
+    def test_unsupported_operator(self, collection: ColumnarCollection) -> None:
+        """Test that unknown operators are rejected."""
+        with pytest.raises(ValueError, match="Unsupported operator"):
+            collection.match({"status": {"$exists": True}})
+
+
+class TestMotorApi:
+    """Tests for the Motor-compatible collection API."""
+
+    @pytest.mark.asyncio
+    async def test_find_raw_batches_projects_and_limits(
+        self, collection: ColumnarCollection
+    ) -> None:
+        """Test raw batches honour projection, limit and batch size."""
+        cursor = collection.find_raw_batches(
+            {"status": "CLOSED"},
+            {"customer.name": 1, "_id": 0},
+            limit=2,
+            batch_size=1,
+        )
+        batches = [batch async for batch in cursor]
+
+        assert len(batches) == 2
+        assert [bson.decode(batch) for batch in batches] == [
+            {"customer": {"name": "Bruno"}},
+            {"customer": {"name": "Carla"}},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_find_raw_batches_sorts_before_limit(
+        self, collection: ColumnarCollection
+    ) -> None:
+        """Test that the sort applies before the limit."""
+        cursor = collection.find_raw_batches(
+            {"status": "CLOSED"},
+            {"customer.name": 1, "_id": 0},
+            limit=1,
+            sort=[("customer.name", -1)],
+        )
+        rows = [row async for batch in cursor for row in bson.decode_all(batch)]
+
+        names = [
+            document["customer"]["name"]
+            async for document in collection.find({"status": "CLOSED"})
+        ]
+        assert rows == [{"customer": {"name": max(names)}}]
+
+    @pytest.mark.asyncio
+    async def test_aggregate_sample(self, collection: ColumnarCollection) -> None:
+        """Test that $sample draws distinct matching documents."""
+        cursor = collection.aggregate_raw_batches(
+            [
+                {"$match": {"status": "CLOSED"}},
+                {"$sample": {"size": 5}},
+                {"$project": {"consumerId": 1, "_id": 0}},
+            ]
+        )
+        rows = [row async for batch in cursor for row in bson.decode_all(batch)]
+
+        assert sorted(row["consumerId"] for row in rows) == ["2", "3"]
+
+    @pytest.mark.asyncio
+    async def test_counts_and_sorted_find(self, collection: ColumnarCollection) -> None:
+        """Test counting and the find().sort().limit().to_list() chain."""
+        assert await collection.count_documents({"status": "CLOSED"}) == 2
+        assert await collection.estimated_document_count() == 3
+
+        last = await collection.find({}, {"_id": 1}).sort("_id", -1).limit(1).to_list(1)
+        assert last == [{"_id": bson.ObjectId("61df355c6d26db1a6b46515d")}]
+
+    @pytest.mark.asyncio
+    async def test_aggregate_facet_group_count(
+        self, collection: ColumnarCollection
+    ) -> None:
+        """Test $facet sub-pipelines with $group and $count."""
+        cursor = collection.aggregate_raw_batches(
+            [
+                {"$match": {"status": {"$in": ["OPEN", "CLOSED"]}}},
+                {
+                    "$facet": {
+                        "users": [
+                            {"$group": {"_id": "$status"}},
+                            {"$count": "count"},
+                        ],
+                        "closed": [{"$match": {"status": "CLOSED"}}, {"$count": "n"}],
+                        "none": [{"$match": {"status": "PAID"}}, {"$count": "n"}],
+                    }
+                },
+            ]
+        )
+        documents = [row async for batch in cursor for row in bson.decode_all(batch)]
+
+        assert documents == [
+            {"users": [{"count": 2}], "closed": [{"n": 2}], "none": []}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_aggregate_group_first_replace_root(
+        self, collection: ColumnarCollection
+    ) -> None:
+        """Test $group with $first followed by document-level stages."""
+        cursor = collection.aggregate_raw_batches(
+            [
+                {"$project": {"status": 1, "consumerId": 1, "_id": 0}},
+                {"$group": {"_id": "$status", "document": {"$first": "$$ROOT"}}},
+                {"$limit": 5},
+                {"$replaceRoot": {"newRoot": "$document"}},
+                {"$project": {"consumerId": 1, "_id": 0}},
+            ]
+        )
+        documents = [row async for batch in cursor for row in bson.decode_all(batch)]
+
+        assert documents == [{"consumerId": "1"}, {"consumerId": "2"}]
+
+    def test_missing_collection_is_empty(self, base_path: Path) -> None:
+        """Test that collections without a file behave as empty."""
+        assert len(MockMongoClient(base_path)["credit"]["unknown"]) == 0
+
+
+class TestQueryExecutorOnMock:
+    """Tests running QueryExecutor against the mock engine."""
+
+    @pytest.mark.asyncio
+    async def test_execute_query(self, base_path: Path) -> None:
+        """Test that SQL runs end to end and returns JSON-ready rows."""
+        executor = QueryExecutor(
+            MagicMock(),
+            mongo_client=MockMongoClient(base_path),  # type: ignore[arg-type]
+            catalog_repository=AsyncMock(),
+        )
+        stored_query = StoredQuery(
+            sql="SELECT _id, consumerId FROM credit.invoice "
+            "WHERE status = 'CLOSED' AND installments >= 2",
+            interpretation_id="00000000-0000-0000-0000-000000000000",
+            is_valid=True,
+        )
+
+        result = await executor.execute_query(stored_query, limit=10)
+
+        assert result.row_count == 1
+        assert result.rows == [{"_id": "61df355c6d26db1a6b46515c", "consumerId": "2"}]
+
+    @pytest.mark.asyncio
+    async def test_counts_match_sample_data(self) -> None:
+        """Test that the bundled res/db data is queried like MongoDB would."""
+        path = Path("res/db/credit.invoice.json")
+        if not path.exists():
+            pytest.skip("mock data not available")
+        documents = json.loads(path.read_text(encoding="utf-8"))
+        collection = MockMongoClient()["credit"]["invoice"]
+
+        expected = sum(1 for d in documents if d.get("status") == "CLOSED")
+        assert await collection.count_documents({"status": "CLOSED"}) == expected
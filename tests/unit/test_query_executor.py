@@ -0,0 +1,867 @@
+"""Unit tests for QueryExecutor."""
+
+import json
+import random
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import bson
+import pytest
+
+from src.config import Settings
+from src.repositories.external.mock_engine import MockMongoClient
+from src.schemas.catalog_yaml import ColumnMetadataYaml, SourceMetadataYaml
+from src.schemas.enums import InferredSubtype, InferredType
+from src.schemas.interpreter import StoredQuery
+from src.services.interpreter.query_executor import (
+    QueryExecutionError,
+    QueryExecutor,
+    get_count_cache,
+)
+from src.services.interpreter.query_plan import compile_sql
+
+
+def _matches(document: dict[str, Any], filter_query: dict[str, Any]) -> bool:
+    """Evaluate the subset of MongoDB filters used by the executor."""
+    for key, condition in filter_query.items():
+        if key == "$and":
+            if not all(_matches(document, sub) for sub in condition):
+                return False
+            continue
+        value = document.get(key)
+        if isinstance(condition, dict):
+            if "$in" in condition and value not in condition["$in"]:
+                return False
+            if "$nin" in condition and value in condition["$nin"]:
+                return False
+            if "$gte" in condition and not value >= condition["$gte"]:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+class FakeCursor:
+    """Minimal async cursor over in-memory documents."""
+
+    def __init__(self, documents: list[dict[str, Any]]) -> None:
+        self._documents = documents
+
+    def limit(self, limit: int) -> "FakeCursor":
+        return FakeCursor(self._documents[:limit])
+
+    def sort(self, key: str, direction: int) -> "FakeCursor":
+        ordered = sorted(self._documents, key=lambda d: d[key], reverse=direction < 0)
+        return FakeCursor(ordered)
+
+    async def to_list(self, length: int) -> list[dict[str, Any]]:
+        return self._documents[:length]
+
+    async def __aiter__(self) -> AsyncIterator[dict[str, Any]]:
+        for document in self._documents:
+            yield document
+
+
+class FakeRawBatchCursor:
+    """Async cursor yielding documents as concatenated raw BSON batches."""
+
+    def __init__(self, documents: list[dict[str, Any]], batch_size: int) -> None:
+        self._documents = documents
+        self._batch_size = batch_size or len(documents) or 1
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for start in range(0, len(self._documents), self._batch_size):
+            chunk = self._documents[start : start + self._batch_size]
+            yield b"".join(bson.encode(document) for document in chunk)
+
+
+class FakeCollection:
+    """Minimal Motor-like collection used to exercise the executor."""
+
+    def __init__(self, documents: list[dict[str, Any]]) -> None:
+        self.documents = documents
+        self.find_calls: list[tuple[dict[str, Any], dict[str, Any] | None]] = []
+        self.pipelines: list[list[dict[str, Any]]] = []
+        self.count_calls: list[tuple[dict[str, Any], int | None]] = []
+        self.sorts: list[tuple[dict[str, Any], list[tuple[str, int]] | None]] = []
+
+    def find(
+        self,
+        filter_query: dict[str, Any],
+        projection: dict[str, Any] | None = None,
+    ) -> FakeCursor:
+        self.find_calls.append((filter_query, projection))
+        matched = [d for d in self.documents if _matches(d, filter_query)]
+        if projection:
+            fields = [k for k, v in projection.items() if v]
+            matched = [{k: d[k] for k in fields if k in d} for d in matched]
+        return FakeCursor(matched)
+
+    def find_raw_batches(
+        self,
+        filter_query: dict[str, Any],
+        projection: dict[str, Any] | None = None,
+        limit: int = 0,
+        batch_size: int = 0,
+        sort: list[tuple[str, int]] | None = None,
+    ) -> FakeRawBatchCursor:
+        self.sorts.append((filter_query, sort))
+        cursor = self.find(filter_query, projection)
+        for key, direction in reversed(sort or []):
+            cursor = cursor.sort(key, direction)
+        return FakeRawBatchCursor(cursor._documents[: limit or None], batch_size)
+
+    def aggregate_raw_batches(
+        self, pipeline: list[dict[str, Any]]
+    ) -> FakeRawBatchCursor:
+        self.pipelines.append(pipeline)
+        documents = self.documents
+        for stage in pipeline:
+            if "$match" in stage:
+                documents = [d for d in documents if _matches(d, stage["$match"])]
+            elif "$sample" in stage:
+                size = min(stage["$sample"]["size"], len(documents))
+                documents = random.sample(documents, size)
+        return FakeRawBatchCursor(documents, 0)
+
+    async def count_documents(
+        self, filter_query: dict[str, Any], limit: int | None = None
+    ) -> int:
+        self.count_calls.append((filter_query, limit))
+        count = sum(1 for d in self.documents if _matches(d, filter_query))
+        return min(count, limit) if limit else count
+
+    async def estimated_document_count(self) -> int:
+        return len(self.documents)
+
+
+class FakeMongoClient:
+    """Dictionary-backed client: client[db][collection]."""
+
+    def __init__(self, data: dict[str, dict[str, FakeCollection]]) -> None:
+        self._data = data
+
+    def __getitem__(self, db_name: str) -> dict[str, FakeCollection]:
+        return self._data[db_name]
+
+
+@pytest.fixture
+def mongo_client() -> FakeMongoClient:
+    """Create a fake client with cards and invoices for three users."""
+    return FakeMongoClient(
+        {
+            "card_account_authorization": {
+                "card_main": FakeCollection(
+                    [
+                        {"_id": "c1", "consumer_id": "1", "status": "ACTIVE"},
+                        {"_id": "c2", "consumer_id": "2", "status": "ACTIVE"},
+                        {"_id": "c3", "consumer_id": "3", "status": "BLOCKED"},
+                    ]
+                )
+            },
+            "credit": {
+                "invoice": FakeCollection(
+                    [
+                        {"_id": "i1", "consumerId": "1", "status": "OPEN"},
+                        {"_id": "i2", "consumerId": "1", "status": "OPEN"},
+                        {"_id": "i3", "consumerId": "3", "status": "OPEN"},
+                        {"_id": "i4", "consumerId": "2", "status": "PAID"},
+                    ]
+                )
+            },
+        }
+    )
+
+
+def _make_executor(
+    mongo_client: FakeMongoClient,
+    sources: dict[str, SourceMetadataYaml] | None = None,
+) -> QueryExecutor:
+    """Build an executor wired to the fake client and a stub catalog."""
+    catalog = MagicMock()
+    catalog.get_source_by_identity = AsyncMock(
+        side_effect=lambda db, table: (sources or {}).get(f"{db}.{table}")
+    )
+    return QueryExecutor(
+        MagicMock(),
+        mongo_client=mongo_client,  # type: ignore[arg-type]
+        catalog_repository=catalog,
+    )
+
+
+def _source(db_name: str, table_name: str, user_key: str) -> SourceMetadataYaml:
+    return SourceMetadataYaml(
+        db_name=db_name,
+        table_name=table_name,
+        document_count=1,
+        extracted_at="2025-01-15T10:00:00+00:00",  # type: ignore[arg-type]
+        user_key=user_key,
+    )
+
+
+class TestExecuteSql:
+    """Tests for SQL execution through the compiled plan."""
+
+    @pytest.mark.asyncio
+    async def test_single_collection(self, mongo_client: FakeMongoClient) -> None:
+        """Test that a single-table query runs a filtered find."""
+        executor = _make_executor(mongo_client)
+
+        rows = await executor._execute_sql(
+            "SELECT * FROM credit.invoice WHERE status = 'OPEN'", limit=10
+        )
+
+        assert [r["_id"] for r in rows] == ["i1", "i2", "i3"]
+
+    @pytest.mark.asyncio
+    async def test_join_with_on_clause(self, mongo_client: FakeMongoClient) -> None:
+        """Test that only users present on both sides survive the join."""
+        executor = _make_executor(mongo_client)
+
+        rows = await executor._execute_sql(
+            "SELECT * FROM card_account_authorization.card_main c "
+            "JOIN credit.invoice i ON c.consumer_id = i.consumerId "
+            "WHERE c.status = 'ACTIVE' AND i.status = 'OPEN'",
+            limit=10,
+        )
+
+        assert len(rows) == 1
+        row = rows[0]
+        assert row["card_account_authorization.card_main"]["_id"] == "c1"
+        assert row["credit.invoice"]["_id"] == "i1"
+
+    @pytest.mark.asyncio
+    async def test_join_projects_only_keys(self, mongo_client: FakeMongoClient) -> None:
+        """Test that key collection scans project only the join key."""
+        executor = _make_executor(mongo_client)
+
+        await executor._execute_sql(
+            "SELECT * FROM card_account_authorization.card_main c "
+            "JOIN credit.invoice i ON c.consumer_id = i.consumerId",
+            limit=10,
+        )
+
+        invoice = mongo_client["credit"]["invoice"]
+        projections = [p for _, p in invoice.find_calls if p is not None]
+        assert projections == [{"consumerId": 1, "_id": 0}]
+
+    @pytest.mark.asyncio
+    async def test_join_applies_select_columns(
+        self, mongo_client: FakeMongoClient
+    ) -> None:
+        """Test that joined documents keep only their SELECT columns and key."""
+        executor = _make_executor(mongo_client)
+
+        rows = await executor._execute_sql(
+            "SELECT c.status, i._id FROM card_account_authorization.card_main c "
+            "JOIN credit.invoice i ON c.consumer_id = i.consumerId "
+            "WHERE c.status = 'ACTIVE' AND i.status = 'OPEN'",
+            limit=10,
+        )
+
+        assert rows == [
+            {
+                "consumer_id": "1",
+                "card_account_authorization.card_main": {
+                    "consumer_id": "1",
+                    "status": "ACTIVE",
+                },
+                "credit.invoice": {"_id": "i1", "consumerId": "1"},
+            }
+        ]
+
+    @pytest.mark.asyncio
+    async def test_join_uses_catalog_user_key(
+        self, mongo_client: FakeMongoClient
+    ) -> None:
+        """Test that comma joins fall back to the catalog-declared user key."""
+        executor = _make_executor(
+            mongo_client,
+            {
+                "credit.invoice": _source("credit", "invoice", "consumerId"),
+                "card_account_authorization.card_main": _source(
+                    "card_account_authorization", "card_main", "consumer_id"
+                ),
+            },
+        )
+
+        rows = await executor._execute_sql(
+            "SELECT * FROM credit.invoice i, card_account_authorization.card_main c "
+            "WHERE i.status = 'OPEN'",
+            limit=10,
+        )
+
+        assert sorted(r["consumerId"] for r in rows) == ["1", "3"]
+
+    @pytest.mark.asyncio
+    async def test_join_without_key_raises(self, mongo_client: FakeMongoClient) -> None:
+        """Test that a join without ON clause or catalog key is rejected."""
+        executor = _make_executor(mongo_client)
+
+        with pytest.raises(QueryExecutionError) as exc_info:
+            await executor._execute_sql(
+                "SELECT * FROM credit.invoice i, card_account_authorization.card_main c",
+                limit=10,
+            )
+
+        assert exc_info.value.code == "JOIN_KEY_NOT_FOUND"
+
+    @pytest.mark.asyncio
+    async def test_or_across_join_raises(self, mongo_client: FakeMongoClient) -> None:
+        """Test that an OR spanning joined collections is rejected, not dropped."""
+        executor = _make_executor(mongo_client)
+
+        with pytest.raises(QueryExecutionError) as exc_info:
+            await executor._execute_sql(
+                "SELECT * FROM card_account_authorization.card_main c "
+                "JOIN credit.invoice i ON c.consumer_id = i.consumerId "
+                "WHERE c.status = 'BLOCKED' OR i.status = 'PAID'",
+                limit=10,
+            )
+
+        assert exc_info.value.code == "UNSUPPORTED_CONDITION"
+        assert mongo_client["credit"]["invoice"].find_calls == []
+
+
+class TestRawBatchDecoding:
+    """Tests for the raw BSON result path."""
+
+    @pytest.mark.asyncio
+    async def test_bson_values_decoded_to_strings(self) -> None:
+        """Test that ObjectId and Decimal128 come out as strings."""
+        object_id = bson.ObjectId()
+        client = FakeMongoClient(
+            {
+                "credit": {
+                    "invoice": FakeCollection(
+                        [{"_id": object_id, "value": bson.Decimal128("54.08")}]
+                    )
+                }
+            }
+        )
+        executor = _make_executor(client)
+
+        rows = await executor._execute_sql("SELECT * FROM credit.invoice", limit=10)
+
+        assert rows == [{"_id": str(object_id), "value": "54.08"}]
+
+    @pytest.mark.asyncio
+    async def test_selected_columns_are_projected(
+        self, mongo_client: FakeMongoClient
+    ) -> None:
+        """Test that only SELECT columns are fetched."""
+        executor = _make_executor(mongo_client)
+
+        rows = await executor._execute_sql(
+            "SELECT consumerId FROM credit.invoice WHERE status = 'PAID'", limit=10
+        )
+
+        assert rows == [{"consumerId": "2"}]
+
+
+def _invoices(count: int) -> FakeCollection:
+    """Create invoices with real ObjectIds, one per second, half OPEN."""
+    return FakeCollection(
+        [
+            {
+                "_id": bson.ObjectId.from_datetime(
+                    datetime(2025, 1, 1, tzinfo=UTC) + timedelta(seconds=i)
+                ),
+                "consumerId": str(i),
+                "status": "OPEN" if i % 2 == 0 else "PAID",
+            }
+            for i in range(count)
+        ]
+    )
+
+
+class TestRandomSample:
+    """Tests for the random sampling execution mode."""
+
+    @pytest.mark.asyncio
+    async def test_match_then_sample_pipeline(self) -> None:
+        """Test that sampling runs $match -> $sample with the limit as size."""
+        invoices = _invoices(100)
+        executor = _make_executor(FakeMongoClient({"credit": {"invoice": invoices}}))
+
+        rows = await executor._execute_sql(
+            "SELECT * FROM credit.invoice WHERE status = 'OPEN'",
+            limit=10,
+            random_sample=True,
+        )
+
+        assert invoices.pipelines == [
+            [{"$match": {"status": "OPEN"}}, {"$sample": {"size": 10}}]
+        ]
+        assert len(rows) == 10
+        assert all(row["status"] == "OPEN" for row in rows)
+
+    @pytest.mark.asyncio
+    async def test_large_collections_use_id_seeks(self) -> None:
+        """Test that collections above the threshold are sampled by _id seeks."""
+        invoices = _invoices(200)
+        executor = _make_executor(FakeMongoClient({"credit": {"invoice": invoices}}))
+        executor._settings = Settings(query_sample_seek_threshold=50)
+
+        rows = await executor._execute_sql(
+            "SELECT consumerId FROM credit.invoice WHERE status = 'OPEN'",
+            limit=20,
+            random_sample=True,
+        )
+
+        assert invoices.pipelines == []
+        assert len(rows) == 20
+        assert len({row["consumerId"] for row in rows}) == 20
+        assert all(set(row) == {"consumerId"} for row in rows)
+        assert all(int(row["consumerId"]) % 2 == 0 for row in rows)
+
+    @pytest.mark.asyncio
+    async def test_id_seeks_are_sorted_range_scans(self) -> None:
+        """Test that every seek asks for _id order from its pivot."""
+        invoices = _invoices(200)
+        executor = _make_executor(FakeMongoClient({"credit": {"invoice": invoices}}))
+        executor._settings = Settings(query_sample_seek_threshold=50)
+
+        await executor._execute_sql(
+            "SELECT * FROM credit.invoice", limit=20, random_sample=True
+        )
+
+        seeks = [
+            sort for filter_query, sort in invoices.sorts if "$gte" in str(filter_query)
+        ]
+        assert seeks
+        assert all(sort == [("_id", 1)] for sort in seeks)
+
+    @pytest.mark.asyncio
+    async def test_join_samples_surviving_keys(
+        self, mongo_client: FakeMongoClient
+    ) -> None:
+        """Test that join sampling keeps the limit over surviving keys."""
+        executor = _make_executor(mongo_client)
+
+        rows = await executor._execute_sql(
+            "SELECT * FROM card_account_authorization.card_main c "
+            "JOIN credit.invoice i ON c.consumer_id = i.consumerId",
+            limit=2,
+            random_sample=True,
+        )
+
+        assert len(rows) == 2
+        assert {row["consumer_id"] for row in rows} <= {"1", "2", "3"}
+
+
+class TestStreamBatches:
+    """Tests for batched streaming used by exports."""
+
+    @pytest.mark.asyncio
+    async def test_batches_respect_size_and_limit(
+        self, mongo_client: FakeMongoClient
+    ) -> None:
+        """Test that rows are yielded in fixed-size batches up to the limit."""
+        executor = _make_executor(mongo_client)
+        query = StoredQuery(
+            interpretation_id=uuid4(),
+            sql="SELECT * FROM credit.invoice",
+            is_valid=True,
+        )
+
+        batches = [
+            batch
+            async for batch in executor.stream_batches(query, limit=3, batch_size=2)
+        ]
+
+        assert [[r["_id"] for r in batch] for batch in batches] == [
+            ["i1", "i2"],
+            ["i3"],
+        ]
+
+
+class TestMaterialize:
+    """Tests for materializing every user of a plan."""
+
+    @pytest.mark.asyncio
+    async def test_join_keys_are_resolved_once(
+        self, mongo_client: FakeMongoClient
+    ) -> None:
+        """Test that a join materialization counts and scans each side once."""
+        executor = _make_executor(mongo_client)
+        sql = (
+            "SELECT * FROM card_account_authorization.card_main c "
+            "JOIN credit.invoice i ON c.consumer_id = i.consumerId"
+        )
+        query = StoredQuery(interpretation_id=uuid4(), sql=sql, is_valid=True)
+        plan = await executor.compile_plan(sql)
+        assert plan is not None
+
+        result = await executor.materialize(query, plan, sample_size=10)
+
+        assert sorted(result.user_keys) == ["1", "2", "3"]
+        assert len(result.rows) == 3
+        for collection in (
+            mongo_client["card_account_authorization"]["card_main"],
+            mongo_client["credit"]["invoice"],
+        ):
+            assert len(collection.count_calls) == 1
+            key_scans = [p for _, p in collection.find_calls if p is not None]
+            assert len(key_scans) == 1
+
+
+@pytest.fixture
+def engine_client(tmp_path: Path) -> MockMongoClient:
+    """Create an in-process engine client with cards and invoices."""
+    invoices = [
+        {"consumerId": "1", "status": "OPEN", "dueDate": "2025-01-10"},
+        {"consumerId": "1", "status": "CLOSED", "dueDate": "2025-02-10"},
+        {"consumerId": "2", "status": "CLOSED", "dueDate": "2025-01-10"},
+        {"consumerId": "3", "status": "CLOSED", "dueDate": "2025-03-10"},
+    ]
+    cards = [
+        {"consumer_id": "7", "status": "ACTIVE"},
+        {"consumer_id": "8", "status": "ACTIVE"},
+    ]
+    (tmp_path / "credit.invoice.json").write_text(json.dumps(invoices))
+    (tmp_path / "card_account_authorization.card_main.json").write_text(
+        json.dumps(cards)
+    )
+    return MockMongoClient(tmp_path)
+
+
+class TestNoResultsAnalysis:
+    """Tests for the $facet leave-one-out analysis of empty results."""
+
+    @pytest.mark.asyncio
+    async def test_suggests_filter_removals_with_user_counts(
+        self, engine_client: MockMongoClient
+    ) -> None:
+        """Test that each removable filter is reported with its user count."""
+        executor = _make_executor(
+            engine_client,  # type: ignore[arg-type]
+            {"credit.invoice": _source("credit", "invoice", "consumerId")},
+        )
+        executor._suggestion_service = MagicMock()
+        stored_query = StoredQuery(
+            interpretation_id=uuid4(),
+            sql="SELECT * FROM credit.invoice "
+            "WHERE status = 'OPEN' AND dueDate >= '2025-02-01'",
+            is_valid=True,
+        )
+
+        result, suggestions = await executor.execute_query_with_no_results_handling(
+            stored_query
+        )
+
+        assert result.row_count == 0
+        assert suggestions == [
+            "Remover o filtro `status = OPEN` retorna 2 usuários.",
+            "Remover o filtro `dueDate >= 2025-02-01` retorna 1 usuários.",
+        ]
+        executor._suggestion_service.generate_no_results_suggestions.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_single_facet_round_trip(
+        self, engine_client: MockMongoClient
+    ) -> None:
+        """Test that all counts come from one $facet aggregation."""
+        executor = _make_executor(engine_client)  # type: ignore[arg-type]
+        collection = engine_client["credit"]["invoice"]
+        pipelines: list[list[dict[str, Any]]] = []
+        aggregate = collection.aggregate_raw_batches
+
+        def recording_aggregate(pipeline: list[dict[str, Any]]) -> Any:
+            pipelines.append(pipeline)
+            return aggregate(pipeline)
+
+        collection.aggregate_raw_batches = recording_aggregate  # type: ignore[method-assign]
+
+        analysis = await executor._relaxation_counts(
+            compile_sql(
+                "SELECT * FROM credit.invoice WHERE status = 'PAID' "
+                "AND consumerId = '1'"
+            ).primary  # type: ignore[union-attr]
+        )
+
+        assert len(pipelines) == 1
+        assert list(pipelines[0][-1]["$facet"]) == ["all", "without_0", "without_1"]
+        assert analysis.unit == "registros"
+        assert analysis.matches == 0
+        assert [count for _, count in analysis.relaxed] == [2, 0]
+
+    @pytest.mark.asyncio
+    async def test_join_without_common_users(
+        self, engine_client: MockMongoClient
+    ) -> None:
+        """Test that a join of non-empty sides points at the join itself."""
+        executor = _make_executor(engine_client)  # type: ignore[arg-type]
+
+        plan = compile_sql(
+            "SELECT * FROM card_account_authorization.card_main c "
+            "JOIN credit.invoice i ON c.consumer_id = i.consumerId "
+            "WHERE c.status = 'ACTIVE' AND i.status = 'CLOSED'"
+        )
+        suggestions = await executor._explain_no_results(plan)  # type: ignore[arg-type]
+
+        assert len(suggestions) == 1
+        assert suggestions[0].startswith("Cada tabela tem resultados isoladamente")
+        assert "2 registros em card_account_authorization.card_main" in suggestions[0]
+
+
+class TestDistinctUsers:
+    """Tests for the one-document-per-user execution mode."""
+
+    @pytest.mark.asyncio
+    async def test_limit_applies_to_users(self, engine_client: MockMongoClient) -> None:
+        """Test that duplicates per user are grouped away server-side."""
+        executor = _make_executor(
+            engine_client,  # type: ignore[arg-type]
+            {"credit.invoice": _source("credit", "invoice", "consumerId")},
+        )
+
+        rows = await executor._execute_sql(
+            "SELECT status FROM credit.invoice", limit=10, distinct_users=True
+        )
+
+        assert len(rows) == 3
+        assert sorted(rows, key=lambda r: r["status"]) == [
+            {"status": "CLOSED"},
+            {"status": "CLOSED"},
+            {"status": "OPEN"},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_random_sample_of_users(self, engine_client: MockMongoClient) -> None:
+        """Test that sampling draws distinct users."""
+        executor = _make_executor(
+            engine_client,  # type: ignore[arg-type]
+            {"credit.invoice": _source("credit", "invoice", "consumerId")},
+        )
+
+        rows = await executor._execute_sql(
+            "SELECT consumerId FROM credit.invoice WHERE status = 'CLOSED'",
+            limit=2,
+            random_sample=True,
+            distinct_users=True,
+        )
+
+        users = [r["consumerId"] for r in rows]
+        assert len(users) == len(set(users)) == 2
+
+    @pytest.mark.asyncio
+    async def test_source_without_user_key(
+        self, engine_client: MockMongoClient
+    ) -> None:
+        """Test that sources without a catalog user key are rejected."""
+        executor = _make_executor(engine_client)  # type: ignore[arg-type]
+
+        with pytest.raises(QueryExecutionError) as exc_info:
+            await executor._execute_sql(
+                "SELECT * FROM credit.invoice", limit=10, distinct_users=True
+            )
+
+        assert exc_info.value.code == "USER_KEY_NOT_FOUND"
+
+
+class TestNumericStringFilters:
+    """Tests for range filters on string-encoded amounts."""
+
+    @pytest.mark.asyncio
+    async def test_range_filter_on_string_amounts(self, tmp_path: Path) -> None:
+        """Test that catalog-tagged string amounts are compared as numbers."""
+        invoices = [
+            {"_id": "a", "value": "54.08"},
+            {"_id": "b", "value": "500.00"},
+            {"_id": "c", "value": "1200.10"},
+            {"_id": "d", "value": None},
+        ]
+        (tmp_path / "credit.invoice.json").write_text(json.dumps(invoices))
+        source = _source("credit", "invoice", "consumerId")
+        source.columns = [
+            ColumnMetadataYaml(
+                path="value",
+                name="value",
+                type=InferredType.STRING,
+                subtype=InferredSubtype.NUMERIC_STRING,
+                required=True,
+                nullable=True,
+                enumerable=False,
+                presence_ratio=1.0,
+            )
+        ]
+        executor = _make_executor(
+            MockMongoClient(tmp_path),  # type: ignore[arg-type]
+            {"credit.invoice": source},
+        )
+
+        rows = await executor._execute_sql(
+            "SELECT _id FROM credit.invoice WHERE value > 500", limit=10
+        )
+
+        assert rows == [{"_id": "c"}]
+
+
+class TestCountQuery:
+    """Tests for count-only execution."""
+
+    @pytest.fixture(autouse=True)
+    def _clear_count_cache(self) -> None:
+        get_count_cache().clear()
+
+    @staticmethod
+    def _stored(sql: str) -> StoredQuery:
+        return StoredQuery(interpretation_id=uuid4(), sql=sql, is_valid=True)
+
+    @pytest.mark.asyncio
+    async def test_filtered_count(self, mongo_client: FakeMongoClient) -> None:
+        """Test that filtered queries run countDocuments with the plan filter."""
+        executor = _make_executor(mongo_client)
+
+        result = await executor.count_query(
+            self._stored("SELECT * FROM credit.invoice WHERE status = 'OPEN'")
+        )
+
+        assert result.count == 3
+        assert not result.is_estimated
+        assert not result.is_bounded
+        assert not result.cached
+        invoice = mongo_client["credit"]["invoice"]
+        assert invoice.count_calls == [({"status": "OPEN"}, None)]
+
+    @pytest.mark.asyncio
+    async def test_unfiltered_count_is_estimated(
+        self, mongo_client: FakeMongoClient
+    ) -> None:
+        """Test that queries without filters use the estimated count."""
+        executor = _make_executor(mongo_client)
+
+        result = await executor.count_query(
+            self._stored("SELECT * FROM credit.invoice")
+        )
+
+        assert result.count == 4
+        assert result.is_estimated
+        assert mongo_client["credit"]["invoice"].count_calls == []
+
+    @pytest.mark.asyncio
+    async def test_bounded_count(self, mongo_client: FakeMongoClient) -> None:
+        """Test that max_count stops counting and flags the result."""
+        executor = _make_executor(mongo_client)
+        sql = "SELECT * FROM credit.invoice WHERE status = 'OPEN'"
+
+        bounded = await executor.count_query(self._stored(sql), max_count=2)
+        exact = await executor.count_query(self._stored(sql), max_count=10)
+
+        assert (bounded.count, bounded.is_bounded) == (2, True)
+        assert (exact.count, exact.is_bounded) == (3, False)
+        assert mongo_client["credit"]["invoice"].count_calls[0] == (
+            {"status": "OPEN"},
+            2,
+        )
+
+    @pytest.mark.asyncio
+    async def test_count_is_cached_per_plan(
+        self, mongo_client: FakeMongoClient
+    ) -> None:
+        """Test that equivalent queries reuse the cached count."""
+        executor = _make_executor(mongo_client)
+
+        first = await executor.count_query(
+            self._stored("SELECT * FROM credit.invoice WHERE status = 'OPEN'")
+        )
+        second = await executor.count_query(
+            self._stored("select * from credit.invoice where status='OPEN'")
+        )
+
+        assert (first.cached, second.cached) == (False, True)
+        assert second.count == first.count
+        assert len(mongo_client["credit"]["invoice"].count_calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_join_counts_common_users(
+        self, mongo_client: FakeMongoClient
+    ) -> None:
+        """Test that joins count the users present in every side."""
+        executor = _make_executor(mongo_client)
+
+        result = await executor.count_query(
+            self._stored(
+                "SELECT * FROM card_account_authorization.card_main c "
+                "JOIN credit.invoice i ON c.consumer_id = i.consumerId "
+                "WHERE i.status = 'OPEN'"
+            )
+        )
+
+        assert result.count == 2
+        assert not result.is_estimated
+
+
+class TestRevalidateIds:
+    """Tests for batched revalidation of previously returned documents."""
+
+    @staticmethod
+    def _stored(sql: str) -> StoredQuery:
+        return StoredQuery(interpretation_id=uuid4(), sql=sql, is_valid=True)
+
+    @pytest.mark.asyncio
+    async def test_single_collection(self, mongo_client: FakeMongoClient) -> None:
+        """Test that IDs are checked in one filtered round trip."""
+        executor = _make_executor(mongo_client)
+
+        result = await executor.revalidate_ids(
+            self._stored("SELECT * FROM credit.invoice WHERE status = 'OPEN'"),
+            ["i4", "i1", "missing", "i3", "i1"],
+        )
+
+        assert result.valid_ids == ["i1", "i3"]
+        assert result.invalid_ids == ["i4", "missing"]
+        invoice = mongo_client["credit"]["invoice"]
+        assert invoice.find_calls == [
+            (
+                {
+                    "$and": [
+                        {"status": "OPEN"},
+                        {"_id": {"$in": ["i4", "i1", "missing", "i3"]}},
+                    ]
+                },
+                {"_id": 1},
+            )
+        ]
+
+    @pytest.mark.asyncio
+    async def test_object_ids(self, tmp_path: Path) -> None:
+        """Test that hex IDs from results match ObjectId _ids."""
+        invoices = [
+            {"_id": "61df355c6d26db1a6b46515b", "status": "OPEN"},
+            {"_id": "61df355c6d26db1a6b46515c", "status": "PAID"},
+        ]
+        (tmp_path / "credit.invoice.json").write_text(json.dumps(invoices))
+        executor = _make_executor(MockMongoClient(tmp_path))  # type: ignore[arg-type]
+
+        result = await executor.revalidate_ids(
+            self._stored("SELECT * FROM credit.invoice WHERE status = 'OPEN'"),
+            ["61df355c6d26db1a6b46515b", "61df355c6d26db1a6b46515c"],
+        )
+
+        assert result.valid_ids == ["61df355c6d26db1a6b46515b"]
+        assert result.invalid_ids == ["61df355c6d26db1a6b46515c"]
+
+    @pytest.mark.asyncio
+    async def test_join_requires_user_in_every_side(
+        self, mongo_client: FakeMongoClient
+    ) -> None:
+        """Test that join documents are invalid once their user drops out."""
+        executor = _make_executor(mongo_client)
+
+        result = await executor.revalidate_ids(
+            self._stored(
+                "SELECT * FROM card_account_authorization.card_main c "
+                "JOIN credit.invoice i ON c.consumer_id = i.consumerId "
+                "WHERE c.status = 'ACTIVE' AND i.status = 'OPEN'"
+            ),
+            ["c1", "i1", "i3", "c2"],
+        )
+
+        assert result.valid_ids == ["c1", "i1"]
+        assert result.invalid_ids == ["i3", "c2"]
@@ -0,0 +1,344 @@
+"""Unit tests for SQL to MongoDB query plan compilation."""
+
+from bson import Decimal128
+
+from src.services.interpreter.query_plan import (
+    Predicate,
+    build_filter,
+    compile_sql,
+    like_to_regex,
+)
+
+
+class TestCompileSingleCollection:
+    """Tests for plans over a single collection."""
+
+    def test_simple_equality(self) -> None:
+        """Test that string equality becomes a plain field match."""
+        plan = compile_sql("SELECT * FROM credit.invoice WHERE status = 'OPEN'")
+
+        assert plan is not None
+        assert not plan.is_join
+        assert plan.primary.source_id == "credit.invoice"
+        assert plan.primary.filter == {"status": "OPEN"}
+
+    def test_table_without_database(self) -> None:
+        """Test that a bare table name is used as both db and collection."""
+        plan = compile_sql("SELECT * FROM invoice")
+
+        assert plan is not None
+        assert plan.primary.db_name == "invoice"
+        assert plan.primary.collection_name == "invoice"
+        assert plan.primary.filter == {}
+
+    def test_no_from_clause_returns_none(self) -> None:
+        """Test that SQL without FROM cannot be compiled."""
+        assert compile_sql("SELECT 1") is None
+
+    def test_comparison_operators(self) -> None:
+        """Test numeric comparisons and IN lists."""
+        plan = compile_sql(
+            "SELECT * FROM credit.invoice "
+            "WHERE dueDays >= 30 AND status IN ('OPEN', 'OVERDUE') "
+            "AND archived IS NULL LIMIT 10"
+        )
+
+        assert plan is not None
+        assert plan.primary.filter == {
+            "dueDays": {"$gte": 30},
+            "status": {"$in": ["OPEN", "OVERDUE"]},
+            "archived": None,
+        }
+
+    def test_between_is_not_split_on_and(self) -> None:
+        """Test that BETWEEN x AND y stays a single predicate."""
+        plan = compile_sql(
+            "SELECT * FROM credit.invoice WHERE amount BETWEEN 10 AND 20 "
+            "AND status = 'OPEN'"
+        )
+
+        assert plan is not None
+        assert plan.primary.predicates == [
+            Predicate(field="amount", operator="BETWEEN", value=[10, 20]),
+            Predicate(field="status", operator="=", value="OPEN"),
+        ]
+
+    def test_or_becomes_or_filter(self) -> None:
+        """Test that OR expressions are compiled to $or, binding after AND."""
+        plan = compile_sql(
+            "SELECT * FROM credit.invoice WHERE status = 'OPEN' OR status = 'PAID' "
+            "AND value > 10"
+        )
+
+        assert plan is not None
+        assert plan.primary.filter == {
+            "$or": [
+                {"status": "OPEN"},
+                {"$and": [{"status": "PAID"}, {"value": {"$gt": 10}}]},
+            ]
+        }
+
+    def test_parenthesized_or_is_one_condition(self) -> None:
+        """Test that a parenthesized OR is ANDed with the other conditions."""
+        plan = compile_sql(
+            "SELECT * FROM credit.invoice "
+            "WHERE (status = 'OPEN' OR note = 'a OR b') AND value BETWEEN 1 AND 5"
+        )
+
+        assert plan is not None
+        assert plan.unsupported == []
+        assert plan.primary.filter == {
+            "$or": [{"status": "OPEN"}, {"note": "a OR b"}],
+            "value": {"$gte": 1, "$lte": 5},
+        }
+
+    def test_unparsable_condition_is_unsupported(self) -> None:
+        """Test that an AND condition the parser cannot read is not dropped."""
+        plan = compile_sql(
+            "SELECT * FROM credit.invoice "
+            "WHERE LOWER(status) = 'open' AND value > 10 AND dueDate < NOW()"
+        )
+
+        assert plan is not None
+        assert plan.primary.filter == {"value": {"$gt": 10}}
+        assert plan.unsupported == ["LOWER(status) = 'open'", "dueDate < NOW()"]
+
+
+class TestSelectProjection:
+    """Tests for SELECT column projection."""
+
+    def test_star_selects_whole_documents(self) -> None:
+        """Test that SELECT * has no projection."""
+        plan = compile_sql("SELECT * FROM credit.invoice")
+
+        assert plan is not None
+        assert plan.primary.projection is None
+
+    def test_columns_are_projected_without_id(self) -> None:
+        """Test that listed columns (and their aliases) become a projection."""
+        plan = compile_sql(
+            "SELECT i.consumerId, i.status AS situacao FROM credit.invoice i"
+        )
+
+        assert plan is not None
+        assert plan.primary.projection == {"consumerId": 1, "status": 1, "_id": 0}
+
+    def test_functions_disable_projection(self) -> None:
+        """Test that non-column expressions fall back to whole documents."""
+        plan = compile_sql("SELECT COUNT(*) FROM credit.invoice")
+
+        assert plan is not None
+        assert plan.primary.projection is None
+
+    def test_join_projects_each_side(self) -> None:
+        """Test that each joined collection gets its own SELECT columns."""
+        plan = compile_sql(
+            "SELECT c.name, i.* FROM card_main c "
+            "JOIN credit.invoice i ON c.consumerId = i.consumerId "
+            "JOIN credit.payment p ON c.consumerId = p.consumerId"
+        )
+
+        assert plan is not None
+        card, invoice, payment = plan.collections
+        assert card.projection == {"name": 1, "_id": 0}
+        assert invoice.projection is None
+        assert payment.projection == {"_id": 0}
+
+    def test_projection_changes_fingerprint(self) -> None:
+        """Test that plans selecting different columns do not collide."""
+        plain = compile_sql("SELECT * FROM credit.invoice")
+        projected = compile_sql("SELECT status FROM credit.invoice")
+
+        assert plain is not None and projected is not None
+        assert plain.fingerprint != projected.fingerprint
+
+    def test_field_order_does_not_change_fingerprint(self) -> None:
+        """Test that the same columns in another order share a fingerprint."""
+        first = compile_sql("SELECT status, consumerId FROM credit.invoice")
+        second = compile_sql("SELECT i.consumerId, i.status FROM credit.invoice i")
+
+        assert first is not None and second is not None
+        assert first.fingerprint == second.fingerprint
+
+
+class TestCompileJoin:
+    """Tests for multi-collection plans."""
+
+    def test_inner_join_with_on_clause(self) -> None:
+        """Test that JOIN ... ON assigns join keys and per-alias predicates."""
+        plan = compile_sql(
+            "SELECT * FROM card_account_authorization.card_main c "
+            "JOIN credit.invoice i ON c.consumer_id = i.consumerId "
+            "WHERE c.status = 'ACTIVE' AND i.status = 'OPEN'"
+        )
+
+        assert plan is not None
+        assert plan.is_join
+        card, invoice = plan.collections
+        assert card.join_key == "consumer_id"
+        assert invoice.join_key == "consumerId"
+        assert card.filter == {"status": "ACTIVE"}
+        assert invoice.filter == {"status": "OPEN"}
+        assert plan.tables == [
+            "card_account_authorization.card_main",
+            "credit.invoice",
+        ]
+
+    def test_comma_separated_from_list(self) -> None:
+        """Test that comma joins produce collections without ON keys."""
+        plan = compile_sql(
+            "SELECT * FROM credit.invoice AS i, credit.closed_invoice AS ci "
+            "WHERE i.status = 'OPEN'"
+        )
+
+        assert plan is not None
+        assert [c.alias for c in plan.collections] == ["i", "ci"]
+        assert all(c.join_key is None for c in plan.collections)
+        assert plan.collections[1].filter == {}
+
+    def test_where_equality_joins_from_list(self) -> None:
+        """Test that a WHERE column equality becomes the join key."""
+        plan = compile_sql(
+            "SELECT * FROM card_main c, credit.invoice i "
+            "WHERE c.consumerId = i.consumerId AND i.status = 'OPEN'"
+        )
+
+        assert plan is not None
+        card, invoice = plan.collections
+        assert (card.join_key, invoice.join_key) == ("consumerId", "consumerId")
+        assert card.filter == {}
+        assert invoice.filter == {"status": "OPEN"}
+        assert plan.unsupported == []
+
+    def test_unresolved_column_comparison_is_unsupported(self) -> None:
+        """Test that a column compared to an unknown reference is rejected."""
+        plan = compile_sql(
+            "SELECT * FROM card_main c, credit.invoice i "
+            "WHERE c.consumerId = x.consumerId"
+        )
+
+        assert plan is not None
+        assert plan.unsupported == ["c.consumerId = x.consumerId"]
+        assert all(c.filter == {} for c in plan.collections)
+
+    def test_or_within_one_collection_is_pushed_down(self) -> None:
+        """Test that an OR on one alias stays on that collection."""
+        plan = compile_sql(
+            "SELECT * FROM credit.invoice i JOIN credit.closed_invoice ci "
+            "ON i.consumerId = ci.consumerId "
+            "WHERE (i.status = 'OPEN' OR i.status = 'PAID') AND ci.value > 10"
+        )
+
+        assert plan is not None
+        invoice, closed = plan.collections
+        assert invoice.filter == {"$or": [{"status": "OPEN"}, {"status": "PAID"}]}
+        assert closed.filter == {"value": {"$gt": 10}}
+
+    def test_or_across_collections_is_unsupported(self) -> None:
+        """Test that an OR spanning two collections is not dropped silently."""
+        plan = compile_sql(
+            "SELECT * FROM credit.invoice i JOIN credit.closed_invoice ci "
+            "ON i.consumerId = ci.consumerId "
+            "WHERE i.status = 'OPEN' OR ci.status = 'PAID'"
+        )
+
+        assert plan is not None
+        assert plan.unsupported == ["i.status = 'OPEN' OR ci.status = 'PAID'"]
+        assert all(c.filter == {} for c in plan.collections)
+
+
+class TestFilterHelpers:
+    """Tests for filter building helpers."""
+
+    def test_repeated_field_uses_and(self) -> None:
+        """Test that two predicates on one field are not merged destructively."""
+        result = build_filter(
+            [
+                Predicate(field="value", operator=">", value=10),
+                Predicate(field="value", operator="<", value=20),
+            ]
+        )
+
+        assert result == {"$and": [{"value": {"$gt": 10}}, {"value": {"$lt": 20}}]}
+
+    def test_like_to_regex(self) -> None:
+        """Test LIKE wildcard translation."""
+        assert like_to_regex("PIC%") == "^PIC.*$"
+        assert like_to_regex("a_c") == "^a.c$"
+
+    def test_describe(self) -> None:
+        """Test human-readable predicate rendering."""
+        assert Predicate("status", "=", "CLOSED").describe() == "status = CLOSED"
+        assert Predicate("archived", "IS NULL").describe() == "archived IS NULL"
+        group = Predicate("", "OR", [Predicate("a", "=", 1), Predicate("b", "IS NULL")])
+        assert group.describe() == "(a = 1 OR b IS NULL)"
+
+
+class TestNumericStrings:
+    """Tests for decimal comparisons on string-encoded numeric columns."""
+
+    _CONVERTED = {
+        "$convert": {
+            "input": "$value",
+            "to": "decimal",
+            "onError": None,
+            "onNull": None,
+        }
+    }
+
+    def test_range_uses_decimal_expression(self) -> None:
+        """Test that range filters compare the converted value."""
+        plan = compile_sql("SELECT * FROM credit.invoice WHERE value > 500")
+        assert plan is not None
+        plan.primary.mark_numeric_strings({"value"})
+
+        assert plan.primary.filter == {
+            "$expr": {
+                "$and": [
+                    {"$ne": [self._CONVERTED, None]},
+                    {"$gt": [self._CONVERTED, Decimal128("500")]},
+                ]
+            }
+        }
+
+    def test_between_and_in(self) -> None:
+        """Test BETWEEN bounds and numeric IN lists."""
+        between = Predicate("value", "BETWEEN", ["10.5", 20], numeric_string=True)
+        in_list = Predicate("value", "IN", [1, 2.5], numeric_string=True)
+
+        assert between.to_mongo()["$expr"]["$and"][1] == {
+            "$and": [
+                {"$gte": [self._CONVERTED, Decimal128("10.5")]},
+                {"$lte": [self._CONVERTED, Decimal128("20")]},
+            ]
+        }
+        assert in_list.to_mongo()["$expr"]["$and"][1] == {
+            "$in": [self._CONVERTED, [Decimal128("1"), Decimal128("2.5")]]
+        }
+
+    def test_string_equality_is_unchanged(self) -> None:
+        """Test that string literals keep the plain, indexable comparison."""
+        predicate = Predicate("value", "=", "54.08", numeric_string=True)
+        assert predicate.to_mongo() == {"value": "54.08"}
+
+    def test_unmarked_columns_are_unchanged(self) -> None:
+        """Test that only catalog-tagged columns are converted."""
+        plan = compile_sql(
+            "SELECT * FROM credit.invoice WHERE value > 500 AND installments > 2"
+        )
+        assert plan is not None
+        plan.primary.mark_numeric_strings({"value"})
+
+        assert plan.primary.filter["installments"] == {"$gt": 2}
+
+    def test_or_members_are_marked(self) -> None:
+        """Test that conditions inside an OR are converted too."""
+        plan = compile_sql(
+            "SELECT * FROM credit.invoice WHERE value > 500 OR installments > 2"
+        )
+        assert plan is not None
+        plan.primary.mark_numeric_strings({"value"})
+
+        first, second = plan.primary.filter["$or"]
+        assert "$expr" in first
+        assert second == {"installments": {"$gt": 2}}
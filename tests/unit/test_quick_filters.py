@@ -0,0 +1,228 @@
+"""Unit tests for quick filter materialization."""
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pymongo.errors import ServerSelectionTimeoutError
+
+from src.repositories.external.mock_engine import MockMongoClient
+from src.schemas.catalog_yaml import SourceMetadataYaml
+from src.schemas.enums import MaterializationStatus
+from src.schemas.quick_filters import QuickFilterDefinition
+from src.services.interpreter.admission import AdmissionController
+from src.services.interpreter.query_executor import QueryExecutionError, QueryExecutor
+from src.services.quick_filters import (
+    QuickFilterScheduler,
+    load_quick_filter_definitions,
+)
+
+INVOICES: list[dict[str, Any]] = [
+    {"consumerId": "1", "status": "OPEN"},
+    {"consumerId": "1", "status": "OPEN"},
+    {"consumerId": "2", "status": "OPEN"},
+    {"consumerId": "3", "status": "CLOSED"},
+]
+
+OPEN_INVOICES = QuickFilterDefinition(
+    id="faturas-abertas",
+    name="Faturas abertas",
+    sql="SELECT consumerId, status FROM credit.invoice WHERE status = 'OPEN'",
+)
+
+
+@pytest.fixture
+def executor(tmp_path: Path) -> QueryExecutor:
+    """Create an executor over a mock invoice collection keyed by consumerId."""
+    (tmp_path / "credit.invoice.json").write_text(json.dumps(INVOICES))
+    catalog = MagicMock()
+    catalog.get_source_by_identity = AsyncMock(
+        return_value=SourceMetadataYaml(
+            db_name="credit",
+            table_name="invoice",
+            document_count=len(INVOICES),
+            extracted_at="2025-01-15T10:00:00+00:00",
+            user_key="consumerId",
+        )
+    )
+    return QueryExecutor(
+        MagicMock(),
+        mongo_client=MockMongoClient(tmp_path),  # type: ignore[arg-type]
+        catalog_repository=catalog,
+        admission=AdmissionController(
+            max_in_flight=4,
+            source_max_in_flight=4,
+            max_queue_size=10,
+            queue_timeout_seconds=1.0,
+        ),
+    )
+
+
+def _scheduler(
+    executor: QueryExecutor, *definitions: QuickFilterDefinition
+) -> QuickFilterScheduler:
+    return QuickFilterScheduler(
+        definitions=list(definitions or [OPEN_INVOICES]),
+        refresh_interval_seconds=60,
+        sample_size=10,
+        executor=executor,
+    )
+
+
+class TestLoadDefinitions:
+    """Tests for reading quick filter definitions."""
+
+    def test_missing_file_has_no_filters(self, tmp_path: Path) -> None:
+        """Test that a missing definitions file yields no filters."""
+        assert load_quick_filter_definitions(tmp_path / "missing.yaml") == []
+
+    def test_duplicate_ids_are_rejected(self, tmp_path: Path) -> None:
+        """Test that repeated filter IDs are reported."""
+        path = tmp_path / "quick_filters.yaml"
+        item = {"id": "a", "name": "A", "sql": "SELECT * FROM credit.invoice"}
+        path.write_text(json.dumps({"quick_filters": [item, item]}))
+
+        with pytest.raises(ValueError, match="Duplicate quick filter IDs"):
+            load_quick_filter_definitions(path)
+
+    def test_bundled_definitions_are_valid(self) -> None:
+        """Test that the shipped definitions file parses."""
+        definitions = load_quick_filter_definitions("catalog/quick_filters.yaml")
+        assert definitions
+        assert all(d.sql.upper().startswith("SELECT") for d in definitions)
+
+
+class TestQuickFilterScheduler:
+    """Tests for refreshing and serving materializations."""
+
+    @pytest.mark.asyncio
+    async def test_refresh_materializes_users_and_rows(
+        self, executor: QueryExecutor
+    ) -> None:
+        """Test that a refresh stores every user key and a row sample."""
+        scheduler = _scheduler(executor)
+        state = scheduler.filters()[0]
+        assert state.status == MaterializationStatus.PENDING
+
+        await scheduler.refresh(state)
+
+        response = state.response(include_user_keys=True)
+        assert response.status == MaterializationStatus.READY
+        assert response.user_count == 2
+        assert sorted(response.user_keys or []) == ["1", "2"]
+        assert len(response.rows) == 3
+        assert response.refreshed_at is not None
+        assert state.summary().user_count == 2
+        assert state.response().user_keys is None
+
+    @pytest.mark.asyncio
+    async def test_plan_is_compiled_once(
+        self, executor: QueryExecutor, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that refreshes reuse the compiled plan."""
+        compile_plan = AsyncMock(wraps=executor.compile_plan)
+        monkeypatch.setattr(executor, "compile_plan", compile_plan)
+        scheduler = _scheduler(executor)
+        state = scheduler.filters()[0]
+
+        await scheduler.refresh(state)
+        await scheduler.refresh(state)
+
+        assert compile_plan.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_previous_results(
+        self, executor: QueryExecutor, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a failure is reported without dropping the last results."""
+        scheduler = _scheduler(executor)
+        state = scheduler.filters()[0]
+        await scheduler.refresh(state)
+        refreshed_at = state.response().refreshed_at
+
+        monkeypatch.setattr(
+            executor,
+            "materialize",
+            AsyncMock(side_effect=QueryExecutionError("QUERY_QUEUE_FULL", "Fila")),
+        )
+        await scheduler.refresh(state)
+
+        response = state.response()
+        assert response.status == MaterializationStatus.READY
+        assert response.error == "Fila"
+        assert response.refreshed_at == refreshed_at
+        assert response.user_count == 2
+
+    @pytest.mark.asyncio
+    async def test_invalid_sql_fails_without_results(
+        self, executor: QueryExecutor
+    ) -> None:
+        """Test that blocked SQL marks a never-refreshed filter as failed."""
+        scheduler = _scheduler(
+            executor,
+            QuickFilterDefinition(
+                id="apagar", name="Apagar", sql="DELETE FROM credit.invoice"
+            ),
+        )
+        state = scheduler.filters()[0]
+
+        await scheduler.refresh(state)
+
+        assert state.status == MaterializationStatus.FAILED
+        assert state.error is not None
+
+    @pytest.mark.asyncio
+    async def test_driver_error_schedules_retry(
+        self, executor: QueryExecutor, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a database driver error is recorded and retried later."""
+        monkeypatch.setattr(
+            executor,
+            "materialize",
+            AsyncMock(side_effect=ServerSelectionTimeoutError("no servers")),
+        )
+        scheduler = _scheduler(executor)
+        state = scheduler.filters()[0]
+
+        await scheduler.refresh(state)
+
+        assert state.status == MaterializationStatus.FAILED
+        assert state.error == "no servers"
+        assert state.next_refresh > time.monotonic()
+
+    @pytest.mark.asyncio
+    async def test_cancellation_is_not_recorded_as_failure(
+        self, executor: QueryExecutor, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that cancelling a refresh propagates instead of failing it."""
+        monkeypatch.setattr(
+            executor, "materialize", AsyncMock(side_effect=asyncio.CancelledError)
+        )
+        scheduler = _scheduler(executor)
+        state = scheduler.filters()[0]
+
+        with pytest.raises(asyncio.CancelledError):
+            await scheduler.refresh(state)
+
+        assert state.error is None
+
+    @pytest.mark.asyncio
+    async def test_background_loop_refreshes_on_start(
+        self, executor: QueryExecutor
+    ) -> None:
+        """Test that the scheduler refreshes due filters in the background."""
+        scheduler = _scheduler(executor)
+        scheduler.start()
+        try:
+            for _ in range(100):
+                if scheduler.filters()[0].materialization is not None:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await scheduler.stop()
+
+        assert scheduler.filters()[0].status == MaterializationStatus.READY
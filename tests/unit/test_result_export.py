@@ -0,0 +1,195 @@
+"""Unit tests for query result export encoders."""
+
+import io
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+
+from src.schemas.catalog_yaml import ColumnMetadataYaml, SourceMetadataYaml
+from src.schemas.enums import InferredType
+from src.schemas.interpreter import ExportFormat
+from src.services.interpreter.result_export import (
+    CsvEncoder,
+    JsonlEncoder,
+    catalog_columns,
+    create_encoder,
+    encode_batches,
+    flatten_document,
+)
+
+
+def _column(path: str, type_: InferredType = InferredType.STRING) -> ColumnMetadataYaml:
+    return ColumnMetadataYaml(
+        path=path,
+        name=path.rsplit(".", 1)[-1],
+        type=type_,
+        required=True,
+        nullable=False,
+        enumerable=False,
+        presence_ratio=1.0,
+    )
+
+
+@pytest.fixture
+def source() -> SourceMetadataYaml:
+    """Create a source with a nested object and an array column."""
+    return SourceMetadataYaml(
+        db_name="credit",
+        table_name="invoice",
+        document_count=2,
+        extracted_at="2025-01-15T10:00:00+00:00",  # type: ignore[arg-type]
+        columns=[
+            _column("status"),
+            _column("customer", InferredType.OBJECT),
+            _column("customer.name"),
+            _column("value", InferredType.NUMBER),
+            _column("tags", InferredType.ARRAY),
+        ],
+    )
+
+
+async def _batches(
+    *batches: list[dict[str, Any]],
+) -> AsyncIterator[list[dict[str, Any]]]:
+    for batch in batches:
+        yield batch
+
+
+async def _collect(chunks: AsyncIterator[bytes]) -> bytes:
+    return b"".join([chunk async for chunk in chunks])
+
+
+class TestHelpers:
+    """Tests for column helpers."""
+
+    def test_flatten_document(self) -> None:
+        """Test that objects are expanded and arrays kept."""
+        assert flatten_document({"a": {"b": 1, "c": {"d": 2}}, "e": [1, 2]}) == {
+            "a.b": 1,
+            "a.c.d": 2,
+            "e": [1, 2],
+        }
+
+    def test_catalog_columns_skip_object_parents(
+        self, source: SourceMetadataYaml
+    ) -> None:
+        """Test that only leaf columns are exported, in catalog order."""
+        assert catalog_columns(source) == ["status", "customer.name", "value", "tags"]
+
+
+class TestCsvEncoder:
+    """Tests for CSV export."""
+
+    @pytest.mark.asyncio
+    async def test_header_once_in_catalog_order(
+        self, source: SourceMetadataYaml
+    ) -> None:
+        """Test that the header follows the catalog and is written once."""
+        encoder = create_encoder(ExportFormat.CSV, source)
+
+        output = await _collect(
+            encode_batches(
+                _batches(
+                    [{"value": 1.5, "status": "OPEN", "customer": {"name": "Ana"}}],
+                    [{"status": "PAID", "tags": ["a", "b"]}],
+                ),
+                encoder,
+            )
+        )
+
+        lines = output.decode("utf-8").splitlines()
+        assert lines == [
+            "status,customer.name,value,tags",
+            "OPEN,Ana,1.5,",
+            'PAID,,,"[""a"", ""b""]"',
+        ]
+
+    def test_columns_from_first_batch(self) -> None:
+        """Test that unknown sources take columns from the first batch."""
+        encoder = CsvEncoder()
+
+        output = encoder.encode([{"b": 1, "a": 2}]) + encoder.encode([{"a": 3}])
+
+        assert output.decode("utf-8").splitlines() == ["b,a", "1,2", ",3"]
+
+    @pytest.mark.asyncio
+    async def test_empty_result_keeps_header(self, source: SourceMetadataYaml) -> None:
+        """Test that an empty export still has the catalog header."""
+        output = await _collect(
+            encode_batches(_batches(), create_encoder(ExportFormat.CSV, source))
+        )
+
+        assert output.decode("utf-8").strip() == "status,customer.name,value,tags"
+
+    def test_select_list_sets_columns(self, source: SourceMetadataYaml) -> None:
+        """Test that only the selected columns are exported, in SELECT order."""
+        encoder = create_encoder(
+            ExportFormat.CSV, source, fields=["value", "customer", "score"]
+        )
+
+        output = encoder.encode(
+            [{"customer": {"name": "Ana"}, "value": 2, "score": 9, "other": 1}]
+        )
+
+        # Uncataloged keys of the first batch are kept after the selected ones
+        assert output.decode("utf-8").splitlines() == [
+            "value,customer.name,score,other",
+            "2,Ana,9,1",
+        ]
+
+    def test_select_star_appends_uncataloged_keys(
+        self, source: SourceMetadataYaml
+    ) -> None:
+        """Test that keys missing from the catalog are not dropped."""
+        encoder = create_encoder(ExportFormat.CSV, source)
+
+        output = encoder.encode([{"status": "OPEN", "legacy": "x"}])
+
+        assert output.decode("utf-8").splitlines() == [
+            "status,customer.name,value,tags,legacy",
+            "OPEN,,,,x",
+        ]
+
+
+class TestJsonlEncoder:
+    """Tests for JSON Lines export."""
+
+    def test_keys_follow_catalog_then_extras(self) -> None:
+        """Test that top-level keys are ordered by catalog, extras last."""
+        encoder = JsonlEncoder(["status", "customer.name"])
+
+        output = encoder.encode(
+            [{"extra": 1, "customer": {"name": "Ana"}, "status": "OPEN"}]
+        )
+
+        line = output.decode("utf-8").strip()
+        assert list(json.loads(line)) == ["status", "customer", "extra"]
+
+
+class TestParquetEncoder:
+    """Tests for Parquet export."""
+
+    @pytest.mark.asyncio
+    async def test_one_row_group_per_batch(self, source: SourceMetadataYaml) -> None:
+        """Test that each batch becomes a row group with catalog types."""
+        pq = pytest.importorskip("pyarrow.parquet")
+        encoder = create_encoder(ExportFormat.PARQUET, source)
+
+        output = await _collect(
+            encode_batches(
+                _batches(
+                    [{"status": "OPEN", "value": "10.5"}, {"status": "PAID"}],
+                    [{"status": "OVERDUE", "value": "n/a", "tags": ["x"]}],
+                ),
+                encoder,
+            )
+        )
+
+        parquet_file = pq.ParquetFile(io.BytesIO(output))
+        assert parquet_file.num_row_groups == 2
+        table = parquet_file.read()
+        assert table.column_names == ["status", "customer.name", "value", "tags"]
+        assert table.column("value").to_pylist() == [10.5, None, None]
+        assert table.column("tags").to_pylist() == [None, None, '["x"]']
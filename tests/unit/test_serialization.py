@@ -0,0 +1,68 @@
+"""Unit tests for orjson serialization and ORJSONResponse."""
+
+import json
+from datetime import UTC, datetime
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from bson import Decimal128, ObjectId
+
+from src.api.responses import ORJSONResponse
+from src.core.serialization import dumps
+from src.schemas.interpreter import QueryResultResponse
+
+
+class TestDumps:
+    """Tests for the orjson dumps helper."""
+
+    def test_bson_and_decimal_values(self) -> None:
+        """Test that BSON scalars and decimals are rendered as strings."""
+        object_id = ObjectId()
+
+        result = json.loads(
+            dumps(
+                {
+                    "_id": object_id,
+                    "value": Decimal128("54.08"),
+                    "fee": Decimal("1.50"),
+                    "raw": b"\x00\x01",
+                }
+            )
+        )
+
+        assert result == {
+            "_id": str(object_id),
+            "value": "54.08",
+            "fee": "1.50",
+            "raw": "AAE=",
+        }
+
+    def test_model_fields_are_expanded(self) -> None:
+        """Test that Pydantic models serialize like model_dump(mode='json')."""
+        model = QueryResultResponse(
+            query_id=uuid4(),
+            rows=[{"createdAt": datetime(2025, 1, 15, 10, 0, tzinfo=UTC)}],
+            row_count=1,
+            execution_time_ms=3,
+        )
+
+        assert json.loads(dumps(model)) == json.loads(model.model_dump_json())
+
+    def test_unsupported_type_raises(self) -> None:
+        """Test that unknown types are rejected instead of stringified."""
+        with pytest.raises(TypeError):
+            dumps({"value": object()})
+
+
+class TestORJSONResponse:
+    """Tests for the ORJSONResponse class."""
+
+    def test_render(self) -> None:
+        """Test that the response body and media type are JSON."""
+        response = ORJSONResponse(
+            {"rows": [{"_id": ObjectId("61df355c6d26db1a6b46515b")}]}
+        )
+
+        assert response.media_type == "application/json"
+        assert response.body == b'{"rows":[{"_id":"61df355c6d26db1a6b46515b"}]}'
@@ -0,0 +1,238 @@
+"""Unit tests for the user bitmap index."""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pymongo.errors import PyMongoError
+
+from src.repositories.external.mock_engine import MockMongoClient
+from src.schemas.catalog_yaml import ColumnMetadataYaml, SourceMetadataYaml
+from src.schemas.enums import InferredType
+from src.schemas.users import UserSetQueryRequest
+from src.services.interpreter.admission import AdmissionController
+from src.services.interpreter.query_executor import QueryExecutionError
+from src.services.user_bitmap_index import UserBitmapIndex
+
+INVOICES: list[dict[str, Any]] = [
+    {"_id": "61df355c6d26db1a6b465101", "consumerId": "1", "status": "OPEN"},
+    {"_id": "61df355c6d26db1a6b465102", "consumerId": "1", "status": "CLOSED"},
+    {"_id": "61df355c6d26db1a6b465103", "consumerId": "2", "status": "OPEN"},
+    {"_id": "61df355c6d26db1a6b465104", "consumerId": "3", "status": "CLOSED"},
+]
+
+CARDS: list[dict[str, Any]] = [
+    {"consumer_id": 1, "status": "ACTIVE"},
+    {"consumer_id": 3, "status": "ACTIVE"},
+    {"consumer_id": 4, "status": "BLOCKED"},
+]
+
+
+def _column(path: str, type_: InferredType, enumerable: bool) -> ColumnMetadataYaml:
+    return ColumnMetadataYaml(
+        path=path,
+        name=path,
+        type=type_,
+        required=True,
+        nullable=False,
+        enumerable=enumerable,
+        presence_ratio=1.0,
+    )
+
+
+def _source(db_name: str, table_name: str, user_key: str) -> SourceMetadataYaml:
+    return SourceMetadataYaml(
+        db_name=db_name,
+        table_name=table_name,
+        document_count=1,
+        extracted_at="2025-01-15T10:00:00+00:00",
+        user_key=user_key,
+        columns=[
+            _column(user_key, InferredType.STRING, False),
+            _column("status", InferredType.STRING, True),
+        ],
+    )
+
+
+SOURCES = [
+    _source("credit", "invoice", "consumerId"),
+    _source("card_account_authorization", "card_main", "consumer_id"),
+]
+
+
+def _write(path: Path, name: str, documents: list[dict[str, Any]]) -> None:
+    (path / f"{name}.json").write_text(json.dumps(documents))
+
+
+def _index(path: Path) -> UserBitmapIndex:
+    catalog = MagicMock()
+    catalog.count_sources = AsyncMock(return_value=len(SOURCES))
+    catalog.list_sources = AsyncMock(return_value=SOURCES)
+    return UserBitmapIndex(
+        mongo_client=MockMongoClient(path),  # type: ignore[arg-type]
+        catalog_repository=catalog,
+        admission=AdmissionController(
+            max_in_flight=4,
+            source_max_in_flight=4,
+            max_queue_size=10,
+            queue_timeout_seconds=1.0,
+        ),
+    )
+
+
+@pytest.fixture
+def index(tmp_path: Path) -> UserBitmapIndex:
+    """Create an index over invoices and cards keyed by the same users."""
+    _write(tmp_path, "credit.invoice", INVOICES)
+    _write(tmp_path, "card_account_authorization.card_main", CARDS)
+    return _index(tmp_path)
+
+
+def _request(expression: dict[str, Any], **kwargs: Any) -> UserSetQueryRequest:
+    return UserSetQueryRequest.model_validate({"expression": expression, **kwargs})
+
+
+OPEN = {"source": "credit.invoice", "column": "status", "values": ["OPEN"]}
+ACTIVE = {
+    "source": "card_account_authorization.card_main",
+    "column": "status",
+    "values": ["ACTIVE"],
+}
+
+
+class TestUserSetQueries:
+    """Tests for evaluating scenarios over the bitmaps."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("expression", "expected"),
+        [
+            (OPEN, ["1", "2"]),
+            ({"operator": "and", "operands": [OPEN, ACTIVE]}, ["1"]),
+            ({"operator": "or", "operands": [OPEN, ACTIVE]}, ["1", "2", "3"]),
+            ({"operator": "andnot", "operands": [ACTIVE, OPEN]}, ["3"]),
+            (
+                {
+                    "operator": "andnot",
+                    "operands": [{"source": "credit.invoice"}, ACTIVE],
+                },
+                ["2"],
+            ),
+        ],
+    )
+    async def test_set_operations(
+        self, index: UserBitmapIndex, expression: dict[str, Any], expected: list[str]
+    ) -> None:
+        """Test user-level and / or / andnot across sources."""
+        response = await index.query(_request(expression, limit=10))
+
+        assert response.user_count == len(expected)
+        assert sorted(response.user_keys) == expected
+
+    @pytest.mark.asyncio
+    async def test_rows_are_hydrated_from_source(self, index: UserBitmapIndex) -> None:
+        """Test that only the first users' rows are fetched, from any source."""
+        expression = {"operator": "and", "operands": [OPEN, ACTIVE]}
+        response = await index.query(
+            _request(expression, source="card_account_authorization.card_main")
+        )
+
+        assert response.source == "card_account_authorization.card_main"
+        assert [row["consumer_id"] for row in response.rows] == [1]
+        assert response.index_refreshed_at is not None
+
+    @pytest.mark.asyncio
+    async def test_unindexed_column_is_rejected(self, index: UserBitmapIndex) -> None:
+        """Test that terms on non-enumerable columns are reported."""
+        term = {"source": "credit.invoice", "column": "consumerId", "values": ["1"]}
+
+        with pytest.raises(QueryExecutionError) as exc_info:
+            await index.query(_request(term))
+
+        assert exc_info.value.code == "PREDICATE_NOT_INDEXED"
+
+
+class TestRefresh:
+    """Tests for incremental refreshes and statistics."""
+
+    @pytest.mark.asyncio
+    async def test_incremental_refresh_adds_new_documents(self, tmp_path: Path) -> None:
+        """Test that a refresh only scans documents after the last _id."""
+        _write(tmp_path, "credit.invoice", INVOICES)
+        _write(tmp_path, "card_account_authorization.card_main", CARDS)
+        index = _index(tmp_path)
+        await index.refresh(full=True)
+
+        # New client over an appended file: same old documents plus one
+        _write(
+            tmp_path,
+            "credit.invoice",
+            [
+                *INVOICES,
+                {
+                    "_id": "61df355c6d26db1a6b465105",
+                    "consumerId": "9",
+                    "status": "OPEN",
+                },
+            ],
+        )
+        index._mongo_client = MockMongoClient(tmp_path)  # type: ignore[assignment]
+        await index.refresh()
+
+        invoices = next(s for s in index.stats().sources if s.user_key == "consumerId")
+        assert invoices.documents_scanned == len(INVOICES) + 1
+        response = await index.query(_request(OPEN))
+        assert sorted(response.user_keys) == ["1", "2", "9"]
+
+    @pytest.mark.asyncio
+    async def test_stats_report_memory(self, index: UserBitmapIndex) -> None:
+        """Test that stats cover users, predicates and memory per source."""
+        assert not index.stats().ready
+
+        await index.refresh()
+        stats = index.stats()
+
+        assert stats.ready
+        assert stats.users == 4
+        assert stats.predicates == 4
+        assert stats.bitmap_bytes > 0
+        assert stats.dictionary_bytes > 0
+        assert stats.refresh_count == 1
+
+    @pytest.mark.asyncio
+    async def test_ensure_ready_skips_lock_once_built(
+        self, index: UserBitmapIndex
+    ) -> None:
+        """Test that a built index does not wait on a running refresh."""
+        await index.ensure_ready()
+
+        async with index._refresh_lock:
+            await asyncio.wait_for(index.ensure_ready(), timeout=1.0)
+
+        assert index.stats().refresh_count == 1
+
+    @pytest.mark.asyncio
+    async def test_refresher_survives_driver_errors(
+        self, index: UserBitmapIndex
+    ) -> None:
+        """Test that a failed background refresh is retried on the next tick."""
+        index._settings = index._settings.model_copy(
+            update={"user_index_refresh_interval_seconds": 0}
+        )
+        index._catalog_repository.count_sources.side_effect = [  # type: ignore[attr-defined]
+            PyMongoError("connection reset"),
+            len(SOURCES),
+        ]
+        index.start()
+        try:
+            for _ in range(100):
+                if index.is_ready:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await index.stop()
+
+        assert index.is_ready
@@ -0,0 +1,153 @@
+"""Unit tests for the user dossier service."""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.config import Settings
+from src.repositories.external.mock_engine import MockMongoClient
+from src.schemas.catalog_yaml import SourceMetadataYaml
+from src.schemas.enums import DossierSourceStatus
+from src.services.interpreter.admission import AdmissionController
+from src.services.user_dossier import UserDossierService, get_dossier_cache
+
+
+def _source(db_name: str, table_name: str, user_key: str | None) -> SourceMetadataYaml:
+    return SourceMetadataYaml(
+        db_name=db_name,
+        table_name=table_name,
+        document_count=1,
+        extracted_at="2025-01-15T10:00:00+00:00",  # type: ignore[arg-type]
+        user_key=user_key,
+    )
+
+
+SOURCES = [
+    _source("credit", "invoice", "consumerId"),
+    _source("card_account_authorization", "card_main", "consumer_id"),
+    _source("catalog", "products", None),
+]
+
+
+@pytest.fixture
+def mongo_client(tmp_path: Path) -> MockMongoClient:
+    """Create an engine client with invoices, cards and an unkeyed source."""
+    data: dict[str, list[dict[str, Any]]] = {
+        "credit.invoice": [
+            {"consumerId": "42", "status": "OPEN"},
+            {"consumerId": "42", "status": "CLOSED"},
+            {"consumerId": "7", "status": "OPEN"},
+        ],
+        "card_account_authorization.card_main": [
+            {"consumer_id": 42, "status": "ACTIVE"},
+        ],
+        "catalog.products": [{"consumerId": "42"}],
+    }
+    for name, documents in data.items():
+        (tmp_path / f"{name}.json").write_text(json.dumps(documents))
+    return MockMongoClient(tmp_path)
+
+
+def _make_service(mongo_client: Any, **settings: Any) -> UserDossierService:
+    catalog = MagicMock()
+    catalog.count_sources = AsyncMock(return_value=len(SOURCES))
+    catalog.list_sources = AsyncMock(return_value=SOURCES)
+    service = UserDossierService(
+        mongo_client=mongo_client,
+        catalog_repository=catalog,
+        admission=AdmissionController(
+            max_in_flight=10,
+            source_max_in_flight=2,
+            max_queue_size=10,
+            queue_timeout_seconds=1.0,
+        ),
+    )
+    service._settings = Settings(**settings)
+    return service
+
+
+class TestUserDossier:
+    """Tests for the concurrent per-user fan-out."""
+
+    @pytest.fixture(autouse=True)
+    def _clear_dossier_cache(self) -> None:
+        get_dossier_cache().clear()
+
+    @pytest.mark.asyncio
+    async def test_merges_sources_with_user_key(
+        self, mongo_client: MockMongoClient
+    ) -> None:
+        """Test that every keyed source is queried and merged by source ID."""
+        service = _make_service(mongo_client)
+
+        dossier = await service.get_dossier("42")
+
+        assert sorted(dossier.documents) == [
+            "card_account_authorization.card_main",
+            "credit.invoice",
+        ]
+        assert [d["status"] for d in dossier.documents["credit.invoice"]] == [
+            "OPEN",
+            "CLOSED",
+        ]
+        assert [s.source_id for s in dossier.sources] == [
+            "credit.invoice",
+            "card_account_authorization.card_main",
+        ]
+        assert not dossier.is_partial
+        assert not dossier.cached
+
+    @pytest.mark.asyncio
+    async def test_truncates_per_source(self, mongo_client: MockMongoClient) -> None:
+        """Test that each source returns at most the configured documents."""
+        service = _make_service(mongo_client, dossier_source_max_documents=1)
+
+        dossier = await service.get_dossier("42")
+
+        invoice = dossier.sources[0]
+        assert (invoice.document_count, invoice.truncated) == (1, True)
+        assert len(dossier.documents["credit.invoice"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_slow_source_times_out(self, mongo_client: MockMongoClient) -> None:
+        """Test that a slow source is reported without failing the dossier."""
+        service = _make_service(mongo_client, dossier_source_timeout_seconds=0.01)
+        cards = mongo_client["card_account_authorization"]["card_main"]
+        find_raw_batches = cards.find_raw_batches
+
+        def slow_find(*args: Any, **kwargs: Any) -> Any:
+            cursor = find_raw_batches(*args, **kwargs)
+
+            async def batches() -> Any:
+                await asyncio.sleep(1)
+                async for batch in cursor:
+                    yield batch
+
+            return batches()
+
+        cards.find_raw_batches = slow_find  # type: ignore[method-assign]
+
+        dossier = await service.get_dossier("42")
+
+        assert dossier.is_partial
+        assert dossier.sources[1].status == DossierSourceStatus.TIMEOUT
+        assert "credit.invoice" in dossier.documents
+        # Partial dossiers are not cached
+        assert (await service.get_dossier("42")).cached is False
+
+    @pytest.mark.asyncio
+    async def test_complete_dossier_is_cached(
+        self, mongo_client: MockMongoClient
+    ) -> None:
+        """Test that a repeated lookup is served from the cache."""
+        service = _make_service(mongo_client)
+
+        await service.get_dossier("42")
+        dossier = await service.get_dossier("42")
+
+        assert dossier.cached
+        service._catalog_repository.list_sources.assert_awaited_once()  # type: ignore[attr-defined]